@@ -0,0 +1,118 @@
+"""
+CFX Transport Throughput Benchmark
+
+Measures CFXTransport publish and consume throughput against the in-process
+MemoryBroker, comparing the unbatched/serial settings (one confirm round
+trip per message, one handler at a time) with batched confirms and a
+parallel handler pool.
+
+The broker's confirm latency and the handler's work time stand in for the
+network round trip and the per-message processing of a real line.
+
+Run with: python examples/performance/cfx_transport_benchmark.py
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+
+from pywats_events import Event, EventType
+
+from pywats_cfx import CFXConfig, CFXTransport, MemoryBroker
+from pywats_cfx.config import EndpointConfig, ExchangeConfig
+
+
+MESSAGES = 2000
+SOURCES = 20
+CONFIRM_LATENCY = 0.002  # Broker round trip per confirm (seconds)
+HANDLER_TIME = 0.001  # Simulated async work per incoming message (seconds)
+
+
+@dataclass
+class BenchmarkResult:
+    """Results from a benchmark run"""
+    name: str
+    messages: int
+    duration_seconds: float
+
+    @property
+    def messages_per_second(self) -> float:
+        return self.messages / self.duration_seconds
+
+    def __str__(self) -> str:
+        return f"{self.name:<40} {self.messages_per_second:>10.0f} msg/s ({self.duration_seconds:.2f}s)"
+
+
+def make_transport(broker: MemoryBroker, on_event=None, **exchange) -> CFXTransport:
+    config = CFXConfig(
+        endpoint=EndpointConfig(cfx_handle="//Benchmark/WATS/Station1"),
+        exchange=ExchangeConfig(**exchange),
+        auto_reconnect=False,
+        publish_endpoint_connected=False,
+        publish_endpoint_disconnected=False,
+    )
+    return CFXTransport(config, on_event=on_event, amqp=broker)
+
+
+async def benchmark_publish(name: str, **exchange) -> BenchmarkResult:
+    """Publish MESSAGES events from SOURCES concurrent producers."""
+    transport = make_transport(MemoryBroker(confirm_latency=CONFIRM_LATENCY), **exchange)
+    await transport.connect()
+
+    async def producer(source: int) -> None:
+        for n in range(MESSAGES // SOURCES):
+            await transport.send(Event(event_type=EventType.TEST_RESULT, payload={"source": source, "n": n}))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(producer(source) for source in range(SOURCES)))
+    duration = time.perf_counter() - start
+
+    await transport.disconnect()
+    return BenchmarkResult(name, MESSAGES, duration)
+
+
+async def benchmark_consume(name: str, **exchange) -> BenchmarkResult:
+    """Handle MESSAGES incoming messages from SOURCES endpoints."""
+    broker = MemoryBroker()
+    done = asyncio.Event()
+    received = 0
+
+    async def on_event(event: Event) -> None:
+        nonlocal received
+        await asyncio.sleep(HANDLER_TIME)
+        received += 1
+        if received == MESSAGES:
+            done.set()
+
+    transport = make_transport(broker, on_event, **exchange)
+    await transport.connect()
+
+    start = time.perf_counter()
+    for n in range(MESSAGES):
+        source = f"//Line1/Station{n % SOURCES}"
+        body = json.dumps({"MessageName": "CFX.Production.Testing.Benchmark", "Seq": n}).encode()
+        broker.deliver("cfx.exchange", "CFX.Production.Testing.Benchmark", body, app_id=source)
+    await done.wait()
+    duration = time.perf_counter() - start
+
+    await transport.disconnect()
+    return BenchmarkResult(name, MESSAGES, duration)
+
+
+async def main() -> None:
+    print(f"{MESSAGES} messages, {SOURCES} sources, "
+          f"confirm latency {CONFIRM_LATENCY * 1000:.0f}ms, handler {HANDLER_TIME * 1000:.0f}ms\n")
+
+    print("Publish")
+    print(await benchmark_publish("one confirm per message", publish_batch_size=1))
+    print(await benchmark_publish("batched confirms (100)", publish_batch_size=100))
+
+    print("\nConsume")
+    print(await benchmark_consume("serial handler", consumer_concurrency=1))
+    print(await benchmark_consume("8 handlers, prefetch 100", consumer_concurrency=8))
+    print(await benchmark_consume("32 handlers, prefetch 200", consumer_concurrency=32, prefetch_count=200))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
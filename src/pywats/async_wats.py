@@ -16,6 +16,7 @@ from .core.throttle import RateLimiter
 from .core.exceptions import ErrorMode, ErrorHandler
 
 if TYPE_CHECKING:
+    import httpx
     from .core.config import APISettings
 
 # Import async services
@@ -99,6 +100,7 @@ class AsyncWATS:
         cache_max_size: int = 1000,
         instance_id: str = "default",
         settings: Optional['APISettings'] = None,
+        transport: Optional['httpx.AsyncBaseTransport'] = None,
     ):
         """
         Initialize the async pyWATS API.
@@ -142,6 +144,8 @@ class AsyncWATS:
             instance_id: pyWATS Client instance ID for auto-discovery (default: "default")
             settings: APISettings object for injected configuration. Settings from this
                      object are used as defaults, but can be overridden by explicit parameters.
+            transport: Optional httpx transport used instead of the network
+                      (e.g. the pywats_dev server stand-in or a replay transport).
         
         Raises:
             ValueError: If credentials not provided and service discovery fails
@@ -242,6 +246,7 @@ class AsyncWATS:
             enable_cache=enable_cache,
             cache_ttl=cache_ttl,
             cache_max_size=cache_max_size,
+            transport=transport,
         )
         
         # Service instances (lazy initialization)
@@ -343,6 +348,14 @@ class AsyncWATS:
     
     async def close(self) -> None:
         """Close the async HTTP client."""
+        if self._asset is not None:
+            await self._asset.close()
+        if self._process is not None:
+            await self._process.close()
+        if self._product is not None:
+            await self._product.close()
+        if self._production is not None:
+            await self._production.close()
         await self._http_client.close()
     
     # -------------------------------------------------------------------------
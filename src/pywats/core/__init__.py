@@ -67,6 +67,8 @@ from .parallel import (
 from .pagination import (
     paginate,
     paginate_all,
+    apaginate,
+    apaginate_windows,
     Paginator,
     PaginationConfig,
 )
@@ -128,6 +130,8 @@ __all__ = [
     # Pagination
     "paginate",
     "paginate_all",
+    "apaginate",
+    "apaginate_windows",
     "Paginator",
     "PaginationConfig",
     # Routes
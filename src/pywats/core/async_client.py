@@ -77,6 +77,7 @@ class AsyncHttpClient:
         metrics_collector: Optional['MetricsCollector'] = None,
         circuit_breaker_config: Optional[CircuitBreakerConfig] = None,
         enable_circuit_breaker: bool = True,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
     ):
         """
         Initialize the async HTTP client.
@@ -95,6 +96,9 @@ class AsyncHttpClient:
             metrics_collector: Optional MetricsCollector for request tracking
             circuit_breaker_config: Circuit breaker configuration (default: reasonable defaults)
             enable_circuit_breaker: Enable circuit breaker pattern (default: True)
+            transport: Optional httpx transport (e.g. httpx.MockTransport) used
+                      instead of the network. Intended for tests, the local
+                      server stand-in and traffic replay.
         """
         # Clean up base URL
         self.base_url = base_url.rstrip("/")
@@ -152,6 +156,7 @@ class AsyncHttpClient:
 
         # Async httpx client (created on first use or via context manager)
         self._client: Optional[httpx.AsyncClient] = None
+        self._transport = transport
 
         # Trace capture stack
         self._trace_stack: list[list[dict[str, Any]]] = []
@@ -270,7 +275,8 @@ class AsyncHttpClient:
                 verify=self.verify_ssl,
                 follow_redirects=True,
                 limits=limits,  # Enable connection pooling
-                http2=True  # Enable HTTP/2 for multiplexing
+                http2=True,  # Enable HTTP/2 for multiplexing
+                transport=self._transport
             )
         return self._client
 
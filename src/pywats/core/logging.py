@@ -21,21 +21,46 @@ JSON structured logging usage:
 Quick debugging:
     >>> from pywats import enable_debug_logging
     >>> enable_debug_logging()
+
+Non-blocking logging for long-running services:
+    >>> from pywats.core.logging import configure_logging, shutdown_logging
+    >>> configure_logging(file_path=Path("pywats.log"), queued=True, rate_limit_seconds=5.0)
+    >>> # Records are handed to a background writer thread; the caller never
+    >>> # touches the disk. Call shutdown_logging() to flush on exit.
 """
 
+import atexit
+import copy
 import json
 import logging
+import queue
 import sys
+import threading
+import time
+from collections import OrderedDict
 from contextvars import ContextVar, copy_context
 from datetime import datetime, timezone
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
 
 
 # Context variable for structured logging metadata
 _logging_context: ContextVar[Dict[str, Any]] = ContextVar('_logging_context', default={})
 
+# Record attribute used to carry a snapshot of the logging context across
+# threads (see QueuedHandler). Underscore-prefixed so it never shows up as an
+# extra field in structured output.
+_CONTEXT_ATTR = '_pywats_context'
+
+# Standard LogRecord attributes that are never emitted as extra fields
+_RESERVED_FIELDS = frozenset({
+    'name', 'msg', 'args', 'created', 'filename', 'funcName', 'levelname',
+    'levelno', 'lineno', 'module', 'msecs', 'message', 'pathname', 'process',
+    'processName', 'relativeCreated', 'thread', 'threadName', 'exc_info',
+    'exc_text', 'stack_info', 'correlation_id', 'taskName',
+})
+
 
 class CorrelationFilter(logging.Filter):
     """
@@ -99,37 +124,159 @@ class StructuredFormatter(logging.Formatter):
         if hasattr(record, 'correlation_id') and record.correlation_id != "--------":
             log_data["correlation_id"] = record.correlation_id
         
-        # Add context from ContextVar
-        try:
+        # Add context - prefer the snapshot taken by QueuedHandler on the
+        # logging thread, fall back to the ContextVar for direct handlers
+        context = record.__dict__.get(_CONTEXT_ATTR)
+        if context is None:
             context = _logging_context.get()
-            if context:
-                log_data["context"] = context
-        except LookupError:
-            pass
+        if context:
+            log_data["context"] = context
         
         # Add extra fields from record.__dict__
         # Exclude standard logging fields and private attributes
-        reserved_fields = {
-            'name', 'msg', 'args', 'created', 'filename', 'funcName', 'levelname',
-            'levelno', 'lineno', 'module', 'msecs', 'message', 'pathname', 'process',
-            'processName', 'relativeCreated', 'thread', 'threadName', 'exc_info',
-            'exc_text', 'stack_info', 'correlation_id'
-        }
-        
         for key, value in record.__dict__.items():
-            if key not in reserved_fields and not key.startswith('_'):
-                # Handle non-serializable types
-                try:
-                    json.dumps(value)  # Test serializability
-                    log_data[key] = value
-                except (TypeError, ValueError):
-                    log_data[key] = str(value)
+            if key not in _RESERVED_FIELDS and not key.startswith('_'):
+                log_data[key] = value
         
-        # Add exception info if present
+        # Add exception info if present (exc_text is pre-rendered by QueuedHandler)
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_data["exception"] = record.exc_text
+        
+        # Single encoding pass - non-serializable values fall back to str()
+        try:
+            return json.dumps(log_data, default=str)
+        except (TypeError, ValueError):
+            # Circular references or non-str keys in extra: keep the record
+            return json.dumps({
+                key: log_data[key]
+                for key in ("timestamp", "level", "logger", "message", "exception")
+                if key in log_data
+            }, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Logging filter that suppresses repeated messages.
+    
+    Records are keyed by logger name, level and source location plus the
+    formatted message, so only identical messages are suppressed: a call
+    site that logs a different argument each time (e.g. one line per file)
+    is never throttled. The first occurrence passes; repeats within
+    ``interval`` seconds are dropped. The next record let through after the
+    window carries a ``suppressed`` count.
+    
+    Args:
+        interval: Suppression window in seconds (default: 5.0)
+        max_keys: Maximum number of distinct messages tracked (default: 1024)
         
-        return json.dumps(log_data)
+    Example:
+        >>> from pywats.core.logging import RateLimitFilter
+        >>> handler.addFilter(RateLimitFilter(interval=10.0))
+    """
+    
+    def __init__(self, interval: float = 5.0, max_keys: int = 1024):
+        """Initialize filter with suppression window."""
+        super().__init__()
+        self.interval = interval
+        self.max_keys = max_keys
+        # key -> [window_start, suppressed_count]
+        self._seen: "OrderedDict[Tuple[Any, ...], List[Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Return False for repeats inside the suppression window."""
+        key = (record.name, record.levelno, record.pathname, record.lineno, record.getMessage())
+        now = time.monotonic()
+        
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry is not None and now - entry[0] < self.interval:
+                entry[1] += 1
+                return False
+            
+            suppressed = entry[1] if entry is not None else 0
+            self._seen[key] = [now, 0]
+            self._seen.move_to_end(key)
+            while len(self._seen) > self.max_keys:
+                self._seen.popitem(last=False)
+        
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class QueuedHandler(QueueHandler):
+    """
+    Queue handler that hands records to a background writer thread.
+    
+    Unlike the stdlib QueueHandler, the record is not pre-formatted: it is
+    only made thread-safe (message merged with args, exception rendered to
+    text, logging context snapshotted) so that the handlers behind the
+    QueueListener can still apply their own formatters.
+    
+    Enqueueing never blocks. With a bounded queue, records that do not fit
+    are dropped and counted in ``dropped``.
+    
+    Args:
+        log_queue: Queue shared with the QueueListener
+    """
+    
+    def __init__(self, log_queue: "queue.Queue[Any]"):
+        """Initialize handler."""
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._exc_formatter = logging.Formatter()
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Make the record safe to format on another thread."""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        if _CONTEXT_ATTR not in record.__dict__:
+            context = _logging_context.get()
+            record.__dict__[_CONTEXT_ATTR] = dict(context) if context else {}
+        return record
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Enqueue without blocking, dropping the record if the queue is full."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+# Active listener when configure_logging(queued=True) is in effect
+_queue_listener: Optional[QueueListener] = None
+_atexit_registered = False
+
+
+def shutdown_logging() -> None:
+    """
+    Stop the background logging writer, flushing all queued records.
+    
+    Safe to call when queued logging is not active. Registered with atexit
+    automatically by configure_logging(queued=True).
+    """
+    global _queue_listener
+    
+    listener = _queue_listener
+    _queue_listener = None
+    if listener is None:
+        return
+    
+    listener.stop()
+    for handler in listener.handlers:
+        try:
+            handler.flush()
+            handler.close()
+        except Exception:
+            pass
 
 
 # Default format with correlation ID
@@ -285,7 +432,10 @@ def configure_logging(
     rotate_size_mb: int = 10,
     rotate_backups: int = 5,
     enable_correlation_ids: bool = True,
-    enable_context: bool = True
+    enable_context: bool = True,
+    queued: bool = False,
+    queue_size: int = 0,
+    rate_limit_seconds: Optional[float] = None
 ) -> None:
     """
     Configure unified logging for pyWATS with support for text/JSON formats and file rotation.
@@ -302,6 +452,13 @@ def configure_logging(
         rotate_backups: Number of backup files to keep (default: 5)
         enable_correlation_ids: Include correlation IDs in log output (default: True)
         enable_context: Include logging context in log output (default: True)
+        queued: Hand records to a background writer thread through a
+            QueueHandler/QueueListener pair so that logging never blocks the
+            caller on I/O (default: False)
+        queue_size: Maximum queued records when queued=True, 0 for unbounded.
+            Records that do not fit are dropped rather than blocking.
+        rate_limit_seconds: Suppress repeats of the same message within this
+            window (default: None, no rate limiting)
         
     Example (text logging to console):
         >>> from pywats.core.logging import configure_logging
@@ -323,7 +480,17 @@ def configure_logging(
         >>> from pywats.core.logging import configure_logging
         >>> custom_handler = logging.StreamHandler()
         >>> configure_logging(handlers=[custom_handler])
+        
+    Example (service with background writer):
+        >>> configure_logging(
+        ...     format="json",
+        ...     file_path=Path("logs/pywats.log"),
+        ...     queued=True,
+        ...     rate_limit_seconds=5.0
+        ... )
     """
+    global _atexit_registered, _queue_listener
+    
     # Convert string level to numeric if needed
     if isinstance(level, str):
         level = getattr(logging, level.upper())
@@ -331,6 +498,9 @@ def configure_logging(
     # Get root logger
     root_logger = logging.getLogger()
     
+    # Stop a previous background writer before replacing its handlers
+    shutdown_logging()
+    
     # Clear existing handlers to avoid duplicates
     root_logger.handlers.clear()
     
@@ -361,13 +531,35 @@ def configure_logging(
         
         handler.setFormatter(formatter)
         
+        if queued:
+            continue
+        
         # Add correlation filter if enabled (for both JSON and text)
         if enable_correlation_ids:
             handler.addFilter(CorrelationFilter())
+        if rate_limit_seconds:
+            handler.addFilter(RateLimitFilter(rate_limit_seconds))
         
         # Add handler to root logger
         root_logger.addHandler(handler)
     
+    if queued:
+        # Filters run on the logging thread, where the correlation ID
+        # ContextVar is visible and suppressed records are cheapest to drop
+        log_queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        queue_handler = QueuedHandler(log_queue)
+        if enable_correlation_ids:
+            queue_handler.addFilter(CorrelationFilter())
+        if rate_limit_seconds:
+            queue_handler.addFilter(RateLimitFilter(rate_limit_seconds))
+        root_logger.addHandler(queue_handler)
+        
+        _queue_listener = QueueListener(log_queue, *handler_list, respect_handler_level=True)
+        _queue_listener.start()
+        if not _atexit_registered:
+            atexit.register(shutdown_logging)
+            _atexit_registered = True
+    
     # Set root logger level
     root_logger.setLevel(level)
     
@@ -459,7 +651,10 @@ __all__ = [
     'get_logging_context',
     'FileRotatingHandler',
     'LoggingContext',
+    'shutdown_logging',
     'CorrelationFilter',
+    'RateLimitFilter',
+    'QueuedHandler',
     'StructuredFormatter',
     'DEFAULT_FORMAT',
     'DEFAULT_FORMAT_DETAILED',
@@ -28,7 +28,7 @@ import functools
 import logging
 from pywats.core.logging import get_logger
 import time
-from typing import Callable, Optional, TypeVar, Any
+from typing import Any, Callable, Dict, Optional, TypeVar
 import threading
 
 logger = get_logger(__name__)
@@ -44,6 +44,7 @@ try:
         CONTENT_TYPE_LATEST,
     )
     from prometheus_client import start_http_server
+    from prometheus_client.core import HistogramMetricFamily
     
     PROMETHEUS_AVAILABLE = True
 except ImportError:
@@ -61,6 +62,33 @@ except ImportError:
 T = TypeVar('T')
 
 
+class _ConverterQueueWaitCollector:
+    """
+    Exports per-converter queue wait times as a Prometheus histogram.
+    
+    The histograms are kept by the converter pool's queue; this collector
+    republishes the latest snapshot (see update_converter_queues).
+    """
+    
+    def __init__(self):
+        self.flows: Dict[str, Dict[str, Any]] = {}
+    
+    def collect(self):
+        family = HistogramMetricFamily(
+            'pywats_converter_queue_wait_seconds',
+            'Time files waited in the conversion queue before processing',
+            labels=['converter']
+        )
+        for converter, flow in self.flows.items():
+            wait = flow["wait_seconds"]
+            family.add_metric(
+                [converter],
+                buckets=list(wait["buckets"].items()),
+                sum_value=wait["sum"]
+            )
+        yield family
+
+
 class MetricsCollector:
     """
     Central metrics collection for pyWATS.
@@ -164,6 +192,51 @@ class MetricsCollector:
             ['converter'],
             registry=self.registry
         )
+        
+        # Adaptive upload concurrency (converter pool submit stage)
+        self.upload_concurrency_limit = Gauge(
+            'pywats_upload_concurrency_limit',
+            'Current adaptive upload concurrency limit',
+            registry=self.registry
+        )
+        
+        self.upload_concurrency_in_flight = Gauge(
+            'pywats_upload_concurrency_in_flight',
+            'Report submits currently in flight',
+            registry=self.registry
+        )
+        
+        self.upload_concurrency_decisions = Gauge(
+            'pywats_upload_concurrency_decisions',
+            'Adaptive upload concurrency decisions by type',
+            ['decision'],
+            registry=self.registry
+        )
+        
+        # Fair scheduling across converters (converter pool queue)
+        self.converter_queue_pending = Gauge(
+            'pywats_converter_queue_pending',
+            'Files queued for conversion by converter',
+            ['converter'],
+            registry=self.registry
+        )
+        
+        self.converter_queue_in_flight = Gauge(
+            'pywats_converter_queue_in_flight',
+            'Conversions in flight by converter',
+            ['converter'],
+            registry=self.registry
+        )
+        
+        self.converter_queue_rejected = Gauge(
+            'pywats_converter_queue_rejected',
+            'Files left on disk because the converter queue was full',
+            ['converter'],
+            registry=self.registry
+        )
+        
+        self._converter_queue_wait = _ConverterQueueWaitCollector()
+        self.registry.register(self._converter_queue_wait)
     
     def track_request(self, method: str, endpoint: str) -> Callable:
         """
@@ -266,6 +339,33 @@ class MetricsCollector:
         if self.enabled:
             self.queue_depth.labels(queue_name=queue_name).set(depth)
     
+    def update_upload_concurrency(self, snapshot: Dict[str, Any]):
+        """
+        Update adaptive upload concurrency metrics.
+        
+        Args:
+            snapshot: AdaptiveConcurrencyLimiter.snapshot() result
+        """
+        if self.enabled:
+            self.upload_concurrency_limit.set(snapshot["limit"])
+            self.upload_concurrency_in_flight.set(snapshot["in_flight"])
+            for decision, count in snapshot["decisions"].items():
+                self.upload_concurrency_decisions.labels(decision=decision).set(count)
+    
+    def update_converter_queues(self, flows: Dict[str, Dict[str, Any]]):
+        """
+        Update per-converter queue metrics.
+        
+        Args:
+            flows: AsyncConverterPool.converter_queues result
+        """
+        if self.enabled:
+            for converter, flow in flows.items():
+                self.converter_queue_pending.labels(converter=converter).set(flow["pending"])
+                self.converter_queue_in_flight.labels(converter=converter).set(flow["in_flight"])
+                self.converter_queue_rejected.labels(converter=converter).set(flow["rejected"])
+            self._converter_queue_wait.flows = flows
+    
     def track_queue_processing(self, queue_name: str, item_type: str, duration: float):
         """
         Track queue item processing duration.
@@ -15,14 +15,32 @@ Usage:
     ):
         print(user.display_name)
 
+Async services use the prefetching variants, which fetch the next pages
+while the caller consumes the current one:
+
+    async for user in apaginate(
+        fetch_page=lambda start, count: api.scim.get_users(start_index=start, count=count),
+        get_items=lambda response: response.resources,
+        get_total=lambda response: response.total_results,
+        prefetch=2,
+    ):
+        print(user.display_name)
+
 Key Features:
 - Memory-efficient iteration (doesn't load all pages at once)
 - Automatic page boundary handling
 - Early termination support (break works)
 - Configurable page sizes
 - Progress tracking support
+- Bounded concurrent prefetch for async iteration
 """
-from typing import TypeVar, Callable, Iterator, Optional, Any, List, Generic
+import asyncio
+from collections import deque
+from datetime import datetime, timedelta
+from typing import (
+    TypeVar, Callable, Iterator, AsyncIterator, Awaitable, Optional, Any, List, Generic,
+    Deque, Tuple,
+)
 from dataclasses import dataclass
 import logging
 from pywats.core.logging import get_logger
@@ -334,9 +352,233 @@ class Paginator(Generic[T, R]):
             return None
 
 
+# =============================================================================
+# Async prefetching pagination
+# =============================================================================
+
+
+def _discard_tasks(tasks: List["asyncio.Future[Any]"]) -> None:
+    """Cancel prefetched pages that will not be consumed."""
+    for task in tasks:
+        if task.done():
+            if not task.cancelled():
+                task.exception()  # Mark retrieved - avoids "never retrieved" warnings
+        else:
+            task.cancel()
+
+
+async def apaginate(
+    fetch_page: Callable[[int, int], Awaitable[R]],
+    get_items: Callable[[R], Optional[List[T]]],
+    get_total: Optional[Callable[[R], Optional[int]]] = None,
+    page_size: int = 100,
+    start_index: int = 1,
+    max_items: Optional[int] = None,
+    prefetch: int = 2,
+    on_page: Optional[Callable[[int, int, Optional[int]], None]] = None,
+) -> AsyncIterator[T]:
+    """Async variant of paginate() that prefetches upcoming pages.
+
+    While the caller consumes one page, up to ``prefetch`` following pages
+    are already being fetched. Page offsets are computed up front
+    (``start_index + n * page_size``), so this fits offset-based APIs:
+    OData ``$skip``/``$top`` (``start_index=0``) and SCIM
+    ``startIndex``/``count`` (``start_index=1``).
+
+    Iteration stops at the first empty or partial page, or once
+    ``get_total`` reports all items retrieved; prefetched pages beyond that
+    point are cancelled. At most ``prefetch + 1`` pages are held in memory.
+
+    Args:
+        fetch_page: Async function fetching a page, takes (start_index, count)
+        get_items: Function to extract items from a page response
+        get_total: Optional function to get total count from response
+        page_size: Number of items per page (default: 100)
+        start_index: Starting index (default: 1 for SCIM-style)
+        max_items: Maximum items to retrieve (default: unlimited)
+        prefetch: Pages fetched ahead of the consumer (0 = sequential)
+        on_page: Optional callback (page_num, items_so_far, total); also
+            called for an empty first page
+
+    Yields:
+        Individual items in page order
+
+    Example:
+        >>> async for header in apaginate(
+        ...     fetch_page=lambda skip, top: repo.query_headers(skip=skip, top=top),
+        ...     get_items=lambda page: page,
+        ...     start_index=0,
+        ...     page_size=500,
+        ... ):
+        ...     process(header)
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+    if prefetch < 0:
+        raise ValueError("prefetch must be >= 0")
+
+    pending: Deque[Tuple[int, "asyncio.Future[R]"]] = deque()
+    next_index = start_index
+    total_items: Optional[int] = None
+    items_retrieved = 0
+    page_number = 0
+
+    def schedule() -> None:
+        """Keep up to prefetch + 1 page fetches in flight."""
+        nonlocal next_index
+        while len(pending) <= prefetch:
+            offset = next_index - start_index
+            if max_items is not None and offset >= max_items:
+                return
+            if total_items is not None and offset >= total_items:
+                return
+            count = page_size if max_items is None else min(page_size, max_items - offset)
+            pending.append((count, asyncio.ensure_future(fetch_page(next_index, count))))
+            next_index += count
+
+    try:
+        schedule()
+        while pending:
+            count, task = pending.popleft()
+            try:
+                response = await task
+            except Exception as e:
+                logger.exception(f"Error fetching page {page_number + 1}: {e}")
+                raise
+
+            items = get_items(response) or []
+            if get_total is not None and total_items is None:
+                try:
+                    total_items = get_total(response)
+                except Exception:
+                    pass  # Total not available
+
+            if not items:
+                logger.debug(f"Empty page {page_number + 1}, stopping")
+                if on_page and page_number == 0:
+                    on_page(1, 0, total_items)  # Callers rely on a first report
+                break
+
+            page_number += 1
+            if on_page:
+                on_page(page_number, items_retrieved + len(items), total_items)
+
+            is_last = len(items) < count
+            if is_last:
+                logger.debug(f"Partial page ({len(items)} < {count}), stopping")
+            else:
+                # Refill before handing items out so fetches overlap consumption
+                schedule()
+
+            for item in items:
+                yield item
+                items_retrieved += 1
+                if max_items is not None and items_retrieved >= max_items:
+                    return
+
+            if is_last:
+                break
+            if total_items is not None and items_retrieved >= total_items:
+                logger.debug(f"Reached total_items ({total_items}), stopping")
+                break
+    finally:
+        _discard_tasks([task for _, task in pending])
+
+    logger.debug(f"Async pagination complete: {items_retrieved} items in {page_number} pages")
+
+
+def date_windows(
+    start: datetime,
+    end: datetime,
+    window: timedelta,
+) -> List[Tuple[datetime, datetime]]:
+    """Split [start, end) into consecutive half-open windows.
+
+    Args:
+        start: Start of the range (inclusive)
+        end: End of the range (exclusive)
+        window: Window length
+
+    Returns:
+        List of (window_start, window_end) tuples in chronological order
+
+    Example:
+        >>> date_windows(datetime(2026, 1, 1), datetime(2026, 1, 3), timedelta(days=1))
+        [(datetime(2026, 1, 1, 0, 0), datetime(2026, 1, 2, 0, 0)),
+         (datetime(2026, 1, 2, 0, 0), datetime(2026, 1, 3, 0, 0))]
+    """
+    if window <= timedelta(0):
+        raise ValueError("window must be positive")
+    windows = []
+    current = start
+    while current < end:
+        upper = min(current + window, end)
+        windows.append((current, upper))
+        current = upper
+    return windows
+
+
+async def apaginate_windows(
+    fetch_window: Callable[[datetime, datetime], Awaitable[List[T]]],
+    start: datetime,
+    end: datetime,
+    window: timedelta,
+    prefetch: int = 2,
+    on_page: Optional[Callable[[int, int, Optional[int]], None]] = None,
+) -> AsyncIterator[T]:
+    """Iterate a time range window by window with prefetch.
+
+    Date-window cursoring avoids deep ``$skip`` offsets: each window is an
+    independent query, so the next ``prefetch`` windows are fetched while
+    the current one is consumed. Windows are half-open [start, end) and
+    yielded in chronological order.
+
+    Args:
+        fetch_window: Async function returning all items in (window_start, window_end)
+        start: Start of the range (inclusive)
+        end: End of the range (exclusive)
+        window: Window length
+        prefetch: Windows fetched ahead of the consumer (0 = sequential)
+        on_page: Optional callback (window_num, items_so_far, window_count)
+
+    Yields:
+        Items of each window in window order
+    """
+    if prefetch < 0:
+        raise ValueError("prefetch must be >= 0")
+
+    windows = deque(date_windows(start, end, window))
+    window_count = len(windows)
+    pending: Deque["asyncio.Future[List[T]]"] = deque()
+    items_retrieved = 0
+    window_number = 0
+
+    def schedule() -> None:
+        while windows and len(pending) <= prefetch:
+            lower, upper = windows.popleft()
+            pending.append(asyncio.ensure_future(fetch_window(lower, upper)))
+
+    try:
+        schedule()
+        while pending:
+            items = await pending.popleft() or []
+            schedule()
+            window_number += 1
+            if on_page:
+                on_page(window_number, items_retrieved + len(items), window_count)
+            for item in items:
+                yield item
+                items_retrieved += 1
+    finally:
+        _discard_tasks(list(pending))
+
+
 __all__ = [
     "paginate",
     "paginate_all",
+    "apaginate",
+    "apaginate_windows",
+    "date_windows",
     "Paginator",
     "PaginationConfig",
     "PaginationState",
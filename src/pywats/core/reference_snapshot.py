@@ -0,0 +1,313 @@
+"""
+Indexed, persistable snapshots of reference data.
+
+Processes and the product list change rarely but are looked up on every
+report. A ReferenceSnapshot keeps such a list in memory with hash indexes
+(e.g. process code and name, product part number), optionally saves it to
+a StateStore so a restarted client is warm immediately and keeps working
+offline, and refreshes it in the background. pywats itself stays
+memory-only; pywats_client.core.persistence.FileStateStore keeps the
+snapshot in a local JSON file.
+
+The list endpoints have no "modified since" filter, so a refresh downloads
+the list and applies it as a delta: entries are compared by content
+fingerprint, only added, changed and removed entries are swapped, and the
+store is written only when something changed. Unchanged entries keep
+their object identity. Entries saved through the API are applied at once
+with upsert(), so they are visible to the next read.
+
+Example:
+    >>> snapshot = ReferenceSnapshot(
+    ...     "processes", repo.get_processes, ProcessInfo,
+    ...     key=lambda p: p.code,
+    ...     indexes={"name": lambda p: p.name.lower() if p.name else None},
+    ...     store=FileStateStore("processes.json"),
+    ... )
+    >>> await snapshot.ensure_loaded()
+    >>> snapshot.lookup("name", "end of line test")
+"""
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from typing import (
+    Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Type, TypeVar,
+)
+
+from pydantic import BaseModel
+
+from pywats.core.logging import get_logger
+from pywats.core.state_store import StateStore
+
+logger = get_logger(__name__)
+
+M = TypeVar("M", bound=BaseModel)
+
+SNAPSHOT_VERSION = 1
+
+
+@dataclass
+class SnapshotDelta:
+    """Changes applied by one refresh."""
+    added: int = 0
+    changed: int = 0
+    removed: int = 0
+
+    @property
+    def unchanged(self) -> bool:
+        return not (self.added or self.changed or self.removed)
+
+
+class ReferenceSnapshot(Generic[M]):
+    """
+    In-memory, indexed copy of a reference-data list with optional persistence.
+
+    Args:
+        name: Name used in logs
+        loader: Async function returning the full list from the server
+        model: Pydantic model of the entries (for loading saved state)
+        key: Identity of an entry, used to compute deltas
+        indexes: Named secondary indexes, value function per index
+            (entries mapping to None are not indexed; first entry wins)
+        views: Named filtered lists, recomputed only when the data changes
+        store: Where the snapshot is saved between runs (None = not saved)
+        refresh_interval: Seconds after which an access triggers a
+            background refresh (0 = never refresh automatically)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        loader: Callable[[], Awaitable[List[M]]],
+        model: Type[M],
+        key: Callable[[M], Hashable],
+        indexes: Optional[Dict[str, Callable[[M], Optional[Hashable]]]] = None,
+        views: Optional[Dict[str, Callable[[M], bool]]] = None,
+        store: Optional[StateStore] = None,
+        refresh_interval: float = 300.0,
+    ) -> None:
+        self.name = name
+        self._loader = loader
+        self._model = model
+        self._key = key
+        self._index_funcs = dict(indexes or {})
+        self._view_funcs = dict(views or {})
+        self.store = store
+        self.refresh_interval = refresh_interval
+
+        self._items: Dict[Hashable, M] = {}
+        self._fingerprints: Dict[Hashable, str] = {}
+        self._indexes: Dict[str, Dict[Hashable, M]] = {}
+        self._views: Dict[str, List[M]] = {}
+        self._loaded = False
+        self._upserts: List[M] = []  # Saved while not loaded or while a download runs
+        self._refreshed_at: Optional[float] = None  # time.time() of last server refresh
+        self._refresh_task: Optional["asyncio.Task[SnapshotDelta]"] = None
+        self.version = 0  # Incremented on every change
+
+    # =========================================================================
+    # Access
+    # =========================================================================
+
+    @property
+    def loaded(self) -> bool:
+        """True once data is available (from the store or server)."""
+        return self._loaded
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the data was last refreshed from the server."""
+        return None if self._refreshed_at is None else time.time() - self._refreshed_at
+
+    def items(self) -> List[M]:
+        """All entries, in server order."""
+        return list(self._items.values())
+
+    def get(self, key: Hashable) -> Optional[M]:
+        """Entry by identity key."""
+        return self._items.get(key)
+
+    def lookup(self, index: str, value: Hashable) -> Optional[M]:
+        """Entry by secondary index value (O(1))."""
+        return self._indexes[index].get(value)
+
+    def view(self, name: str) -> List[M]:
+        """Precomputed filtered list (copy)."""
+        return list(self._views[name])
+
+    async def ensure_loaded(self) -> None:
+        """
+        Make data available and keep it fresh.
+
+        Loads the stored snapshot on first use; downloads only if there is
+        no usable snapshot. Stale data is served while a background refresh
+        runs.
+        """
+        if not self._loaded and self.store is not None:
+            await self._load()
+        if not self._loaded:
+            await self.refresh()
+        elif self._is_stale():
+            self._start_refresh()
+
+    def invalidate(self) -> None:
+        """Mark the data stale so the next access refreshes it."""
+        self._refreshed_at = None
+
+    def upsert(self, entries: List[M]) -> None:
+        """
+        Apply entries just saved to the server (added or replaced by key).
+
+        They are visible to the next read; the snapshot is marked stale so
+        a background refresh picks up anything the server changed on save.
+        """
+        if not entries:
+            return
+        self.invalidate()
+        if not self._loaded or (self._refresh_task is not None and not self._refresh_task.done()):
+            # Re-applied after the load or the running download
+            self._upserts.extend(entries)
+        if not self._loaded:
+            return
+        for entry in entries:
+            key = self._key(entry)
+            self._items[key] = entry
+            self._fingerprints[key] = _fingerprint(entry)
+        self._rebuild()
+
+    # =========================================================================
+    # Refresh
+    # =========================================================================
+
+    async def refresh(self) -> SnapshotDelta:
+        """
+        Download the list and apply it as a delta.
+
+        Concurrent callers share one download. If the download fails and
+        snapshot data is available, the error is logged and the existing
+        data is kept (offline operation).
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh())
+        return await asyncio.shield(self._refresh_task)
+
+    async def close(self) -> None:
+        """Wait for a running background refresh."""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+
+    def _is_stale(self) -> bool:
+        if self.refresh_interval <= 0:
+            return False
+        age = self.age
+        return age is None or age > self.refresh_interval
+
+    def _start_refresh(self) -> None:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh())
+            self._refresh_task.add_done_callback(self._background_done)
+
+    def _background_done(self, task: "asyncio.Task[SnapshotDelta]") -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background refresh of {self.name} failed: {task.exception()}")
+
+    async def _refresh(self) -> SnapshotDelta:
+        upserts_before = len(self._upserts)
+        try:
+            entries = await self._loader()
+        except Exception as e:
+            if not self._loaded:
+                raise
+            logger.warning(f"Refreshing {self.name} failed, serving snapshot (age {self.age or 0:.0f}s): {e}")
+            return SnapshotDelta()
+
+        delta = self._apply(entries)
+        self._refreshed_at = time.time()
+        # Entries saved during the download may be missing from the list
+        later, self._upserts = self._upserts[upserts_before:], []
+        if later:
+            self.upsert(later)
+        if not delta.unchanged and self.store is not None:
+            await self._save()
+        logger.debug(
+            f"Refreshed {self.name}: {delta.added} added, {delta.changed} changed, {delta.removed} removed"
+        )
+        return delta
+
+    def _apply(self, entries: List[M]) -> SnapshotDelta:
+        """Swap in changed entries only; rebuild indexes if anything changed."""
+        delta = SnapshotDelta()
+        items: Dict[Hashable, M] = {}
+        fingerprints: Dict[Hashable, str] = {}
+        for entry in entries:
+            key = self._key(entry)
+            fingerprint = _fingerprint(entry)
+            if key not in self._items:
+                delta.added += 1
+            elif self._fingerprints.get(key) != fingerprint:
+                delta.changed += 1
+            else:
+                entry = self._items[key]  # Keep the existing object
+            items[key] = entry
+            fingerprints[key] = fingerprint
+        delta.removed = sum(1 for key in self._items if key not in items)
+
+        if not self._loaded or not delta.unchanged or list(items) != list(self._items):
+            self._items = items
+            self._fingerprints = fingerprints
+            self._rebuild()
+        self._loaded = True
+        return delta
+
+    def _rebuild(self) -> None:
+        self.version += 1
+        self._indexes = {}
+        for name, func in self._index_funcs.items():
+            index: Dict[Hashable, M] = {}
+            for entry in self._items.values():
+                value = func(entry)
+                if value is not None:
+                    index.setdefault(value, entry)
+            self._indexes[name] = index
+        self._views = {
+            name: [entry for entry in self._items.values() if func(entry)]
+            for name, func in self._view_funcs.items()
+        }
+
+    # =========================================================================
+    # Persistence
+    # =========================================================================
+
+    async def _load(self) -> None:
+        try:
+            state = await self.store.load()
+            if state is None:
+                return
+            if state.get("version") != SNAPSHOT_VERSION:
+                raise ValueError(f"unsupported version {state.get('version')}")
+            entries = [self._model.model_validate(item) for item in state["items"]]
+        except Exception as e:
+            # Reference data can always be downloaded again
+            logger.warning(f"Ignoring unreadable {self.name} snapshot: {e}")
+            return
+        self._apply(entries)
+        self._refreshed_at = state.get("saved_at")
+        if self._upserts:
+            upserts, self._upserts = self._upserts, []
+            self.upsert(upserts)  # Saved before the load
+        logger.info(f"Loaded {len(entries)} {self.name} from stored snapshot")
+
+    async def _save(self) -> None:
+        state = {
+            "version": SNAPSHOT_VERSION,
+            "saved_at": self._refreshed_at,
+            "items": [entry.model_dump(mode="json", by_alias=True) for entry in self._items.values()],
+        }
+        try:
+            await self.store.save(state)
+        except Exception as e:
+            logger.warning(f"Could not save {self.name} snapshot: {e}")
+
+
+def _fingerprint(entry: BaseModel) -> str:
+    return json.dumps(entry.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
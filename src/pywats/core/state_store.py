@@ -0,0 +1,37 @@
+"""
+Pluggable persistence for helper state.
+
+pywats is memory-only. Helpers that can keep state across restarts
+(reference snapshots, the serial number reservoir) take a StateStore; the
+default keeps the state in memory for the life of the process. The
+file-backed store is pywats_client.core.persistence.FileStateStore.
+
+Example:
+    >>> store = StateStore()
+    >>> await store.save({"version": 1, "items": []})
+    >>> await store.load()
+    {'version': 1, 'items': []}
+"""
+import copy
+from typing import Any, Dict, Optional
+
+
+class StateStore:
+    """
+    Holds one JSON-compatible state document.
+
+    Subclasses persist it. load() returns None when nothing was saved and
+    raises if saved state exists but cannot be read; save() raises if the
+    state could not be stored.
+    """
+
+    def __init__(self) -> None:
+        self._state: Optional[Dict[str, Any]] = None
+
+    async def load(self) -> Optional[Dict[str, Any]]:
+        """The last saved state, or None."""
+        return copy.deepcopy(self._state)
+
+    async def save(self, state: Dict[str, Any]) -> None:
+        """Replace the stored state."""
+        self._state = copy.deepcopy(state)
@@ -8,6 +8,7 @@ from .enums import AssetState, AssetLogType, AssetAlarmState, IntervalMode
 # Async implementations (primary API)
 from .async_repository import AsyncAssetRepository
 from .async_service import AsyncAssetService
+from .count_aggregator import AssetCountAggregator, CountJournal
 
 __all__ = [
     # Models
@@ -22,4 +23,6 @@ __all__ = [
     # Async implementations
     "AsyncAssetRepository",
     "AsyncAssetService",
+    "AssetCountAggregator",
+    "CountJournal",
 ]
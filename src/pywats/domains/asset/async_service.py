@@ -14,6 +14,7 @@ from pywats.core.logging import get_logger
 from .models import Asset, AssetType, AssetLog
 from .enums import AssetState
 from .async_repository import AsyncAssetRepository
+from .count_aggregator import AssetCountAggregator, CountJournal
 
 logger = get_logger(__name__)
 
@@ -40,6 +41,7 @@ class AsyncAssetService:
         """
         self._repository = repository
         self._base_url = base_url.rstrip("/") if base_url else ""
+        self._count_aggregator: Optional[AssetCountAggregator] = None
 
     # =========================================================================
     # Asset Operations
@@ -383,8 +385,12 @@ class AsyncAssetService:
             increment_children: Also increment child asset counts
 
         Returns:
-            True if successful
+            True if successful. With count aggregation enabled, True once
+            the increment is journaled; it is sent on the next flush.
         """
+        if self._count_aggregator is not None:
+            await self._count_aggregator.add(asset_id, serial_number, amount, increment_children)
+            return True
         return await self._repository.update_count(
             asset_id=asset_id,
             serial_number=serial_number,
@@ -392,6 +398,72 @@ class AsyncAssetService:
             increment_children=increment_children
         )
 
+    def enable_count_aggregation(
+        self,
+        journal: Optional[CountJournal] = None,
+        flush_interval: float = 5.0,
+        max_pending: int = 1000,
+    ) -> AssetCountAggregator:
+        """
+        Coalesce increment_count calls into one request per asset.
+
+        Increments are summed in memory and sent every ``flush_interval``
+        seconds, or as soon as ``max_pending`` increments are waiting. With a
+        ``journal`` they are recorded first, so unsent increments are
+        replayed after a crash. Count-setting operations on this service
+        flush pending increments first to keep them in order; counts read
+        from the server lag by up to one flush interval.
+
+        Args:
+            journal: Write-ahead journal, e.g. pywats_client's
+                FileCountJournal (None = memory only; unsent increments
+                are then lost on a crash)
+            flush_interval: Seconds between flushes
+            max_pending: Increments that trigger an early flush
+
+        Returns:
+            The AssetCountAggregator
+
+        Example:
+            >>> api.asset.enable_count_aggregation(FileCountJournal("station1_counts.journal"))
+            >>> await api.asset.increment_count(serial_number="FIXTURE-01")
+        """
+        if self._count_aggregator is not None:
+            raise RuntimeError("Asset count aggregation is already enabled")
+        self._count_aggregator = AssetCountAggregator(
+            self._repository.update_count,
+            journal=journal,
+            flush_interval=flush_interval,
+            max_pending=max_pending,
+        )
+        return self._count_aggregator
+
+    @property
+    def count_aggregator(self) -> Optional[AssetCountAggregator]:
+        """The enabled asset count aggregator, if any."""
+        return self._count_aggregator
+
+    async def flush_counts(self) -> bool:
+        """
+        Send aggregated increments now.
+
+        Returns:
+            True if nothing is left pending
+        """
+        if self._count_aggregator is None:
+            return True
+        return await self._count_aggregator.flush()
+
+    async def close(self) -> None:
+        """Flush aggregated increments and stop the flush timer."""
+        if self._count_aggregator is not None:
+            await self._count_aggregator.close()
+
+    async def _flush_counts_first(self) -> None:
+        # A reset or set must not be overtaken by increments made before it
+        if self._count_aggregator is not None and self._count_aggregator.pending:
+            await self._count_aggregator.flush()
+
     async def reset_running_count(
         self,
         asset_id: Optional[str] = None,
@@ -409,6 +481,7 @@ class AsyncAssetService:
         Returns:
             True if successful
         """
+        await self._flush_counts_first()
         return await self._repository.reset_running_count(asset_id, serial_number, comment)
 
     async def set_running_count(
@@ -436,6 +509,7 @@ class AsyncAssetService:
             ...     serial_number="ASSET-001"
             ... )
         """
+        await self._flush_counts_first()
         return await self._repository.set_running_count(value, asset_id, serial_number)
 
     async def set_total_count(
@@ -463,6 +537,7 @@ class AsyncAssetService:
             ...     serial_number="ASSET-001"
             ... )
         """
+        await self._flush_counts_first()
         return await self._repository.set_total_count(value, asset_id, serial_number)
 
     # =========================================================================
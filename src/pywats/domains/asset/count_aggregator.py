@@ -0,0 +1,267 @@
+"""Coalesced asset count increments.
+
+Fixtures and probe cards are counted once per use, which with a plain
+increment_count() call means one HTTP request per test. The aggregator
+sums increments per asset in memory and sends one ``incrementBy`` request
+per asset when a size or time trigger fires.
+
+Increments can be made crash-safe with a CountJournal. The aggregator
+drives it as a write-ahead journal:
+
+- append() records each increment before add() returns.
+- A flush seals the live journal into a numbered segment (seal()).
+- Each total accepted by the server is acknowledged in every sealed
+  segment that contributed to it (acknowledge()); a segment is finished
+  once all of its increments are acknowledged. Failed totals stay
+  unacknowledged and are retried on the next flush.
+- recover() returns the unacknowledged amounts of a previous run.
+
+The base CountJournal keeps nothing (pywats is memory-only); the
+file-backed journal is pywats_client.core.persistence.FileCountJournal.
+
+Example:
+    >>> aggregator = AssetCountAggregator(repo.update_count, FileCountJournal("asset_counts.journal"))
+    >>> await aggregator.add(serial_number="FIXTURE-01")   # journaled, no HTTP call
+    >>> await aggregator.flush()                           # one PUT per asset
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from pywats.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# (asset_id, serial_number, increment_children)
+CountKey = Tuple[Optional[str], Optional[str], bool]
+
+# Sends one aggregated increment, mirrors AsyncAssetRepository.update_count
+UpdateCountFunc = Callable[..., Awaitable[bool]]
+
+
+class CountJournal:
+    """
+    Durable record of unsent increments for AssetCountAggregator.
+
+    This base class records nothing, so unsent increments are lost on a
+    crash. Subclasses persist them; calls are made one at a time, in order.
+    """
+
+    async def recover(self) -> Dict[int, Dict[CountKey, int]]:
+        """Unacknowledged amounts per sealed segment left by a previous run."""
+        return {}
+
+    async def append(self, key: CountKey, amount: int) -> None:
+        """Record an increment in the live journal."""
+
+    async def seal(self, segment: int) -> None:
+        """Turn the live journal into sealed segment ``segment``."""
+
+    async def acknowledge(self, segment: int, key: CountKey, amount: int, finished: bool) -> None:
+        """Record a sent total; ``finished`` when the segment has nothing left."""
+
+    async def close(self) -> None:
+        """Release resources."""
+
+
+class AssetCountAggregator:
+    """
+    In-memory increment aggregation per asset with optional journaling.
+
+    Args:
+        update_count: Async function sending an increment
+            (asset_id=, serial_number=, increment_by=, increment_children=)
+        journal: Write-ahead journal (None = memory only)
+        flush_interval: Seconds between time-triggered flushes
+        max_pending: Flush once this many increments are pending
+    """
+
+    def __init__(
+        self,
+        update_count: UpdateCountFunc,
+        journal: Optional[CountJournal] = None,
+        flush_interval: float = 5.0,
+        max_pending: int = 1000,
+    ) -> None:
+        if flush_interval <= 0:
+            raise ValueError("flush_interval must be positive")
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        self._update_count = update_count
+        self.journal = journal if journal is not None else CountJournal()
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        # Unsent amounts: live journal plus sealed segments awaiting acks
+        self._live: Dict[CountKey, int] = {}
+        self._segments: Dict[int, Dict[CountKey, int]] = {}
+        self._next_segment = 1
+        self._pending_ticks = 0
+        self._recovered = False
+
+        self._journal_lock = asyncio.Lock()  # Orders appends against seals
+        self._flush_lock = asyncio.Lock()
+        self._timer: Optional["asyncio.Task[None]"] = None
+        self._size_flush: Optional["asyncio.Task[None]"] = None
+        self._closed = False
+
+        # Statistics
+        self.increments_received = 0
+        self.requests_sent = 0
+
+    # =========================================================================
+    # Public API
+    # =========================================================================
+
+    @property
+    def pending(self) -> Dict[CountKey, int]:
+        """
+        Unsent totals per (asset_id, serial_number, increment_children).
+
+        Includes a previous run's journal once recovered (recover(), or the
+        first add() or flush()).
+        """
+        totals: Dict[CountKey, int] = {}
+        for amounts in (*self._segments.values(), self._live):
+            for key, amount in amounts.items():
+                totals[key] = totals.get(key, 0) + amount
+        return {key: amount for key, amount in totals.items() if amount}
+
+    async def add(
+        self,
+        asset_id: Optional[str] = None,
+        serial_number: Optional[str] = None,
+        amount: int = 1,
+        increment_children: bool = False,
+    ) -> None:
+        """
+        Record an increment; it is journaled before this returns.
+
+        Args:
+            asset_id: Asset ID
+            serial_number: Asset serial number (alternative)
+            amount: Increment
+            increment_children: Also increment child asset counts
+        """
+        if self._closed:
+            raise RuntimeError("Asset count aggregator is closed")
+        if not asset_id and not serial_number:
+            raise ValueError("asset_id or serial_number is required")
+        key: CountKey = (asset_id, serial_number, bool(increment_children))
+        async with self._journal_lock:
+            await self._recover()
+            await self.journal.append(key, amount)
+            self._live[key] = self._live.get(key, 0) + amount
+        self._pending_ticks += 1
+        self.increments_received += 1
+
+        self._ensure_timer()
+        if self._pending_ticks >= self.max_pending and (self._size_flush is None or self._size_flush.done()):
+            self._size_flush = asyncio.create_task(self._flush_quietly())
+
+    async def flush(self) -> bool:
+        """
+        Send all pending totals now.
+
+        Returns:
+            True if every total was accepted; failed totals stay pending
+            and are retried on the next flush.
+        """
+        async with self._flush_lock:
+            async with self._journal_lock:
+                await self._recover()
+                await self._seal()
+            self._pending_ticks = 0
+            batch = self.pending
+            failed = 0
+            for key, amount in batch.items():
+                try:
+                    ok = await self._update_count(
+                        asset_id=key[0],
+                        serial_number=key[1],
+                        increment_by=amount,
+                        increment_children=key[2],
+                    )
+                except Exception as e:
+                    logger.warning(f"Asset count flush failed for {key[0] or key[1]}: {e}")
+                    ok = False
+                self.requests_sent += 1
+                if ok:
+                    await self._acknowledge(key)
+                else:
+                    failed += 1
+
+            if batch:
+                logger.debug(f"Flushed asset counts: {len(batch) - failed} assets sent, {failed} pending retry")
+            return failed == 0
+
+    async def close(self) -> None:
+        """Flush pending totals and stop the flush timer."""
+        for task in (self._timer, self._size_flush):
+            if task is not None and not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        try:
+            await self.flush()
+        finally:
+            self._closed = True
+            await self.journal.close()
+
+    async def recover(self) -> None:
+        """Load unsent increments of a previous run from the journal."""
+        async with self._journal_lock:
+            await self._recover()
+
+    # =========================================================================
+    # Triggers
+    # =========================================================================
+
+    def _ensure_timer(self) -> None:
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._run_timer())
+
+    async def _run_timer(self) -> None:
+        while not self._closed:
+            await asyncio.sleep(self.flush_interval)
+            await self._flush_quietly()
+
+    async def _flush_quietly(self) -> None:
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.warning(f"Asset count flush failed: {e}")
+
+    # =========================================================================
+    # Journal
+    # =========================================================================
+
+    async def _seal(self) -> None:
+        """Turn the live totals into a sealed segment awaiting acknowledgement."""
+        if not self._live:
+            return
+        segment = self._next_segment
+        self._next_segment += 1
+        await self.journal.seal(segment)
+        self._segments[segment], self._live = self._live, {}
+
+    async def _acknowledge(self, key: CountKey) -> None:
+        """Record a sent total in every segment it came from; drop finished segments."""
+        for segment in list(self._segments):
+            amounts = self._segments[segment]
+            amount = amounts.pop(key, None)
+            if amount is None:
+                continue
+            await self.journal.acknowledge(segment, key, amount, finished=not amounts)
+            if not amounts:
+                del self._segments[segment]
+
+    async def _recover(self) -> None:
+        """Rebuild unsent totals from the journal (once, under _journal_lock)."""
+        if self._recovered:
+            return
+        self._recovered = True
+        segments = await self.journal.recover()
+        for segment, amounts in segments.items():
+            self._segments[segment] = dict(amounts)
+        if segments:
+            self._next_segment = max(segments) + 1
+            logger.info(f"Recovered unsent asset counts for {len(self.pending)} assets")
@@ -23,6 +23,8 @@ class SyncAssetService:
     def get_assets_in_warning(self, top: Optional[int] = None) -> List[Asset]: ...
     def get_assets_by_alarm_state(self, state: Union[AssetState, int], top: Optional[int] = None) -> List[Asset]: ...
     def increment_count(self, asset_id: Optional[str] = None, serial_number: Optional[str] = None, amount: int = 1, increment_children: bool = False) -> bool: ...
+    def flush_counts(self) -> bool: ...
+    def close(self) -> None: ...
     def reset_running_count(self, asset_id: Optional[str] = None, serial_number: Optional[str] = None, comment: Optional[str] = None) -> bool: ...
     def set_running_count(self, value: int, asset_id: Optional[str] = None, serial_number: Optional[str] = None) -> bool: ...
     def set_total_count(self, value: int, asset_id: Optional[str] = None, serial_number: Optional[str] = None) -> bool: ...
@@ -15,6 +15,8 @@ from pywats.core.logging import get_logger
 from .async_repository import AsyncProcessRepository
 from .models import ProcessInfo, RepairOperationConfig, RepairCategory
 from ...core.cache import AsyncTTLCache
+from ...core.reference_snapshot import ReferenceSnapshot
+from ...core.state_store import StateStore
 from ...shared.stats import CacheStats
 
 logger = get_logger(__name__)
@@ -78,6 +80,7 @@ class AsyncProcessService:
         
         self._lock = asyncio.Lock()
         self._cache_started = False
+        self._snapshot: Optional[ReferenceSnapshot[ProcessInfo]] = None
 
     # =========================================================================
     # Cache Management
@@ -136,6 +139,58 @@ class AsyncProcessService:
             max_size=None  # TTL cache doesn't have max size
         )
 
+    def enable_reference_snapshot(
+        self,
+        store: Optional[StateStore] = None,
+        refresh_interval: Optional[float] = None,
+    ) -> ReferenceSnapshot[ProcessInfo]:
+        """
+        Serve process lookups from an indexed, persistable snapshot.
+
+        Lookups by code and name become hash lookups. With a ``store`` the
+        process list is saved so a restarted client starts warm and keeps
+        working while the server is unreachable. Stale data is refreshed in
+        the background, replacing only processes that changed.
+
+        Args:
+            store: Where the snapshot is kept between runs, e.g.
+                pywats_client's FileStateStore (None = memory only)
+            refresh_interval: Seconds before a background refresh
+                (default: the cache TTL)
+
+        Returns:
+            The ReferenceSnapshot
+
+        Example:
+            >>> api.process.enable_reference_snapshot(FileStateStore("processes.json"))
+            >>> process = await api.process.get_process_by_code(100)
+        """
+        if self._snapshot is not None:
+            raise RuntimeError("Process reference snapshot is already enabled")
+        self._snapshot = ReferenceSnapshot(
+            "processes",
+            self._repository.get_processes,
+            ProcessInfo,
+            key=lambda p: (p.code, p.name),
+            indexes={
+                "code": lambda p: p.code,
+                "name": lambda p: p.name.lower() if p.name else None,
+            },
+            views={
+                "test": lambda p: p.is_test_operation,
+                "repair": lambda p: p.is_repair_operation,
+                "wip": lambda p: p.is_wip_operation,
+            },
+            store=store,
+            refresh_interval=self._cache_ttl if refresh_interval is None else refresh_interval,
+        )
+        return self._snapshot
+
+    @property
+    def reference_snapshot(self) -> Optional[ReferenceSnapshot[ProcessInfo]]:
+        """The enabled process reference snapshot, if any."""
+        return self._snapshot
+
     async def refresh(self) -> None:
         """
         Force refresh the process cache from the server.
@@ -143,6 +198,14 @@ class AsyncProcessService:
         Thread-safe operation that fetches fresh data from the API
         and updates the cache.
         """
+        if self._snapshot is not None:
+            delta = await self._snapshot.refresh()
+            logger.info(
+                f"Process snapshot refreshed ({delta.added} added, "
+                f"{delta.changed} changed, {delta.removed} removed)"
+            )
+            return
+
         await self._ensure_cache_started()
         
         processes = await self._repository.get_processes()
@@ -152,6 +215,10 @@ class AsyncProcessService:
 
     async def _get_cached_processes(self) -> List[ProcessInfo]:
         """Get processes from cache or fetch if not cached."""
+        if self._snapshot is not None:
+            await self._snapshot.ensure_loaded()
+            return self._snapshot.items()
+
         await self._ensure_cache_started()
         
         # Try to get from cache
@@ -165,8 +232,15 @@ class AsyncProcessService:
         
         return processes if processes is not None else []
 
+    async def close(self) -> None:
+        """Wait for a running background snapshot refresh."""
+        if self._snapshot is not None:
+            await self._snapshot.close()
+
     async def clear_cache(self) -> None:
         """Clear the process cache."""
+        if self._snapshot is not None:
+            self._snapshot.invalidate()
         await self._cache.clear()
         logger.info("Process cache cleared")
     async def get_processes(self) -> List[ProcessInfo]:
@@ -186,6 +260,9 @@ class AsyncProcessService:
         Returns:
             List of test operation ProcessInfo objects
         """
+        if self._snapshot is not None:
+            await self._snapshot.ensure_loaded()
+            return self._snapshot.view("test")
         processes = await self.get_processes()
         return [p for p in processes if p.is_test_operation]
 
@@ -196,6 +273,9 @@ class AsyncProcessService:
         Returns:
             List of repair operation ProcessInfo objects
         """
+        if self._snapshot is not None:
+            await self._snapshot.ensure_loaded()
+            return self._snapshot.view("repair")
         processes = await self.get_processes()
         return [p for p in processes if p.is_repair_operation]
 
@@ -206,6 +286,9 @@ class AsyncProcessService:
         Returns:
             List of WIP operation ProcessInfo objects
         """
+        if self._snapshot is not None:
+            await self._snapshot.ensure_loaded()
+            return self._snapshot.view("wip")
         processes = await self.get_processes()
         return [p for p in processes if p.is_wip_operation]
 
@@ -223,6 +306,9 @@ class AsyncProcessService:
         Returns:
             ProcessInfo or None if not found
         """
+        if self._snapshot is not None:
+            await self._snapshot.ensure_loaded()
+            return self._snapshot.lookup("code", code)
         processes = await self.get_processes()
         for p in processes:
             if p.code == code:
@@ -240,6 +326,9 @@ class AsyncProcessService:
             ProcessInfo or None if not found
         """
         name_lower = name.lower()
+        if self._snapshot is not None:
+            await self._snapshot.ensure_loaded()
+            return self._snapshot.lookup("name", name_lower)
         processes = await self.get_processes()
         for p in processes:
             if p.name and p.name.lower() == name_lower:
@@ -11,6 +11,7 @@ class SyncProcessService:
     """Synchronous wrapper for AsyncProcessService."""
 
     def refresh(self) -> None: ...
+    def close(self) -> None: ...
     def clear_cache(self) -> None: ...
     def get_processes(self) -> List[ProcessInfo]: ...
     def get_test_operations(self) -> List[ProcessInfo]: ...
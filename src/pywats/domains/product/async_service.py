@@ -13,6 +13,8 @@ from pywats.core.logging import get_logger
 from .models import Product, ProductRevision, ProductGroup, ProductView, BomItem, ProductRevisionRelation
 from .enums import ProductState
 from .async_repository import AsyncProductRepository
+from ...core.reference_snapshot import ReferenceSnapshot
+from ...core.state_store import StateStore
 
 logger = get_logger(__name__)
 
@@ -40,11 +42,68 @@ class AsyncProductService:
         """
         self._repository = repository
         self._base_url = base_url.rstrip("/") if base_url else ""
+        self._snapshot: Optional[ReferenceSnapshot[Product]] = None
 
     # =========================================================================
     # Product Operations
     # =========================================================================
 
+    def enable_reference_snapshot(
+        self,
+        store: Optional[StateStore] = None,
+        refresh_interval: float = 300.0,
+    ) -> ReferenceSnapshot[Product]:
+        """
+        Serve the product list from an indexed, persistable snapshot.
+
+        get_products, get_active_products and find_product are answered
+        locally (hash lookup by part number, precomputed active list). With
+        a ``store`` the list is saved so a restarted client starts warm and
+        keeps working while the server is unreachable, and it is refreshed in
+        the background, replacing only products that changed. Products saved
+        through this service are applied to the snapshot at once.
+
+        Args:
+            store: Where the snapshot is kept between runs, e.g.
+                pywats_client's FileStateStore (None = memory only)
+            refresh_interval: Seconds before a background refresh
+
+        Returns:
+            The ReferenceSnapshot
+
+        Example:
+            >>> api.product.enable_reference_snapshot(FileStateStore("products.json"))
+            >>> product = await api.product.find_product("WIDGET-001")
+        """
+        if self._snapshot is not None:
+            raise RuntimeError("Product reference snapshot is already enabled")
+        self._snapshot = ReferenceSnapshot(
+            "products",
+            self._repository.get_all,
+            Product,
+            key=lambda p: p.part_number,
+            views={"active": lambda p: p.state == ProductState.ACTIVE},
+            store=store,
+            refresh_interval=refresh_interval,
+        )
+        return self._snapshot
+
+    @property
+    def reference_snapshot(self) -> Optional[ReferenceSnapshot[Product]]:
+        """The enabled product reference snapshot, if any."""
+        return self._snapshot
+
+    async def close(self) -> None:
+        """Wait for a running background snapshot refresh."""
+        if self._snapshot is not None:
+            await self._snapshot.close()
+
+    def _snapshot_saved(self, products: List[Optional[Product]]) -> None:
+        # Visible to the next read; a background refresh reconciles
+        if self._snapshot is not None:
+            self._snapshot.upsert([p for p in products if p is not None])
+            self._snapshot.invalidate()
+
     async def get_products(self) -> List[Product]:
         """
         Get all products (lightweight list view).
@@ -58,6 +117,9 @@ class AsyncProductService:
         Returns:
             List of Product objects with basic fields only
         """
+        if self._snapshot is not None:
+            await self._snapshot.ensure_loaded()
+            return self._snapshot.items()
         return await self._repository.get_all()
 
     async def get_products_full(self) -> List[Product]:
@@ -128,6 +190,7 @@ class AsyncProductService:
             product_category_id=UUID(product_category_id) if product_category_id else None,
         )
         result = await self._repository.save(product)
+        self._snapshot_saved([result])
         if result:
             logger.info(f"PRODUCT_CREATED: {result.part_number} (name={name}, state={state.name})")
         return result
@@ -143,6 +206,7 @@ class AsyncProductService:
             Updated Product object
         """
         result = await self._repository.save(product)
+        self._snapshot_saved([result])
         if result:
             logger.info(f"PRODUCT_UPDATED: {result.part_number}")
         return result
@@ -160,6 +224,7 @@ class AsyncProductService:
             List of saved Product objects
         """
         results = await self._repository.save_bulk(products)
+        self._snapshot_saved(results or [])
         if results:
             logger.info(f"PRODUCTS_BULK_SAVED: count={len(results)}")
         return results
@@ -174,9 +239,34 @@ class AsyncProductService:
         Returns:
             List of active Product objects (state == ACTIVE) with basic fields
         """
+        if self._snapshot is not None:
+            await self._snapshot.ensure_loaded()
+            return self._snapshot.view("active")
         products = await self.get_products()
         return [p for p in products if p.state == ProductState.ACTIVE]
 
+    async def find_product(self, part_number: str) -> Optional[Product]:
+        """
+        Find a product in the product list (lightweight list view).
+
+        With the reference snapshot enabled this is a local hash lookup;
+        otherwise the product list is downloaded. Use get_product() for
+        complete product details.
+
+        Args:
+            part_number: Product part number
+
+        Returns:
+            Product with basic fields, or None if not found
+        """
+        if self._snapshot is not None:
+            await self._snapshot.ensure_loaded()
+            return self._snapshot.get(part_number)
+        for product in await self.get_products():
+            if product.part_number == part_number:
+                return product
+        return None
+
     def is_active(self, product: Product) -> bool:
         """
         Check if a product is in active state.
@@ -10,6 +10,7 @@ if TYPE_CHECKING:
 class SyncProductService:
     """Synchronous wrapper for AsyncProductService."""
 
+    def close(self) -> None: ...
     def get_products(self) -> List[Product]: ...
     def get_products_full(self) -> List[Product]: ...
     def get_product(self, part_number: str) -> Optional[Product]: ...
@@ -17,6 +18,7 @@ class SyncProductService:
     def update_product(self, product: Product) -> Optional[Product]: ...
     def bulk_save_products(self, products: List[Product]) -> List[Product]: ...
     def get_active_products(self) -> List[Product]: ...
+    def find_product(self, part_number: str) -> Optional[Product]: ...
     def get_revisions(self, part_number: str) -> List[ProductRevision]: ...
     def get_revision(self, part_number: str, revision: str) -> Optional[ProductRevision]: ...
     def create_revision(self, part_number: str, revision: str, name: Optional[str] = None, description: Optional[str] = None, state: ProductState = ProductState.ACTIVE) -> Optional[ProductRevision]: ...
@@ -11,6 +11,7 @@ from .enums import SerialNumberIdentifier, UnitPhaseFlag
 # Async implementations (primary API)
 from .async_repository import AsyncProductionRepository
 from .async_service import AsyncProductionService
+from .serial_reservoir import SerialNumberReservoir
 
 # Rebuild Unit model to resolve forward references to Product/ProductRevision
 from ..product.models import Product, ProductRevision
@@ -31,4 +32,5 @@ __all__ = [
     # Async implementations
     "AsyncProductionService",
     "AsyncProductionRepository",
+    "SerialNumberReservoir",
 ]
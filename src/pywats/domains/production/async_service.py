@@ -9,6 +9,7 @@ from typing import Optional, List, Dict, Any, Sequence, Union, TYPE_CHECKING
 from datetime import datetime
 import logging
 from pywats.core.logging import get_logger
+from pywats.core.state_store import StateStore
 
 from .models import (
     Unit, UnitChange, ProductionBatch, SerialNumberType,
@@ -16,6 +17,7 @@ from .models import (
 )
 from .enums import UnitPhaseFlag
 from .async_repository import AsyncProductionRepository
+from .serial_reservoir import SerialNumberReservoir
 
 logger = get_logger(__name__)
 
@@ -50,6 +52,9 @@ class AsyncProductionService:
         self._phase_by_code: Dict[str, UnitPhase] = {}
         self._phase_by_name: Dict[str, UnitPhase] = {}
 
+        # Optional client-side serial number reservoir
+        self._serial_reservoir: Optional[SerialNumberReservoir] = None
+
     # =========================================================================
     # Unit Operations
     # =========================================================================
@@ -673,6 +678,11 @@ class AsyncProductionService:
         """
         Allocate serial numbers from pool.
 
+        When a serial number reservoir is enabled (enable_serial_reservoir)
+        plain allocations are served locally from prefetched blocks.
+        Allocations with a reference or station name always go to the
+        server, which records those values at allocation time.
+
         Args:
             type_name: Serial number type name
             count: Number of serial numbers to take (quantity)
@@ -683,10 +693,60 @@ class AsyncProductionService:
         Returns:
             List of allocated serial numbers
         """
+        if self._serial_reservoir is not None and not (reference_sn or reference_pn or station_name):
+            return await self._serial_reservoir.take(type_name, count)
         return await self._repository.take_serial_numbers(
             type_name, count, reference_sn, reference_pn, station_name
         )
 
+    def enable_serial_reservoir(
+        self,
+        store: Optional[StateStore] = None,
+        block_size: int = 50,
+        low_water: int = 10,
+    ) -> SerialNumberReservoir:
+        """
+        Serve allocate_serial_numbers from a local, prefetching reservoir.
+
+        Serial numbers are taken from the server in blocks of ``block_size``
+        per serial number type and refilled in the background when fewer
+        than ``low_water`` remain. Unused serial numbers are saved to
+        ``store`` and picked up again after a restart.
+
+        Args:
+            store: State store, e.g. pywats_client's FileStateStore
+                (None = memory only; unused serial numbers are then
+                abandoned on exit)
+            block_size: Serial numbers taken per server request
+            low_water: Background refill threshold
+
+        Returns:
+            The SerialNumberReservoir (e.g. to prefetch() at start-up)
+
+        Example:
+            >>> api.production.enable_serial_reservoir(FileStateStore("station1_serials.json"))
+            >>> sn = (await api.production.allocate_serial_numbers("PCBA-SN"))[0]
+        """
+        if self._serial_reservoir is not None:
+            raise RuntimeError("Serial number reservoir is already enabled")
+        self._serial_reservoir = SerialNumberReservoir(
+            lambda type_name, count: self._repository.take_serial_numbers(type_name, count),
+            store=store,
+            block_size=block_size,
+            low_water=low_water,
+        )
+        return self._serial_reservoir
+
+    @property
+    def serial_reservoir(self) -> Optional[SerialNumberReservoir]:
+        """The enabled serial number reservoir, if any."""
+        return self._serial_reservoir
+
+    async def close(self) -> None:
+        """Stop background work (serial number refills)."""
+        if self._serial_reservoir is not None:
+            await self._serial_reservoir.close()
+
     async def find_serial_numbers_in_range(
         self,
         type_name: str,
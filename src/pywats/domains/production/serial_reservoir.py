@@ -0,0 +1,228 @@
+"""Client-side serial number reservoir.
+
+Taking serial numbers one unit at a time costs a server round trip per
+unit. The reservoir takes blocks of serial numbers per serial number type
+and hands them out locally, refilling in the background when a pool
+drops below its low-water mark.
+
+With a StateStore, reserved-but-unused serial numbers are saved before
+any change becomes visible, so a restart neither loses nor reissues them:
+
+- A serial number is removed from the saved state before it is returned.
+- A refilled block is saved before it can be taken.
+
+If the process dies between the server allocating a block and the state
+being saved, that block is skipped (never reissued). The file-backed store
+is pywats_client.core.persistence.FileStateStore.
+
+Example:
+    >>> reservoir = SerialNumberReservoir(repo.take_serial_numbers, FileStateStore("serials.json"))
+    >>> serials = await reservoir.take("PCBA-SN", 1)
+"""
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+from pywats.core.logging import get_logger
+from pywats.core.state_store import StateStore
+
+logger = get_logger(__name__)
+
+# (type_name, count) -> serial numbers taken from the server
+TakeFunc = Callable[[str, int], Awaitable[List[str]]]
+
+STATE_VERSION = 1
+
+
+class SerialNumberReservoir:
+    """
+    Prefetching, persistable pool of serial numbers per serial number type.
+
+    Saved state is loaded on first use (or by load()).
+
+    Args:
+        take: Async function taking serial numbers from the server
+        store: Store persisting unused serial numbers
+            (None keeps the pools in memory only)
+        block_size: Serial numbers taken per server request
+        low_water: Refill in the background when a pool drops below this
+    """
+
+    def __init__(
+        self,
+        take: TakeFunc,
+        store: Optional[StateStore] = None,
+        block_size: int = 50,
+        low_water: int = 10,
+    ) -> None:
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
+        if not 0 <= low_water <= block_size:
+            raise ValueError("low_water must be between 0 and block_size")
+        self._take = take
+        self.store = store
+        self.block_size = block_size
+        self.low_water = low_water
+
+        self._pools: Dict[str, Deque[str]] = {}
+        self._refills: Dict[str, "asyncio.Task[int]"] = {}
+        self._lock = asyncio.Lock()  # Guards pools and the saved state
+        self._take_locks: Dict[str, asyncio.Lock] = {}  # One taker per type at a time
+        self._loaded = store is None
+        self._closed = False
+
+    # =========================================================================
+    # Public API
+    # =========================================================================
+
+    async def take(self, type_name: str, count: int = 1) -> List[str]:
+        """
+        Take serial numbers, refilling from the server when needed.
+
+        Args:
+            type_name: Serial number type name
+            count: Number of serial numbers
+
+        Returns:
+            Serial numbers in server allocation order. Fewer than ``count``
+            only if the server has no more free serial numbers.
+        """
+        if count < 1:
+            return []
+        if self._closed:
+            raise RuntimeError("Serial number reservoir is closed")
+        await self.load()
+
+        # Check, refill and pop as one step per type, so a concurrent taker
+        # cannot empty the pool between this taker's refill and its pop
+        async with self._take_locks.setdefault(type_name, asyncio.Lock()):
+            pool = self._pools.setdefault(type_name, deque())
+            while len(pool) < count:
+                if await self._refill(type_name, count - len(pool)) == 0:
+                    break  # Server has no more free serial numbers
+
+            async with self._lock:
+                taken = [pool.popleft() for _ in range(min(count, len(pool)))]
+                try:
+                    await self._persist()
+                except Exception:
+                    pool.extendleft(reversed(taken))
+                    raise
+
+        if len(taken) < count:
+            logger.warning(
+                f"Server returned no more serial numbers for '{type_name}'; "
+                f"returning {len(taken)} of {count}"
+            )
+
+        if len(pool) < self.low_water:
+            self._start_refill(type_name)
+        return taken
+
+    async def prefetch(self, type_name: str) -> int:
+        """
+        Fill a pool up to block_size ahead of use (e.g. at station start-up).
+
+        Returns:
+            Number of serial numbers now available for the type
+        """
+        await self.load()
+        pool = self._pools.setdefault(type_name, deque())
+        if len(pool) < self.block_size:
+            await self._refill(type_name, self.block_size - len(pool))
+        return len(pool)
+
+    def available(self, type_name: str) -> int:
+        """Serial numbers available locally for a type."""
+        return len(self._pools.get(type_name, ()))
+
+    async def close(self) -> None:
+        """Stop background refills; unused serial numbers stay persisted."""
+        self._closed = True
+        tasks = list(self._refills.values())
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._refills.clear()
+
+    # =========================================================================
+    # Refill
+    # =========================================================================
+
+    def _start_refill(self, type_name: str) -> None:
+        """Start a background refill unless one is already running."""
+        if not self._closed and type_name not in self._refills:
+            self._spawn_fill(type_name, self.block_size)
+
+    def _spawn_fill(self, type_name: str, count: int) -> "asyncio.Task[int]":
+        """Run a fill as a task shared by every waiter for the type."""
+        task = asyncio.create_task(self._fill(type_name, count))
+        self._refills[type_name] = task
+        task.add_done_callback(lambda t: self._refill_done(type_name, t))
+        return task
+
+    def _refill_done(self, type_name: str, task: "asyncio.Task[int]") -> None:
+        if self._refills.get(type_name) is task:
+            del self._refills[type_name]
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Serial number refill for '{type_name}' failed: {task.exception()}")
+
+    async def _refill(self, type_name: str, needed: int) -> int:
+        """Join the running refill for the type, or start one. Returns numbers added."""
+        task = self._refills.get(type_name)
+        if task is None:
+            task = self._spawn_fill(type_name, max(needed, self.block_size))
+        # Shielded: a cancelled caller must not cancel a fill others wait for
+        return await asyncio.shield(task)
+
+    async def _fill(self, type_name: str, count: int) -> int:
+        """Take a block from the server and add it to the pool."""
+        serials = await self._take(type_name, count)
+        if not serials:
+            return 0
+        async with self._lock:
+            pool = self._pools.setdefault(type_name, deque())
+            pool.extend(serials)
+            await self._persist()
+        logger.debug(f"Reserved {len(serials)} serial numbers for '{type_name}' ({len(pool)} available)")
+        return len(serials)
+
+    # =========================================================================
+    # Persistence
+    # =========================================================================
+
+    async def load(self) -> None:
+        """
+        Restore unused serial numbers from the store (once).
+
+        Raises:
+            RuntimeError: Saved state exists but cannot be read. The
+                reservoir never starts empty over it - that could lose
+                reserved numbers.
+        """
+        if self._loaded:
+            return
+        async with self._lock:
+            if self._loaded:
+                return
+            try:
+                state = await self.store.load()
+            except Exception as e:
+                raise RuntimeError(f"Cannot read serial number reservoir state: {e}") from e
+            if state is not None:
+                if state.get("version") != STATE_VERSION:
+                    raise RuntimeError("Unsupported serial number reservoir state version")
+                for name, serials in state.get("pools", {}).items():
+                    self._pools.setdefault(name, deque()).extendleft(reversed(serials))
+                restored = sum(len(p) for p in self._pools.values())
+                if restored:
+                    logger.info(f"Restored {restored} reserved serial numbers")
+            self._loaded = True
+
+    async def _persist(self) -> None:
+        if self.store is None:
+            return
+        state = {
+            "version": STATE_VERSION,
+            "pools": {name: list(pool) for name, pool in self._pools.items() if pool},
+        }
+        await self.store.save(state)
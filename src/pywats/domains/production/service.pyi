@@ -37,6 +37,7 @@ class SyncProductionService:
     def remove_all_children_from_assembly(self, parent_serial: str, parent_part: str) -> bool: ...
     def verify_assembly(self, serial_number: str, part_number: str, revision: str) -> Optional[Dict[str, Any]]: ...
     def allocate_serial_numbers(self, type_name: str, count: int = 1, reference_sn: Optional[str] = None, reference_pn: Optional[str] = None, station_name: Optional[str] = None) -> List[str]: ...
+    def close(self) -> None: ...
     def find_serial_numbers_in_range(self, type_name: str, from_serial: str, to_serial: str) -> List[Dict[str, Any]]: ...
     def find_serial_numbers_by_reference(self, type_name: str, reference_serial: Optional[str] = None, reference_part: Optional[str] = None) -> List[Dict[str, Any]]: ...
     def import_serial_numbers(self, file_content: bytes, content_type: str = 'text/csv') -> bool: ...
@@ -39,6 +39,7 @@ from .filter_builders import (
     build_serial_filter,
     build_part_number_filter,
     build_date_range_filter,
+    build_date_window_filter,
     build_recent_filter,
     build_today_filter,
     build_subunit_part_filter,
@@ -54,6 +55,8 @@ from .query_helpers import (
     build_query_params,
     get_default_query_params,
 )
+from .sharded_query import ShardedHeaderQuery, ShardStats
+from .wsjf_writer import WSJFStreamWriter, WSJFDocument, StreamSequence
 
 # Async implementations (primary API)
 from .async_repository import AsyncReportRepository
@@ -92,6 +95,7 @@ __all__ = [
     "build_serial_filter",
     "build_part_number_filter",
     "build_date_range_filter",
+    "build_date_window_filter",
     "build_recent_filter",
     "build_today_filter",
     "build_subunit_part_filter",
@@ -105,6 +109,13 @@ __all__ = [
     "build_orderby_clause",
     "build_query_params",
     "get_default_query_params",
+    # Sharded queries
+    "ShardedHeaderQuery",
+    "ShardStats",
+    # Streaming WSJF output
+    "WSJFStreamWriter",
+    "WSJFDocument",
+    "StreamSequence",
     # Async implementations
     "AsyncReportRepository",
     "AsyncReportService",
@@ -15,6 +15,7 @@ if TYPE_CHECKING:
 
 from .models import ReportHeader
 from .report_models import UUTReport, UURReport
+from .wsjf_writer import WSJFDocument
 from .enums import ImportMode, ReportType
 
 logger = get_logger(__name__)
@@ -146,15 +147,21 @@ class AsyncReportRepository:
     # =========================================================================
 
     async def post_wsjf(
-        self, report: Union[UUTReport, UURReport, Dict[str, Any]]
+        self, report: Union[UUTReport, UURReport, WSJFDocument, Dict[str, Any]]
     ) -> Optional[str]:
         """
         Post a new WSJF report.
 
         POST /api/Report/WSJF
+
+        A WSJFDocument (see WSJFStreamWriter) is streamed from its file as-is.
         """
+        headers = None
         # Check if it's a Pydantic model (V1 or V3) by checking for model_dump
-        if hasattr(report, 'model_dump'):
+        if isinstance(report, WSJFDocument):
+            data = report
+            headers = {"Content-Length": str(report.size)}  # Not chunked
+        elif hasattr(report, 'model_dump'):
             data = report.model_dump(
                 mode="json", by_alias=True, exclude_none=True
             )
@@ -176,7 +183,7 @@ class AsyncReportRepository:
         else:
             data = report
             
-        response = await self._http_client.post(Routes.Report.WSJF, data=data)
+        response = await self._http_client.post(Routes.Report.WSJF, data=data, headers=headers)
         
         if not response.is_success:
             error_msg = "Report submission failed"
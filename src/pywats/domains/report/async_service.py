@@ -2,11 +2,13 @@
 
 Async version of the report service for non-blocking operations.
 """
+from contextlib import aclosing
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any, Union, Callable, Protocol, overload
+from typing import Optional, List, Dict, Any, Union, Callable, Protocol, AsyncIterator, overload
 from uuid import UUID, uuid4
 import logging
 from pywats.core.logging import get_logger
+from pywats.core.pagination import apaginate, apaginate_windows
 
 from .models import WATSFilter, ReportHeader
 from .report_models import UUTReport, UURReport
@@ -20,10 +22,14 @@ from .filter_builders import (
     build_serial_filter,
     build_part_number_filter,
     build_date_range_filter,
+    build_date_window_filter,
     build_subunit_part_filter,
     build_subunit_serial_filter,
+    combine_filters,
 )
 from .query_helpers import is_uut_report_type, get_expand_fields
+from .sharded_query import ShardedHeaderQuery
+from .wsjf_writer import WSJFDocument
 from ...shared.stats import QueueProcessingResult
 
 logger = get_logger(__name__)
@@ -517,6 +523,107 @@ class AsyncReportService:
             skip=skip
         )
 
+    async def iter_headers(
+        self,
+        report_type: Union[ReportType, str] = ReportType.UUT,
+        expand: Optional[List[str]] = None,
+        odata_filter: Optional[str] = None,
+        orderby: Optional[str] = "start",
+        page_size: int = 500,
+        max_headers: Optional[int] = None,
+        prefetch: int = 2,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        window: Optional[timedelta] = None,
+        on_page: Optional[Callable[[int, int, Optional[int]], None]] = None,
+    ) -> AsyncIterator[ReportHeader]:
+        """
+        Iterate over report headers with automatic, prefetching pagination.
+
+        Pages are requested with $skip/$top while the caller consumes the
+        current page; up to ``prefetch`` further pages are in flight, so
+        memory stays bounded by ``(prefetch + 1) * page_size`` headers.
+
+        With ``start_date``, ``end_date`` and ``window`` the range is split
+        into half-open date windows instead, each queried independently
+        (and paginated within itself). This keeps $skip shallow for large
+        ranges; windows are prefetched the same way and yielded in order.
+
+        Args:
+            report_type: ReportType.UUT or ReportType.UUR
+            expand: Fields to expand (subUnits, miscInfo, assets, attachments)
+            odata_filter: Additional OData filter
+            orderby: Sort order - must be stable for $skip paging (default: "start")
+            page_size: Headers per request ($top)
+            max_headers: Maximum headers to yield (default: all)
+            prefetch: Pages (or windows) fetched ahead of the consumer
+            start_date: Start of date range (inclusive)
+            end_date: End of date range (exclusive when windowed)
+            window: Date window length; enables date-window cursoring
+            on_page: Optional callback (page_num, headers_so_far, total)
+
+        Yields:
+            ReportHeader objects one at a time
+
+        Example:
+            >>> async for header in service.iter_headers(
+            ...     odata_filter="partNumber eq 'PN-001'",
+            ...     start_date=datetime(2026, 1, 1),
+            ...     end_date=datetime(2026, 2, 1),
+            ...     window=timedelta(days=1),
+            ... ):
+            ...     print(header.serial_number)
+        """
+        def fetch(query_filter: Optional[str]) -> Callable[[int, int], Any]:
+            return lambda skip, top: self._repository.query_headers(
+                report_type=report_type,
+                expand=expand,
+                odata_filter=query_filter,
+                top=top,
+                orderby=orderby,
+                skip=skip,
+            )
+
+        if window is not None:
+            if start_date is None or end_date is None:
+                raise ValueError("start_date and end_date are required with window")
+
+            async def fetch_window(lower: datetime, upper: datetime) -> List[ReportHeader]:
+                window_filter = combine_filters([odata_filter, build_date_window_filter(lower, upper)])
+                return [
+                    header async for header in apaginate(
+                        fetch(window_filter), get_items=lambda page: page,
+                        page_size=page_size, start_index=0, prefetch=0,
+                    )
+                ]
+
+            headers: AsyncIterator[ReportHeader] = apaginate_windows(
+                fetch_window, start_date, end_date, window, prefetch=prefetch, on_page=on_page
+            )
+        else:
+            date_filter = None
+            if start_date is not None and end_date is not None:
+                date_filter = build_date_range_filter(start_date, end_date)
+            elif start_date is not None or end_date is not None:
+                raise ValueError("start_date and end_date must be given together")
+            headers = apaginate(
+                fetch(combine_filters([odata_filter, date_filter])),
+                get_items=lambda page: page,
+                page_size=page_size,
+                start_index=0,
+                max_items=max_headers,
+                prefetch=prefetch,
+                on_page=on_page,
+            )
+
+        yielded = 0
+        async with aclosing(headers):
+            async for header in headers:
+                if max_headers is not None and yielded >= max_headers:
+                    break
+                yield header
+                yielded += 1
+
     async def query_uut_headers(
         self,
         expand: Optional[List[str]] = None,
@@ -598,13 +705,14 @@ class AsyncReportService:
 
     async def submit_report(
         self,
-        report: Union[UUTReport, UURReport, Dict[str, Any]],
+        report: Union[UUTReport, UURReport, WSJFDocument, Dict[str, Any]],
     ) -> Optional[str]:
         """
         Submit a test report.
 
         Args:
-            report: UUTReport, UURReport, or dict
+            report: UUTReport, UURReport, dict, or a WSJFDocument from
+                WSJFStreamWriter (streamed as-is)
 
         Returns:
             Report ID if successful
@@ -836,7 +944,9 @@ class AsyncReportService:
         self,
         start_date: datetime,
         end_date: datetime,
-        report_type: Union[ReportType, str] = ReportType.UUT
+        report_type: Union[ReportType, str] = ReportType.UUT,
+        shards: Optional[int] = None,
+        max_concurrent: int = 4,
     ) -> List[ReportHeader]:
         """
         Get report headers by date range.
@@ -845,15 +955,92 @@ class AsyncReportService:
             start_date: Start date
             end_date: End date
             report_type: ReportType.UUT or ReportType.UUR
+            shards: Split the range into this many concurrent queries
+                (see iter_headers_sharded). Default: one query.
+            max_concurrent: Maximum concurrent shard queries
 
         Returns:
             List of ReportHeader
         """
+        if shards:
+            return [
+                header async for header in self.iter_headers_sharded(
+                    start_date, end_date, report_type=report_type,
+                    shards=shards, max_concurrent=max_concurrent,
+                )
+            ]
         odata_filter = build_date_range_filter(start_date, end_date)
         return await self._repository.query_headers(
             report_type, odata_filter=odata_filter
         )
 
+    async def iter_headers_sharded(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        report_type: Union[ReportType, str] = ReportType.UUT,
+        expand: Optional[List[str]] = None,
+        odata_filter: Optional[str] = None,
+        orderby: Optional[str] = "start",
+        shards: int = 8,
+        max_concurrent: int = 4,
+        shard_limit: int = 1000,
+    ) -> AsyncIterator[ReportHeader]:
+        """
+        Query a date range as concurrent date-sharded queries.
+
+        The ``start`` range is split into sub-windows queried in parallel
+        (at most ``max_concurrent`` at a time). Results are de-duplicated
+        by report ID and streamed in ``orderby`` order. Shards that return
+        ``shard_limit`` headers are split and re-queried, so a busy month
+        is not silently capped by the server's $top; the size of upcoming
+        shards follows the observed header density.
+
+        Args:
+            start_date: Start of the range
+            end_date: End of the range
+            report_type: ReportType.UUT or ReportType.UUR
+            expand: Fields to expand
+            odata_filter: Additional OData filter applied to every shard
+            orderby: Single-field sort order (default: "start")
+            shards: Initial number of shards
+            max_concurrent: Maximum concurrent shard queries
+            shard_limit: $top per shard (at most the server's $top cap)
+
+        Yields:
+            ReportHeader objects in orderby order
+
+        Example:
+            >>> async for header in service.iter_headers_sharded(
+            ...     datetime(2026, 1, 1), datetime(2026, 2, 1),
+            ...     odata_filter="partNumber eq 'PN-001'",
+            ...     shards=31,
+            ... ):
+            ...     print(header.serial_number)
+        """
+        async def fetch(shard_filter: Optional[str], top: int) -> List[ReportHeader]:
+            return await self._repository.query_headers(
+                report_type=report_type,
+                expand=expand,
+                odata_filter=shard_filter,
+                top=top,
+                orderby=orderby,
+            )
+
+        query = ShardedHeaderQuery(
+            fetch,
+            start_date,
+            end_date,
+            odata_filter=odata_filter,
+            orderby=orderby,
+            shards=shards,
+            max_concurrent=max_concurrent,
+            shard_limit=shard_limit,
+        )
+        async with aclosing(query.stream()) as headers:
+            async for header in headers:
+                yield header
+
     async def get_recent_headers(
         self,
         days: int = DEFAULT_RECENT_DAYS,
@@ -906,19 +1093,34 @@ class AsyncReportService:
 
     async def submit(
         self,
-        report: Union[UUTReport, UURReport, Dict[str, Any]]
+        report: Union[UUTReport, UURReport, WSJFDocument, Dict[str, Any]]
     ) -> Optional[str]:
         """
         Submit a new report (alias for submit_report).
 
         Args:
-            report: Report to submit (UUTReport, UURReport or dict)
+            report: Report to submit (UUTReport, UURReport, WSJFDocument or dict)
 
         Returns:
             Report ID if successful, None otherwise
         """
         return await self.submit_report(report)
 
+    async def submit_raw(self, report_data: Dict[str, Any]) -> Optional[str]:
+        """
+        Submit an already serialized WSJF report.
+
+        Used for reports read back from disk (e.g. the client pending queue),
+        which are posted as-is without model validation.
+
+        Args:
+            report_data: WSJF report as a JSON-compatible dict
+
+        Returns:
+            Report ID if successful, None otherwise
+        """
+        return await self.submit_report(report_data)
+
     # =========================================================================
     # WSXF (XML Format) Operations
     # =========================================================================
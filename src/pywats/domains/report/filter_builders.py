@@ -85,6 +85,34 @@ def build_date_range_filter(
     return f"{field_name} ge {start_str} and {field_name} le {end_str}"
 
 
+def build_date_window_filter(
+    start_date: datetime,
+    end_date: datetime,
+    field_name: str = "start"
+) -> str:
+    """
+    Build OData filter for a half-open date window [start_date, end_date).
+
+    Unlike build_date_range_filter, consecutive windows never overlap, so
+    a range split into windows returns each report exactly once.
+
+    Args:
+        start_date: Start of window (inclusive)
+        end_date: End of window (exclusive)
+        field_name: Date field to filter on (default: "start")
+
+    Returns:
+        OData filter string
+
+    Example:
+        >>> build_date_window_filter(datetime(2026, 1, 1), datetime(2026, 1, 2))
+        "start ge 2026-01-01T00:00:00Z and start lt 2026-01-02T00:00:00Z"
+    """
+    start_str = start_date.strftime("%Y-%m-%dT%H:%M:%SZ")
+    end_str = end_date.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return f"{field_name} ge {start_str} and {field_name} lt {end_str}"
+
+
 def build_recent_filter(
     days: int = 7,
     field_name: str = "start"
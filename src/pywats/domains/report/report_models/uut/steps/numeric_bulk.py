@@ -0,0 +1,305 @@
+"""
+Bulk NumericStep construction - column-wise build of numeric step blocks.
+
+Parametric and ICT converters add tens of thousands of numeric steps.
+Building them one by one through SequenceCall.add_numeric_step runs full
+Pydantic validation twice per step (measurement and step) plus a status
+calculation that re-parses the comparison operator and limits.
+
+build_numeric_steps() takes parallel columns instead:
+- Each column is coerced and checked once, in a single pass, with the
+  same rules Pydantic applies (whitespace stripping, float | str values,
+  name length, CompOp lookup).
+- Steps are cloned from one validated template (as model_construct()
+  does), so they are identical to step-by-step output, including
+  defaults and fields_set.
+- Active-mode statuses are evaluated per column with a predicate table
+  that mirrors CompOp.evaluate().
+"""
+from __future__ import annotations
+
+from numbers import Real
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .numeric_step import NumericStep
+from .measurement import NumericMeasurement
+from ...common_types import StepStatus, CompOp
+
+if TYPE_CHECKING:
+    from .sequence_call import SequenceCall
+
+Number = Union[float, str, None]
+Column = Union[Any, Sequence[Any]]
+
+_STATUS_CODES = ("P", "F", "D", "E", "T", "S")
+
+# Mirrors CompOp.evaluate(value, low, high) for each operator
+_Predicate = Callable[[float, Optional[float], Optional[float]], bool]
+_PREDICATES: Dict[CompOp, _Predicate] = {
+    CompOp.LOG: lambda v, lo, hi: True,
+    CompOp.CASESENSIT: lambda v, lo, hi: True,
+    CompOp.IGNORECASE: lambda v, lo, hi: True,
+    CompOp.EQT: lambda v, lo, hi: True,
+    CompOp.EQ: lambda v, lo, hi: lo is None or v == lo,
+    CompOp.NE: lambda v, lo, hi: lo is None or v != lo,
+    CompOp.GT: lambda v, lo, hi: lo is None or v > lo,
+    CompOp.LT: lambda v, lo, hi: lo is None or v < lo,
+    CompOp.GE: lambda v, lo, hi: lo is None or v >= lo,
+    CompOp.LE: lambda v, lo, hi: lo is None or v <= lo,
+    CompOp.GTLT: lambda v, lo, hi: lo is None or hi is None or lo < v < hi,
+    CompOp.GELE: lambda v, lo, hi: lo is None or hi is None or lo <= v <= hi,
+    CompOp.GELT: lambda v, lo, hi: lo is None or hi is None or lo <= v < hi,
+    CompOp.GTLE: lambda v, lo, hi: lo is None or hi is None or lo < v <= hi,
+    CompOp.LTGT: lambda v, lo, hi: lo is None or hi is None or v < lo or v > hi,
+    CompOp.LEGE: lambda v, lo, hi: lo is None or hi is None or v <= lo or v >= hi,
+    CompOp.LEGT: lambda v, lo, hi: lo is None or hi is None or v <= lo or v > hi,
+    CompOp.LTGE: lambda v, lo, hi: lo is None or hi is None or v < lo or v >= hi,
+}
+
+
+# ============================================================================
+# Column coercion
+# ============================================================================
+
+def _is_scalar(value: Any) -> bool:
+    return value is None or isinstance(value, (str, bytes, Real, CompOp)) or not isinstance(value, Iterable)
+
+
+def _broadcast(column: Column, count: int, label: str) -> List[Any]:
+    """Expand a scalar to ``count`` rows, or check a column's length."""
+    if _is_scalar(column):
+        return [column] * count
+    values = list(column)
+    if len(values) != count:
+        raise ValueError(f"{label} has {len(values)} entries, expected {count}")
+    return values
+
+
+def _coerce_number(value: Any, label: str, row: int) -> Number:
+    """float | str | None, as Pydantic validates Union[float, str]."""
+    if value is None or type(value) is float:
+        return value
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, Real):
+        return float(value)
+    raise ValueError(f"{label}[{row}]: expected a number or string, got {type(value).__name__}")
+
+
+def _number_column(column: Column, count: int, label: str) -> List[Number]:
+    if _is_scalar(column):
+        return [_coerce_number(column, label, 0)] * count
+    return [_coerce_number(v, label, i) for i, v in enumerate(_broadcast(column, count, label))]
+
+
+def _name_column(names: Sequence[str]) -> List[str]:
+    result = []
+    for i, name in enumerate(names):
+        if not isinstance(name, str):
+            raise ValueError(f"names[{i}]: expected a string, got {type(name).__name__}")
+        name = name.strip()
+        if not 1 <= len(name) <= NumericStep.MAX_NAME_LENGTH:
+            raise ValueError(f"names[{i}]: length must be 1-{NumericStep.MAX_NAME_LENGTH} characters")
+        result.append(name)
+    return result
+
+
+def _unit_column(column: Column, count: int) -> List[Optional[str]]:
+    def coerce(unit: Any, row: int) -> Optional[str]:
+        if unit is None:
+            return None
+        if not isinstance(unit, str):
+            raise ValueError(f"units[{row}]: expected a string, got {type(unit).__name__}")
+        return unit.strip()
+
+    if _is_scalar(column):
+        return [coerce(column, 0)] * count
+    return [coerce(u, i) for i, u in enumerate(_broadcast(column, count, "units"))]
+
+
+def _comp_op_column(column: Column, count: int) -> List[CompOp]:
+    cache: Dict[Any, CompOp] = {}
+
+    def coerce(op: Any, row: int) -> CompOp:
+        try:
+            return cache[op]
+        except KeyError:
+            pass
+        try:
+            cache[op] = CompOp(op)
+        except ValueError:
+            raise ValueError(f"comp_ops[{row}]: invalid comparison operator {op!r}") from None
+        return cache[op]
+
+    if _is_scalar(column):
+        return [coerce(column, 0)] * count
+    return [coerce(op, i) for i, op in enumerate(_broadcast(column, count, "comp_ops"))]
+
+
+def _status_column(column: Column, count: int) -> List[Optional[StepStatus]]:
+    """None = calculate in Active mode; otherwise as add_numeric_step resolves it."""
+    def coerce(status: Any) -> Optional[StepStatus]:
+        if status is None:
+            return None
+        if isinstance(status, StepStatus):
+            return status
+        return StepStatus(status) if status in _STATUS_CODES else StepStatus.Passed
+
+    if _is_scalar(column):
+        return [coerce(column)] * count
+    return [coerce(s) for s in _broadcast(column, count, "statuses")]
+
+
+def _as_float(value: Number) -> Optional[float]:
+    return value if value is None or type(value) is float else float(value)
+
+
+def calculate_statuses(
+    values: Sequence[Number],
+    comp_ops: Sequence[CompOp],
+    low_limits: Sequence[Number],
+    high_limits: Sequence[Number],
+) -> List[bool]:
+    """
+    Pass/fail per row, equivalent to NumericMeasurement.calculate_status().
+
+    Rows that cannot be evaluated (no value, non-numeric value or limits)
+    pass, like the single-step path.
+    """
+    passed = []
+    for value, op, low, high in zip(values, comp_ops, low_limits, high_limits):
+        predicate = _PREDICATES.get(op)
+        if value is None or predicate is None or op is CompOp.LOG:
+            passed.append(True)
+            continue
+        try:
+            passed.append(predicate(_as_float(value), _as_float(low), _as_float(high)))
+        except (ValueError, TypeError):
+            passed.append(True)  # Error status -> treated as pass
+    return passed
+
+
+# ============================================================================
+# Builder
+# ============================================================================
+
+def build_numeric_steps(
+    parent: "SequenceCall",
+    *,
+    names: Sequence[str],
+    values: Column,
+    units: Column = "NA",
+    comp_ops: Column = CompOp.LOG,
+    low_limits: Column = None,
+    high_limits: Column = None,
+    statuses: Column = None,
+    group: str = "M",
+    fail_parent_on_failure: bool = True,
+    active: bool = False,
+) -> Tuple[List[NumericStep], bool]:
+    """
+    Build NumericSteps from parallel columns (see SequenceCall.add_numeric_steps).
+
+    Returns:
+        The steps, with parent set, not yet added to the parent; and
+        whether any Active-mode calculated status failed (explicit
+        statuses never count, as in add_numeric_step).
+
+    Raises:
+        ValueError: A column has the wrong length or an invalid entry
+            (the message names the column and row).
+    """
+    name_column = _name_column(list(names))
+    count = len(name_column)
+    value_column = _number_column(values, count, "values")
+    unit_column = _unit_column(units, count)
+    op_column = _comp_op_column(comp_ops, count)
+    low_column = _number_column(low_limits, count, "low_limits")
+    high_column = _number_column(high_limits, count, "high_limits")
+    status_column = _status_column(statuses, count)
+    if count == 0:
+        return [], False
+
+    calculated: List[bool] = []
+    if active and any(s is None for s in status_column):
+        calculated = calculate_statuses(value_column, op_column, low_column, high_column)
+
+    # Template built through the regular path: defaults and fields_set
+    # match add_numeric_step exactly
+    template = NumericStep.create(name=name_column[0], value=0.0)
+    template.id = None
+    template.group = group
+    template.error_code = None
+    template.error_message = None
+    template.report_text = None
+    template.start = None
+    template.tot_time = None
+    template.fail_parent_on_failure = fail_parent_on_failure
+    template.parent = parent
+    step_fields = dict(template.__dict__)
+    step_set = set(template.model_fields_set)
+    meas_fields = dict(template.measurement.__dict__)
+    meas_set = set(template.measurement.model_fields_set)
+
+    # Enum .value is a descriptor call; resolve each distinct member once
+    op_values = {op: op.value for op in set(op_column)}
+    status_values: Dict[Any, Any] = {s: s.value for s in set(status_column) if s is not None}
+    status_values[None] = StepStatus.Passed.value
+
+    steps: List[NumericStep] = []
+    for i in range(count):
+        status = status_column[i]
+        if status is None and calculated and not calculated[i]:
+            status_value: Any = StepStatus.Failed  # As assigned by add_numeric_step
+        else:
+            status_value = status_values[status]
+
+        measurement = _clone(NumericMeasurement, meas_fields, meas_set)
+        fields = measurement.__dict__
+        fields["value"] = value_column[i]
+        fields["unit"] = unit_column[i]
+        fields["comp_op"] = op_values[op_column[i]]
+        fields["low_limit"] = low_column[i]
+        fields["high_limit"] = high_column[i]
+        fields["status"] = status_value
+
+        step = _clone(NumericStep, step_fields, step_set)
+        fields = step.__dict__
+        fields["name"] = name_column[i]
+        fields["measurement"] = measurement
+        fields["status"] = status_value
+        steps.append(step)
+    calculated_failure = any(
+        status is None and not passed for status, passed in zip(status_column, calculated)
+    )
+    return steps, calculated_failure
+
+
+_new = object.__new__
+_setattr = object.__setattr__
+
+
+def _clone(cls: type, fields: Dict[str, Any], fields_set: set) -> Any:
+    """
+    Instance of a validated model from a template's field values.
+
+    What BaseModel.model_construct() does for a complete field dict, without
+    its per-field default resolution (the template already resolved them).
+    """
+    instance = _new(cls)
+    _setattr(instance, "__dict__", dict(fields))
+    _setattr(instance, "__pydantic_fields_set__", set(fields_set))
+    _setattr(instance, "__pydantic_extra__", None)
+    _setattr(instance, "__pydantic_private__", None)
+    return instance
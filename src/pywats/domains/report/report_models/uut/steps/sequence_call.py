@@ -16,6 +16,7 @@ from typing import (
     Optional,
     List,
     Literal,
+    Sequence,
     Union,
     overload,
 )
@@ -68,6 +69,7 @@ class SequenceCall(Step):
     
     Factory Methods:
         - add_numeric_step(): Add a NumericStep
+        - add_numeric_steps(): Add a block of NumericSteps from columns
         - add_boolean_step(): Add a PassFailStep
         - add_string_step(): Add a StringValueStep
         - add_sequence_call(): Add a nested SequenceCall
@@ -239,7 +241,81 @@ class SequenceCall(Step):
                         self.propagate_failure()
         
         return step
-    
+
+    def add_numeric_steps(
+        self,
+        *,
+        names: Sequence[str],
+        values: Sequence[float | str] | float | str,
+        units: Sequence[str] | str = "NA",
+        comp_ops: Sequence[CompOp | str] | CompOp | str = CompOp.LOG,
+        low_limits: Sequence[float | str | None] | float | str | None = None,
+        high_limits: Sequence[float | str | None] | float | str | None = None,
+        statuses: Sequence[StepStatus | str | None] | StepStatus | str | None = None,
+        group: str = "M",
+        fail_parent_on_failure: bool = True,
+    ) -> List[NumericStep]:
+        """
+        Add a block of numeric limit test steps from parallel columns.
+
+        Produces the same steps as calling add_numeric_step() once per row,
+        but validates each column in one pass and skips per-step Pydantic
+        validation, which matters for converters adding thousands of steps.
+        Every column except ``names`` may also be a single value used for
+        all rows.
+
+        Args:
+            names: Step names
+            values: Measured values
+            units: Units of measurement (default "NA")
+            comp_ops: Comparison operators (default LOG = log only)
+            low_limits: Low limit values
+            high_limits: High limit values
+            statuses: Step statuses (None = auto-calculate in Active mode)
+            group: Step group (S/M/C) for all steps
+            fail_parent_on_failure: Propagate failure to parent
+
+        Returns:
+            The created NumericSteps, in row order.
+
+        Raises:
+            ValueError: If a column has the wrong length or an invalid entry.
+
+        Example:
+            >>> seq.add_numeric_steps(
+            ...     names=["R1", "R2", "R3"],
+            ...     values=[99.8, 101.2, 150.0],
+            ...     units="Ohm",
+            ...     comp_ops=CompOp.GELE,
+            ...     low_limits=95.0,
+            ...     high_limits=105.0,
+            ... )
+        """
+        from pywats.domains.report.import_mode import is_active_mode
+        from .numeric_bulk import build_numeric_steps
+
+        active = is_active_mode()
+        steps, calculated_failure = build_numeric_steps(
+            self,
+            names=names,
+            values=values,
+            units=units,
+            comp_ops=comp_ops,
+            low_limits=low_limits,
+            high_limits=high_limits,
+            statuses=statuses,
+            group=group,
+            fail_parent_on_failure=fail_parent_on_failure,
+            active=active,
+        )
+        self.steps.extend(steps)
+
+        # Calculated failures only, matching add_numeric_step
+        if fail_parent_on_failure and calculated_failure:
+            self.propagate_failure()
+
+        return steps
+
     def add_multi_numeric_step(
         self,
         *,
@@ -11,10 +11,11 @@ class SyncReportService:
     """Synchronous wrapper for AsyncReportService."""
 
     def query_headers(self, report_type: Union[ReportType, str] = ReportType.UUT, expand: Optional[List[str]] = None, odata_filter: Optional[str] = None, top: Optional[int] = None, orderby: Optional[str] = None, skip: Optional[int] = None) -> List[ReportHeader]: ...
+    def iter_headers(self, report_type: Union[ReportType, str] = ReportType.UUT, expand: Optional[List[str]] = None, odata_filter: Optional[str] = None, orderby: Optional[str] = 'start', page_size: int = 500, max_headers: Optional[int] = None, prefetch: int = 2, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, window: Optional[timedelta] = None, on_page: Optional[Callable[[int, int, Optional[int]], None]] = None) -> AsyncIterator[ReportHeader]: ...
     def query_uut_headers(self, expand: Optional[List[str]] = None, odata_filter: Optional[str] = None, top: Optional[int] = None, orderby: Optional[str] = None) -> List[ReportHeader]: ...
     def query_uur_headers(self, expand: Optional[List[str]] = None, odata_filter: Optional[str] = None, top: Optional[int] = None, orderby: Optional[str] = None) -> List[ReportHeader]: ...
     def get_report(self, report_id: str, detail_level: Optional[int] = None) -> Optional[Union[UUTReport, UURReport]]: ...
-    def submit_report(self, report: Union[UUTReport, UURReport, Dict[str, Any]]) -> Optional[str]: ...
+    def submit_report(self, report: Union[UUTReport, UURReport, WSJFDocument, Dict[str, Any]]) -> Optional[str]: ...
     def get_attachment(self, attachment_id: Optional[str] = None, step_id: Optional[str] = None) -> Optional[bytes]: ...
     def get_all_attachments(self, report_id: str) -> Optional[bytes]: ...
     def get_certificate(self, report_id: str) -> Optional[bytes]: ...
@@ -24,9 +25,11 @@ class SyncReportService:
     def query_headers_by_misc_info(self, description: str, string_value: str, top: Optional[int] = None) -> List[ReportHeader]: ...
     def get_headers_by_serial(self, serial_number: str, report_type: Union[ReportType, str] = ReportType.UUT, top: Optional[int] = None) -> List[ReportHeader]: ...
     def get_headers_by_part_number(self, part_number: str, report_type: Union[ReportType, str] = ReportType.UUT, top: Optional[int] = None) -> List[ReportHeader]: ...
-    def get_headers_by_date_range(self, start_date: datetime, end_date: datetime, report_type: Union[ReportType, str] = ReportType.UUT) -> List[ReportHeader]: ...
+    def get_headers_by_date_range(self, start_date: datetime, end_date: datetime, report_type: Union[ReportType, str] = ReportType.UUT, shards: Optional[int] = None, max_concurrent: int = 4) -> List[ReportHeader]: ...
+    def iter_headers_sharded(self, start_date: datetime, end_date: datetime, report_type: Union[ReportType, str] = ReportType.UUT, expand: Optional[List[str]] = None, odata_filter: Optional[str] = None, orderby: Optional[str] = 'start', shards: int = 8, max_concurrent: int = 4, shard_limit: int = 1000) -> AsyncIterator[ReportHeader]: ...
     def get_recent_headers(self, days: int = DEFAULT_RECENT_DAYS, report_type: Union[ReportType, str] = ReportType.UUT, top: Optional[int] = None) -> List[ReportHeader]: ...
     def get_todays_headers(self, report_type: Union[ReportType, str] = ReportType.UUT, top: Optional[int] = None) -> List[ReportHeader]: ...
-    def submit(self, report: Union[UUTReport, UURReport, Dict[str, Any]]) -> Optional[str]: ...
+    def submit(self, report: Union[UUTReport, UURReport, WSJFDocument, Dict[str, Any]]) -> Optional[str]: ...
+    def submit_raw(self, report_data: Dict[str, Any]) -> Optional[str]: ...
     def get_report_xml(self, report_id: str, include_attachments: Optional[bool] = None, include_chartdata: Optional[bool] = None, include_indexes: Optional[bool] = None) -> Optional[bytes]: ...
     def submit_report_xml(self, xml_content: str) -> Optional[str]: ...
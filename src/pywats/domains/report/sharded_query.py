@@ -0,0 +1,304 @@
+"""Parallel date-sharded report header queries.
+
+Splits a ``start`` date range into sub-windows that are queried
+concurrently, de-duplicated by report ID and merged back in ``orderby``
+order. Extracted from async_service.py for testability, in the same way
+as filter_builders and query_helpers.
+
+Shard size adapts to the data: a shard that fills ``shard_limit`` may have
+been truncated and is split in half and re-queried, and the length of
+upcoming shards follows the observed header density so each shard
+returns roughly half of ``shard_limit``.
+
+Example:
+    >>> query = ShardedHeaderQuery(fetch, start, end, shards=8, max_concurrent=4)
+    >>> async for header in query:
+    ...     print(header.serial_number)
+    >>> print(query.stats)
+"""
+import asyncio
+import heapq
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from pywats.core.logging import get_logger
+
+from .filter_builders import build_date_range_filter, combine_filters
+from .models import ReportHeader
+
+logger = get_logger(__name__)
+
+# Fetches one shard: (odata_filter, top) -> headers
+ShardFetcher = Callable[[Optional[str], int], Awaitable[List[ReportHeader]]]
+
+# OData orderby names that differ from the ReportHeader attribute
+_ORDERBY_ATTRIBUTES = {"start": "start_utc"}
+
+_EWMA_ALPHA = 0.5
+_MAX_GROWTH = 4.0
+
+
+@dataclass
+class ShardStats:
+    """Counters for a sharded query run."""
+    shards: int = 0
+    splits: int = 0
+    truncated: int = 0
+    headers: int = 0
+    duplicates: int = 0
+
+
+class _Shard:
+    """One date window and its (eventual) result."""
+
+    __slots__ = ("lower", "upper", "task", "headers")
+
+    def __init__(self, lower: datetime, upper: datetime) -> None:
+        self.lower = lower
+        self.upper = upper
+        self.task: Optional["asyncio.Task[List[ReportHeader]]"] = None
+        self.headers: Optional[List[ReportHeader]] = None
+
+    @property
+    def seconds(self) -> float:
+        return max((self.upper - self.lower).total_seconds(), 1.0)
+
+
+def _parse_orderby(orderby: Optional[str]) -> Tuple[str, bool]:
+    """Return (field, descending) for a single-field OData orderby."""
+    if not orderby:
+        return "start", False
+    field_name, _, direction = orderby.strip().partition(" ")
+    return field_name, direction.strip().lower() == "desc"
+
+
+def _attribute_for(field_name: str) -> str:
+    """Map an OData field name to the ReportHeader attribute."""
+    if field_name in _ORDERBY_ATTRIBUTES:
+        return _ORDERBY_ATTRIBUTES[field_name]
+    for name, info in ReportHeader.model_fields.items():
+        if field_name in (name, info.serialization_alias):
+            return name
+    raise ValueError(f"Cannot merge on orderby field '{field_name}'")
+
+
+def _whole_seconds(value: datetime) -> datetime:
+    # Filters are rendered with second precision
+    return value.replace(microsecond=0)
+
+
+class ShardedHeaderQuery:
+    """
+    Concurrent, adaptive, date-sharded header query.
+
+    Results stream out in ``orderby`` order. When ordering by ``start``
+    each shard is yielded as soon as it and all earlier shards are done;
+    for other fields the shards are k-way merged once all are fetched.
+
+    Args:
+        fetch: Async function running one shard query (odata_filter, top)
+        start_date: Start of the range
+        end_date: End of the range
+        odata_filter: Additional filter applied to every shard
+        orderby: Single-field sort order, e.g. "start desc" (default: "start")
+        shards: Initial number of shards the range is split into
+        max_concurrent: Maximum shard queries in flight
+        shard_limit: $top per shard; a full shard is split and re-queried.
+            Keep this at or below the server's $top cap.
+        min_shard: Shards are not split below this length
+    """
+
+    def __init__(
+        self,
+        fetch: ShardFetcher,
+        start_date: datetime,
+        end_date: datetime,
+        odata_filter: Optional[str] = None,
+        orderby: Optional[str] = "start",
+        shards: int = 8,
+        max_concurrent: int = 4,
+        shard_limit: int = 1000,
+        min_shard: timedelta = timedelta(seconds=2),
+    ) -> None:
+        if shards < 1 or max_concurrent < 1 or shard_limit < 1:
+            raise ValueError("shards, max_concurrent and shard_limit must be at least 1")
+        self._fetch = fetch
+        self.start_date = _whole_seconds(start_date)
+        self.end_date = _whole_seconds(end_date)
+        self.odata_filter = odata_filter
+        self.orderby = orderby or "start"
+        self.shard_limit = shard_limit
+        self.max_concurrent = max_concurrent
+        self.min_shard = max(min_shard, timedelta(seconds=2))
+
+        field_name, self._descending = _parse_orderby(self.orderby)
+        self._attribute = _attribute_for(field_name)
+        self._time_ordered = self._attribute == "start_utc"
+
+        total_seconds = max((self.end_date - self.start_date).total_seconds(), 1.0)
+        self._span = max(total_seconds / shards, 1.0)
+        self._max_span = total_seconds
+        self._density: Optional[float] = None
+        self._cursor = self.end_date if self._descending else self.start_date
+        self.stats = ShardStats()
+
+    def __aiter__(self) -> AsyncIterator[ReportHeader]:
+        return self.stream()
+
+    # =========================================================================
+    # Shard planning
+    # =========================================================================
+
+    def _next_window(self) -> Optional[_Shard]:
+        """Cut the next window off the unplanned part of the range."""
+        span = timedelta(seconds=round(self._span))
+        if self._descending:
+            if self._cursor <= self.start_date:
+                return None
+            lower = max(self._cursor - span, self.start_date)
+            shard = _Shard(lower, self._cursor)
+            self._cursor = lower
+        else:
+            if self._cursor >= self.end_date:
+                return None
+            upper = min(self._cursor + span, self.end_date)
+            shard = _Shard(self._cursor, upper)
+            self._cursor = upper
+        return shard
+
+    def _observe(self, shard: _Shard, count: int) -> None:
+        """Update the density estimate and resize upcoming shards."""
+        density = count / shard.seconds
+        self._density = density if self._density is None else (
+            _EWMA_ALPHA * density + (1 - _EWMA_ALPHA) * self._density
+        )
+        target = self.shard_limit / 2
+        wanted = target / self._density if self._density > 0 else self._max_span
+        self._span = min(max(wanted, 1.0), self._span * _MAX_GROWTH, self._max_span)
+
+    def _split(self, shard: _Shard) -> Optional[List[_Shard]]:
+        """Split a saturated shard in two (in emission order), if possible."""
+        if shard.upper - shard.lower < self.min_shard:
+            return None
+        middle = _whole_seconds(shard.lower + (shard.upper - shard.lower) / 2)
+        halves = [_Shard(shard.lower, middle), _Shard(middle, shard.upper)]
+        return halves[::-1] if self._descending else halves
+
+    async def _run(self, shard: _Shard) -> List[ReportHeader]:
+        shard_filter = combine_filters([
+            self.odata_filter,
+            build_date_range_filter(shard.lower, shard.upper),
+        ])
+        return await self._fetch(shard_filter, self.shard_limit)
+
+    # =========================================================================
+    # Execution
+    # =========================================================================
+
+    async def stream(self) -> AsyncIterator[ReportHeader]:
+        """Run the shards and yield merged, de-duplicated headers."""
+        order: List[_Shard] = []  # Emission order; front is emitted next
+        emitted = 0
+        seen: Set[Any] = set()
+        running: Set["asyncio.Task[List[ReportHeader]]"] = set()
+        by_task: Dict["asyncio.Task[List[ReportHeader]]", _Shard] = {}
+        planning_done = False
+
+        def launch() -> None:
+            nonlocal planning_done
+            # Re-queries of split shards first, then fresh windows
+            for shard in order[emitted:]:
+                if len(running) >= self.max_concurrent:
+                    return
+                if shard.task is None and shard.headers is None:
+                    self._start(shard, running, by_task)
+            while not planning_done and len(running) < self.max_concurrent:
+                shard = self._next_window()
+                if shard is None:
+                    planning_done = True
+                    return
+                order.append(shard)
+                self._start(shard, running, by_task)
+
+        try:
+            launch()
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    running.discard(task)
+                    shard = by_task.pop(task)
+                    shard.task = None
+                    headers = task.result()
+                    self._complete(shard, headers, order)
+                launch()
+
+                if self._time_ordered:
+                    while emitted < len(order) and order[emitted].headers is not None:
+                        shard = order[emitted]
+                        emitted += 1
+                        for header in self._unique(shard.headers, seen):
+                            yield header
+                        shard.headers = []  # Release memory once emitted
+
+            if not self._time_ordered:
+                shard_results = [shard.headers or [] for shard in order]
+                for header in heapq.merge(*shard_results, key=self._sort_key, reverse=self._descending):
+                    for unique in self._unique([header], seen):
+                        yield unique
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        logger.debug(
+            f"Sharded query done: {self.stats.shards} shards, {self.stats.splits} splits, "
+            f"{self.stats.headers} headers, {self.stats.duplicates} duplicates"
+        )
+
+    def _start(self, shard: _Shard, running: Set["asyncio.Task[List[ReportHeader]]"],
+               by_task: Dict["asyncio.Task[List[ReportHeader]]", _Shard]) -> None:
+        shard.task = asyncio.create_task(self._run(shard))
+        running.add(shard.task)
+        by_task[shard.task] = shard
+        self.stats.shards += 1
+
+    def _complete(self, shard: _Shard, headers: List[ReportHeader], order: List[_Shard]) -> None:
+        """Accept a shard result, or replace a saturated shard by its halves."""
+        if len(headers) >= self.shard_limit:
+            halves = self._split(shard)
+            if halves is not None:
+                index = order.index(shard)
+                order[index:index + 1] = halves
+                self.stats.splits += 1
+                # Make future shards smaller right away
+                self._span = max(self._span / 2, 1.0)
+                return
+            self.stats.truncated += 1
+            logger.warning(
+                f"Shard {shard.lower:%Y-%m-%dT%H:%M:%S}..{shard.upper:%Y-%m-%dT%H:%M:%S} "
+                f"returned {len(headers)} headers (shard_limit) and cannot be split further; "
+                "results may be incomplete"
+            )
+        self._observe(shard, len(headers))
+        shard.headers = sorted(headers, key=self._sort_key, reverse=self._descending)
+
+    def _sort_key(self, header: ReportHeader) -> Tuple[bool, Any]:
+        value = getattr(header, self._attribute, None)
+        # None sorts last ascending (first descending)
+        return (False, value) if value is not None else (True, 0)
+
+    def _unique(self, headers: List[ReportHeader], seen: Set[Any]) -> List[ReportHeader]:
+        """Drop headers already emitted (adjacent shards share their boundary second)."""
+        unique = []
+        for header in headers:
+            key = header.uuid
+            if key is not None:
+                if key in seen:
+                    self.stats.duplicates += 1
+                    continue
+                seen.add(key)
+            unique.append(header)
+        self.stats.headers += len(unique)
+        return unique
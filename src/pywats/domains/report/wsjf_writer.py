@@ -0,0 +1,386 @@
+"""Streaming WSJF writer for very large UUT reports.
+
+Building a complete UUTReport for a huge test log keeps every step model in
+memory until the report is serialized, and serialization then builds a
+second, dict-shaped copy. WSJFStreamWriter writes the WSJF JSON while the
+source is parsed instead: each step is created through the regular
+SequenceCall factory methods (so it is validated exactly like the model
+path), serialized on the next writer call and dropped.
+
+Output goes to a spooled temporary file (in memory up to ``spool_size``,
+then on disk) or to a seekable binary stream. Statuses that are only known
+at the end - a sequence failed by a later child, or the report result - are
+single-letter codes written as placeholders and patched in place.
+
+The finished WSJFDocument can be posted with AsyncReportRepository.post_wsjf
+(streamed from the file, never held as one object) or saved into the client
+pending queue folder with pywats_client.io.WSJFDocumentIO.
+
+Example:
+    >>> writer = WSJFStreamWriter(UUTReport(pn="PCBA", sn="SN1", rev="A", ...))
+    >>> with writer.root.add_sequence_call("ICT") as ict:
+    ...     for row in rows:
+    ...         ict.add_numeric_step(name=row.name, value=row.value, ...)
+    >>> document = writer.finish(result="F")
+    >>> await api.report.submit(document)
+"""
+import asyncio
+import json
+import tempfile
+from typing import IO, Any, AsyncIterator, Callable, Dict, List, Optional, Union
+
+from .report_models import UUTReport, Step
+from .report_models.common_types import ReportStatus, StepStatus
+from .report_models.uut.steps.sequence_call import SequenceCall
+
+DEFAULT_SPOOL_SIZE = 8 * 1024 * 1024
+CHUNK_SIZE = 256 * 1024
+
+# Same encoding httpx uses for json= request bodies
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode
+
+
+def _dump(model: Any) -> Dict[str, Any]:
+    return model.model_dump(mode="json", by_alias=True, exclude_none=True)
+
+
+def _code(status: Any) -> str:
+    """Serialized single-letter form of a StepStatus/ReportStatus (or its value)."""
+    return status.value if isinstance(status, (StepStatus, ReportStatus)) else str(status)
+
+
+class WSJFDocument:
+    """
+    A serialized WSJF report backed by a file.
+
+    Submittable with AsyncReportService.submit()/AsyncReportRepository.post_wsjf(),
+    which stream it as the request body (re-readable, so retries work). Only
+    one consumer may read it at a time.
+
+    Attributes:
+        size: Length of the JSON document in bytes
+        pn: Part number (for logging)
+        sn: Serial number (for logging)
+    """
+
+    def __init__(
+        self,
+        file: IO[bytes],
+        size: int,
+        *,
+        start: int = 0,
+        pn: Optional[str] = None,
+        sn: Optional[str] = None,
+    ) -> None:
+        self._file = file
+        self._start = start
+        self.size = size
+        self.pn = pn
+        self.sn = sn
+
+    def read_bytes(self) -> bytes:
+        """The whole document."""
+        self._file.seek(self._start)
+        return self._file.read(self.size)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Parse the document (loads it completely; intended for inspection and tests)."""
+        return json.loads(self.read_bytes())
+
+    def write_to(self, stream: IO[bytes]) -> int:
+        """
+        Copy the document to a binary stream in chunks.
+
+        Returns:
+            Bytes written (the document size)
+        """
+        self._file.seek(self._start)
+        remaining = self.size
+        while remaining:
+            chunk = self._file.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                raise IOError(f"WSJF document truncated ({remaining} bytes missing)")
+            stream.write(chunk)
+            remaining -= len(chunk)
+        return self.size
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        # A new iterator per request, so the HTTP client can resend on retry
+        return self._chunks()
+
+    async def _chunks(self) -> AsyncIterator[bytes]:
+        self._file.seek(self._start)
+        remaining = self.size
+        while remaining:
+            chunk = await asyncio.to_thread(self._file.read, min(CHUNK_SIZE, remaining))
+            if not chunk:
+                raise IOError(f"WSJF document truncated ({remaining} bytes missing)")
+            remaining -= len(chunk)
+            yield chunk
+
+    def close(self) -> None:
+        """Release the backing file (deletes a spooled temporary file)."""
+        self._file.close()
+
+    def __enter__(self) -> "WSJFDocument":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"WSJFDocument(pn={self.pn!r}, sn={self.sn!r}, size={self.size})"
+
+
+class StreamSequence:
+    """
+    An open sequence of a WSJFStreamWriter.
+
+    Offers the SequenceCall factory methods. A step returned by a factory
+    method may still be modified (e.g. measurements added to a multi-step)
+    until the next call on the writer; then it is serialized and released.
+    Only the innermost open sequence accepts steps.
+
+    Use as a context manager (or call close()) to end the sequence. Fields of
+    the sequence other than its status are written when it is opened.
+    """
+
+    def __init__(self, writer: "WSJFStreamWriter", call: SequenceCall, status_offset: int) -> None:
+        self._writer = writer
+        self.step = call
+        self._status_offset = status_offset
+        self._written_status = _code(call.status)
+        self._count = 0
+        self.closed = False
+
+    @property
+    def name(self) -> str:
+        return self.step.name
+
+    @property
+    def step_count(self) -> int:
+        """Steps written to this sequence so far (not counting pending ones)."""
+        return self._count
+
+    # =========================================================================
+    # Factory methods (see SequenceCall)
+    # =========================================================================
+
+    def add_step(self, step: Step) -> Step:
+        return self._add(self.step.add_step, step)
+
+    def add_numeric_step(self, **kwargs: Any) -> Any:
+        return self._add(self.step.add_numeric_step, **kwargs)
+
+    def add_numeric_steps(self, **kwargs: Any) -> List[Any]:
+        return self._add(self.step.add_numeric_steps, **kwargs)
+
+    def add_multi_numeric_step(self, **kwargs: Any) -> Any:
+        return self._add(self.step.add_multi_numeric_step, **kwargs)
+
+    def add_boolean_step(self, **kwargs: Any) -> Any:
+        return self._add(self.step.add_boolean_step, **kwargs)
+
+    def add_multi_boolean_step(self, **kwargs: Any) -> Any:
+        return self._add(self.step.add_multi_boolean_step, **kwargs)
+
+    def add_string_step(self, **kwargs: Any) -> Any:
+        return self._add(self.step.add_string_step, **kwargs)
+
+    def add_multi_string_step(self, **kwargs: Any) -> Any:
+        return self._add(self.step.add_multi_string_step, **kwargs)
+
+    def add_action_step(self, name: str, **kwargs: Any) -> Any:
+        return self._add(self.step.add_action_step, name, **kwargs)
+
+    def add_generic_step(self, **kwargs: Any) -> Any:
+        return self._add(self.step.add_generic_step, **kwargs)
+
+    def add_chart_step(self, name: str, **kwargs: Any) -> Any:
+        return self._add(self.step.add_chart_step, name, **kwargs)
+
+    def add_sequence_call(self, name: str, **kwargs: Any) -> "StreamSequence":
+        """Open a nested sequence (see SequenceCall.add_sequence_call)."""
+        self._writer._check_active(self)
+        self._writer._drain()
+        child = self.step.add_sequence_call(name, **kwargs)
+        self.step.steps.pop()  # Children are written, not collected
+        self._writer._separate(self)
+        return self._writer._open(child)
+
+    # =========================================================================
+    # Closing
+    # =========================================================================
+
+    def close(self) -> None:
+        """Write pending steps and end the sequence (patching its status)."""
+        if not self.closed:
+            self._writer._close(self)
+
+    def __enter__(self) -> "StreamSequence":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if not self._writer.finished:
+            self.close()
+
+    def _add(self, factory: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        self._writer._check_active(self)
+        self._writer._drain()
+        return factory(*args, **kwargs)
+
+
+class WSJFStreamWriter:
+    """
+    Incremental WSJF serializer for a UUT report.
+
+    Args:
+        report: Report header (identification, info, misc infos, sub-units,
+            assets, ...). Its root sequence supplies the root step fields
+            and must not contain steps.
+        target: Seekable binary stream to write to (None = spooled temp file)
+        spool_size: Bytes kept in memory before a spooled file moves to disk
+
+    Raises:
+        ValueError: report.root already has steps, or target is not seekable
+    """
+
+    def __init__(
+        self,
+        report: UUTReport,
+        target: Optional[IO[bytes]] = None,
+        spool_size: int = DEFAULT_SPOOL_SIZE,
+    ) -> None:
+        if report.root.steps:
+            raise ValueError("The header report must not contain steps; add them through the writer")
+        if target is None:
+            target = tempfile.SpooledTemporaryFile(max_size=spool_size, mode="w+b")
+        elif not target.seekable():
+            raise ValueError("WSJFStreamWriter needs a seekable target")
+        self._out = target
+        self._start = target.tell()
+        self._pos = self._start
+        self._report = report
+        self._stack: List[StreamSequence] = []
+        self.finished = False
+
+        header = _dump(report)
+        header.pop("root", None)
+        self._write("{")
+        self._result_offset = self._write_fields(header, "result")
+        self._written_result = header.get("result")
+        self._write(',"root":')
+        self.root = self._open(report.root)
+
+    @property
+    def bytes_written(self) -> int:
+        return self._pos - self._start
+
+    def finish(self, result: Optional[Union[ReportStatus, str]] = None) -> WSJFDocument:
+        """
+        Close all open sequences and complete the document.
+
+        Args:
+            result: Final report result (None = keep the header's result)
+
+        Returns:
+            The serialized report.
+        """
+        if self.finished:
+            raise RuntimeError("WSJF document already finished")
+        while self._stack:
+            self._close(self._stack[-1])
+        if result is not None:
+            self._report.result = ReportStatus(result)
+            self._patch(self._result_offset, self._written_result, _code(self._report.result))
+        self._write("}")
+        self._out.flush()
+        self.finished = True
+        return WSJFDocument(
+            self._out, self.bytes_written, start=self._start,
+            pn=self._report.pn, sn=self._report.sn,
+        )
+
+    def abort(self) -> None:
+        """Discard an unfinished document."""
+        if not self.finished:
+            self.finished = True
+            self._stack.clear()
+            self._out.close()
+
+    def __enter__(self) -> "WSJFStreamWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, *exc_info: Any) -> None:
+        if exc_type is not None:
+            self.abort()
+
+    # =========================================================================
+    # Internals
+    # =========================================================================
+
+    def _write(self, text: str) -> None:
+        data = text.encode("utf-8")
+        self._out.write(data)
+        self._pos += len(data)
+
+    def _write_fields(self, fields: Dict[str, Any], patchable: str) -> Optional[int]:
+        """Write object members; returns the offset of ``patchable``'s value."""
+        offset = None
+        for i, (key, value) in enumerate(fields.items()):
+            self._write(("," if i else "") + _encode(key) + ":")
+            if key == patchable:
+                offset = self._pos + 1  # Inside the quotes
+            self._write(_encode(value))
+        return offset
+
+    def _patch(self, offset: Optional[int], written: Optional[str], code: str) -> None:
+        if code == written:
+            return
+        if offset is None or written is None or len(code) != len(written):
+            raise ValueError(f"Cannot update status {written!r} to {code!r} in the written document")
+        self._out.seek(offset)
+        self._out.write(code.encode("ascii"))
+        self._out.seek(self._pos)
+
+    def _open(self, call: SequenceCall) -> StreamSequence:
+        fields = _dump(call)
+        fields.pop("steps", None)
+        self._write("{")
+        offset = self._write_fields(fields, "status")
+        self._write(',"steps":[')
+        sequence = StreamSequence(self, call, offset)
+        self._stack.append(sequence)
+        return sequence
+
+    def _close(self, sequence: StreamSequence) -> None:
+        self._check_active(sequence)
+        self._drain()
+        self._write("]}")
+        self._patch(sequence._status_offset, sequence._written_status, _code(sequence.step.status))
+        sequence.closed = True
+        self._stack.pop()
+
+    def _check_active(self, sequence: StreamSequence) -> None:
+        if self.finished or sequence.closed:
+            raise RuntimeError(f"Sequence {sequence.name!r} is closed")
+        if self._stack[-1] is not sequence:
+            raise RuntimeError(
+                f"Sequence {sequence.name!r} is not the innermost open sequence "
+                f"({self._stack[-1].name!r} is open)"
+            )
+
+    def _separate(self, sequence: StreamSequence) -> None:
+        if sequence._count:
+            self._write(",")
+        sequence._count += 1
+
+    def _drain(self) -> None:
+        """Serialize and release the steps added by the previous call."""
+        sequence = self._stack[-1]
+        steps = sequence.step.steps
+        for step in steps:
+            text = _encode(_dump(step))
+            self._separate(sequence)
+            self._write(text)
+        list.clear(steps)
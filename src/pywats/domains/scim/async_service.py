@@ -2,8 +2,11 @@
 
 Async business logic layer for SCIM (System for Cross-domain Identity Management) operations.
 """
+from contextlib import aclosing
 from typing import Optional, AsyncIterator, Callable
 
+from pywats.core.pagination import apaginate
+
 from .async_repository import AsyncScimRepository
 from .models import (
     ScimToken,
@@ -64,49 +67,36 @@ class AsyncScimService:
         page_size: int = 100,
         max_users: Optional[int] = None,
         on_page: Optional[Callable[[int, int, Optional[int]], None]] = None,
+        prefetch: int = 2,
     ) -> AsyncIterator[ScimUser]:
         """
         Iterate over all SCIM users with automatic pagination.
         
-        Memory-efficient async iterator that fetches users page by page.
+        Memory-efficient async iterator; while one page is consumed the next
+        ``prefetch`` pages are already being fetched.
         
         Args:
             page_size: Number of users per page (default: 100)
             max_users: Maximum users to retrieve (default: all)
             on_page: Optional callback (page_num, users_so_far, total)
+            prefetch: Pages fetched ahead of the consumer (0 = sequential)
             
         Yields:
             ScimUser objects one at a time
         """
-        start_index = 1
-        page_num = 0
-        users_yielded = 0
-        
-        while True:
-            response = await self._repository.get_users(
-                start_index=start_index, 
-                count=page_size
-            )
-            
-            resources = response.resources or []
-            total = response.total_results
-            
-            page_num += 1
-            if on_page:
-                on_page(page_num, users_yielded + len(resources), total)
-            
-            for user in resources:
-                if max_users and users_yielded >= max_users:
-                    return
+        users = apaginate(
+            fetch_page=lambda start, count: self._repository.get_users(start_index=start, count=count),
+            get_items=lambda response: response.resources,
+            get_total=lambda response: response.total_results or None,
+            page_size=page_size,
+            start_index=1,
+            max_items=max_users or None,
+            prefetch=prefetch,
+            on_page=on_page,
+        )
+        async with aclosing(users):
+            async for user in users:
                 yield user
-                users_yielded += 1
-            
-            if not resources or len(resources) < page_size:
-                break
-            if total and start_index + len(resources) > total:
-                break
-            
-            start_index += len(resources)
 
     async def create_user(self, user: ScimUser) -> Optional[ScimUser]:
         """
@@ -12,7 +12,7 @@ class SyncScimService:
 
     def get_token(self, duration_days: int = 90) -> Optional[ScimToken]: ...
     def get_users(self, start_index: Optional[int] = None, count: Optional[int] = None) -> ScimListResponse: ...
-    def iter_users(self, page_size: int = 100, max_users: Optional[int] = None, on_page: Optional[Callable[[int, int, Optional[int]], None]] = None) -> AsyncIterator[ScimUser]: ...
+    def iter_users(self, page_size: int = 100, max_users: Optional[int] = None, on_page: Optional[Callable[[int, int, Optional[int]], None]] = None, prefetch: int = 2) -> AsyncIterator[ScimUser]: ...
     def create_user(self, user: ScimUser) -> Optional[ScimUser]: ...
     def get_user(self, user_id: str) -> Optional[ScimUser]: ...
     def delete_user(self, user_id: str) -> None: ...
@@ -982,7 +982,10 @@ class pyWATS:
         return self.analytics.get_version()
     
     def close(self) -> None:
-        """Close the HTTP client and release resources."""
+        """Stop service background work, close the HTTP client and release resources."""
+        for service in (self._asset, self._process, self._product, self._production):
+            if service is not None:
+                _run_sync(service._async.close())
         _run_sync(self._http_client.close())
     
     def __enter__(self) -> "pyWATS":
@@ -224,6 +224,15 @@ class AsyncQueueAdapter(Generic[T]):
             metadata=metadata,
         )
     
+    def notify(self) -> None:
+        """
+        Wake waiting get() calls (thread-safe).
+        
+        For queues that can hold items back (e.g. per-flow in-flight caps):
+        call when such an item may have become available.
+        """
+        self._not_empty.set()
+    
     def update(self, item: QueueItem) -> None:
         """
         Update item in queue (thread-safe).
@@ -25,7 +25,7 @@ Example:
 """
 
 # Transport
-from pywats_cfx.transport import CFXTransport
+from pywats_cfx.transport import CFXTransport, MemoryBroker
 
 # Configuration
 from pywats_cfx.config import (
@@ -78,6 +78,7 @@ __version__ = "0.2.0b1"
 __all__ = [
     # Transport
     "CFXTransport",
+    "MemoryBroker",
     # Configuration
     "CFXConfig",
     "AMQPConfig",
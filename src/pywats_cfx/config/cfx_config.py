@@ -83,7 +83,13 @@ class ExchangeConfig:
     
     # Message settings
     message_ttl: Optional[int] = None  # milliseconds
-    prefetch_count: int = 100
+    prefetch_count: int = 100  # Unacknowledged deliveries per consumer
+    
+    # Throughput settings
+    publisher_confirms: bool = True
+    publish_batch_size: int = 100  # Max publishes awaiting confirms together
+    publish_linger: float = 0.0  # Seconds to wait for a batch to fill
+    consumer_concurrency: int = 8  # Parallel handlers (ordered per source)
     
     # Topic routing
     binding_keys: list[str] = field(default_factory=lambda: [
@@ -159,6 +165,15 @@ class CFXConfig:
         
         if self.retry.initial_delay <= 0:
             raise ValueError("initial_delay must be > 0")
+        
+        if self.exchange.prefetch_count < 0:
+            raise ValueError("prefetch_count must be >= 0")
+        
+        if self.exchange.publish_batch_size < 1:
+            raise ValueError("publish_batch_size must be >= 1")
+        
+        if self.exchange.consumer_concurrency < 1:
+            raise ValueError("consumer_concurrency must be >= 1")
     
     @classmethod
     def from_dict(cls, data: dict) -> "CFXConfig":
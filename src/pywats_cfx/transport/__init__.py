@@ -1,5 +1,6 @@
 """CFX transport adapter for AMQP messaging."""
 
 from pywats_cfx.transport.cfx_transport import CFXTransport
+from pywats_cfx.transport.memory_broker import MemoryBroker
 
-__all__ = ["CFXTransport"]
+__all__ = ["CFXTransport", "MemoryBroker"]
@@ -8,11 +8,13 @@ Extends the base transport from pywats_events.
 from __future__ import annotations
 
 import asyncio
+import inspect
 import json
 import logging
+from collections import deque
 from pywats.core.logging import get_logger
 from datetime import datetime
-from typing import Any, Callable, Optional
+from typing import Any, Awaitable, Callable, Deque, Optional, Union
 from uuid import uuid4
 
 from pywats_events.models import Event, EventMetadata, EventType
@@ -30,6 +32,31 @@ from ..models.cfx_messages import (
 
 logger = get_logger(__name__)
 
+# Outgoing: event type -> CFX topic
+_EVENT_ROUTING_KEYS: dict[EventType, str] = {
+    EventType.TEST_RESULT: "CFX.Production.Testing.UnitsTested",
+    EventType.INSPECTION_RESULT: "CFX.Production.Assembly.UnitsInspected",
+    EventType.ASSET_FAULT: "CFX.ResourcePerformance.FaultOccurred",
+    EventType.MATERIAL_INSTALLED: "CFX.Production.Assembly.MaterialsInstalled",
+    EventType.WORK_STARTED: "CFX.Production.WorkStarted",
+    EventType.WORK_COMPLETED: "CFX.Production.WorkCompleted",
+}
+
+# Incoming: CFX message name -> event type
+_MESSAGE_EVENT_TYPES: dict[str, EventType] = {
+    "CFX.Production.Testing.UnitsTested": EventType.TEST_RESULT,
+    "CFX.Production.Assembly.UnitsInspected": EventType.INSPECTION_RESULT,
+    "CFX.Production.Assembly.MaterialsInstalled": EventType.MATERIAL_INSTALLED,
+    "CFX.ResourcePerformance.FaultOccurred": EventType.ASSET_FAULT,
+    "CFX.ResourcePerformance.FaultCleared": EventType.ASSET_FAULT,  # cleared=True in the adapter
+    "CFX.ResourcePerformance.StationStateChanged": EventType.ASSET_STATE_CHANGED,
+    "CFX.Production.WorkStarted": EventType.WORK_STARTED,
+    "CFX.Production.WorkCompleted": EventType.WORK_COMPLETED,
+    "CFX.Production.UnitsArrived": EventType.UNIT_ARRIVED,
+    "CFX.Production.UnitsDeparted": EventType.UNIT_DEPARTED,
+    "CFX.Production.UnitsDisqualified": EventType.UNIT_DISQUALIFIED,
+}
+
 
 class CFXTransport(BaseTransport):
     """
@@ -54,32 +81,59 @@ class CFXTransport(BaseTransport):
         await transport.connect()
         # ... transport receives CFX messages and publishes events
         await transport.disconnect()
+    
+    Throughput:
+        - Channels and the exchange are opened once per connection, not
+          looked up per message.
+        - ``send``/``send_batch`` queue messages for a single publisher task
+          that publishes up to ``publish_batch_size`` messages at a time and
+          awaits their publisher confirms together (group commit): senders
+          arriving while a batch is in flight form the next batch.
+        - Deliveries are handled by up to ``consumer_concurrency`` handlers in
+          parallel, bounded by the broker's ``prefetch_count``. Messages from
+          the same source (AMQP ``app_id``, or the routing key when absent)
+          are handled strictly in arrival order.
     """
     
     def __init__(
         self,
         config: CFXConfig,
-        on_event: Optional[Callable[[Event], None]] = None,
+        on_event: Optional[Callable[[Event], Union[None, Awaitable[None]]]] = None,
+        amqp: Optional[Any] = None,
     ) -> None:
         """
         Initialize CFX transport.
         
         Args:
             config: CFX configuration with AMQP and endpoint settings.
-            on_event: Callback for received events.
+            on_event: Callback for received events (may be a coroutine function).
+            amqp: AMQP client module (default: aio_pika). Pass a
+                MemoryBroker to run without a broker.
         """
         super().__init__(name="cfx-amqp")
         
         self.config = config
         self._on_event = on_event
+        self._amqp = amqp
         
         # AMQP connection state (set when connected)
         self._connection: Optional[Any] = None
         self._channel: Optional[Any] = None
+        self._publish_channel: Optional[Any] = None
+        self._exchange: Optional[Any] = None
+        self._queue: Optional[Any] = None
         self._consumer_tag: Optional[str] = None
         
-        # Background task for consuming messages
-        self._consume_task: Optional[asyncio.Task] = None
+        # Batched publishing (message, routing key, confirmation future)
+        self._publish_buffer: Deque[tuple[Any, str, asyncio.Future]] = deque()
+        self._publish_ready = asyncio.Event()
+        self._publish_task: Optional[asyncio.Task] = None
+        
+        # Concurrent consumption: one FIFO lane per message source
+        self._lanes: dict[str, Deque[Any]] = {}
+        self._lane_tasks: set[asyncio.Task] = set()
+        self._handler_slots = asyncio.Semaphore(config.exchange.consumer_concurrency)
+        self._handlers_active: int = 0
         
         # Reconnection state
         self._reconnect_attempts: int = 0
@@ -88,6 +142,8 @@ class CFXTransport(BaseTransport):
         # Statistics
         self._messages_received: int = 0
         self._messages_sent: int = 0
+        self._publish_batches: int = 0
+        self._publish_errors: int = 0
         self._last_message_time: Optional[datetime] = None
     
     @property
@@ -95,6 +151,22 @@ class CFXTransport(BaseTransport):
         """Return transport type identifier."""
         return "amqp"
     
+    def start(self) -> None:
+        """Not supported: the AMQP client is async-only."""
+        raise NotImplementedError("CFXTransport is async-only; use start_async()")
+    
+    def stop(self) -> None:
+        """Not supported: the AMQP client is async-only."""
+        raise NotImplementedError("CFXTransport is async-only; use stop_async()")
+    
+    async def start_async(self) -> None:
+        """Start the transport (same as connect())."""
+        await self.connect()
+    
+    async def stop_async(self) -> None:
+        """Stop the transport (same as disconnect())."""
+        await self.disconnect()
+    
     async def connect(self) -> None:
         """
         Connect to AMQP broker and start consuming CFX messages.
@@ -111,42 +183,52 @@ class CFXTransport(BaseTransport):
         
         try:
             # Import aio_pika here to make it optional
-            import aio_pika
+            amqp = self._amqp
+            if amqp is None:
+                import aio_pika as amqp
+                self._amqp = amqp
+            exchange_config = self.config.exchange
             
             # Connect to broker
-            self._connection = await aio_pika.connect_robust(
+            self._connection = await amqp.connect_robust(
                 self.config.amqp.broker_url,
                 timeout=self.config.amqp.connection_timeout,
             )
             
-            # Create channel
+            # Consumer channel (prefetch bounds unacknowledged deliveries)
             self._channel = await self._connection.channel()
-            await self._channel.set_qos(prefetch_count=self.config.exchange.prefetch_count)
+            await self._channel.set_qos(prefetch_count=exchange_config.prefetch_count)
+            
+            # Publisher channel, kept separate so confirms never wait behind QoS
+            self._publish_channel = await self._connection.channel(
+                publisher_confirms=exchange_config.publisher_confirms,
+            )
             
-            # Declare exchange
-            exchange = await self._channel.declare_exchange(
-                self.config.exchange.exchange_name,
-                self.config.exchange.exchange_type,
-                durable=self.config.exchange.durable,
-                auto_delete=self.config.exchange.auto_delete,
+            # Declare exchange (once per connection; reused by every send)
+            self._exchange = await self._publish_channel.declare_exchange(
+                exchange_config.exchange_name,
+                exchange_config.exchange_type,
+                durable=exchange_config.durable,
+                auto_delete=exchange_config.auto_delete,
             )
             
             # Declare queue
-            queue_name = f"{self.config.exchange.queue_name_prefix}.{self.config.endpoint.cfx_handle}"
-            queue = await self._channel.declare_queue(
+            queue_name = f"{exchange_config.queue_name_prefix}.{self.config.endpoint.cfx_handle}"
+            self._queue = await self._channel.declare_queue(
                 queue_name,
-                durable=self.config.exchange.queue_durable,
-                auto_delete=self.config.exchange.queue_auto_delete,
-                exclusive=self.config.exchange.queue_exclusive,
+                durable=exchange_config.queue_durable,
+                auto_delete=exchange_config.queue_auto_delete,
+                exclusive=exchange_config.queue_exclusive,
             )
             
             # Bind routing keys
-            for binding_key in self.config.exchange.binding_keys:
-                await queue.bind(exchange, routing_key=binding_key)
+            for binding_key in exchange_config.binding_keys:
+                await self._queue.bind(self._exchange, routing_key=binding_key)
                 logger.debug(f"Bound queue to routing key: {binding_key}")
             
-            # Start consuming
-            self._consumer_tag = await queue.consume(self._on_message)
+            # Start publisher and consumer
+            self._publish_task = asyncio.create_task(self._publish_loop())
+            self._consumer_tag = await self._queue.consume(self._on_message)
             
             self._state = TransportState.CONNECTED
             self._reconnect_attempts = 0
@@ -164,6 +246,7 @@ class CFXTransport(BaseTransport):
         except Exception as e:
             logger.exception(f"Failed to connect to CFX broker: {e}")
             self._state = TransportState.ERROR
+            await self._stop_publisher()
             
             if self.config.auto_reconnect:
                 await self._schedule_reconnect()
@@ -176,19 +259,20 @@ class CFXTransport(BaseTransport):
             return
         
         self._should_reconnect = False
-        self._state = TransportState.DISCONNECTING
         
         logger.info("Disconnecting from CFX broker")
         
         try:
+            # Stop deliveries, then let admitted messages finish
+            if self._queue and self._consumer_tag:
+                await self._queue.cancel(self._consumer_tag)
+            if self._lane_tasks:
+                await asyncio.gather(*list(self._lane_tasks), return_exceptions=True)
+            
             # Publish endpoint disconnected event
-            if self.config.publish_endpoint_disconnected and self._channel:
+            if self.config.publish_endpoint_disconnected and self._exchange:
                 await self._publish_endpoint_disconnected()
             
-            # Cancel consumer
-            if self._channel and self._consumer_tag:
-                await self._channel.cancel(self._consumer_tag)
-            
             # Close connection
             if self._connection:
                 await self._connection.close()
@@ -196,8 +280,12 @@ class CFXTransport(BaseTransport):
         except Exception as e:
             logger.warning(f"Error during disconnect: {e}", exc_info=True)
         finally:
+            await self._stop_publisher()
             self._connection = None
             self._channel = None
+            self._publish_channel = None
+            self._exchange = None
+            self._queue = None
             self._consumer_tag = None
             self._state = TransportState.DISCONNECTED
             
@@ -208,52 +296,150 @@ class CFXTransport(BaseTransport):
         Send an event as a CFX message.
         
         Converts the normalized event to a CFX message and publishes
-        to the AMQP exchange.
+        to the AMQP exchange. Returns once the broker has confirmed it.
         
         Args:
             event: Event to send.
         """
+        await self.send_batch([event])
+    
+    async def send_batch(self, events: list[Event]) -> None:
+        """
+        Send several events, awaiting all their publisher confirms together.
+        
+        Args:
+            events: Events to send (published in order).
+            
+        Raises:
+            RuntimeError: If the transport is not connected.
+            Exception: The first publish failure; the other events are
+                still published.
+        """
         if self._state != TransportState.CONNECTED:
             raise RuntimeError("CFX transport not connected")
         
-        try:
-            import aio_pika
-            
-            # Convert event to CFX message format
-            cfx_message = self._event_to_cfx(event)
-            message_body = json.dumps(cfx_message).encode()
-            
-            # Get exchange
-            exchange = await self._channel.get_exchange(self.config.exchange.exchange_name)
-            
-            # Determine routing key from event type
-            routing_key = self._get_routing_key(event)
-            
-            # Publish message
-            await exchange.publish(
-                aio_pika.Message(
-                    body=message_body,
-                    content_type="application/json",
-                    message_id=str(event.event_id),
-                    correlation_id=event.metadata.correlation_id,
-                    timestamp=datetime.now(),
-                ),
-                routing_key=routing_key,
+        loop = asyncio.get_running_loop()
+        confirmations = []
+        for event in events:
+            confirmation = loop.create_future()
+            self._publish_buffer.append(
+                (self._build_message(event), self._get_routing_key(event), confirmation)
             )
+            confirmations.append(confirmation)
+        self._publish_ready.set()
+        
+        results = await asyncio.gather(*confirmations, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to send CFX message: {result}")
+                raise result
+    
+    def _build_message(self, event: Event) -> Any:
+        """Convert an event to an AMQP message."""
+        cfx_message = self._event_to_cfx(event)
+        return self._amqp.Message(
+            body=json.dumps(cfx_message).encode(),
+            content_type="application/json",
+            message_id=str(event.event_id),
+            correlation_id=event.metadata.correlation_id,
+            timestamp=datetime.now(),
+            app_id=self.config.endpoint.cfx_handle,
+        )
+    
+    async def _publish_loop(self) -> None:
+        """Publish buffered messages in batches until cancelled."""
+        exchange_config = self.config.exchange
+        while True:
+            await self._publish_ready.wait()
+            if exchange_config.publish_linger > 0 and len(self._publish_buffer) < exchange_config.publish_batch_size:
+                await asyncio.sleep(exchange_config.publish_linger)
+            self._publish_ready.clear()
             
-            self._messages_sent += 1
-            self._last_message_time = datetime.now()
+            while self._publish_buffer:
+                count = min(exchange_config.publish_batch_size, len(self._publish_buffer))
+                batch = [self._publish_buffer.popleft() for _ in range(count)]
+                await self._publish_batch(batch)
+    
+    async def _publish_batch(self, batch: list[tuple[Any, str, asyncio.Future]]) -> None:
+        """Publish a batch concurrently and resolve each sender's confirmation."""
+        results = await asyncio.gather(
+            *(self._exchange.publish(message, routing_key=routing_key) for message, routing_key, _ in batch),
+            return_exceptions=True,
+        )
+        self._publish_batches += 1
+        
+        for (_, routing_key, confirmation), result in zip(batch, results):
+            if isinstance(result, BaseException):
+                self._publish_errors += 1
+                if not confirmation.done():
+                    confirmation.set_exception(result)
+                continue
             
+            self._messages_sent += 1
+            if not confirmation.done():
+                confirmation.set_result(None)
             if self.config.log_messages:
                 logger.debug(f"Sent CFX message: {routing_key}")
-            
-        except Exception as e:
-            logger.exception(f"Failed to send CFX message: {e}")
-            raise
+        
+        self._last_message_time = datetime.now()
+    
+    async def _stop_publisher(self) -> None:
+        """Stop the publisher task and fail anything still buffered."""
+        if self._publish_task:
+            self._publish_task.cancel()
+            try:
+                await self._publish_task
+            except asyncio.CancelledError:
+                pass
+            self._publish_task = None
+        
+        while self._publish_buffer:
+            _, _, confirmation = self._publish_buffer.popleft()
+            if not confirmation.done():
+                confirmation.set_exception(ConnectionError("CFX transport disconnected"))
+        self._publish_ready.clear()
     
     async def _on_message(self, message: Any) -> None:
         """
-        Handle incoming AMQP message.
+        Accept an incoming AMQP message into its source's lane.
+        
+        The broker's prefetch window bounds how many messages are held here
+        (a message is acknowledged only after it has been handled).
+        """
+        key = self._ordering_key(message)
+        lane = self._lanes.get(key)
+        if lane is not None:
+            lane.append(message)
+            return
+        
+        self._lanes[key] = deque([message])
+        task = asyncio.create_task(self._drain_lane(key))
+        self._lane_tasks.add(task)
+        task.add_done_callback(self._lane_tasks.discard)
+    
+    @staticmethod
+    def _ordering_key(message: Any) -> str:
+        """Source whose messages must be handled in order."""
+        return getattr(message, "app_id", None) or message.routing_key
+    
+    async def _drain_lane(self, key: str) -> None:
+        """Handle one source's messages in order, one handler slot at a time."""
+        lane = self._lanes[key]
+        try:
+            while lane:
+                message = lane.popleft()
+                async with self._handler_slots:
+                    self._handlers_active += 1
+                    try:
+                        await self._handle_message(message)
+                    finally:
+                        self._handlers_active -= 1
+        finally:
+            del self._lanes[key]
+    
+    async def _handle_message(self, message: Any) -> None:
+        """
+        Handle one AMQP message.
         
         Parses CFX JSON, converts to normalized Event, and invokes callback.
         """
@@ -276,7 +462,9 @@ class CFXTransport(BaseTransport):
                 
                 # Invoke callback
                 if self._on_event:
-                    self._on_event(event)
+                    result = self._on_event(event)
+                    if inspect.isawaitable(result):
+                        await result
                 
             except json.JSONDecodeError as e:
                 logger.exception(f"Invalid JSON in CFX message: {e}")
@@ -327,34 +515,11 @@ class CFXTransport(BaseTransport):
             return event.payload["MessageName"]
         
         # Map event type to CFX topic
-        type_mapping = {
-            EventType.TEST_RESULT: "CFX.Production.Testing.UnitsTested",
-            EventType.INSPECTION_RESULT: "CFX.Production.Assembly.UnitsInspected",
-            EventType.ASSET_FAULT: "CFX.ResourcePerformance.FaultOccurred",
-            EventType.MATERIAL_INSTALLED: "CFX.Production.Assembly.MaterialsInstalled",
-            EventType.WORK_STARTED: "CFX.Production.WorkStarted",
-            EventType.WORK_COMPLETED: "CFX.Production.WorkCompleted",
-        }
-        
-        return type_mapping.get(event.event_type, f"CFX.Custom.{event.event_type.value}")
+        return _EVENT_ROUTING_KEYS.get(event.event_type, f"CFX.Custom.{event.event_type.value}")
     
     def _map_message_to_event_type(self, message_name: str) -> EventType:
         """Map CFX message name to EventType."""
-        mapping = {
-            "CFX.Production.Testing.UnitsTested": EventType.TEST_RESULT,
-            "CFX.Production.Assembly.UnitsInspected": EventType.INSPECTION_RESULT,
-            "CFX.Production.Assembly.MaterialsInstalled": EventType.MATERIAL_INSTALLED,
-            "CFX.ResourcePerformance.FaultOccurred": EventType.ASSET_FAULT,
-            "CFX.ResourcePerformance.FaultCleared": EventType.ASSET_FAULT_CLEARED,
-            "CFX.ResourcePerformance.StationStateChanged": EventType.ASSET_STATE_CHANGED,
-            "CFX.Production.WorkStarted": EventType.WORK_STARTED,
-            "CFX.Production.WorkCompleted": EventType.WORK_COMPLETED,
-            "CFX.Production.UnitsArrived": EventType.UNIT_ARRIVED,
-            "CFX.Production.UnitsDeparted": EventType.UNIT_DEPARTED,
-            "CFX.Production.UnitsDisqualified": EventType.UNIT_DISQUALIFIED,
-        }
-        
-        return mapping.get(message_name, EventType.CUSTOM)
+        return _MESSAGE_EVENT_TYPES.get(message_name, EventType.CUSTOM)
     
     async def _publish_endpoint_connected(self) -> None:
         """Publish EndpointConnected CFX message."""
@@ -406,6 +571,11 @@ class CFXTransport(BaseTransport):
             "state": self._state.value,
             "messages_received": self._messages_received,
             "messages_sent": self._messages_sent,
+            "publish_batches": self._publish_batches,
+            "publish_errors": self._publish_errors,
+            "publish_pending": len(self._publish_buffer),
+            "handlers_active": self._handlers_active,
+            "source_lanes": len(self._lanes),
             "last_message_time": self._last_message_time.isoformat() if self._last_message_time else None,
             "reconnect_attempts": self._reconnect_attempts,
             "endpoint": self.config.endpoint.cfx_handle,
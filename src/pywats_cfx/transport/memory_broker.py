@@ -0,0 +1,268 @@
+"""
+In-process AMQP stand-in.
+
+Implements the subset of the aio_pika API that CFXTransport uses (robust
+connection, channels with QoS and publisher confirms, topic exchanges,
+queues, consumers and ``message.process()`` acknowledgement), entirely in
+memory. Used to test and benchmark the transport without a broker:
+
+    broker = MemoryBroker(confirm_latency=0.001)
+    transport = CFXTransport(config, amqp=broker)
+    await transport.connect()
+
+``confirm_latency`` simulates the broker round trip of a publisher confirm;
+concurrent publishes on one channel wait for it in parallel, like pipelined
+confirms on a real broker.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Optional
+from uuid import uuid4
+
+
+def topic_matches(binding_key: str, routing_key: str) -> bool:
+    """AMQP topic match (``*`` = one word, ``#`` = zero or more words)."""
+    return _match(binding_key.split("."), routing_key.split("."))
+
+
+def _match(pattern: list[str], words: list[str]) -> bool:
+    if not pattern:
+        return not words
+    head, rest = pattern[0], pattern[1:]
+    if head == "#":
+        return any(_match(rest, words[i:]) for i in range(len(words) + 1))
+    if not words:
+        return False
+    return (head == "*" or head == words[0]) and _match(rest, words[1:])
+
+
+class MemoryMessage:
+    """Outgoing message (mirrors ``aio_pika.Message``)."""
+
+    def __init__(
+        self,
+        body: bytes,
+        content_type: Optional[str] = None,
+        message_id: Optional[str] = None,
+        correlation_id: Optional[str] = None,
+        timestamp: Optional[datetime] = None,
+        app_id: Optional[str] = None,
+        headers: Optional[dict[str, Any]] = None,
+    ) -> None:
+        self.body = body
+        self.content_type = content_type
+        self.message_id = message_id
+        self.correlation_id = correlation_id
+        self.timestamp = timestamp
+        self.app_id = app_id
+        self.headers = headers or {}
+
+
+class MemoryIncomingMessage(MemoryMessage):
+    """Delivered message (mirrors ``aio_pika.IncomingMessage``)."""
+
+    def __init__(self, message: MemoryMessage, routing_key: str, channel: "MemoryChannel") -> None:
+        super().__init__(
+            body=message.body,
+            content_type=message.content_type,
+            message_id=message.message_id,
+            correlation_id=message.correlation_id,
+            timestamp=message.timestamp,
+            app_id=message.app_id,
+            headers=message.headers,
+        )
+        self.routing_key = routing_key
+        self._channel = channel
+        self._settled = False
+
+    @asynccontextmanager
+    async def process(self, requeue: bool = False) -> AsyncIterator["MemoryIncomingMessage"]:
+        """Acknowledge on success, reject on exception."""
+        try:
+            yield self
+        except BaseException:
+            self._settle(acked=False)
+            raise
+        self._settle(acked=True)
+
+    def _settle(self, acked: bool) -> None:
+        if self._settled:
+            return
+        self._settled = True
+        self._channel._on_settled(acked)
+
+
+class MemoryExchange:
+    """Topic exchange."""
+
+    def __init__(self, broker: "MemoryBroker", name: str, channel: "MemoryChannel") -> None:
+        self.name = name
+        self._broker = broker
+        self._channel = channel
+
+    async def publish(self, message: MemoryMessage, routing_key: str) -> None:
+        """Route the message; with confirms, return once the broker confirms."""
+        self._broker._route(self.name, message, routing_key)
+        if self._channel.publisher_confirms and self._broker.confirm_latency > 0:
+            await asyncio.sleep(self._broker.confirm_latency)
+
+
+class MemoryQueue:
+    """Queue with at most one consumer."""
+
+    def __init__(self, broker: "MemoryBroker", name: str, channel: "MemoryChannel") -> None:
+        self.name = name
+        self._broker = broker
+        self._channel = channel
+        self._messages: Deque[tuple[MemoryMessage, str]] = deque()
+        self._bindings: list[tuple[str, str]] = []  # (exchange, binding key)
+        self._consumer: Optional[tuple[str, Callable[[Any], Awaitable[None]]]] = None
+
+    async def bind(self, exchange: MemoryExchange, routing_key: str) -> None:
+        self._bindings.append((exchange.name, routing_key))
+
+    async def consume(self, callback: Callable[[Any], Awaitable[None]]) -> str:
+        consumer_tag = f"ctag-{uuid4().hex[:8]}"
+        self._consumer = (consumer_tag, callback)
+        self._channel._consumers.append(self)
+        self._dispatch()
+        return consumer_tag
+
+    async def cancel(self, consumer_tag: str) -> None:
+        if self._consumer and self._consumer[0] == consumer_tag:
+            self._consumer = None
+            self._channel._consumers.remove(self)
+
+    def _matches(self, exchange: str, routing_key: str) -> bool:
+        return any(
+            name == exchange and topic_matches(binding_key, routing_key)
+            for name, binding_key in self._bindings
+        )
+
+    def _dispatch(self) -> None:
+        """Deliver while the consumer channel's prefetch window has room."""
+        while self._messages and self._consumer and self._channel._has_credit():
+            message, routing_key = self._messages.popleft()
+            self._channel._unacked += 1
+            self._channel.max_unacked = max(self._channel.max_unacked, self._channel._unacked)
+            delivery = MemoryIncomingMessage(message, routing_key, self._channel)
+            # aio_pika runs each consumer callback as its own task
+            self._broker._spawn(self._consumer[1](delivery))
+
+
+class MemoryChannel:
+    """Channel with QoS and publisher confirms."""
+
+    def __init__(self, broker: "MemoryBroker", publisher_confirms: bool) -> None:
+        self.publisher_confirms = publisher_confirms
+        self.prefetch_count = 0  # 0 = unlimited
+        self.max_unacked = 0
+        self.acked = 0
+        self.rejected = 0
+        self._broker = broker
+        self._unacked = 0
+        self._consumers: list[MemoryQueue] = []
+        self.is_closed = False
+
+    async def set_qos(self, prefetch_count: int = 0) -> None:
+        self.prefetch_count = prefetch_count
+
+    async def declare_exchange(self, name: str, type: str = "topic", **kwargs: Any) -> MemoryExchange:
+        self._broker.exchanges_declared += 1
+        return MemoryExchange(self._broker, name, self)
+
+    async def get_exchange(self, name: str) -> MemoryExchange:
+        self._broker.exchange_lookups += 1
+        return MemoryExchange(self._broker, name, self)
+
+    async def declare_queue(self, name: str, **kwargs: Any) -> MemoryQueue:
+        queue = self._broker._queues.get(name)
+        if queue is None:
+            queue = MemoryQueue(self._broker, name, self)
+            self._broker._queues[name] = queue
+        else:
+            queue._channel = self
+        return queue
+
+    async def close(self) -> None:
+        self.is_closed = True
+
+    def _has_credit(self) -> bool:
+        return self.prefetch_count <= 0 or self._unacked < self.prefetch_count
+
+    def _on_settled(self, acked: bool) -> None:
+        self._unacked -= 1
+        if acked:
+            self.acked += 1
+        else:
+            self.rejected += 1
+        for queue in list(self._consumers):
+            queue._dispatch()
+
+
+class MemoryConnection:
+    """Connection (mirrors ``aio_pika.RobustConnection``)."""
+
+    def __init__(self, broker: "MemoryBroker") -> None:
+        self._broker = broker
+        self.is_closed = False
+
+    async def channel(self, publisher_confirms: bool = True) -> MemoryChannel:
+        self._broker.channels_opened += 1
+        return MemoryChannel(self._broker, publisher_confirms)
+
+    async def close(self) -> None:
+        self.is_closed = True
+
+
+class MemoryBroker:
+    """
+    In-process broker exposing the aio_pika module surface used by CFXTransport.
+
+    Args:
+        confirm_latency: Seconds until a publish on a confirming channel is confirmed
+    """
+
+    Message = MemoryMessage
+
+    def __init__(self, confirm_latency: float = 0.0) -> None:
+        self.confirm_latency = confirm_latency
+        self.published = 0
+        self.unroutable = 0
+        self.channels_opened = 0
+        self.exchanges_declared = 0
+        self.exchange_lookups = 0
+        self._queues: dict[str, MemoryQueue] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def connect_robust(self, url: Optional[str] = None, **kwargs: Any) -> MemoryConnection:
+        return MemoryConnection(self)
+
+    def queue(self, name: str) -> Optional[MemoryQueue]:
+        """Declared queue by name."""
+        return self._queues.get(name)
+
+    def deliver(self, exchange: str, routing_key: str, body: bytes, app_id: Optional[str] = None) -> None:
+        """Inject a message as if another endpoint had published it."""
+        self._route(exchange, MemoryMessage(body=body, app_id=app_id), routing_key)
+
+    def _route(self, exchange: str, message: MemoryMessage, routing_key: str) -> None:
+        self.published += 1
+        routed = False
+        for queue in self._queues.values():
+            if queue._matches(exchange, routing_key):
+                queue._messages.append((message, routing_key))
+                queue._dispatch()
+                routed = True
+        if not routed:
+            self.unroutable += 1
+
+    def _spawn(self, coro: Awaitable[None]) -> None:
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
@@ -59,6 +59,7 @@ from .service.async_ipc_client import (
     discover_services_async,
     ServiceDiscoveryAsync,
 )
+from .service.instance_registry import InstanceRecord, InstanceRegistry
 
 # Aliases for cleaner imports
 ConverterPool = AsyncConverterPool
@@ -81,6 +82,7 @@ from .control.cli import ConfigCLI, cli_main
 # File I/O utilities
 from .io import (
     AttachmentIO,
+    WSJFDocumentIO,
     FileInfo as AttachmentFileInfo,
     load_attachment,
     save_attachment,
@@ -113,6 +115,8 @@ __all__ = [
     "InstanceInfo",
     "discover_services_async",
     "ServiceDiscoveryAsync",
+    "InstanceRecord",
+    "InstanceRegistry",
     
     # Converters
     "ConverterBase",
@@ -129,6 +133,7 @@ __all__ = [
     
     # File I/O
     "AttachmentIO",
+    "WSJFDocumentIO",
     "AttachmentFileInfo",
     "load_attachment",
     "save_attachment",
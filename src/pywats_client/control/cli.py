@@ -89,7 +89,7 @@ class ConfigCLI:
                 "Station": ["station_name", "location", "purpose", "station_description"],
                 "Paths": ["data_path", "reports_path", "queue_path"],
                 "Converters": ["converters_enabled", "watch_folders"],
-                "Logging": ["log_level", "log_file"],
+                "Logging": ["log_level", "log_file", "log_rate_limit_seconds"],
             }
             
             for group_name, keys in groups.items():
@@ -97,9 +97,16 @@ class HeadlessService:
             log_format="text",
             enable_console=True,  # Headless service needs console output
             rotate_size_mb=10,
-            rotate_backups=5
+            rotate_backups=5,
+            queued=True,  # Keep file I/O off the service event loop
+            rate_limit_seconds=self._log_rate_limit()
         )
     
+    def _log_rate_limit(self) -> Optional[float]:
+        """Repeat-suppression window from the client config (None = off)"""
+        seconds = getattr(self.client_config, 'log_rate_limit_seconds', 0.0)
+        return float(seconds) if seconds else None
+    
     def run(self) -> int:
         """
         Run the headless service (blocking).
@@ -62,6 +62,9 @@ from .folder_converter import FolderConverter
 from .scheduled_converter import ScheduledConverter
 from .context import ConverterContext
 
+# Streaming XML parsing (for XML-based converters)
+from .xml_stream import XmlStream
+
 # Standard converters
 from .standard import (
     SeicaXMLConverter,
@@ -116,6 +119,8 @@ __all__ = [
     "FolderConverter",
     "ScheduledConverter",
     "ConverterContext",
+    # Streaming XML parsing
+    "XmlStream",
     # Standard converters
     "SeicaXMLConverter",
     "TeradyneICTConverter",
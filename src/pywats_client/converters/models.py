@@ -353,6 +353,8 @@ class ConverterResult:
     - A dict (raw WSJF format)
     - A UUTReport model (preferred - uses factory methods)
     - A UURReport model
+    - A WSJFDocument from WSJFStreamWriter (very large logs - steps are
+      written to a spooled file as they are parsed, see pywats.domains.report)
     
     Example with UUTReport (RECOMMENDED):
         from pywats.domains.report.report_models import UUTReport
@@ -37,7 +37,7 @@ import re
 import math
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 from enum import Enum
 import xml.etree.ElementTree as ET
 
@@ -52,6 +52,7 @@ from pywats.domains.report.report_models.uut.steps import CompOp
 
 # Converter infrastructure
 from pywats_client.converters.file_converter import FileConverter
+from pywats_client.converters.xml_stream import XmlStream, local_name
 from pywats_client.converters.context import ConverterContext
 from pywats_client.converters.models import (
     ConverterSource,
@@ -101,6 +102,10 @@ ATML_NAMESPACES = {
 }
 
 
+# Namespace prefix at the start of a path step ("tr:Outcome", "a/c:Datum")
+_PREFIX_RE = re.compile(r"(?<![\w.-])([A-Za-z_][\w.-]*):")
+
+
 # TestStand icon type to step type mapping
 ICON_TYPE_MAP = {
     "Label": 0,
@@ -276,7 +281,6 @@ class ATMLConverter(FileConverter):
         super().__init__()
         self._version: ATMLVersion = ATMLVersion.UNKNOWN
         self._ns: Dict[str, str] = {}
-        self._root: Optional[ET.Element] = None
     
     @property
     def name(self) -> str:
@@ -327,8 +331,12 @@ class ATMLConverter(FileConverter):
             ),
         }
     
-    def _detect_version(self, root: ET.Element) -> ATMLVersion:
-        """Detect ATML version from XML namespaces."""
+    def _detect_version(
+        self,
+        root: ET.Element,
+        namespaces: Optional[Dict[str, str]] = None,
+    ) -> ATMLVersion:
+        """Detect ATML version from the root tag and declared XML namespaces."""
         # Get namespaces from root element
         root_tag = root.tag
         
@@ -340,8 +348,8 @@ class ATMLConverter(FileConverter):
         elif "IEEE-1636.1:2006" in root_tag:
             return ATMLVersion.V2_02
         
-        # Check xmlns attributes
-        for attr, value in root.attrib.items():
+        # Check xmlns declarations (ElementTree does not keep them as attributes)
+        for value in list((namespaces or {}).values()) + list(root.attrib.values()):
             if "IEEE-1636.1:2013" in value:
                 return ATMLVersion.V6_01
             elif "IEEE-1636.1:2011" in value:
@@ -359,20 +367,21 @@ class ATMLConverter(FileConverter):
         # Fallback to 6.01 namespaces as default
         return ATML_NAMESPACES[ATMLVersion.V6_01]
     
+    def _qualify(self, path: str) -> str:
+        """Replace namespace prefixes in a path with ``{uri}``."""
+        # Whole-prefix match, so "c:" does not hit the tail of "trc:"
+        return _PREFIX_RE.sub(
+            lambda m: f"{{{self._ns[m.group(1)]}}}" if m.group(1) in self._ns else m.group(0),
+            path,
+        )
+    
     def _find(self, element: ET.Element, path: str) -> Optional[ET.Element]:
         """Find element with namespace-aware path."""
-        # Replace namespace prefixes with actual URIs
-        xpath = path
-        for prefix, uri in self._ns.items():
-            xpath = xpath.replace(f"{prefix}:", f"{{{uri}}}")
-        return element.find(xpath)
+        return element.find(self._qualify(path))
     
     def _findall(self, element: ET.Element, path: str) -> List[ET.Element]:
         """Find all elements with namespace-aware path."""
-        xpath = path
-        for prefix, uri in self._ns.items():
-            xpath = xpath.replace(f"{prefix}:", f"{{{uri}}}")
-        return element.findall(xpath)
+        return element.findall(self._qualify(path))
     
     def _get_attr(self, element: ET.Element, attr: str, default: str = "") -> str:
         """Get attribute value with default."""
@@ -383,7 +392,12 @@ class ATMLConverter(FileConverter):
         return element.text if element is not None and element.text else default
     
     def validate(self, source: ConverterSource, context: ConverterContext) -> ValidationResult:
-        """Validate that the file is a properly formatted ATML file."""
+        """
+        Validate that the file is a properly formatted ATML file.
+        
+        The file is streamed: headers are read as they arrive and test
+        elements are skipped without being kept.
+        """
         if not source.path or not source.path.exists():
             return ValidationResult.no_match("File not found")
         
@@ -392,66 +406,53 @@ class ATMLConverter(FileConverter):
             return ValidationResult.no_match("Not an XML/ATML file")
         
         try:
-            tree = ET.parse(source.path)
-            root = tree.getroot()
-            
-            # Detect ATML version
-            version = self._detect_version(root)
-            if version == ATMLVersion.UNKNOWN:
-                # Check if it might still be ATML by looking for common elements
-                root_tag_local = root.tag.split('}')[-1] if '}' in root.tag else root.tag
-                if root_tag_local not in ('TestResultsCollection', 'TestResults'):
-                    return ValidationResult.no_match(
-                        f"XML file but root is '{root_tag_local}', not ATML"
-                    )
-                # Might be ATML without standard namespace
-                version = ATMLVersion.V6_01  # Assume latest
-            
-            self._version = version
-            self._ns = self._setup_namespaces(version)
-            self._root = root
-            
-            # Find TestResults element
-            test_results = self._find(root, "trc:TestResults")
-            if test_results is None:
-                # Try direct TestResults root
-                root_tag_local = root.tag.split('}')[-1] if '}' in root.tag else root.tag
-                if root_tag_local == "TestResults":
-                    test_results = root
-                else:
+            with XmlStream(source.path) as xml:
+                root = xml.root
+                
+                # Detect ATML version
+                version = self._detect_version(root, xml.namespaces)
+                if version == ATMLVersion.UNKNOWN:
+                    # Check if it might still be ATML by looking for common elements
+                    root_tag_local = local_name(root.tag)
+                    if root_tag_local not in ('TestResultsCollection', 'TestResults'):
+                        return ValidationResult.no_match(
+                            f"XML file but root is '{root_tag_local}', not ATML"
+                        )
+                    # Might be ATML without standard namespace
+                    version = ATMLVersion.V6_01  # Assume latest
+                
+                self._version = version
+                self._ns = self._setup_namespaces(version)
+                
+                # Find TestResults element
+                test_results = next(self._iter_test_results(xml), None)
+                if test_results is None:
                     return ValidationResult(
                         can_convert=True,
                         confidence=0.3,
                         message=f"ATML {version.value} but cannot find TestResults element"
                     )
-            
-            # Extract preview info
-            serial_number = ""
-            part_number = ""
-            result_str = "Unknown"
-            
-            # Try to get UUT info
-            uut = self._find(test_results, "tr:UUT")
-            if uut is not None:
-                serial_el = self._find(uut, "c:SerialNumber")
-                serial_number = self._get_text(serial_el)
                 
-                definition = self._find(uut, "c:Definition")
-                if definition is not None:
-                    ident = self._find(definition, "c:Identification")
-                    if ident is not None:
-                        id_numbers = self._find(ident, "c:IdentificationNumbers")
-                        if id_numbers is not None:
-                            id_num = self._find(id_numbers, "c:IdentificationNumber")
-                            part_number = self._get_attr(id_num, "number")
-            
-            # Get outcome
-            result_set = self._find(test_results, "tr:ResultSet")
-            if result_set is not None:
-                outcome = self._find(result_set, "tr:Outcome")
-                if outcome is not None:
-                    outcome_value = self._get_attr(outcome, "value")
-                    result_str = "Passed" if outcome_value == "Passed" else "Failed"
+                # Extract preview info
+                serial_number = ""
+                part_number = ""
+                result_str = "Unknown"
+                
+                for child in xml.children(test_results):
+                    tag = local_name(child.tag)
+                    if tag == "UUT":
+                        # Try to get UUT info
+                        uut = xml.complete(child)
+                        serial_el = self._find(uut, "c:SerialNumber")
+                        serial_number = self._get_text(serial_el)
+                        part_number = self._get_part_number(uut, "")
+                    elif tag == "ResultSet":
+                        # Get outcome (follows the steps, which are skipped)
+                        for result_child in xml.children(child):
+                            if local_name(result_child.tag) == "Outcome":
+                                outcome_value = self._get_attr(result_child, "value")
+                                result_str = "Passed" if outcome_value == "Passed" else "Failed"
+                        break
             
             return ValidationResult(
                 can_convert=True,
@@ -468,22 +469,16 @@ class ATMLConverter(FileConverter):
             return ValidationResult.no_match(f"Error reading file: {e}")
     
     def convert(self, source: ConverterSource, context: ConverterContext) -> ConverterResult:
-        """Convert ATML test file to WATS UUTReport."""
+        """
+        Convert ATML test file to WATS UUTReport.
+        
+        Steps are added to the report while the file is read; each Test or
+        SessionAction element is released once it has been converted.
+        """
         if not source.path:
             return ConverterResult.failed_result(error="No file path provided")
         
         try:
-            tree = ET.parse(source.path)
-            root = tree.getroot()
-            
-            # Detect version and setup namespaces
-            self._version = self._detect_version(root)
-            if self._version == ATMLVersion.UNKNOWN:
-                self._version = ATMLVersion.V6_01  # Default to latest
-            
-            self._ns = self._setup_namespaces(self._version)
-            self._root = root
-            
             # Get arguments
             default_op_code = context.get_argument("operationTypeCode", "10")
             default_part = context.get_argument("partNumber", "")
@@ -491,31 +486,38 @@ class ATMLConverter(FileConverter):
             default_seq_version = context.get_argument("sequenceVersion", "1.0")
             default_operator = context.get_argument("operator", "")
             
-            # Find TestResults element(s)
-            test_results_list = self._findall(root, "trc:TestResults")
-            if not test_results_list:
-                # Try direct TestResults root
-                root_tag_local = root.tag.split('}')[-1] if '}' in root.tag else root.tag
-                if root_tag_local == "TestResults":
-                    test_results_list = [root]
-                else:
-                    return ConverterResult.failed_result(
-                        error="No TestResults element found in ATML file"
-                    )
-            
             reports = []
             
-            for test_results in test_results_list:
-                report = self._create_report_from_test_results(
-                    test_results,
-                    default_op_code,
-                    default_part,
-                    default_revision,
-                    default_seq_version,
-                    default_operator,
+            with XmlStream(source.path) as xml:
+                root = xml.root
+                
+                # Detect version and setup namespaces
+                self._version = self._detect_version(root, xml.namespaces)
+                if self._version == ATMLVersion.UNKNOWN:
+                    self._version = ATMLVersion.V6_01  # Default to latest
+                
+                self._ns = self._setup_namespaces(self._version)
+                
+                # Find TestResults element(s)
+                found = False
+                for test_results in self._iter_test_results(xml):
+                    found = True
+                    report = self._create_report_from_test_results(
+                        xml,
+                        test_results,
+                        default_op_code,
+                        default_part,
+                        default_revision,
+                        default_seq_version,
+                        default_operator,
+                    )
+                    if report:
+                        reports.append(report)
+            
+            if not found:
+                return ConverterResult.failed_result(
+                    error="No TestResults element found in ATML file"
                 )
-                if report:
-                    reports.append(report)
             
             if not reports:
                 return ConverterResult.failed_result(
@@ -547,8 +549,34 @@ class ATMLConverter(FileConverter):
         except Exception as e:
             return ConverterResult.failed_result(error=f"Conversion error: {e}")
     
+    def _iter_test_results(self, xml: XmlStream) -> Iterator[ET.Element]:
+        """Yield the open TestResults element(s): the root or its collection children."""
+        root = xml.root
+        if local_name(root.tag) == "TestResults":
+            yield root
+            return
+        
+        test_results_tag = self._qualify("trc:TestResults")
+        for child in xml.children(root):
+            if child.tag == test_results_tag:
+                yield child
+    
+    def _get_part_number(self, uut: ET.Element, default: str) -> str:
+        """Part number from UUT Definition/Identification."""
+        definition = self._find(uut, "c:Definition")
+        if definition is not None:
+            ident = self._find(definition, "c:Identification")
+            if ident is not None:
+                id_numbers = self._find(ident, "c:IdentificationNumbers")
+                if id_numbers is not None:
+                    id_num = self._find(id_numbers, "c:IdentificationNumber")
+                    if id_num is not None:
+                        return self._get_attr(id_num, "number", default)
+        return default
+    
     def _create_report_from_test_results(
         self,
+        xml: XmlStream,
         test_results: ET.Element,
         default_op_code: str,
         default_part: str,
@@ -556,10 +584,48 @@ class ATMLConverter(FileConverter):
         default_seq_version: str,
         default_operator: str,
     ) -> Optional[UUTReport]:
-        """Create a UUTReport from a TestResults element."""
+        """
+        Create a UUTReport from an open TestResults element.
+        
+        The header elements (UUT, Personnel, TestStation) precede ResultSet
+        in the schema; the report is created when ResultSet starts and its
+        steps are streamed into it.
+        """
+        headers: Dict[str, ET.Element] = {}
+        
+        for child in xml.children(test_results):
+            tag = local_name(child.tag)
+            if tag in ("UUT", "Personnel", "TestStation"):
+                headers.setdefault(tag, xml.complete(child))
+            elif tag == "ResultSet":
+                return self._create_report(
+                    xml,
+                    child,
+                    headers,
+                    default_op_code,
+                    default_part,
+                    default_revision,
+                    default_seq_version,
+                    default_operator,
+                )
+        
+        return None
+    
+    def _create_report(
+        self,
+        xml: XmlStream,
+        result_set: ET.Element,
+        headers: Dict[str, ET.Element],
+        default_op_code: str,
+        default_part: str,
+        default_revision: str,
+        default_seq_version: str,
+        default_operator: str,
+    ) -> Optional[UUTReport]:
+        """Create the report at the start of ResultSet and stream its steps."""
         
         # Extract UUT information
-        uut = self._find(test_results, "tr:UUT")
+        uut = headers.get("UUT")
         if uut is None:
             return None
         
@@ -568,21 +634,12 @@ class ATMLConverter(FileConverter):
         serial_number = self._get_text(serial_el, "NA")
         
         # Get part number from UUT Definition
-        part_number = default_part
+        part_number = self._get_part_number(uut, default_part)
         part_revision = default_revision
-        
         definition = self._find(uut, "c:Definition")
-        if definition is not None:
-            ident = self._find(definition, "c:Identification")
-            if ident is not None:
-                id_numbers = self._find(ident, "c:IdentificationNumbers")
-                if id_numbers is not None:
-                    id_num = self._find(id_numbers, "c:IdentificationNumber")
-                    if id_num is not None:
-                        part_number = self._get_attr(id_num, "number", default_part)
         
         # Get operator from Personnel
-        personnel = self._find(test_results, "tr:Personnel")
+        personnel = headers.get("Personnel")
         operator = default_operator
         if personnel is not None:
             sys_operator = self._find(personnel, "tr:SystemOperator")
@@ -590,10 +647,6 @@ class ATMLConverter(FileConverter):
                 operator = self._get_attr(sys_operator, "name") or self._get_attr(sys_operator, "ID", default_operator)
         
         # Get sequence name from ResultSet
-        result_set = self._find(test_results, "tr:ResultSet")
-        if result_set is None:
-            return None
-        
         sequence_name = self._get_attr(result_set, "name", "Unknown")
         
         # Parse dates
@@ -604,18 +657,12 @@ class ATMLConverter(FileConverter):
         end_time = self._parse_datetime(end_str)
         
         # Get station name
-        test_station = self._find(test_results, "tr:TestStation")
+        test_station = headers.get("TestStation")
         station_name = "Unknown"
         if test_station is not None:
             serial_el = self._find(test_station, "c:SerialNumber")
             station_name = self._get_text(serial_el, "Unknown")
         
-        # Get overall outcome
-        outcome = self._find(result_set, "tr:Outcome")
-        outcome_value = self._get_attr(outcome, "value", "Done")
-        outcome_qualifier = self._get_attr(outcome, "qualifier")
-        report_status = _get_report_status(outcome_value, outcome_qualifier)
-        
         # Create the report
         report = UUTReport(
             operator=operator,
@@ -632,16 +679,21 @@ class ATMLConverter(FileConverter):
             report.execution_time = (end_time - start_time).total_seconds()
         
         report.station_name = station_name
-        report.status = report_status
         
         # Process additional data from UUT Definition Extension
         self._process_additional_data(definition, report)
         
-        # Process all child elements (steps)
-        self._process_elements(result_set, report, report)
+        # Process all child elements (steps) as they are read
+        trailer = self._process_elements(xml, result_set, report, report)
+        
+        # Get overall outcome
+        outcome = trailer.get("Outcome")
+        outcome_value = self._get_attr(outcome, "value", "Done")
+        outcome_qualifier = self._get_attr(outcome, "qualifier")
+        report.status = _get_report_status(outcome_value, outcome_qualifier)
         
         # Check for batch serial number in ResultSet Extension
-        self._process_result_set_extension(result_set, report)
+        self._process_result_set_extension(trailer.get("Extension"), report)
         
         return report
     
@@ -715,9 +767,8 @@ class ATMLConverter(FileConverter):
         if name and value:
             report.add_misc_info(name, value)
     
-    def _process_result_set_extension(self, result_set: ET.Element, report: UUTReport) -> None:
+    def _process_result_set_extension(self, extension: Optional[ET.Element], report: UUTReport) -> None:
         """Process ResultSet Extension for batch info."""
-        extension = self._find(result_set, "tr:Extension")
         if extension is None:
             return
         
@@ -742,83 +793,114 @@ class ATMLConverter(FileConverter):
                 except ValueError:
                     pass
     
+    def _get_step_properties(
+        self,
+        extension: Optional[ET.Element],
+        default_type: str,
+    ) -> Tuple[str, StepGroup, Optional[float], Optional[float]]:
+        """
+        Read TSStepProperties from a step's Extension element.
+        
+        Returns:
+            (step_type, step_group, total_time, module_time)
+        """
+        step_type = default_type
+        step_group = StepGroup.MAIN
+        step_time = None
+        module_time = None
+        
+        ts_props = self._find(extension, "ts:TSStepProperties") if extension is not None else None
+        if ts_props is not None:
+            type_el = self._find(ts_props, "ts:StepType")
+            if type_el is not None:
+                step_type = self._get_text(type_el, default_type)
+            
+            group_el = self._find(ts_props, "ts:StepGroup")
+            if group_el is not None:
+                step_group = _get_step_group(self._get_text(group_el, "Main"))
+            
+            time_el = self._find(ts_props, "ts:TotalTime")
+            if time_el is not None:
+                try:
+                    step_time = float(time_el.get("value", "0"))
+                except ValueError:
+                    pass
+            
+            mod_time_el = self._find(ts_props, "ts:ModuleTime")
+            if mod_time_el is not None:
+                try:
+                    module_time = float(mod_time_el.get("value", "0"))
+                except ValueError:
+                    pass
+        
+        return step_type, step_group, step_time, module_time
+    
+    def _get_outcome_status(self, outcome: Optional[ET.Element]) -> StepStatus:
+        """Step status from an Outcome/ActionOutcome element (DONE if missing)."""
+        if outcome is None:
+            return StepStatus.DONE
+        outcome_value = self._get_attr(outcome, "value", "Done")
+        outcome_qualifier = self._get_attr(outcome, "qualifier")
+        return _get_step_status(outcome_value, outcome_qualifier)
+    
     def _process_elements(
         self,
+        xml: XmlStream,
         parent: ET.Element,
         report: UUTReport,
         current_parent: Union[UUTReport, SequenceCall],
-    ) -> None:
+    ) -> Dict[str, ET.Element]:
         """
-        Recursively process child elements (TestGroup, SessionAction, Test).
+        Stream child elements (TestGroup, SessionAction, Test) of an open
+        ResultSet/TestGroup, recursing into groups.
+        
+        Returns:
+            The group's own Extension and Outcome elements, which follow the
+            steps in the schema.
         """
-        for child in parent:
+        trailer: Dict[str, ET.Element] = {}
+        
+        for child in xml.children(parent):
             # Get local tag name (without namespace)
-            tag = child.tag.split('}')[-1] if '}' in child.tag else child.tag
+            tag = local_name(child.tag)
             
             if tag == "TestGroup":
-                self._process_test_group(child, report, current_parent)
+                self._process_test_group(xml, child, report, current_parent)
             elif tag == "SessionAction":
-                self._process_session_action(child, report, current_parent)
+                self._process_session_action(xml.complete(child), report, current_parent)
             elif tag == "Test":
-                self._process_test(child, report, current_parent)
+                self._process_test(xml.complete(child), report, current_parent)
+            elif tag in ("Extension", "Outcome"):
+                trailer[tag] = xml.complete(child)
+        
+        return trailer
     
     def _process_test_group(
         self,
+        xml: XmlStream,
         element: ET.Element,
         report: UUTReport,
         current_parent: Union[UUTReport, SequenceCall],
     ) -> None:
-        """Process a TestGroup element -> SequenceCall."""
+        """Process an open TestGroup element -> SequenceCall."""
         name = element.get("name", "Unknown")
         caller_name = element.get("callerName", name)
         
-        # Get step properties from Extension
-        step_group = StepGroup.MAIN
-        step_time = None
-        module_time = None
-        status = StepStatus.DONE
-        
-        extension = self._find(element, "tr:Extension")
-        if extension is not None:
-            ts_props = self._find(extension, "ts:TSStepProperties")
-            if ts_props is not None:
-                group_el = self._find(ts_props, "ts:StepGroup")
-                if group_el is not None:
-                    step_group = _get_step_group(self._get_text(group_el, "Main"))
-                
-                time_el = self._find(ts_props, "ts:TotalTime")
-                if time_el is not None:
-                    try:
-                        step_time = float(time_el.get("value", "0"))
-                    except ValueError:
-                        pass
-                
-                mod_time_el = self._find(ts_props, "ts:ModuleTime")
-                if mod_time_el is not None:
-                    try:
-                        module_time = float(mod_time_el.get("value", "0"))
-                    except ValueError:
-                        pass
-        
-        # Get outcome
-        outcome = self._find(element, "tr:Outcome")
-        if outcome is not None:
-            outcome_value = self._get_attr(outcome, "value", "Done")
-            outcome_qualifier = self._get_attr(outcome, "qualifier")
-            status = _get_step_status(outcome_value, outcome_qualifier)
-        
-        # Create sequence call
+        # Create sequence call, then stream its children into it
         seq_call = current_parent.add_sequence_call(caller_name, name)
-        seq_call.status = status
+        trailer = self._process_elements(xml, element, report, seq_call)
+        
+        # Step properties and outcome follow the children
+        _, step_group, step_time, module_time = self._get_step_properties(
+            trailer.get("Extension"), "SequenceCall"
+        )
+        seq_call.status = self._get_outcome_status(trailer.get("Outcome"))
         seq_call.step_group = step_group
         
         if step_time is not None:
             seq_call.total_time = step_time
         if module_time is not None:
             seq_call.module_time = module_time
-        
-        # Recursively process children
-        self._process_elements(element, report, seq_call)
     
     def _process_session_action(
         self,
@@ -830,36 +912,12 @@ class ATMLConverter(FileConverter):
         name = element.get("name", "Unknown")
         
         # Get step properties
-        step_type = "Action"
-        step_group = StepGroup.MAIN
-        step_time = None
-        status = StepStatus.DONE
-        
-        extension = self._find(element, "tr:Extension")
-        if extension is not None:
-            ts_props = self._find(extension, "ts:TSStepProperties")
-            if ts_props is not None:
-                type_el = self._find(ts_props, "ts:StepType")
-                if type_el is not None:
-                    step_type = self._get_text(type_el, "Action")
-                
-                group_el = self._find(ts_props, "ts:StepGroup")
-                if group_el is not None:
-                    step_group = _get_step_group(self._get_text(group_el, "Main"))
-                
-                time_el = self._find(ts_props, "ts:TotalTime")
-                if time_el is not None:
-                    try:
-                        step_time = float(time_el.get("value", "0"))
-                    except ValueError:
-                        pass
+        step_type, step_group, step_time, _ = self._get_step_properties(
+            self._find(element, "tr:Extension"), "Action"
+        )
         
         # Get outcome from ActionOutcome
-        action_outcome = self._find(element, "tr:ActionOutcome")
-        if action_outcome is not None:
-            outcome_value = self._get_attr(action_outcome, "value", "Done")
-            outcome_qualifier = self._get_attr(action_outcome, "qualifier")
-            status = _get_step_status(outcome_value, outcome_qualifier)
+        status = self._get_outcome_status(self._find(element, "tr:ActionOutcome"))
         
         # Create generic step
         step = current_parent.add_step(name, "")
@@ -880,36 +938,12 @@ class ATMLConverter(FileConverter):
         name = element.get("name", "Unknown")
         
         # Determine step type from Extension
-        step_type = "NumericLimitTest"  # Default
-        step_group = StepGroup.MAIN
-        step_time = None
-        status = StepStatus.DONE
-        
-        extension = self._find(element, "tr:Extension")
-        if extension is not None:
-            ts_props = self._find(extension, "ts:TSStepProperties")
-            if ts_props is not None:
-                type_el = self._find(ts_props, "ts:StepType")
-                if type_el is not None:
-                    step_type = self._get_text(type_el, "NumericLimitTest")
-                
-                group_el = self._find(ts_props, "ts:StepGroup")
-                if group_el is not None:
-                    step_group = _get_step_group(self._get_text(group_el, "Main"))
-                
-                time_el = self._find(ts_props, "ts:TotalTime")
-                if time_el is not None:
-                    try:
-                        step_time = float(time_el.get("value", "0"))
-                    except ValueError:
-                        pass
+        step_type, step_group, step_time, _ = self._get_step_properties(
+            self._find(element, "tr:Extension"), "NumericLimitTest"
+        )
         
         # Get outcome
-        outcome = self._find(element, "tr:Outcome")
-        if outcome is not None:
-            outcome_value = self._get_attr(outcome, "value", "Done")
-            outcome_qualifier = self._get_attr(outcome, "qualifier")
-            status = _get_step_status(outcome_value, outcome_qualifier)
+        status = self._get_outcome_status(self._find(element, "tr:Outcome"))
         
         # Process based on step type
         if step_type == "PassFailTest":
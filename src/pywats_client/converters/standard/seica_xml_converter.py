@@ -29,7 +29,7 @@ import xml.etree.ElementTree as ET
 import re
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 # pyWATS model imports - REQUIRED
 from pywats.domains.report.report_models import UUTReport, StepStatus, ReportStatus, SequenceCall
@@ -38,6 +38,7 @@ from pywats.domains.report.report_models.uut.steps import CompOp
 # Converter infrastructure
 from pywats_client.converters.file_converter import FileConverter
 from pywats_client.converters.context import ConverterContext
+from pywats_client.converters.xml_stream import XmlStream
 from pywats_client.converters.models import (
     ConverterSource,
     ConverterResult,
@@ -104,55 +105,67 @@ class SeicaXMLConverter(FileConverter):
             return ValidationResult.no_match("Not an XML file")
         
         try:
-            tree = ET.parse(source.path)
-            root = tree.getroot()
+            with XmlStream(source.path) as xml:
+                root = xml.root
+                
+                if root.tag != 'R':
+                    return ValidationResult.no_match(
+                        f"XML file but root is '{root.tag}', not 'R'"
+                    )
+                
+                # Single streaming pass; TEST elements are dropped as they are read
+                st_attrs: Optional[Dict[str, str]] = None
+                et_attrs: Optional[Dict[str, str]] = None
+                board_count = 0
+                serial_number = ''
+                has_tests = False
+                
+                for child in xml.children(root):
+                    if child.tag == 'ST' and st_attrs is None:
+                        st_attrs = dict(child.attrib)
+                    elif child.tag == 'BI':
+                        if board_count == 0:
+                            serial_number = child.get('BCP', '')
+                        board_count += 1
+                        if not has_tests:
+                            has_tests = any(test.tag == 'TEST' for test in xml.children(child))
+                    elif child.tag == 'ET' and et_attrs is None:
+                        et_attrs = dict(child.attrib)
             
-            if root.tag != 'R':
-                return ValidationResult.no_match(
-                    f"XML file but root is '{root.tag}', not 'R'"
-                )
-            
-            xml_st = root.find('ST')
-            xml_bis = list(root.findall('BI'))
-            xml_et = root.find('ET')
-            
-            if xml_st is None:
+            if st_attrs is None:
                 return ValidationResult(
                     can_convert=True,
                     confidence=0.4,
                     message="Seica XML but missing ST element"
                 )
             
-            if not xml_bis:
+            if not board_count:
                 return ValidationResult(
                     can_convert=True,
                     confidence=0.5,
                     message="Seica XML but missing BI elements"
                 )
             
-            if xml_et is None:
+            if et_attrs is None:
                 return ValidationResult(
                     can_convert=True,
                     confidence=0.6,
                     message="Seica XML but missing ET element"
                 )
             
-            nm = xml_st.get('NM', '')
+            nm = st_attrs.get('NM', '')
             splitted_nm = re.split(r'[_\s]', nm)
             part_number = splitted_nm[0] if splitted_nm else ''
             
-            serial_number = xml_bis[0].get('BCP', '') if xml_bis else ''
-            
-            nf = xml_et.get('NF', '0') if xml_et is not None else '0'
+            nf = et_attrs.get('NF', '0')
             result_str = "Passed" if nf == "0" else "Failed"
             
-            has_tests = any(bi.findall('TEST') for bi in xml_bis)
             confidence = 0.85 if has_tests else 0.7
             
             return ValidationResult(
                 can_convert=True,
                 confidence=confidence,
-                message=f"Valid Seica XML ({len(xml_bis)} board(s))",
+                message=f"Valid Seica XML ({board_count} board(s))",
                 detected_serial_number=serial_number,
                 detected_part_number=part_number,
                 detected_result=result_str,
@@ -164,54 +177,62 @@ class SeicaXMLConverter(FileConverter):
             return ValidationResult.no_match(f"Error reading file: {e}")
     
     def convert(self, source: ConverterSource, context: ConverterContext) -> ConverterResult:
-        """Convert Seica XML test file to WATS UUTReport(s)"""
+        """
+        Convert Seica XML test file to WATS UUTReport(s).
+        
+        The file is streamed: each board's report is built while its TEST
+        elements are read. ST precedes the boards; the ET element (end date
+        and final status) follows them and is applied at the end.
+        """
         if not source.path:
             return ConverterResult.failed_result(error="No file path provided")
         
         try:
-            tree = ET.parse(source.path)
-            xml_r = tree.getroot()
-            
             operation_code = context.get_argument("operationTypeCode", 10)
             seq_name_attr = context.get_argument("sequenceName", "SoftwareName")
             seq_version_attr = context.get_argument("sequenceVersion", "1.0")
             
-            xml_st = xml_r.find('ST')
-            xml_bis = list(xml_r.findall('BI'))
-            xml_et = xml_r.find('ET')
+            st_attrs: Optional[Dict[str, str]] = None
+            et_attrs: Optional[Dict[str, str]] = None
+            reports = []
+            
+            with XmlStream(source.path) as xml:
+                xml_r = xml.root
+                for child in xml.children(xml_r):
+                    if child.tag == 'ST' and st_attrs is None:
+                        st_attrs = dict(child.attrib)
+                    elif child.tag == 'ET' and et_attrs is None:
+                        et_attrs = dict(child.attrib)
+                    elif child.tag == 'BI':
+                        if st_attrs is None:
+                            return ConverterResult.failed_result(error="Missing ST element")
+                        
+                        nm = st_attrs.get('NM', '')
+                        splitted_nm = re.split(r'[_\s]', nm)
+                        part_number = splitted_nm[0] if len(splitted_nm) > 0 else nm
+                        part_revision = splitted_nm[1] if len(splitted_nm) > 1 else '1'
+                        
+                        report = self._process_board(
+                            xml_bi=child,
+                            tests=(test for test in xml.children(child) if test.tag == 'TEST'),
+                            operator=st_attrs.get('OP', ''),
+                            part_number=part_number,
+                            part_revision=part_revision,
+                            board_name=st_attrs.get('NMP', ''),
+                            operation_code=operation_code,
+                            seq_name=seq_name_attr,
+                            seq_version=seq_version_attr,
+                        )
+                        reports.append(report)
             
-            if xml_st is None:
+            if st_attrs is None:
                 return ConverterResult.failed_result(error="Missing ST element")
-            if not xml_bis:
+            if not reports:
                 return ConverterResult.failed_result(error="Missing BI elements")
             
-            nm = xml_st.get('NM', '')
-            operator = xml_st.get('OP', '')
-            board_name = xml_st.get('NMP', '')
-            
-            splitted_nm = re.split(r'[_\s]', nm)
-            part_number = splitted_nm[0] if len(splitted_nm) > 0 else nm
-            part_revision = splitted_nm[1] if len(splitted_nm) > 1 else '1'
-            
-            end_date_string = xml_et.get('ED', '') if xml_et is not None else ''
-            uut_status_string = xml_et.get('NF', '0') if xml_et is not None else '0'
-            
-            reports = []
-            
-            for xml_bi in xml_bis:
-                report = self._process_board(
-                    xml_bi=xml_bi,
-                    operator=operator,
-                    part_number=part_number,
-                    part_revision=part_revision,
-                    board_name=board_name,
-                    operation_code=operation_code,
-                    seq_name=seq_name_attr,
-                    seq_version=seq_version_attr,
-                    end_date_string=end_date_string,
-                    uut_status_string=uut_status_string,
-                )
-                reports.append(report)
+            uut_status_string = et_attrs.get('NF', '0') if et_attrs is not None else '0'
+            for report in reports:
+                report.result = "P" if uut_status_string == "0" else "F"
             
             if len(reports) == 1:
                 return ConverterResult.success_result(
@@ -230,6 +251,7 @@ class SeicaXMLConverter(FileConverter):
     def _process_board(
         self,
         xml_bi: ET.Element,
+        tests: Iterable[ET.Element],
         operator: str,
         part_number: str,
         part_revision: str,
@@ -237,10 +259,8 @@ class SeicaXMLConverter(FileConverter):
         operation_code: int,
         seq_name: str,
         seq_version: str,
-        end_date_string: str,
-        uut_status_string: str,
     ) -> UUTReport:
-        """Process a single board (BI element) into a UUTReport"""
+        """Process a single board (BI element and its streamed TEST elements) into a UUTReport"""
         
         serial_number = xml_bi.get('BCP', '')
         start_date_string = xml_bi.get('SD', '')
@@ -258,6 +278,7 @@ class SeicaXMLConverter(FileConverter):
         # BUILD REPORT USING UUTReport MODEL
         # ========================================
         
+        # Result is set from the ET element once the whole file has been read
         report = UUTReport(
             pn=part_number,
             sn=serial_number,
@@ -266,7 +287,7 @@ class SeicaXMLConverter(FileConverter):
             station_name="Seica",
             location="Production",
             purpose="ICT Test",
-            result="P" if uut_status_string == "0" else "F",
+            result="P",
             start=start_time,
         )
         
@@ -281,12 +302,11 @@ class SeicaXMLConverter(FileConverter):
         root.sequence.version = seq_version
         
         # Process tests grouped by test group (F attribute)
-        tests = list(xml_bi.findall('TEST'))
         self._process_tests(tests, root)
         
         return report
     
-    def _process_tests(self, tests: List[ET.Element], root: SequenceCall) -> None:
+    def _process_tests(self, tests: Iterable[ET.Element], root: SequenceCall) -> None:
         """Process TEST elements, grouping by test group (F attribute)"""
         
         current_group = ""
@@ -28,6 +28,7 @@ from typing import Any, Dict, List, Optional
 
 from pywats_client.converters.file_converter import FileConverter
 from pywats_client.converters.context import ConverterContext
+from pywats_client.converters.xml_stream import XmlStream
 from pywats_client.converters.models import (
     ConverterSource,
     ConverterResult,
@@ -83,6 +84,8 @@ class WATSStandardXMLConverter(FileConverter):
         """
         Validate that the file is a WSXF/WRML format file.
         
+        Reads only up to the first Report element.
+        
         Confidence levels:
         - 0.98: Valid XML with WSXF/WRML namespace and Report elements
         - 0.85: Valid XML with Reports root but no namespace
@@ -96,50 +99,32 @@ class WATSStandardXMLConverter(FileConverter):
             return ValidationResult.no_match("Not an XML file")
         
         try:
-            tree = ET.parse(source.path)
-            root = tree.getroot()
-            
-            # Check for Reports root element
-            root_tag = root.tag
-            
-            # Handle namespaced tag
-            is_wsxf = WSXF_NS in root_tag
-            is_wrml = WRML_NS in root_tag
-            is_reports = 'Reports' in root_tag or root_tag == 'Reports'
-            
-            if not (is_wsxf or is_wrml or is_reports):
-                return ValidationResult.no_match(f"Root element is '{root_tag}', not Reports")
-            
-            # Find first Report element
-            ns = {'wsxf': WSXF_NS, 'wrml': WRML_NS}
-            report_elem = None
-            
-            for prefix, namespace in ns.items():
-                report_elem = root.find(f'{{{namespace}}}Report')
-                if report_elem is not None:
-                    break
-            
-            if report_elem is None:
-                report_elem = root.find('Report')
-            
-            if report_elem is None:
-                # Try direct child
-                for child in root:
-                    if 'Report' in child.tag:
-                        report_elem = child
-                        break
-            
-            if report_elem is None:
-                return ValidationResult(
-                    can_convert=True,
-                    confidence=0.6,
-                    message="WSXF/WRML structure but no Report elements found",
-                )
-            
-            # Extract info from Report
-            serial_number = report_elem.get('SN', '')
-            part_number = report_elem.get('PN', '')
-            result = report_elem.get('Result', 'Passed')
+            with XmlStream(source.path) as xml:
+                # Check for Reports root element
+                root_tag = xml.root.tag
+                
+                # Handle namespaced tag
+                is_wsxf = WSXF_NS in root_tag
+                is_wrml = WRML_NS in root_tag
+                is_reports = 'Reports' in root_tag or root_tag == 'Reports'
+                
+                if not (is_wsxf or is_wrml or is_reports):
+                    return ValidationResult.no_match(f"Root element is '{root_tag}', not Reports")
+                
+                # Find first Report element
+                report_elem = self._first_report(xml)
+                
+                if report_elem is None:
+                    return ValidationResult(
+                        can_convert=True,
+                        confidence=0.6,
+                        message="WSXF/WRML structure but no Report elements found",
+                    )
+                
+                # Extract info from Report
+                serial_number = report_elem.get('SN', '')
+                part_number = report_elem.get('PN', '')
+                result = report_elem.get('Result', 'Passed')
             
             return ValidationResult(
                 can_convert=True,
@@ -156,23 +141,25 @@ class WATSStandardXMLConverter(FileConverter):
             return ValidationResult.no_match(f"Error reading file: {e}")
     
     def convert(self, source: ConverterSource, context: ConverterContext) -> ConverterResult:
-        """Convert WSXF/WRML file to WATS report"""
+        """
+        Convert WSXF/WRML file to WATS report.
+        
+        The first Report element is converted while it is read; the rest of
+        the file is not parsed.
+        """
         if not source.path:
             return ConverterResult.failed_result(error="No file path provided")
         
         try:
-            tree = ET.parse(source.path)
-            root = tree.getroot()
-            
-            # Find Report elements
-            report_elems = self._find_report_elements(root)
-            
-            if not report_elems:
-                return ConverterResult.failed_result(error="No Report elements found")
-            
-            # Convert first report (for single report mode)
-            # TODO: Support multiple reports
-            report = self._convert_report(report_elems[0], context)
+            with XmlStream(source.path) as xml:
+                # Convert first report (for single report mode)
+                # TODO: Support multiple reports
+                report_elem = self._first_report(xml)
+                
+                if report_elem is None:
+                    return ConverterResult.failed_result(error="No Report elements found")
+                
+                report = self._convert_report(xml, report_elem, context)
             
             return ConverterResult.success_result(
                 report=report,
@@ -184,30 +171,20 @@ class WATSStandardXMLConverter(FileConverter):
         except Exception as e:
             return ConverterResult.failed_result(error=f"Conversion error: {e}")
     
-    def _find_report_elements(self, root: ET.Element) -> List[ET.Element]:
-        """Find all Report elements in the XML"""
-        reports = []
-        
-        # Try with namespaces
-        for namespace in [WSXF_NS, WRML_NS]:
-            reports.extend(root.findall(f'{{{namespace}}}Report'))
-        
-        # Try without namespace
-        reports.extend(root.findall('Report'))
-        
-        # Try direct children
-        for child in root:
-            if 'Report' in child.tag and child not in reports:
-                reports.append(child)
-        
-        return reports
+    def _first_report(self, xml: XmlStream) -> Optional[ET.Element]:
+        """Read up to the start of the first Report element (None if there is none)"""
+        for child in xml.children(xml.root):
+            if 'Report' in child.tag:
+                return child
+        return None
     
     def _convert_report(
         self,
+        xml: XmlStream,
         report_elem: ET.Element,
         context: ConverterContext
     ) -> Dict[str, Any]:
-        """Convert a Report element to WATS report format"""
+        """Convert a Report element to WATS report format, streaming its steps"""
         
         default_process_code = context.get_argument("defaultProcessCode", "10")
         
@@ -252,80 +229,87 @@ class WATSStandardXMLConverter(FileConverter):
         elif start_utc:
             report['start'] = start_utc
         
-        # Find and parse UUT element
-        uut_elem = self._find_child(report_elem, 'UUT')
-        if uut_elem is not None:
-            if uut_elem.get('UserLoginName'):
-                report['operator'] = uut_elem.get('UserLoginName')
-            if uut_elem.get('BatchSN'):
-                report['batchSerialNumber'] = uut_elem.get('BatchSN')
-            if uut_elem.get('ExecutionTime'):
+        # Read the Report's children: small header elements and the step tree
+        uut_attrs: Optional[Dict[str, str]] = None
+        uut_comment: Optional[str] = None
+        process_attrs: Optional[Dict[str, str]] = None
+        misc_infos = []
+        subunits = []
+        steps = []
+        
+        for child in xml.children(report_elem):
+            tag = child.tag
+            if tag.endswith('UUT') and uut_attrs is None:
+                uut_attrs = dict(child.attrib)
+                for uut_child in xml.children(child):
+                    if uut_child.tag.endswith('Comment'):
+                        uut_comment = xml.complete(uut_child).text
+                        break
+            elif tag.endswith('Process') and process_attrs is None:
+                process_attrs = dict(child.attrib)
+            elif tag.endswith('MiscInfo'):
+                desc = child.get('Description', '')
+                value = xml.complete(child).text or child.get('Numeric', '')
+                if desc:
+                    misc_infos.append({"name": desc, "value": str(value)})
+            elif tag.endswith('ReportUnitHierarchy'):
+                subunits.append({
+                    "partType": child.get('PartType', ''),
+                    "partNumber": child.get('PN', ''),
+                    "serialNumber": child.get('SN', ''),
+                    "revision": child.get('Rev', ''),
+                })
+            elif tag.endswith('Step'):
+                steps.append(self._convert_step(xml, child))
+        
+        # Parse UUT element
+        if uut_attrs is not None:
+            if uut_attrs.get('UserLoginName'):
+                report['operator'] = uut_attrs.get('UserLoginName')
+            if uut_attrs.get('BatchSN'):
+                report['batchSerialNumber'] = uut_attrs.get('BatchSN')
+            if uut_attrs.get('ExecutionTime'):
                 try:
-                    report['execTime'] = float(uut_elem.get('ExecutionTime'))
+                    report['execTime'] = float(uut_attrs.get('ExecutionTime'))
                 except ValueError:
                     pass
-            if uut_elem.get('FixtureId'):
-                report['fixtureId'] = uut_elem.get('FixtureId')
-            if uut_elem.get('ErrorCode'):
+            if uut_attrs.get('FixtureId'):
+                report['fixtureId'] = uut_attrs.get('FixtureId')
+            if uut_attrs.get('ErrorCode'):
                 try:
-                    report['errorCode'] = int(uut_elem.get('ErrorCode'))
+                    report['errorCode'] = int(uut_attrs.get('ErrorCode'))
                 except ValueError:
                     pass
-            if uut_elem.get('ErrorMessage'):
-                report['errorMessage'] = uut_elem.get('ErrorMessage')
+            if uut_attrs.get('ErrorMessage'):
+                report['errorMessage'] = uut_attrs.get('ErrorMessage')
             
             # Get comment
-            comment_elem = self._find_child(uut_elem, 'Comment')
-            if comment_elem is not None and comment_elem.text:
-                report['comment'] = comment_elem.text
-        
-        # Find and parse Process element
-        process_elem = self._find_child(report_elem, 'Process')
-        if process_elem is not None:
-            if process_elem.get('Code'):
-                report['processCode'] = process_elem.get('Code')
-            if process_elem.get('Name'):
-                report['processName'] = process_elem.get('Name')
+            if uut_comment:
+                report['comment'] = uut_comment
+        
+        # Parse Process element
+        if process_attrs is not None:
+            if process_attrs.get('Code'):
+                report['processCode'] = process_attrs.get('Code')
+            if process_attrs.get('Name'):
+                report['processName'] = process_attrs.get('Name')
         else:
             report['processCode'] = default_process_code
         
-        # Parse MiscInfo elements
-        misc_infos = []
-        for misc_elem in self._find_children(report_elem, 'MiscInfo'):
-            desc = misc_elem.get('Description', '')
-            value = misc_elem.text or misc_elem.get('Numeric', '')
-            if desc:
-                misc_infos.append({"name": desc, "value": str(value)})
-        
         if misc_infos:
             report['miscInfos'] = misc_infos
         
-        # Parse ReportUnitHierarchy (subunits)
-        subunits = []
-        for unit_elem in self._find_children(report_elem, 'ReportUnitHierarchy'):
-            subunits.append({
-                "partType": unit_elem.get('PartType', ''),
-                "partNumber": unit_elem.get('PN', ''),
-                "serialNumber": unit_elem.get('SN', ''),
-                "revision": unit_elem.get('Rev', ''),
-            })
-        
         if subunits:
             report['uutParts'] = subunits
         
-        # Parse Step tree
+        # Step tree
         root_step: Dict[str, Any] = {
             "type": "SEQ",
             "name": "Root",
             "status": "Done",
-            "stepResults": []
+            "stepResults": steps
         }
         
-        # Find Step elements
-        for step_elem in self._find_children(report_elem, 'Step'):
-            converted_step = self._convert_step(step_elem)
-            root_step["stepResults"].append(converted_step)
-        
         # Update root status based on result
         if report['result'] == 'F':
             root_step["status"] = "Failed"
@@ -334,8 +318,8 @@ class WATSStandardXMLConverter(FileConverter):
         
         return report
     
-    def _convert_step(self, step_elem: ET.Element) -> Dict[str, Any]:
-        """Convert a Step element to WATS step format"""
+    def _convert_step(self, xml: XmlStream, step_elem: ET.Element) -> Dict[str, Any]:
+        """Convert a Step element to WATS step format (child steps are streamed)"""
         
         step_type = step_elem.get('StepType', 'SequenceCall')
         name = step_elem.get('Name', 'Step')
@@ -354,10 +338,32 @@ class WATSStandardXMLConverter(FileConverter):
             except ValueError:
                 pass
         
+        # Read children (attributes only, except ReportText)
+        report_text: Optional[str] = None
+        child_steps = []
+        num_limits: List[Dict[str, str]] = []
+        pf_attrs: Optional[Dict[str, str]] = None
+        sv_attrs: Optional[Dict[str, str]] = None
+        seen_report_text = False
+        
+        for child in xml.children(step_elem):
+            tag = child.tag
+            if tag.endswith('ReportText') and not seen_report_text:
+                seen_report_text = True
+                report_text = xml.complete(child).text
+            elif tag.endswith('Step'):
+                if step_type == 'SequenceCall':
+                    child_steps.append(self._convert_step(xml, child))
+            elif tag.endswith('NumericLimit'):
+                num_limits.append(dict(child.attrib))
+            elif tag.endswith('PassFail') and pf_attrs is None:
+                pf_attrs = dict(child.attrib)
+            elif tag.endswith('StringValue') and sv_attrs is None:
+                sv_attrs = dict(child.attrib)
+        
         # Add report text
-        report_text_elem = self._find_child(step_elem, 'ReportText')
-        if report_text_elem is not None and report_text_elem.text:
-            step["reportText"] = report_text_elem.text
+        if report_text:
+            step["reportText"] = report_text
         
         # Add error info
         error_code = step_elem.get('ErrorCode')
@@ -374,18 +380,13 @@ class WATSStandardXMLConverter(FileConverter):
         # Handle step type
         if step_type == 'SequenceCall':
             step["type"] = "SEQ"
-            step["stepResults"] = []
-            
-            # Process child steps
-            for child_step in self._find_children(step_elem, 'Step'):
-                converted = self._convert_step(child_step)
-                step["stepResults"].append(converted)
+            step["stepResults"] = child_steps
         
         elif step_type in ('ET_NLT', 'NumericLimitTest'):
             step["type"] = "NT"
             
-            # Find NumericLimit element
-            num_limit = self._find_child(step_elem, 'NumericLimit')
+            # First NumericLimit element
+            num_limit = num_limits[0] if num_limits else None
             if num_limit is not None:
                 try:
                     step["numericValue"] = float(num_limit.get('NumericValue', '0'))
@@ -414,8 +415,8 @@ class WATSStandardXMLConverter(FileConverter):
             step["type"] = "NT"
             step["measurements"] = []
             
-            # Find all NumericLimit elements
-            for num_limit in self._find_children(step_elem, 'NumericLimit'):
+            # All NumericLimit elements
+            for num_limit in num_limits:
                 meas: Dict[str, Any] = {
                     "status": self._map_status(num_limit.get('Status', 'Done')),
                 }
@@ -464,23 +465,19 @@ class WATSStandardXMLConverter(FileConverter):
         elif step_type in ('ET_PFT', 'PassFailTest'):
             step["type"] = "PF"
             
-            # Find PassFail element
-            pf_elem = self._find_child(step_elem, 'PassFail')
-            if pf_elem is not None:
-                pf_status = pf_elem.get('Status', 'Passed')
+            if pf_attrs is not None:
+                pf_status = pf_attrs.get('Status', 'Passed')
                 step["passFailStatus"] = pf_status in ('Passed', 'Pass', 'P')
         
         elif step_type in ('ET_SVT', 'StringValueTest'):
             step["type"] = "ST"
             
-            # Find StringValue element
-            sv_elem = self._find_child(step_elem, 'StringValue')
-            if sv_elem is not None:
-                step["stringValue"] = sv_elem.get('Value', '')
-                if sv_elem.get('StringLimit'):
-                    step["stringLimit"] = sv_elem.get('StringLimit')
-                if sv_elem.get('CompOperator'):
-                    step["compOp"] = sv_elem.get('CompOperator')
+            if sv_attrs is not None:
+                step["stringValue"] = sv_attrs.get('Value', '')
+                if sv_attrs.get('StringLimit'):
+                    step["stringLimit"] = sv_attrs.get('StringLimit')
+                if sv_attrs.get('CompOperator'):
+                    step["compOp"] = sv_attrs.get('CompOperator')
         
         elif step_type in ('ET_A', 'ActionStep', 'ET_GEN', 'GenericStep'):
             step["type"] = "GEN"
@@ -493,44 +490,6 @@ class WATSStandardXMLConverter(FileConverter):
         
         return step
     
-    def _find_child(self, parent: ET.Element, tag: str) -> Optional[ET.Element]:
-        """Find a child element, handling namespaces"""
-        # Try without namespace
-        elem = parent.find(tag)
-        if elem is not None:
-            return elem
-        
-        # Try with namespaces
-        for namespace in [WSXF_NS, WRML_NS]:
-            elem = parent.find(f'{{{namespace}}}{tag}')
-            if elem is not None:
-                return elem
-        
-        # Try matching tag suffix
-        for child in parent:
-            if child.tag.endswith(tag) or child.tag == tag:
-                return child
-        
-        return None
-    
-    def _find_children(self, parent: ET.Element, tag: str) -> List[ET.Element]:
-        """Find all child elements with given tag, handling namespaces"""
-        results = []
-        
-        # Try without namespace
-        results.extend(parent.findall(tag))
-        
-        # Try with namespaces
-        for namespace in [WSXF_NS, WRML_NS]:
-            results.extend(parent.findall(f'{{{namespace}}}{tag}'))
-        
-        # Try matching tag suffix in direct children
-        for child in parent:
-            if (child.tag.endswith(tag) or child.tag == tag) and child not in results:
-                results.append(child)
-        
-        return results
-    
     def _map_status(self, status: str) -> str:
         """Map XML status to WATS status"""
         if status in ('Passed', 'Pass', 'P'):
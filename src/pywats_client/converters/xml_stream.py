@@ -0,0 +1,125 @@
+"""
+Streaming XML parsing for converters.
+
+ET.parse() builds the whole document before a converter can look at it, so
+a multi-hundred-MB test result takes gigabytes of RAM. XmlStream wraps
+ElementTree.iterparse() in a small pull API that keeps only the open path
+through the document in memory:
+
+- ``root`` is the document element, available as soon as its start tag
+  has been read (tag and attributes; children are not loaded yet).
+- ``children(parent)`` yields the direct children of an open element at
+  their start tag. When the consumer asks for the next child, the rest of
+  the previous one is read past and the element is detached from the tree,
+  so processed siblings never accumulate.
+- ``complete(element)`` reads an element's whole subtree, for the small
+  parts that are easier to handle as a tree (headers, a single test).
+
+Converting starts as soon as the first child has been read, and reading
+stops where the converter stops asking.
+
+Example:
+    with XmlStream(source.path) as xml:
+        if xml.root.tag != "R":
+            return ValidationResult.no_match("Not a Seica file")
+        for board in xml.children(xml.root):
+            for test in xml.children(board):
+                process(test.attrib)
+"""
+
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import IO, Dict, Iterator, List, Optional, Tuple, Union
+
+
+def local_name(tag: str) -> str:
+    """Tag without its ``{namespace}`` prefix."""
+    return tag.rsplit('}', 1)[-1]
+
+
+class XmlStream:
+    """
+    Incremental reader over an XML file or binary stream.
+
+    Use as a context manager; the file is closed on exit. Elements yielded
+    by children() are detached when the next child is requested - copy what
+    is needed (attributes, or the element from complete()) before moving on.
+
+    Args:
+        source: File path or binary file object
+    """
+
+    def __init__(self, source: Union[str, Path, IO[bytes]]) -> None:
+        if isinstance(source, (str, Path)):
+            self._file: IO[bytes] = open(source, 'rb')
+            self._owns_file = True
+        else:
+            self._file = source
+            self._owns_file = False
+        self._events = ET.iterparse(self._file, events=('start', 'end', 'start-ns'))
+        self._stack: List[ET.Element] = []
+        self._root: Optional[ET.Element] = None
+        self.namespaces: Dict[str, str] = {}  # Declared prefix -> URI (read so far)
+
+    @property
+    def root(self) -> ET.Element:
+        """The document element (reads up to its start tag)."""
+        if self._root is None:
+            event, self._root = self._next()
+        return self._root
+
+    @property
+    def depth(self) -> int:
+        """Number of currently open elements."""
+        return len(self._stack)
+
+    def children(self, parent: ET.Element) -> Iterator[ET.Element]:
+        """
+        Yield the direct children of ``parent`` at their start tag.
+
+        ``parent`` must be open with no unfinished child (i.e. just yielded
+        by children() or the root). Each child is read to its end and
+        detached from ``parent`` before the next one is yielded. Returns
+        after ``parent``'s end tag.
+        """
+        while True:
+            event, element = self._next()
+            if event == 'end':
+                if element is not parent:
+                    raise ET.ParseError(f"Unexpected end of <{element.tag}> inside <{parent.tag}>")
+                return
+            yield element
+            self.complete(element)
+            parent.remove(element)
+
+    def complete(self, element: ET.Element) -> ET.Element:
+        """Read ``element`` to its end tag and return it with its full subtree."""
+        while self._is_open(element):
+            self._next()
+        return element
+
+    def close(self) -> None:
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self) -> "XmlStream":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _is_open(self, element: ET.Element) -> bool:
+        return any(open_element is element for open_element in reversed(self._stack))
+
+    def _next(self) -> Tuple[str, ET.Element]:
+        for event, item in self._events:
+            if event == 'start-ns':
+                prefix, uri = item
+                self.namespaces[prefix] = uri
+                continue
+            if event == 'start':
+                self._stack.append(item)
+            else:
+                self._stack.pop()
+            return event, item
+        raise ET.ParseError("Unexpected end of document")
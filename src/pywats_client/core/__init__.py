@@ -17,6 +17,7 @@ from .file_utils import (
     safe_rename,
     ensure_directory,
 )
+from .persistence import FileCountJournal, FileStateStore
 from .async_runner import (
     AsyncTaskRunner,
     TaskResult,
@@ -51,6 +52,9 @@ __all__ = [
     "safe_delete",
     "safe_rename",
     "ensure_directory",
+    # File-backed state for pywats helpers
+    "FileCountJournal",
+    "FileStateStore",
     # Async utilities
     "AsyncTaskRunner",
     "TaskResult",
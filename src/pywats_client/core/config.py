@@ -58,6 +58,11 @@ class ConverterConfig:
     # Processing priority (1=highest, 10=lowest, default=5)
     priority: int = 5
     
+    # Fair scheduling against other converters of the same priority
+    weight: float = 1.0          # Relative share of conversion slots
+    max_in_flight: int = 0       # Max concurrent conversions (0 = pool limit)
+    max_queue_depth: int = 0     # Max queued files, the rest wait on disk (0 = unlimited)
+    
     # Configuration arguments (passed to converter)
     arguments: Dict[str, Any] = field(default_factory=dict)
     
@@ -168,6 +173,16 @@ class ConverterConfig:
         if self.reject_threshold > self.alarm_threshold:
             errors.append("reject_threshold must be <= alarm_threshold")
         
+        # Scheduling validation
+        if self.weight <= 0:
+            errors.append("weight must be positive")
+        
+        if self.max_in_flight < 0:
+            errors.append("max_in_flight must be non-negative")
+        
+        if self.max_queue_depth < 0:
+            errors.append("max_queue_depth must be non-negative")
+        
         return errors
 
 
@@ -307,6 +322,12 @@ class ClientConfig:
     # Queue settings
     max_queue_size: int = 10000  # Maximum reports in queue (0 = unlimited)
     max_concurrent_uploads: int = 5  # Concurrent upload threads
+    duplicate_suppression_enabled: bool = True  # Skip files/reports already uploaded
+    duplicate_retention_days: float = 7.0  # How long content hashes suppress duplicates
+    archive_enabled: bool = False  # Compact processed files into compressed daily archives
+    archive_min_age_hours: float = 24.0  # Leave processed files in place this long
+    archive_retention_days: float = 90.0  # Delete archived files after this (0 = keep)
+    archive_max_size_mb: float = 0.0  # Archive size quota (0 = unlimited)
     
     # HTTP Cache settings
     enable_cache: bool = True  # Enable HTTP response caching for GET requests
@@ -368,6 +389,7 @@ class ClientConfig:
     # Logging
     log_level: str = LogLevel.INFO.value
     log_file: str = "client.log"
+    log_rate_limit_seconds: float = 0.0  # Suppress identical log lines within this window (0 = off)
     
     # GUI settings
     start_minimized: bool = False
@@ -477,7 +499,10 @@ class ClientConfig:
             # Positive-only fields
             if key in ['max_concurrent_uploads', 'max_queue_size', 'cache_max_size', 
                        'sync_interval_seconds', 'retry_interval_seconds', 'max_retry_attempts',
-                       'metrics_port', 'api_port', 'proxy_port', 'sn_start', 'sn_padding']:
+                       'metrics_port', 'api_port', 'proxy_port', 'sn_start', 'sn_padding',
+                       'duplicate_retention_days', 'archive_min_age_hours',
+                       'archive_retention_days', 'archive_max_size_mb',
+                       'log_rate_limit_seconds']:
                 if value < 0:
                     raise ValueError(f"'{key}' must be >= 0, got {value}")
             
@@ -959,6 +984,12 @@ class ClientConfig:
             # Queue settings
             "max_queue_size": self.max_queue_size,
             "max_concurrent_uploads": self.max_concurrent_uploads,
+            "duplicate_suppression_enabled": self.duplicate_suppression_enabled,
+            "duplicate_retention_days": self.duplicate_retention_days,
+            "archive_enabled": self.archive_enabled,
+            "archive_min_age_hours": self.archive_min_age_hours,
+            "archive_retention_days": self.archive_retention_days,
+            "archive_max_size_mb": self.archive_max_size_mb,
             "converters_folder": self.converters_folder,
             "converters": [c.to_dict() for c in self.converters],
             "converters_enabled": self.converters_enabled,
@@ -977,6 +1008,7 @@ class ClientConfig:
             "service_auto_start": self.service_auto_start,
             "log_level": self.log_level,
             "log_file": self.log_file,
+            "log_rate_limit_seconds": self.log_rate_limit_seconds,
             "start_minimized": self.start_minimized,
             "minimize_to_tray": self.minimize_to_tray,
         }
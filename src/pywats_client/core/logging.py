@@ -95,7 +95,9 @@ def setup_client_logging(
     log_format: Literal["text", "json"] = "text",
     enable_console: bool = True,
     rotate_size_mb: int = 10,
-    rotate_backups: int = 5
+    rotate_backups: int = 5,
+    queued: bool = False,
+    rate_limit_seconds: Optional[float] = None
 ) -> Path:
     """
     Configure unified logging for pyWATS client.
@@ -106,6 +108,8 @@ def setup_client_logging(
     - Optional console output
     - Text or JSON format
     - Correlation ID support
+    - Optional background writer thread (queued=True) so that services never
+      block their event loop on log file I/O
     
     This is the recommended way to configure logging for client applications,
     services, and GUI components.
@@ -117,6 +121,9 @@ def setup_client_logging(
         enable_console: Also log to console (default: True)
         rotate_size_mb: Max file size in MB before rotation (default: 10)
         rotate_backups: Number of backup files to keep (default: 5)
+        queued: Write log records from a background thread (default: False)
+        rate_limit_seconds: Suppress repeats of the same message within this
+            window (default: None)
         
     Returns:
         Path to the log file
@@ -126,7 +133,8 @@ def setup_client_logging(
         >>> log_path = setup_client_logging(
         ...     instance_id="test_station",
         ...     log_level="INFO",
-        ...     enable_console=False
+        ...     enable_console=False,
+        ...     queued=True
         ... )
         
     Example (GUI with JSON logging):
@@ -163,7 +171,9 @@ def setup_client_logging(
         format=log_format,
         handlers=handlers,
         enable_correlation_ids=True,
-        enable_context=True
+        enable_context=True,
+        queued=queued,
+        rate_limit_seconds=rate_limit_seconds
     )
     
     # Log startup message
@@ -175,7 +185,8 @@ def setup_client_logging(
             "log_path": str(log_path),
             "log_level": log_level,
             "log_format": log_format,
-            "enable_console": enable_console
+            "enable_console": enable_console,
+            "queued": queued
         }
     )
     
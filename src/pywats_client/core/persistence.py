@@ -0,0 +1,199 @@
+"""
+File-backed state for pywats API helpers
+
+The pywats API layer is memory-only; helpers that keep state across
+restarts take a pluggable journal or store. This module provides the
+file-backed implementations. Disk I/O runs in worker threads
+(asyncio.to_thread), never on the event loop.
+
+- FileCountJournal: write-ahead journal for AssetCountAggregator
+- FileStateStore: JSON state file for ReferenceSnapshot and other
+  StateStore users
+
+Usage:
+    >>> from pywats_client.core.persistence import FileCountJournal, FileStateStore
+    >>> api.asset.enable_count_aggregation(FileCountJournal(data_path / "asset_counts.journal"))
+    >>> api.product.enable_reference_snapshot(FileStateStore(data_path / "products.json"))
+"""
+
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, IO, Optional, Union
+
+from pywats.core.logging import get_logger
+from pywats.core.state_store import StateStore
+from pywats.domains.asset import CountJournal
+from pywats.domains.asset.count_aggregator import CountKey
+
+from .file_utils import SafeFileWriter
+
+logger = get_logger(__name__)
+
+
+# =============================================================================
+# Asset count journal
+# =============================================================================
+
+def _count_record(key: CountKey, amount: int, ack: bool = False) -> str:
+    data: Dict[str, Any] = {"a": key[0], "s": key[1], "c": key[2], "n": amount}
+    if ack:
+        data["ack"] = 1
+    return json.dumps(data, separators=(",", ":")) + "\n"
+
+
+def _read_count_segment(path: Path) -> Dict[CountKey, int]:
+    """Net unacknowledged amount per key in one journal file."""
+    totals: Dict[CountKey, int] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                data = json.loads(line)
+                key: CountKey = (data["a"], data["s"], bool(data["c"]))
+                amount = int(data["n"])
+            except (ValueError, KeyError, TypeError):
+                continue  # Torn write at the tail of a crashed journal
+            totals[key] = totals.get(key, 0) + (-amount if data.get("ack") else amount)
+    return {key: amount for key, amount in totals.items() if amount}
+
+
+class FileCountJournal(CountJournal):
+    """
+    Write-ahead journal of asset count increments.
+
+    Layout:
+        <path>      live journal, one line per increment
+        <path>.<n>  sealed segments (renamed live journals) plus one ack
+                    line per total the server accepted; deleted once
+                    every increment in them is acknowledged
+
+    The only window for a double count is a crash between the server
+    accepting a total and its acknowledgement being written.
+
+    Args:
+        path: Live journal file
+        fsync: fsync on every write (survives power loss, not just process
+            crashes, at the cost of a disk sync per increment)
+    """
+
+    def __init__(self, path: Union[str, Path], fsync: bool = False) -> None:
+        self.path = Path(path)
+        self.fsync = fsync
+        self._file: Optional[IO[str]] = None
+
+    async def recover(self) -> Dict[int, Dict[CountKey, int]]:
+        return await asyncio.to_thread(self._recover)
+
+    async def append(self, key: CountKey, amount: int) -> None:
+        await asyncio.to_thread(self._append, _count_record(key, amount))
+
+    async def seal(self, segment: int) -> None:
+        await asyncio.to_thread(self._seal, segment)
+
+    async def acknowledge(self, segment: int, key: CountKey, amount: int, finished: bool) -> None:
+        await asyncio.to_thread(self._acknowledge, segment, key, amount, finished)
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._close)
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.path.with_name(f"{self.path.name}.{segment}")
+
+    def _append(self, line: str) -> None:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(line)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def _seal(self, segment: int) -> None:
+        self._close()
+        if self.path.exists():
+            os.replace(self.path, self._segment_path(segment))
+
+    def _acknowledge(self, segment: int, key: CountKey, amount: int, finished: bool) -> None:
+        path = self._segment_path(segment)
+        if finished:
+            path.unlink(missing_ok=True)
+            return
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(_count_record(key, amount, ack=True))
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _recover(self) -> Dict[int, Dict[CountKey, int]]:
+        """Unsent amounts from sealed segments and a crashed run's live journal."""
+        segments: Dict[int, Dict[CountKey, int]] = {}
+        if not self.path.parent.exists():
+            return segments
+        prefix = self.path.name + "."
+        sealed = sorted(
+            int(p.name[len(prefix):])
+            for p in self.path.parent.glob(prefix + "*")
+            if p.name[len(prefix):].isdigit()
+        )
+        for segment in sealed:
+            path = self._segment_path(segment)
+            amounts = _read_count_segment(path)
+            if amounts:
+                segments[segment] = amounts
+            else:
+                path.unlink(missing_ok=True)
+
+        if self.path.exists():
+            # Seal the crashed run's live journal as-is (rename is atomic)
+            amounts = _read_count_segment(self.path)
+            if amounts:
+                segment = (sealed[-1] + 1) if sealed else 1
+                os.replace(self.path, self._segment_path(segment))
+                segments[segment] = amounts
+            else:
+                self.path.unlink()
+        return segments
+
+
+# =============================================================================
+# State file
+# =============================================================================
+
+class FileStateStore(StateStore):
+    """
+    StateStore kept in a JSON file, replaced atomically on every save.
+
+    Args:
+        path: State file
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        super().__init__()
+        self.path = Path(path)
+
+    async def load(self) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._load)
+
+    async def save(self, state: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self._save, state)
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        try:
+            text = self.path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        try:
+            return json.loads(text)
+        except ValueError as e:
+            raise ValueError(f"Unreadable state file {self.path}: {e}") from e
+
+    def _save(self, state: Dict[str, Any]) -> None:
+        result = SafeFileWriter.write_json_atomic(self.path, state, indent=None)
+        if not result.success:
+            raise OSError(f"Could not write state file {self.path}: {result.error}")
@@ -1,7 +1,7 @@
 """
 File I/O Utilities for pyWATS Client
 
-Provides file operations for attachments and reports.
+Provides file operations for attachments and streamed WSJF reports.
 All file I/O in pyWATS belongs in pywats_client, not in pywats (API layer).
 
 Design Principle:
@@ -12,12 +12,14 @@ Design Principle:
 import base64
 import mimetypes
 import logging
+import os
+import tempfile
 from pywats.core.logging import get_logger
 from pathlib import Path
 from typing import Optional, Tuple, Union
 from dataclasses import dataclass
 
-from pywats.domains.report import Attachment
+from pywats.domains.report import Attachment, WSJFDocument
 
 from .core.file_utils import SafeFileWriter, SafeFileReader
 
@@ -270,6 +272,78 @@ class AttachmentIO:
         return saved_paths
 
 
+class WSJFDocumentIO:
+    """
+    File I/O operations for streamed WSJF documents.
+
+    WSJFStreamWriter produces a WSJFDocument backed by a spooled temporary
+    file; these methods save it to disk (e.g. into the pending queue
+    folder) and open saved documents again, without parsing either way.
+
+    Example:
+        >>> from pywats_client.io import WSJFDocumentIO
+        >>>
+        >>> # Hand a streamed report to the pending queue
+        >>> WSJFDocumentIO.save(writer.finish(), reports_dir / "SN-1.queued")
+        >>>
+        >>> # Open a saved report for submit()
+        >>> with WSJFDocumentIO.from_file(reports_dir / "SN-1.queued") as document:
+        ...     await api.report.submit(document)
+    """
+
+    @staticmethod
+    def from_file(file_path: Union[str, Path]) -> WSJFDocument:
+        """
+        Open a WSJF file (e.g. a queued report) without parsing it.
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            WSJFDocument reading from the file (close it when done)
+
+        Raises:
+            FileNotFoundError: If file doesn't exist
+        """
+        file = open(file_path, "rb")
+        return WSJFDocument(file, os.fstat(file.fileno()).st_size)
+
+    @staticmethod
+    def save(document: WSJFDocument, file_path: Union[str, Path]) -> Path:
+        """
+        Copy a WSJF document to a file atomically (temp file + fsync + rename).
+
+        The document is copied in chunks, never held in memory as a whole.
+        Saving to ``<reports_dir>/<name>.queued`` hands the report to the
+        client pending queue.
+
+        Args:
+            document: Document to save
+            file_path: Destination file path
+
+        Returns:
+            Path to the saved file
+        """
+        path = Path(file_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                document.write_to(f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+
+        logger.debug(f"Saved WSJF document {document!r} to {path}")
+        return path
+
+
 # Convenience functions
 def load_attachment(file_path: Union[str, Path], **kwargs) -> Attachment:
     """
@@ -306,6 +380,7 @@ def save_attachment(attachment: Attachment, file_path: Union[str, Path], **kwarg
 
 __all__ = [
     "AttachmentIO",
+    "WSJFDocumentIO",
     "FileInfo",
     "load_attachment",
     "save_attachment",
@@ -13,10 +13,13 @@ Architecture:
                          │ extends
     ┌────────────────────▼──────────────────────────────┐
     │  pywats_client.queue (File Persistence)           │
-    │  └── PersistentQueue - File-backed queue          │
-    │      - Uses atomic writes (file_utils)            │
-    │      - Crash recovery                             │
-    │      - WSJF format storage                        │
+    │  ├── PersistentQueue - File-backed queue          │
+    │  │   - Uses atomic writes (file_utils)            │
+    │  │   - Crash recovery                             │
+    │  │   - WSJF format storage                        │
+    │  └── FairQueue - Weighted fair across flows       │
+    │      - Per-flow in-flight caps and depth limits   │
+    │      - Per-flow wait-time histograms              │
     └───────────────────────────────────────────────────┘
 
 Usage:
@@ -42,6 +45,7 @@ For in-memory only (no persistence), use pywats.queue.MemoryQueue.
 """
 
 from .persistent_queue import PersistentQueue
+from .fair_queue import FairQueue
 
 # Re-export base classes from pywats.queue for convenience
 from pywats.queue import (
@@ -66,6 +70,8 @@ from ..exceptions import (
 __all__ = [
     # Persistent queue (file-backed)
     "PersistentQueue",
+    # Fair scheduling across flows (in-memory)
+    "FairQueue",
     # Base classes from pywats
     "MemoryQueue",
     "BaseQueue",
@@ -0,0 +1,380 @@
+"""
+Fair Queue for pyWATS Client
+
+MemoryQueue variant that shares dequeues fairly between flows (e.g. one
+flow per converter), so a single source that drops thousands of items
+cannot starve the others.
+
+Scheduling:
+    - Priority first: the best priority among the flows' head items always
+      wins, exactly as in MemoryQueue.
+    - Within a priority, weighted fair (stride) scheduling: every flow has
+      a pass value that advances by 1/weight per dequeue and the flow with
+      the lowest pass goes next. A flow that was idle re-enters at the
+      current virtual time, so it does not bank credit while empty.
+    - Per-flow in-flight caps: a flow with max_in_flight items dequeued and
+      not yet finished is skipped until one finishes (update() with a
+      non-processing status, or remove()).
+    - Per-flow depth limits: add() raises QueueFullError once a flow has
+      max_depth pending items.
+    - Adding an item_id that is still pending or in flight returns that
+      item instead of queueing it twice.
+
+Each flow records how long its items waited between add() and dequeue in
+a cumulative histogram (see flow_stats()).
+"""
+
+import heapq
+import logging
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from pywats.core.logging import get_logger
+from pywats.queue import MemoryQueue, QueueItem, QueueItemStatus
+
+from ..exceptions import QueueFullError
+
+logger = get_logger(__name__)
+
+# Upper bounds (seconds) of the wait-time histogram buckets; +Inf is implied
+DEFAULT_WAIT_BUCKETS: Tuple[float, ...] = (0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0)
+
+
+@dataclass
+class _Flow:
+    """Scheduling state of one flow"""
+    name: str
+    order: int  # Registration order (stable tie-break)
+    weight: float = 1.0
+    max_in_flight: Optional[int] = None
+    max_depth: Optional[int] = None
+    heap: List[QueueItem] = field(default_factory=list)
+    pending: int = 0
+    in_flight: int = 0
+    pass_value: float = 0.0
+    dispatched: int = 0
+    rejected: int = 0
+    wait_counts: List[int] = field(default_factory=list)
+    wait_sum: float = 0.0
+    
+    @property
+    def eligible(self) -> bool:
+        return self.pending > 0 and (
+            self.max_in_flight is None or self.in_flight < self.max_in_flight
+        )
+
+
+class FairQueue(MemoryQueue):
+    """
+    Thread-safe in-memory queue with weighted fair scheduling across flows.
+    
+    The flow of an item is read from its metadata (``flow_key``). Items
+    without one share the "" flow. Unconfigured flows use the defaults.
+    
+    Example:
+        >>> queue = FairQueue(flow_key="converter")
+        >>> queue.configure_flow("ICT", weight=2.0, max_in_flight=4)
+        >>> queue.add(data, metadata={"converter": "ICT"})
+        >>> item = queue.get_next()  # Fair pick across converters
+        >>> item.mark_processing(); queue.update(item)
+        >>> item.mark_completed(); queue.update(item)  # Frees the in-flight slot
+        """
+    
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        default_max_attempts: int = 3,
+        flow_key: str = "flow",
+        wait_buckets: Tuple[float, ...] = DEFAULT_WAIT_BUCKETS,
+    ) -> None:
+        """
+        Initialize the fair queue.
+        
+        Args:
+            max_size: Maximum queue size (None = unlimited)
+            default_max_attempts: Default retry attempts for new items
+            flow_key: Metadata key that names an item's flow
+            wait_buckets: Wait-time histogram bucket bounds (seconds)
+        """
+        super().__init__(max_size=max_size, default_max_attempts=default_max_attempts)
+        self._flow_key = flow_key
+        self._wait_buckets = tuple(sorted(wait_buckets))
+        self._bucket_labels = [f"{bound:g}" for bound in self._wait_buckets] + ["+Inf"]
+        self._flows: Dict[str, _Flow] = {}
+        self._vtime = 0.0  # Pass value of the last dispatched flow
+        self._queued: Dict[str, Tuple[str, float]] = {}  # id -> (flow, enqueued at)
+        self._in_flight: Dict[str, str] = {}  # id -> flow
+    
+    # =========================================================================
+    # Flow configuration
+    # =========================================================================
+    
+    def configure_flow(
+        self,
+        name: str,
+        weight: float = 1.0,
+        max_in_flight: Optional[int] = None,
+        max_depth: Optional[int] = None,
+    ) -> None:
+        """
+        Set a flow's share and limits (applies to queued items too).
+        
+        Args:
+            name: Flow name
+            weight: Relative share of dequeues within a priority (> 0)
+            max_in_flight: Max items dequeued and not yet finished (None = no cap)
+            max_depth: Max pending items (None = unlimited)
+        """
+        if weight <= 0:
+            raise ValueError(f"weight must be positive: {weight}")
+        with self._lock:
+            flow = self._flow(name)
+            flow.weight = float(weight)
+            flow.max_in_flight = max_in_flight or None
+            flow.max_depth = max_depth or None
+    
+    def fill_ratio(self, name: str) -> float:
+        """Pending items relative to the flow's depth limit (0.0 if unlimited)"""
+        with self._lock:
+            flow = self._flows.get(name)
+            if flow is None or flow.max_depth is None:
+                return 0.0
+            return flow.pending / flow.max_depth
+    
+    def flow_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-flow counters and wait-time histogram.
+        
+        Returns:
+            Dict of flow name -> {weight, max_in_flight, max_depth, pending,
+            in_flight, dispatched, rejected, wait_seconds}, where wait_seconds
+            is {"buckets": {upper bound: cumulative count}, "sum", "count"}
+            with Prometheus-style bounds ("0.1", ..., "+Inf").
+        """
+        with self._lock:
+            stats = {}
+            for name, flow in self._flows.items():
+                cumulative, buckets = 0, {}
+                for bound, count in zip(self._bucket_labels, flow.wait_counts):
+                    cumulative += count
+                    buckets[bound] = cumulative
+                stats[name] = {
+                    "weight": flow.weight,
+                    "max_in_flight": flow.max_in_flight,
+                    "max_depth": flow.max_depth,
+                    "pending": flow.pending,
+                    "in_flight": flow.in_flight,
+                    "dispatched": flow.dispatched,
+                    "rejected": flow.rejected,
+                    "wait_seconds": {
+                        "buckets": buckets,
+                        "sum": flow.wait_sum,
+                        "count": cumulative,
+                    },
+                }
+            return stats
+    
+    # =========================================================================
+    # Queue operations
+    # =========================================================================
+    
+    def add(  # type: ignore[override]
+        self,
+        data: Any,
+        item_id: Optional[str] = None,
+        priority: int = 5,
+        max_attempts: Optional[int] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> QueueItem:
+        """
+        Add an item to its flow.
+        
+        Raises:
+            QueueFullError: If the flow is at its depth limit
+            ValueError: If the queue is full (max_size exceeded)
+        """
+        name = str((metadata or {}).get(self._flow_key, ""))
+        with self._lock:
+            if item_id is not None and (item_id in self._queued or item_id in self._in_flight):
+                return self._items[item_id]
+            
+            flow = self._flow(name)
+            if flow.max_depth is not None and flow.pending >= flow.max_depth:
+                flow.rejected += 1
+                raise QueueFullError(
+                    message=f"Flow '{name}' is full",
+                    current_size=flow.pending,
+                    max_size=flow.max_depth,
+                )
+            
+            if self._max_size and len(self._items) >= self._max_size:
+                raise ValueError(f"Queue is full (max_size={self._max_size})")
+            
+            item = QueueItem.create(
+                data=data,
+                item_id=item_id,
+                priority=priority,
+                max_attempts=max_attempts or self._default_max_attempts,
+                metadata=metadata,
+            )
+            self._items[item.id] = item
+            self._enqueue(flow, item)
+            
+            try:
+                self._item_added_event.set()
+            except Exception:
+                pass  # May fail if no event loop
+            
+            logger.debug(f"Added item {item.id} to flow '{name}' with priority {priority}")
+            return item
+    
+    def get_next(self) -> Optional[QueueItem]:
+        """
+        Get the next pending item: best priority, then lowest flow pass.
+        
+        Returns:
+            Next pending QueueItem, or None if nothing is eligible (empty,
+            or every flow with pending items is at its in-flight cap)
+        """
+        with self._lock:
+            best: Optional[_Flow] = None
+            best_key = None
+            for flow in self._flows.values():
+                if not flow.eligible:
+                    continue
+                head = self._head(flow)
+                if head is None:
+                    continue
+                key = (head.priority, flow.pass_value, flow.order)
+                if best_key is None or key < best_key:
+                    best, best_key = flow, key
+            
+            if best is None:
+                return None
+            
+            item = heapq.heappop(best.heap)
+            _, enqueued = self._queued.pop(item.id)
+            best.pending -= 1
+            best.in_flight += 1
+            best.dispatched += 1
+            self._in_flight[item.id] = best.name
+            self._vtime = best.pass_value
+            best.pass_value += 1.0 / best.weight
+            self._observe_wait(best, time.monotonic() - enqueued)
+            return self._items[item.id]
+    
+    def get_next_any(self, include_suspended: bool = True) -> Optional[QueueItem]:
+        """Same as get_next(); suspended items re-enter through update()."""
+        return self.get_next()
+    
+    def update(self, item: QueueItem) -> None:
+        """
+        Update an item's status.
+        
+        An item that leaves PROCESSING frees its flow's in-flight slot; an
+        item that returns to PENDING is queued again in its flow.
+        """
+        with self._lock:
+            if item.id not in self._items:
+                return
+            self._items[item.id] = item
+            
+            if item.status != QueueItemStatus.PROCESSING:
+                self._finish(item.id)
+            
+            if item.status == QueueItemStatus.PENDING and item.id not in self._queued:
+                self._enqueue(self._flow(str(item.metadata.get(self._flow_key, ""))), item)
+            
+            logger.debug(f"Updated item {item.id} to status {item.status.value}")
+    
+    def remove(self, item_id: str) -> bool:
+        """Remove an item (pending or in flight) from the queue."""
+        with self._lock:
+            if item_id not in self._items:
+                return False
+            del self._items[item_id]
+            self._dequeue(item_id)
+            self._finish(item_id)
+            logger.debug(f"Removed item {item_id} from queue")
+            return True
+    
+    def clear(self, status: Optional[QueueItemStatus] = None) -> int:
+        """Clear items from the queue (all, or those with a status)."""
+        with self._lock:
+            to_remove = [
+                item_id for item_id, item in self._items.items()
+                if status is None or item.status == status
+            ]
+            for item_id in to_remove:
+                del self._items[item_id]
+                self._dequeue(item_id)
+                self._finish(item_id)
+            if status is None:
+                for flow in self._flows.values():
+                    flow.heap.clear()
+            logger.debug(f"Cleared {len(to_remove)} items from queue")
+            return len(to_remove)
+    
+    def retry_failed(self) -> int:
+        """Reset all retryable failed items back to pending."""
+        with self._lock:
+            failed = [
+                item for item in self._items.values()
+                if item.status == QueueItemStatus.FAILED and item.can_retry
+            ]
+            for item in failed:
+                item.reset_to_pending()
+                self.update(item)
+            logger.debug(f"Reset {len(failed)} failed items to pending")
+            return len(failed)
+    
+    # =========================================================================
+    # Internal (call with self._lock held)
+    # =========================================================================
+    
+    def _flow(self, name: str) -> _Flow:
+        flow = self._flows.get(name)
+        if flow is None:
+            flow = _Flow(
+                name=name,
+                order=len(self._flows),
+                pass_value=self._vtime,
+                wait_counts=[0] * (len(self._wait_buckets) + 1),
+            )
+            self._flows[name] = flow
+        return flow
+    
+    def _enqueue(self, flow: _Flow, item: QueueItem) -> None:
+        if flow.pending == 0:
+            # Re-entering flows start at the current virtual time (no banked credit)
+            flow.pass_value = max(flow.pass_value, self._vtime)
+        heapq.heappush(flow.heap, item)
+        flow.pending += 1
+        self._queued[item.id] = (flow.name, time.monotonic())
+    
+    def _dequeue(self, item_id: str) -> None:
+        """Drop a pending item from its flow's count (heap entry goes stale)"""
+        queued = self._queued.pop(item_id, None)
+        if queued is not None:
+            self._flows[queued[0]].pending -= 1
+    
+    def _finish(self, item_id: str) -> None:
+        """Release an item's in-flight slot"""
+        name = self._in_flight.pop(item_id, None)
+        if name is not None:
+            self._flows[name].in_flight -= 1
+    
+    def _head(self, flow: _Flow) -> Optional[QueueItem]:
+        """Flow's next queued item, discarding stale heap entries"""
+        while flow.heap:
+            item = flow.heap[0]
+            if self._queued.get(item.id, (None,))[0] == flow.name:
+                return item
+            heapq.heappop(flow.heap)
+        return None
+    
+    def _observe_wait(self, flow: _Flow, seconds: float) -> None:
+        flow.wait_counts[bisect_left(self._wait_buckets, seconds)] += 1
+        flow.wait_sum += seconds
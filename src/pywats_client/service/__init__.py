@@ -34,6 +34,12 @@ from .async_converter_pool import (
     AsyncConversionItem,
     AsyncConversionItemState,
 )
+from .upload_concurrency import (
+    AdaptiveConcurrencyConfig,
+    AdaptiveConcurrencyLimiter,
+)
+from .content_index import ContentHashIndex
+from .file_archive import ArchiveEntry, FileArchive
 from .async_pending_queue import (
     AsyncPendingQueue,
     AsyncPendingQueueState,
@@ -48,6 +54,7 @@ from .async_ipc_client import (
     discover_services_async,
     ServiceDiscoveryAsync,
 )
+from .instance_registry import InstanceRecord, InstanceRegistry
 
 # Aliases for cleaner imports (async is the default)
 ConverterPool = AsyncConverterPool
@@ -63,6 +70,11 @@ __all__ = [
     'AsyncConverterPool',
     'AsyncConversionItem',
     'AsyncConversionItemState',
+    'AdaptiveConcurrencyConfig',
+    'AdaptiveConcurrencyLimiter',
+    'ContentHashIndex',
+    'FileArchive',
+    'ArchiveEntry',
     'AsyncPendingQueue',
     'AsyncPendingQueueState',
     # Async IPC (pure Python)
@@ -72,6 +84,8 @@ __all__ = [
     'InstanceInfo',
     'discover_services_async',
     'ServiceDiscoveryAsync',
+    'InstanceRecord',
+    'InstanceRegistry',
     # Aliases
     'ConverterPool',
     'PendingQueue',
@@ -14,15 +14,20 @@ See CLIENT_ASYNC_ARCHITECTURE.md for design details.
 """
 
 import asyncio
+import json
 import logging
 from pywats.core.logging import get_logger
 import os
 import signal
 import sys
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable, Tuple
+
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
 
 from pywats import AsyncWATS
 from pywats.core.exceptions import PyWATSError
@@ -75,6 +80,9 @@ class AsyncClientService:
     WATCHDOG_INTERVAL = 60.0
     PING_INTERVAL = 300.0  # 5 minutes
     REGISTER_INTERVAL = 3600.0  # 1 hour
+    HEARTBEAT_INTERVAL = 5.0  # Instance registry heartbeat
+    CONFIG_DEBOUNCE = 0.2  # Quiet period before applying a config file change
+    CONFIG_POLL_INTERVAL = 5.0  # Fallback when file notifications are unavailable
     
     def __init__(self, instance_id: str = "default") -> None:
         """
@@ -115,6 +123,9 @@ class AsyncClientService:
         self._health_port = int(os.environ.get('PYWATS_HEALTH_PORT', '8080'))
         self._health_server: Optional[Any] = None
         
+        # Instance registry for connectionless discovery
+        self._registry: Optional['InstanceRegistry'] = None
+        
         # Statistics
         self._stats: Dict[str, Any] = {
             "start_time": None,
@@ -223,13 +234,21 @@ class AsyncClientService:
             )
             logger.info("Registration timer started (1hr)")
             
+            # Content-hash index and file archive shared by pending queue and converter pool
+            content_index = self._create_content_index()
+            archive = self._create_file_archive()
+            archive_min_age = timedelta(hours=float(self.config.archive_min_age_hours))
+            
             # 5. Initialize async pending queue
             from .async_pending_queue import AsyncPendingQueue
             self._pending_queue = AsyncPendingQueue(
                 api=self.api,
                 reports_dir=self.config.get_reports_path(),
                 max_concurrent=self.config.max_concurrent_uploads,
-                max_queue_size=self.config.max_queue_size
+                max_queue_size=self.config.max_queue_size,
+                content_index=content_index,
+                archive=archive,
+                archive_min_age=archive_min_age,
             )
             self._tasks.append(
                 asyncio.create_task(
@@ -244,7 +263,10 @@ class AsyncClientService:
             self._converter_pool = AsyncConverterPool(
                 config=self.config,
                 api=self.api,
-                max_concurrent=10
+                max_concurrent=10,
+                content_index=content_index,
+                archive=archive,
+                archive_min_age=archive_min_age,
             )
             self._tasks.append(
                 asyncio.create_task(
@@ -279,6 +301,14 @@ class AsyncClientService:
             await self._start_health_server()
             
             self._set_status(AsyncServiceStatus.RUNNING)
+            
+            # 11. Publish heartbeats to the instance registry
+            self._tasks.append(
+                asyncio.create_task(
+                    self._safe_task(self._heartbeat_loop(), "heartbeat"),
+                    name="heartbeat"
+                )
+            )
             logger.info("AsyncClientService started successfully")
             
         except Exception as e:
@@ -374,6 +404,11 @@ class AsyncClientService:
         if self._health_server:
             await self._stop_health_server()
         
+        # Withdraw from the instance registry
+        if self._registry:
+            self._registry.remove(self.instance_id, pid=os.getpid())
+            self._registry = None
+        
         # Close API connection properly via context manager exit
         if self.api:
             try:
@@ -713,24 +748,146 @@ class AsyncClientService:
         # TODO: Implement client registration with server
         logger.debug("Registration update")
     
+    async def _heartbeat_loop(self) -> None:
+        """
+        Heartbeat loop - publishes this instance to the local registry.
+        
+        GUIs discover instances by reading the registry instead of
+        connecting to each one; a missed heartbeat marks us as dead.
+        """
+        from .instance_registry import InstanceRegistry
+        if self._registry is None:
+            self._registry = InstanceRegistry()
+        
+        try:
+            while not self._shutdown_event.is_set():
+                try:
+                    self._publish_heartbeat()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Heartbeat publish failed: {e}")
+                
+                try:
+                    await asyncio.wait_for(
+                        self._shutdown_event.wait(),
+                        timeout=self.HEARTBEAT_INTERVAL
+                    )
+                    break
+                except asyncio.TimeoutError:
+                    pass
+        except asyncio.CancelledError:
+            logger.debug("Heartbeat loop cancelled")
+            raise
+    
+    def _publish_heartbeat(self) -> None:
+        """Write this instance's registry record"""
+        from .instance_registry import InstanceRecord
+        self._registry.publish(InstanceRecord(
+            instance_id=self.instance_id,
+            pid=os.getpid(),
+            socket_name=f"pyWATS_Service_{self.instance_id}",
+            health_port=self._health_port if self._health_server else None,
+            started=self._stats.get("start_time"),
+            heartbeat=time.time(),
+            interval=self.HEARTBEAT_INTERVAL,
+            summary=self._heartbeat_summary(),
+        ))
+    
+    def _heartbeat_summary(self) -> Dict[str, Any]:
+        """Status counters published with each heartbeat (ServiceStatus fields)"""
+        queue = self._pending_queue.stats if self._pending_queue else {}
+        pool = self._converter_pool.stats if self._converter_pool else {}
+        return {
+            "status": self._status.value,
+            "api_status": self._stats.get("api_status", "Offline"),
+            "pending_count": queue.get("queued_files", 0),
+            "processing_count": queue.get("active_uploads", 0),
+            "completed_count": queue.get("successful", 0),
+            "failed_count": queue.get("errors", 0),
+            "converter_active": pool.get("active_conversions", 0),
+            "converter_pending": pool.get("queue_size", 0),
+            "uptime_seconds": self._get_uptime_seconds(),
+        }
+    
     async def _config_watch_loop(self) -> None:
         """
         Config file watcher loop.
         
-        Watches for configuration changes and hot-reloads.
+        Waits for filesystem notifications on the config file and hot-reloads
+        it. Bursts of events (editors that truncate, write and rename in
+        several steps) are debounced into one reload once the file has been
+        quiet for CONFIG_DEBOUNCE seconds. Falls back to mtime polling if
+        notifications are unavailable.
         """
         config_path = self.config.config_path
-        last_mtime = config_path.stat().st_mtime if config_path.exists() else 0
+        changed = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        
+        try:
+            observer = self._create_config_observer(
+                config_path, lambda: loop.call_soon_threadsafe(changed.set)
+            )
+            observer.start()
+        except Exception as e:
+            logger.warning(f"Config file notifications unavailable, polling instead: {e}")
+            await self._poll_config_file(config_path)
+            return
         
+        signature = self._config_signature(config_path)
+        try:
+            while not self._shutdown_event.is_set():
+                if not await self._wait_for_change(changed):
+                    break
+                
+                # Debounce: apply only after a full quiet period
+                while True:
+                    changed.clear()
+                    try:
+                        await asyncio.wait_for(changed.wait(), timeout=self.CONFIG_DEBOUNCE)
+                    except asyncio.TimeoutError:
+                        break
+                
+                try:
+                    current = self._config_signature(config_path)
+                    if current is None or current == signature:
+                        continue  # Deleted, or touched without a content change
+                    signature = current
+                    logger.info("Config file changed, reloading...")
+                    await self._reload_config()
+                except asyncio.CancelledError:
+                    raise  # Always re-raise CancelledError
+                except Exception as e:
+                    logger.exception(f"Config watch error: {e}")
+        except asyncio.CancelledError:
+            logger.debug("Config watch loop cancelled")
+            raise
+        finally:
+            observer.stop()
+            await asyncio.to_thread(observer.join, 5)
+    
+    async def _wait_for_change(self, changed: asyncio.Event) -> bool:
+        """Wait for a change notification; False if shutdown came first"""
+        change = asyncio.ensure_future(changed.wait())
+        shutdown = asyncio.ensure_future(self._shutdown_event.wait())
+        try:
+            await asyncio.wait({change, shutdown}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            change.cancel()
+            shutdown.cancel()
+        return not self._shutdown_event.is_set()
+    
+    async def _poll_config_file(self, config_path: Path) -> None:
+        """Fallback config watcher: poll the file's mtime"""
+        signature = self._config_signature(config_path)
         try:
             while not self._shutdown_event.is_set():
                 try:
-                    if config_path.exists():
-                        current_mtime = config_path.stat().st_mtime
-                        if current_mtime > last_mtime:
-                            logger.info("Config file changed, reloading...")
-                            await self._reload_config()
-                            last_mtime = current_mtime
+                    current = self._config_signature(config_path)
+                    if current is not None and current != signature:
+                        signature = current
+                        logger.info("Config file changed, reloading...")
+                        await self._reload_config()
                 except asyncio.CancelledError:
                     raise  # Always re-raise CancelledError
                 except Exception as e:
@@ -739,7 +896,7 @@ class AsyncClientService:
                 try:
                     await asyncio.wait_for(
                         self._shutdown_event.wait(),
-                        timeout=5.0  # Check every 5 seconds
+                        timeout=self.CONFIG_POLL_INTERVAL
                     )
                     break
                 except asyncio.TimeoutError:
@@ -748,18 +905,73 @@ class AsyncClientService:
             logger.debug("Config watch loop cancelled")
             raise
     
-    async def _reload_config(self) -> None:
-        """Reload configuration from file"""
+    @staticmethod
+    def _create_config_observer(config_path: Path, on_change: Callable[[], None]) -> Observer:
+        """Create a watchdog observer for the config file's directory"""
+        config_path = Path(config_path)
+        observer = Observer()
+        observer.schedule(
+            _ConfigFileEventHandler(config_path, on_change),
+            str(config_path.parent),
+            recursive=False
+        )
+        return observer
+    
+    @staticmethod
+    def _config_signature(config_path: Path) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of the config file, or None if it is missing"""
         try:
-            self.config = ClientConfig.load_for_instance(self.instance_id)
+            stat = os.stat(config_path)
+        except (OSError, TypeError):
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    async def _reload_config(self) -> bool:
+        """
+        Reload configuration from file.
+        
+        The file is parsed and validated before anything is applied; a file
+        that is unreadable or invalid (e.g. caught mid-write) leaves the
+        running configuration untouched.
+        
+        Returns:
+            True if the new configuration was applied
+        """
+        try:
+            config = await asyncio.to_thread(self._load_config_file)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Config file not loadable, keeping current configuration: {e}")
+            return False
+        
+        errors = config.validate()
+        if errors:
+            logger.warning(
+                f"Config file invalid, keeping current configuration: {'; '.join(errors)}"
+            )
+            return False
+        
+        try:
+            self.config = config
             
             # Update components with new config
             if self._converter_pool:
                 await self._converter_pool.reload_config(self.config)
             
             logger.info("Configuration reloaded")
+            return True
         except Exception as e:
             logger.exception(f"Config reload failed: {e}")
+            return False
+    
+    def _load_config_file(self) -> ClientConfig:
+        """Parse the config file without backup fallback"""
+        config_path = Path(self.config.config_path)
+        data = json.loads(config_path.read_text(encoding='utf-8'))
+        if not isinstance(data, dict):
+            raise ValueError("config root must be an object")
+        config = ClientConfig.from_dict(data)
+        config._config_path = config_path
+        return config
     
     # =========================================================================
     # IPC Server (for GUI communication)
@@ -786,6 +998,44 @@ class AsyncClientService:
                 logger.exception(f"IPC server stop failed: {e}")
             self._ipc_server = None
     
+    # =========================================================================
+    # Duplicate Suppression
+    # =========================================================================
+    
+    def _create_content_index(self) -> Optional['ContentHashIndex']:
+        """Create the content-hash index (None if disabled or unavailable)"""
+        if not self.config.duplicate_suppression_enabled:
+            return None
+        try:
+            from .content_index import ContentHashIndex
+            content_index = ContentHashIndex(
+                Path(self.config.data_path) / "content_index.jsonl",
+                retention=timedelta(days=float(self.config.duplicate_retention_days)),
+            )
+            logger.info(f"Duplicate suppression enabled ({len(content_index)} known hashes)")
+            return content_index
+        except Exception as e:
+            logger.warning(f"Duplicate suppression unavailable: {e}", exc_info=True)
+            return None
+    
+    def _create_file_archive(self) -> Optional['FileArchive']:
+        """Create the processed-file archive (None if disabled or unavailable)"""
+        if not self.config.archive_enabled:
+            return None
+        try:
+            from .file_archive import FileArchive
+            retention_days = float(self.config.archive_retention_days)
+            archive = FileArchive(
+                Path(self.config.data_path) / "archive",
+                retention=timedelta(days=retention_days) if retention_days > 0 else None,
+                max_bytes=int(float(self.config.archive_max_size_mb) * 1024 * 1024),
+            )
+            logger.info(f"File archive enabled ({len(archive)} archived files)")
+            return archive
+        except Exception as e:
+            logger.warning(f"File archive unavailable: {e}", exc_info=True)
+            return None
+    
     # =========================================================================
     # Health Server (for Docker/K8s)
     # =========================================================================
@@ -895,6 +1145,31 @@ class AsyncClientService:
         logger.info(f"Service status: {old_status.value} -> {status.value}")
 
 
+class _ConfigFileEventHandler(FileSystemEventHandler):
+    """
+    Watchdog event handler for the config file.
+    
+    Watches the config file's directory (editors and atomic writes replace
+    the file rather than modify it) and reports events that touch the file.
+    """
+    
+    # Read-only accesses, including the service's own reloads
+    _IGNORED = {"opened", "closed_no_write"}
+    
+    def __init__(self, config_path: Path, on_change: Callable[[], None]) -> None:
+        super().__init__()
+        self.config_path = Path(config_path)
+        self.on_change = on_change
+    
+    def on_any_event(self, event) -> None:
+        """Forward writes, creates, deletes and renames of the config file"""
+        if event.is_directory or event.event_type in self._IGNORED:
+            return
+        paths = (event.src_path, getattr(event, 'dest_path', ''))
+        if any(path and Path(os.fsdecode(path)) == self.config_path for path in paths):
+            self.on_change()
+
+
 # =========================================================================
 # Entry Points
 # =========================================================================
@@ -10,23 +10,38 @@ Benefits over sync ConverterPool:
 - Automatic backpressure via semaphore
 - Efficient batch processing
 - **Sandboxed execution** for untrusted converters
+- **Adaptive upload concurrency** (AIMD) for the submit stage
+- **Duplicate suppression** by source and report content hash
+- **Incremental reload**: only converters whose config changed are rebuilt
+- **Fair scheduling** across converters (weights, in-flight caps, depth limits)
 
 See CLIENT_ASYNC_ARCHITECTURE.md for design details.
 """
 
 import asyncio
+import json
 import logging
+import threading
+import time
 from pywats.core.logging import get_logger
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Optional, List, Dict, Any, TYPE_CHECKING
+from typing import Optional, List, Dict, Any, Set, Tuple, TYPE_CHECKING
 
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
 # Priority queue implementation
-from pywats.queue import MemoryQueue, AsyncQueueAdapter, QueueItem
+from pywats.queue import AsyncQueueAdapter, QueueItem
+from pywats.domains.report import WSJFDocument
+from pywats.core.circuit_breaker import CircuitState
+
+from .upload_concurrency import AdaptiveConcurrencyConfig, AdaptiveConcurrencyLimiter
+from .content_index import ContentHashIndex, hash_bytes, hash_file, hash_report
+from .file_archive import ArchiveEntry, FileArchive
+from ..exceptions import QueueFullError
+from ..queue.fair_queue import FairQueue
 
 # Import sandbox for secure converter execution
 from ..converters.sandbox import (
@@ -79,6 +94,7 @@ class AsyncConversionItem:
         self.process_start: Optional[datetime] = None
         self.process_end: Optional[datetime] = None
         self.error: Optional[str] = None
+        self.duplicate_of: Optional[str] = None  # Ref of the earlier upload if skipped
         self.file_date = datetime.fromtimestamp(
             file_path.stat().st_mtime
         ) if file_path.exists() else None
@@ -116,6 +132,8 @@ class AsyncConverterPool:
         await pool.stop()
     """
     
+    ARCHIVE_COMPACT_INTERVAL = 300.0  # Seconds between Done/Error folder compactions
+    
     def __init__(
         self,
         config: 'ClientConfig',
@@ -123,6 +141,11 @@ class AsyncConverterPool:
         max_concurrent: int = 10,
         enable_sandbox: bool = True,
         sandbox_config: Optional[SandboxConfig] = None,
+        adaptive_uploads: bool = True,
+        upload_concurrency: Optional[AdaptiveConcurrencyConfig] = None,
+        content_index: Optional[ContentHashIndex] = None,
+        archive: Optional[FileArchive] = None,
+        archive_min_age: timedelta = timedelta(hours=24),
     ) -> None:
         """
         Initialize async converter pool.
@@ -133,6 +156,15 @@ class AsyncConverterPool:
             max_concurrent: Maximum concurrent conversions
             enable_sandbox: Enable sandboxed execution for converters (default: True)
             sandbox_config: Custom sandbox configuration (uses defaults if not provided)
+            adaptive_uploads: Adapt concurrency of report submits to server
+                latency, errors and circuit breaker state (default: True)
+            upload_concurrency: Limiter configuration (default: up to max_concurrent)
+            content_index: Content-hash index for duplicate suppression
+                (None = disabled)
+            archive: Compressed archive for processed files; Done/Error
+                folders are compacted into it when idle and the ZIP
+                post-process action stages files for it (None = disabled)
+            archive_min_age: Leave Done/Error files younger than this in place
         """
         self.config = config
         self.api = api
@@ -143,28 +175,49 @@ class AsyncConverterPool:
         self._sandbox: Optional[ConverterSandbox] = None
         self._sandbox_config = sandbox_config
         
-        # Priority queue using MemoryQueue foundation
-        # This gives us heap-based priority ordering (tested, reliable)
-        memory_queue = MemoryQueue(max_size=None)  # No size limit for converter queue
-        self._queue = AsyncQueueAdapter(memory_queue)
+        # Priority queue with weighted fair scheduling across converters
+        # (one flow per converter, priority order kept within and across flows)
+        self._fair_queue = FairQueue(max_size=None, flow_key="converter")
+        self._queue = AsyncQueueAdapter(self._fair_queue)
+        # Converters with files left on disk because their queue was full
+        self._backlogged: Set[str] = set()
         
         # Semaphore for concurrency control
         self._semaphore = asyncio.Semaphore(max_concurrent)
         self._active_count = 0  # Track active conversions explicitly (not _semaphore._value)
         
+        # Adaptive limiter for the submit stage (within the semaphore)
+        self._upload_limiter: Optional[AdaptiveConcurrencyLimiter] = None
+        if adaptive_uploads:
+            self._upload_limiter = AdaptiveConcurrencyLimiter(
+                upload_concurrency or AdaptiveConcurrencyConfig(max_limit=max_concurrent),
+                circuit_state=self._circuit_state,
+            )
+        
         # Event loop reference (for thread-safe signaling from watchdog)
         self._loop: Optional[asyncio.AbstractEventLoop] = None
         
+        # Duplicate suppression (hash key -> outcome of the in-flight original)
+        self._content_index = content_index
+        self._claims: Dict[str, asyncio.Future] = {}
+        
+        # Compressed archive of processed files (compacted when idle)
+        self._archive = archive
+        self._archive_min_age = archive_min_age
+        self._archive_compacted_at: Optional[float] = None  # time.monotonic()
+        
         # Converter instances
         self._converters: List['Converter'] = []
+        # Config key -> (config fingerprint, converter) for incremental reload
+        self._converter_configs: Dict[str, Tuple[str, 'Converter']] = {}
         
-        # File watchers
-        self._observers: List[Observer] = []
+        # File watchers (id(converter) -> observer)
+        self._observers: Dict[int, Observer] = {}
         
         # State
         self._running = False
         self._stop_event = asyncio.Event()
-        self._active_tasks: List[asyncio.Task] = []
+        self._active_tasks: Set[asyncio.Task] = set()  # At most max_concurrent (see run)
         
         # Statistics
         self._stats: Dict[str, Any] = {
@@ -175,6 +228,8 @@ class AsyncConverterPool:
             "queue_size": 0,
             "active_conversions": 0,
             "sandbox_enabled": enable_sandbox,
+            "duplicates_skipped": 0,
+            "duplicate_bytes_saved": 0,
         }
         
         # Startup scan deduplication (race condition prevention)
@@ -183,6 +238,8 @@ class AsyncConverterPool:
         self._startup_scan_files: Set[Path] = set()
         self._startup_scan_complete: bool = False
         self._startup_scan_enabled: bool = True  # Default enabled (safer)
+        self._scan_lock = threading.Lock()  # Scan vs. watchdog thread dedupe
+        self._scan_generation = 0  # Latest scan window (see _clear_startup_scan_set)
         
         logger.info(
             f"AsyncConverterPool initialized (max_concurrent={max_concurrent}, "
@@ -194,7 +251,25 @@ class AsyncConverterPool:
         """Get pool statistics"""
         self._stats["queue_size"] = self._queue.size
         self._stats["active_conversions"] = self._active_count
-        return self._stats.copy()
+        stats = self._stats.copy()
+        if self._upload_limiter:
+            stats["upload_concurrency"] = self._upload_limiter.snapshot()
+        if self._content_index is not None:
+            stats["content_index"] = self._content_index.stats.to_dict()
+        if self._archive is not None:
+            stats["archive"] = self._archive.stats.to_dict()
+        stats["converter_queues"] = self.converter_queues
+        return stats
+    
+    @property
+    def converter_queues(self) -> Dict[str, Dict[str, Any]]:
+        """Per-converter queue depth, in-flight count and wait-time histogram"""
+        return self._fair_queue.flow_stats()
+    
+    @property
+    def upload_limiter(self) -> Optional[AdaptiveConcurrencyLimiter]:
+        """Adaptive limiter for report submits (None if disabled)"""
+        return self._upload_limiter
     
     @property
     def is_running(self) -> bool:
@@ -235,35 +310,33 @@ class AsyncConverterPool:
             
             # Process queue until stopped
             while not self._stop_event.is_set():
+                # Admission: only dequeue what can start right now, so a
+                # backlog stays in the queue (pending) instead of becoming
+                # thousands of tasks parked on the semaphore
+                slots = await self._reserve_slots()
+                if self._stop_event.is_set():
+                    self._release_slots(slots)
+                    break
+                
+                # Wait for items with timeout (allows checking stop event)
                 try:
-                    # Wait for item with timeout (allows checking stop event)
-                    # AsyncQueueAdapter.get() returns QueueItem, extract data
-                    queue_item = await self._queue.get(timeout=1.0)
-                    
-                    if queue_item:
-                        # Extract the AsyncConversionItem from queue item data
-                        item = queue_item.data
-                        
-                        # Mark as processing in queue
-                        queue_item.mark_processing()
-                        self._queue.update(queue_item)
-                        
-                        # Process with semaphore limiting concurrency
-                        task = asyncio.create_task(
-                            self._process_with_limit(item, queue_item)
-                        )
-                        self._active_tasks.append(task)
-                        
-                        # Clean up completed tasks
-                        self._active_tasks = [
-                            t for t in self._active_tasks if not t.done()
-                        ]
-                    
-                except asyncio.TimeoutError:
-                    # No item within timeout - check for archive processing
-                    if self._queue.is_empty:
+                    batch = await self._queue.get_batch(max_items=slots, timeout=1.0)
+                except asyncio.CancelledError:
+                    self._release_slots(slots)
+                    raise
+                self._release_slots(slots - len(batch))
+                
+                if not batch:
+                    # No items within timeout - check for archive processing
+                    # (finished items stay in the queue, so "idle" means
+                    # nothing pending and nothing in flight)
+                    if self._fair_queue.count_pending() == 0 and self._active_count == 0:
                         await self._process_archive_queues()
+                        await self._compact_archive()
                     continue
+                
+                for queue_item in batch:
+                    self._admit(queue_item)
                     
         except asyncio.CancelledError:
             logger.info("Pool cancelled")
@@ -283,20 +356,21 @@ class AsyncConverterPool:
         self._stop_event.set()
         
         # Stop file watchers
-        for observer in self._observers:
+        for observer in self._observers.values():
             observer.stop()
         self._observers.clear()
         
         # Wait for active tasks (with timeout)
-        if self._active_tasks:
+        active_tasks = list(self._active_tasks)
+        if active_tasks:
             try:
                 await asyncio.wait_for(
-                    asyncio.gather(*self._active_tasks, return_exceptions=True),
+                    asyncio.gather(*active_tasks, return_exceptions=True),
                     timeout=30.0
                 )
             except asyncio.TimeoutError:
                 logger.warning("Conversion tasks timed out, cancelling...", exc_info=True)
-                for task in self._active_tasks:
+                for task in active_tasks:
                     task.cancel()
         
         self._active_tasks.clear()
@@ -324,7 +398,7 @@ class AsyncConverterPool:
         self._stop_event.set()  # Signal to stop processing new items from queue
         
         # Stop file watchers (no new files detected)
-        for observer in self._observers:
+        for observer in self._observers.values():
             observer.stop()
         self._observers.clear()
     
@@ -332,20 +406,75 @@ class AsyncConverterPool:
         """Get number of currently active conversions"""
         return self._active_count
     
-    async def reload_config(self, config: 'ClientConfig') -> None:
+    async def reload_config(self, config: 'ClientConfig') -> Dict[str, int]:
         """
-        Reload configuration.
+        Reload configuration incrementally.
+        
+        Converters whose configuration is unchanged keep their instance and
+        their running watcher. Changed and added converters are rebuilt, their
+        watchers started, and their folders gap-scanned so files dropped while
+        no watcher was running are still queued. Removed converters' watchers
+        are stopped. Items already queued finish with the converter they were
+        queued with.
         
-        Updates converters and watchers.
+        Returns:
+            Dict with counts: 'added', 'changed', 'removed', 'unchanged'
         """
         logger.info("Reloading converter pool config...")
         self.config = config
+        stats = {'added': 0, 'changed': 0, 'removed': 0, 'unchanged': 0}
+        
+        previous = self._converter_configs
+        configs: Dict[str, Tuple[str, 'Converter']] = {}
+        converters: List['Converter'] = []
+        rebuilt: List['Converter'] = []
+        
+        for key, fingerprint, conv_config in self._converter_specs():
+            current = previous.get(key)
+            if current is not None and current[0] == fingerprint:
+                configs[key] = current
+                converters.append(current[1])
+                stats['unchanged'] += 1
+                continue
+            
+            stats['changed' if current is not None else 'added'] += 1
+            try:
+                converter = await self._create_converter(conv_config)
+            except Exception as e:
+                logger.exception(f"Failed to load converter {key}: {e}")
+                continue
+            if converter:
+                self._configure_flow(converter, conv_config)
+                configs[key] = (fingerprint, converter)
+                converters.append(converter)
+                rebuilt.append(converter)
+                logger.info(f"Loaded converter: {converter.name}")
+        
+        # Stop watchers of converters that were replaced or removed
+        kept = {id(c) for c in converters}
+        for converter in self._converters:
+            if id(converter) not in kept:
+                await self._stop_watcher(converter)
+        stats['removed'] = sum(1 for key in previous if key not in configs)
+        
+        self._converters = converters
+        self._converter_configs = configs
+        
+        if self._running and rebuilt:
+            # Open the dedupe window, then watch, then scan: the scan covers
+            # the restart gap and the scan set deduplicates files the new
+            # watchers see before the scan reaches them
+            if self._startup_scan_enabled:
+                self._open_scan_window()
+            for converter in rebuilt:
+                self._start_watcher(converter)
+            await self._scan_existing_files(rebuilt, window_open=True)
         
-        # Reload converters
-        await self._load_converters()
-        
-        # Restart watchers
-        await self._restart_watchers()
+        logger.info(
+            f"Converter config reloaded: {stats['added']} added, {stats['changed']} changed, "
+            f"{stats['removed']} removed, {stats['unchanged']} unchanged"
+        )
+        return stats
     
     # =========================================================================
     # Converter Management
@@ -354,16 +483,16 @@ class AsyncConverterPool:
     async def _load_converters(self) -> None:
         """Load converters from configuration"""
         self._converters.clear()
+        self._converter_configs.clear()
         
         try:
-            # Get converter configs from config.converters property
-            converter_configs = self.config.converters
-            
-            for conv_config in converter_configs:
+            for key, fingerprint, conv_config in self._converter_specs():
                 try:
                     converter = await self._create_converter(conv_config)
                     if converter:
+                        self._configure_flow(converter, conv_config)
                         self._converters.append(converter)
+                        self._converter_configs[key] = (fingerprint, converter)
                         logger.info(f"Loaded converter: {converter.name}")
                 except Exception as e:
                     logger.exception(f"Failed to load converter: {e}")
@@ -373,6 +502,37 @@ class AsyncConverterPool:
         except Exception as e:
             logger.exception(f"Failed to load converters: {e}")
     
+    def _configure_flow(self, converter: 'Converter', conv_config: Any) -> None:
+        """Apply a converter's fair-scheduling settings to its queue flow"""
+        try:
+            self._fair_queue.configure_flow(
+                converter.name,
+                weight=conv_config.get("weight", 1.0),
+                max_in_flight=conv_config.get("max_in_flight", 0),
+                max_depth=conv_config.get("max_queue_depth", 0),
+            )
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Invalid scheduling settings for {converter.name}, using defaults: {e}")
+    
+    def _converter_specs(self) -> List[Tuple[str, str, Any]]:
+        """
+        Converter configs as (key, fingerprint, config).
+        
+        The key identifies a converter across reloads (its name, else its
+        watch folder); the fingerprint changes whenever any setting does.
+        """
+        specs = []
+        seen: Set[str] = set()
+        for index, conv_config in enumerate(self.config.converters):
+            data = conv_config.to_dict() if hasattr(conv_config, 'to_dict') else dict(conv_config)
+            key = str(data.get("name") or data.get("watch_folder") or index)
+            if key in seen:
+                key = f"{key}#{index}"
+            seen.add(key)
+            fingerprint = json.dumps(data, sort_keys=True, default=str)
+            specs.append((key, fingerprint, conv_config))
+        return specs
+    
     async def _create_converter(
         self,
         config: Dict[str, Any]
@@ -408,43 +568,60 @@ class AsyncConverterPool:
     async def _start_watchers(self) -> None:
         """Start file system watchers for all converters"""
         for converter in self._converters:
-            try:
-                observer = self._create_watcher(converter)
-                if observer:
-                    observer.start()
-                    self._observers.append(observer)
-                    logger.info(f"Started watcher for {converter.name}")
-            except Exception as e:
-                logger.exception(f"Failed to start watcher for {converter.name}: {e}")
+            self._start_watcher(converter)
     
-    async def _restart_watchers(self) -> None:
-        """Restart all file watchers"""
-        # Stop existing
-        for observer in self._observers:
-            observer.stop()
-            observer.join(timeout=5)
-        self._observers.clear()
-        
-        # Start new
-        await self._start_watchers()
+    def _start_watcher(self, converter: 'Converter') -> None:
+        """Start the file system watcher for one converter"""
+        try:
+            observer = self._create_watcher(converter)
+            if observer:
+                observer.start()
+                self._observers[id(converter)] = observer
+                logger.info(f"Started watcher for {converter.name}")
+        except Exception as e:
+            logger.exception(f"Failed to start watcher for {converter.name}: {e}")
+    
+    async def _stop_watcher(self, converter: 'Converter') -> None:
+        """Stop one converter's watcher without blocking the event loop"""
+        observer = self._observers.pop(id(converter), None)
+        if observer is None:
+            return
+        observer.stop()
+        await asyncio.to_thread(observer.join, 5)
+        logger.info(f"Stopped watcher for {converter.name}")
     
-    async def _scan_existing_files(self) -> Dict[str, int]:
+    async def _scan_existing_files(
+        self,
+        converters: Optional[List['Converter']] = None,
+        force: bool = False,
+        window_open: bool = False
+    ) -> Dict[str, int]:
         """
         Scan watch directories for existing files on startup.
         
         Prevents data loss when files are dropped during system downtime.
         Files are queued before watchers start to avoid race conditions.
+        Also used after a reload to gap-scan the folders of restarted
+        watchers, and to pick up files left on disk while a converter's
+        queue was full.
+        
+        Args:
+            converters: Converters to scan (default: all)
+            force: Scan even if startup scanning is disabled
+            window_open: The caller already opened the dedupe window
+                (before starting watchers)
         
         Returns:
             Dict with statistics:
             - 'scanned': Total files examined
             - 'queued': Files queued for processing
             - 'skipped': Files skipped (already queued, wrong extension)
+            - 'deferred': Files left on disk (converter queue full)
             - 'errors': Files that caused errors
         """
-        if not self._startup_scan_enabled:
+        if not self._startup_scan_enabled and not force:
             logger.info("Startup scan disabled in configuration")
-            return {'scanned': 0, 'queued': 0, 'skipped': 0, 'errors': 0}
+            return {'scanned': 0, 'queued': 0, 'skipped': 0, 'deferred': 0, 'errors': 0}
         
         logger.info("Starting scan for existing files in watch directories...")
         
@@ -452,13 +629,17 @@ class AsyncConverterPool:
             'scanned': 0,
             'queued': 0,
             'skipped': 0,
+            'deferred': 0,
             'errors': 0
         }
         
         scan_start = datetime.now()
         
+        if not window_open:
+            self._open_scan_window()
+        
         try:
-            for converter in self._converters:
+            for converter in (self._converters if converters is None else converters):
                 # Skip if no watch path configured
                 if not converter.watch_path or not converter.watch_path.exists():
                     logger.debug(f"Skip scan for {converter.name} (no watch path)")
@@ -484,7 +665,7 @@ class AsyncConverterPool:
                 )
                 
                 # Queue each file
-                for file_path in files_to_scan:
+                for index, file_path in enumerate(files_to_scan):
                     stats['scanned'] += 1
                     
                     try:
@@ -494,8 +675,11 @@ class AsyncConverterPool:
                             stats['skipped'] += 1
                             continue
                         
-                        # Check if file in startup scan set (shouldn't happen, but safety)
-                        if file_path in self._startup_scan_files:
+                        # Check if file in scan set (queued by a watcher or earlier scan)
+                        with self._scan_lock:
+                            seen = file_path in self._startup_scan_files
+                            self._startup_scan_files.add(file_path)
+                        if seen:
                             logger.debug(f"Skip {file_path.name} (duplicate in scan)")
                             stats['skipped'] += 1
                             continue
@@ -504,14 +688,30 @@ class AsyncConverterPool:
                         priority = getattr(converter, 'priority', 5)
                         item = AsyncConversionItem(file_path, converter, priority=priority)
                         
-                        self._queue.put_nowait(
-                            data=item,
-                            priority=priority,
-                            metadata={'file': str(file_path), 'converter': converter.name}
-                        )
+                        try:
+                            queued = self._queue.put_nowait(
+                                data=item,
+                                priority=priority,
+                                item_id=str(file_path),
+                                metadata={'file': str(file_path), 'converter': converter.name}
+                            )
+                        except QueueFullError:
+                            # Leave the rest on disk until the queue drains
+                            with self._scan_lock:
+                                self._startup_scan_files.discard(file_path)
+                            self._backlogged.add(converter.name)
+                            stats['deferred'] += len(files_to_scan) - index
+                            logger.info(
+                                f"{converter.name} queue full, "
+                                f"{len(files_to_scan) - index} files left for later"
+                            )
+                            break
+                        
+                        if queued.data is not item:
+                            logger.debug(f"Skip {file_path.name} (already in queue)")
+                            stats['skipped'] += 1
+                            continue
                         
-                        # Track in startup scan set (deduplicate watchdog events)
-                        self._startup_scan_files.add(file_path)
                         stats['queued'] += 1
                         
                         logger.debug(
@@ -524,7 +724,7 @@ class AsyncConverterPool:
                         stats['errors'] += 1
             
             # Schedule cleanup of deduplication set (after watchdog event buffer clears)
-            asyncio.create_task(self._clear_startup_scan_set())
+            asyncio.create_task(self._clear_startup_scan_set(self._scan_generation))
             
         except Exception as e:
             logger.exception(f"Startup scan failed: {e}")
@@ -534,11 +734,21 @@ class AsyncConverterPool:
         
         logger.info(
             f"Startup scan complete: {stats['queued']} files queued, "
-            f"{stats['skipped']} skipped, {stats['errors']} errors ({scan_duration:.2f}s)"
+            f"{stats['skipped']} skipped, {stats['deferred']} deferred, "
+            f"{stats['errors']} errors ({scan_duration:.2f}s)"
         )
         
         return stats
     
+    def _open_scan_window(self) -> None:
+        """
+        Open a dedupe window: watchdog events for files a scan queues (and
+        files a watcher queued first) are recognised until it closes.
+        """
+        with self._scan_lock:
+            self._scan_generation += 1
+            self._startup_scan_complete = False
+    
     def _is_file_queued(self, file_path: Path) -> bool:
         """
         Check if file is already queued (has .queued marker).
@@ -548,18 +758,22 @@ class AsyncConverterPool:
         queued_marker = file_path.parent / f"{file_path.name}.queued"
         return queued_marker.exists()
     
-    async def _clear_startup_scan_set(self) -> None:
+    async def _clear_startup_scan_set(self, generation: Optional[int] = None) -> None:
         """
         Clear startup scan tracking set after buffer time.
         
         Waits 5 seconds for watchdog to process any buffered events,
-        then clears the deduplication set to free memory.
+        then clears the deduplication set to free memory. Skipped if a
+        newer scan has opened its own window in the meantime.
         """
         await asyncio.sleep(5.0)  # Buffer time for delayed watchdog events
+        if generation is not None and generation != self._scan_generation:
+            return
         
-        count = len(self._startup_scan_files)
-        self._startup_scan_files.clear()
-        self._startup_scan_complete = True
+        with self._scan_lock:
+            count = len(self._startup_scan_files)
+            self._startup_scan_files.clear()
+            self._startup_scan_complete = True
         
         logger.debug(f"Cleared startup scan set ({count} files tracked)")
     
@@ -592,12 +806,16 @@ class AsyncConverterPool:
         if not converter.matches_file(file_path):
             return
         
-        # Deduplicate against startup scan
-        if not self._startup_scan_complete and file_path in self._startup_scan_files:
-            logger.debug(
-                f"Skip {file_path.name} (already queued in startup scan)"
-            )
-            return
+        # Deduplicate against a scan window (startup or reload gap scan)
+        if not self._startup_scan_complete:
+            with self._scan_lock:
+                seen = file_path in self._startup_scan_files
+                self._startup_scan_files.add(file_path)
+            if seen:
+                logger.debug(
+                    f"Skip {file_path.name} (already queued in startup scan)"
+                )
+                return
         
         # Get priority from converter (default to 5 if not set)
         priority = getattr(converter, 'priority', 5)
@@ -609,11 +827,18 @@ class AsyncConverterPool:
             self._queue.put_nowait(
                 data=item,
                 priority=priority,
+                item_id=str(file_path),
                 metadata={'file': str(file_path), 'converter': converter.name}
             )
             logger.debug(
                 f"Queued (priority={priority}): {file_path.name} via {converter.name}"
             )
+        except QueueFullError:
+            # Stays on disk; rescanned once the converter's queue drains
+            with self._scan_lock:
+                self._startup_scan_files.discard(file_path)
+            self._backlogged.add(converter.name)
+            logger.debug(f"Deferred {file_path.name}: {converter.name} queue is full")
         except Exception as e:
             logger.warning(f"Cannot queue {file_path.name}: {e}", exc_info=True)
     
@@ -621,26 +846,77 @@ class AsyncConverterPool:
     # Conversion Processing
     # =========================================================================
     
-    async def _process_with_limit(
+    async def _reserve_slots(self) -> int:
+        """
+        Wait for at least one free conversion slot, then take every free one.
+        
+        Returns:
+            Number of semaphore slots now held by the caller
+        """
+        await self._semaphore.acquire()
+        slots = 1
+        # acquire() on an unlocked semaphore completes without suspending
+        while slots < self._max_concurrent and not self._semaphore.locked():
+            await self._semaphore.acquire()
+            slots += 1
+        return slots
+    
+    def _release_slots(self, count: int) -> None:
+        """Return reserved slots that were not used."""
+        for _ in range(count):
+            self._semaphore.release()
+    
+    def _admit(self, queue_item: 'QueueItem') -> None:
+        """
+        Start processing a dequeued item on a slot reserved by run().
+        
+        The slot is released by the task's done-callback, so it is returned
+        even if the task is cancelled before it starts.
+        """
+        # Mark as processing in queue (only now that it actually runs)
+        queue_item.mark_processing()
+        self._queue.update(queue_item)
+        
+        task = asyncio.create_task(
+            self._process_admitted(queue_item.data, queue_item)
+        )
+        self._active_tasks.add(task)
+        task.add_done_callback(self._on_task_done)
+    
+    def _on_task_done(self, task: asyncio.Task) -> None:
+        self._active_tasks.discard(task)
+        self._semaphore.release()
+    
+    async def _process_admitted(
         self,
         item: AsyncConversionItem,
         queue_item: 'QueueItem'
     ) -> None:
-        """Process conversion item with semaphore limiting"""
-        async with self._semaphore:
-            self._active_count += 1
-            try:
-                await self._process_item(item)
-                # Mark completed in queue
-                queue_item.mark_completed()
-            except Exception as e:
-                # Mark failed in queue
-                queue_item.mark_failed(str(e))
-                logger.exception(f"Conversion failed: {item.file_path.name}: {e}")
-            finally:
-                self._active_count -= 1
-                # Update queue item status
-                self._queue.update(queue_item)
+        """Process conversion item on an already held slot"""
+        self._active_count += 1
+        try:
+            await self._process_item(item)
+            # Mark completed in queue
+            queue_item.mark_completed()
+        except Exception as e:
+            # Mark failed in queue
+            queue_item.mark_failed(str(e))
+            logger.exception(f"Conversion failed: {item.file_path.name}: {e}")
+        finally:
+            self._active_count -= 1
+            # Update queue item status (frees the converter's in-flight slot)
+            self._queue.update(queue_item)
+            self._queue.notify()
+            self._resume_backlog(item.converter.name)
+    
+    def _resume_backlog(self, name: str) -> None:
+        """Rescan a converter's folder for deferred files once its queue is half empty"""
+        if name not in self._backlogged or self._fair_queue.fill_ratio(name) > 0.5:
+            return
+        self._backlogged.discard(name)
+        converters = [c for c in self._converters if c.name == name]
+        if converters and self._running:
+            asyncio.create_task(self._scan_existing_files(converters, force=True))
     
     async def _process_item(self, item: AsyncConversionItem) -> None:
         """
@@ -651,13 +927,24 @@ class AsyncConverterPool:
         2. Convert (sandboxed subprocess OR thread pool)
         3. Submit to WATS (async HTTP)
         4. Handle post-processing
+        
+        With a content index, a source file or report already uploaded
+        within the retention window is not converted/uploaded again.
         """
         item.state = AsyncConversionItemState.PROCESSING
         item.process_start = datetime.now()
         
         logger.info(f"Processing: {item.file_path.name}")
         
+        claims: List[str] = []
         try:
+            # 0. Skip source files that were already uploaded
+            source_hash, source_size = await self._hash_source(item)
+            duplicate = await self._claim(ContentHashIndex.SOURCE, source_hash, source_size, claims)
+            if duplicate is not None:
+                await self._skip_duplicate(item, duplicate, source_size)
+                return
+            
             # Determine if sandbox should be used for this converter
             use_sandbox = self._enable_sandbox and self._should_use_sandbox(item.converter)
             
@@ -675,8 +962,31 @@ class AsyncConverterPool:
                 self._stats["errors"] += 1
                 return
             
+            # Skip reports that were already uploaded (e.g. re-exported under a new name)
+            report_hash = None
+            if self._content_index is not None:
+                report_hash = await asyncio.to_thread(hash_report, report)
+            duplicate = await self._claim(ContentHashIndex.REPORT, report_hash, source_size, claims)
+            if duplicate is not None:
+                if isinstance(report, WSJFDocument):
+                    report.close()
+                await self._content_index.add_many_async([(ContentHashIndex.SOURCE, source_hash, duplicate)])
+                await self._skip_duplicate(item, duplicate, source_size)
+                return
+            
             # 3. Submit to WATS (async HTTP)
-            await self.api.report.submit(report)
+            try:
+                report_id = await self._submit(report)
+            finally:
+                if isinstance(report, WSJFDocument):
+                    report.close()  # Releases the spooled file
+            
+            if self._content_index is not None:
+                ref = str(report_id) if report_id is not None else item.file_path.name
+                await self._content_index.add_many_async([
+                    (ContentHashIndex.SOURCE, source_hash, ref),
+                    (ContentHashIndex.REPORT, report_hash, ref),
+                ])
             
             # 4. Post-processing (move/delete/archive file)
             await self._post_process(item)
@@ -704,6 +1014,92 @@ class AsyncConverterPool:
             
             # Handle error (move to error folder, etc.)
             await self._handle_error(item, e)
+        
+        finally:
+            for key in claims:
+                self._release_claim(key)
+    
+    async def _submit(self, report: Any) -> Optional[str]:
+        """Submit a report, under the adaptive limiter when enabled. Returns the report id."""
+        if not self._upload_limiter:
+            return await self.api.report.submit(report)
+        
+        async with self._upload_limiter.slot() as slot:
+            report_id = await self.api.report.submit(report)
+            slot.success()  # Answered without raising (even if no id came back)
+        return report_id
+    
+    # =========================================================================
+    # Duplicate Suppression
+    # =========================================================================
+    
+    async def _hash_source(self, item: AsyncConversionItem) -> Tuple[Optional[str], int]:
+        """Hash and size of the source file (None if disabled or unreadable)"""
+        if self._content_index is None:
+            return None, 0
+        try:
+            size = item.file_path.stat().st_size
+            return await asyncio.to_thread(hash_file, item.file_path), size
+        except OSError as e:
+            logger.debug(f"Cannot hash {item.file_path.name}: {e}")
+            return None, 0
+    
+    async def _claim(
+        self,
+        kind: str,
+        digest: Optional[str],
+        size: int,
+        claims: List[str],
+    ) -> Optional[str]:
+        """
+        Check a hash against the index and claim it for this item.
+        
+        If the same content is being processed by another item, waits for
+        that item and re-checks, so concurrent drops of one file upload once.
+        
+        Returns:
+            Ref of the earlier upload if this is a duplicate, else None
+            (the hash is then claimed and added to ``claims``).
+        """
+        if self._content_index is None or digest is None:
+            return None
+        key = f"{kind}:{digest}"
+        while True:
+            entry = self._content_index.lookup(kind, digest, size)
+            if entry is not None:
+                return entry.ref or "unknown"
+            pending = self._claims.get(key)
+            if pending is None:
+                self._claims[key] = asyncio.get_running_loop().create_future()
+                claims.append(key)
+                return None
+            await asyncio.shield(pending)
+    
+    def _release_claim(self, key: str) -> None:
+        pending = self._claims.pop(key, None)
+        if pending is not None and not pending.done():
+            pending.set_result(None)
+    
+    async def _skip_duplicate(self, item: AsyncConversionItem, ref: str, size: int) -> None:
+        """Complete a duplicate without uploading, linking it to the original"""
+        item.duplicate_of = ref
+        await self._post_process(item)
+        
+        item.state = AsyncConversionItemState.COMPLETED
+        item.process_end = datetime.now()
+        
+        self._stats["total_processed"] += 1
+        self._stats["duplicates_skipped"] += 1
+        self._stats["duplicate_bytes_saved"] += size
+        
+        logger.info(f"Skipped duplicate: {item.file_path.name} (already uploaded as {ref})")
+    
+    def _circuit_state(self) -> Optional[CircuitState]:
+        """State of the API client's circuit breaker (None if unavailable)"""
+        http_client = getattr(self.api, '_http_client', None)
+        breaker = getattr(http_client, '_circuit_breaker', None)
+        state = getattr(breaker, 'state', None)
+        return state if isinstance(state, CircuitState) else None
     
     def _should_use_sandbox(self, converter: 'Converter') -> bool:
         """
@@ -829,6 +1225,7 @@ class AsyncConverterPool:
                 if report is None:
                     return None
                 # If it's a Pydantic model, dump to dict; otherwise pass through
+                # (dicts and streamed WSJFDocuments are submitted as-is)
                 if hasattr(report, 'model_dump'):
                     return report.model_dump(by_alias=True, exclude_none=True, mode='json')
                 return report
@@ -868,6 +1265,7 @@ class AsyncConverterPool:
         Actions based on converter config:
         - Delete: Remove source file
         - Move: Move to archive folder
+        - Zip: Add to the compressed archive (Move if no archive)
         - Nothing: Leave in place
         """
         from ..converters.models import PostProcessAction
@@ -877,7 +1275,13 @@ class AsyncConverterPool:
         if action == PostProcessAction.DELETE:
             await asyncio.to_thread(item.file_path.unlink, missing_ok=True)
             
-        elif action == PostProcessAction.MOVE:
+        elif action == PostProcessAction.ZIP and self._archive is not None:
+            # Staged here, archived in batches by _compact_archive
+            await asyncio.to_thread(
+                self._archive.stage_file, item.file_path, item.converter.name, FileArchive.DONE
+            )
+            
+        elif action in (PostProcessAction.MOVE, PostProcessAction.ZIP):
             archive_path = item.converter.archive_path
             if archive_path:
                 archive_path.mkdir(parents=True, exist_ok=True)
@@ -906,6 +1310,75 @@ class AsyncConverterPool:
                 await asyncio.to_thread(converter.process_archive_queue)
             except Exception as e:
                 logger.exception(f"Archive queue error for {converter.name}: {e}")
+    
+    async def _compact_archive(self) -> None:
+        """
+        Roll files staged by the ZIP action and old files in the converters'
+        Done/Error folders into the compressed archive (during idle, at most
+        every ARCHIVE_COMPACT_INTERVAL).
+        """
+        if self._archive is None:
+            return
+        now = time.monotonic()
+        if (self._archive_compacted_at is not None
+                and now - self._archive_compacted_at < self.ARCHIVE_COMPACT_INTERVAL):
+            return
+        self._archive_compacted_at = now
+        try:
+            await asyncio.to_thread(self._archive.compact_staged)
+        except Exception as e:
+            logger.exception(f"Archive compaction error for staged files: {e}")
+        for converter in list(self._converters):
+            folders = (
+                (getattr(converter, 'archive_path', None), FileArchive.DONE),
+                (getattr(converter, 'error_path', None), FileArchive.ERROR),
+            )
+            for folder, category in folders:
+                try:
+                    await asyncio.to_thread(
+                        self._archive.compact_directory, folder, converter.name,
+                        category, self._archive_min_age,
+                    )
+                except Exception as e:
+                    logger.exception(f"Archive compaction error for {converter.name}: {e}")
+    
+    async def restore_archived(
+        self,
+        name: str,
+        converter_name: Optional[str] = None,
+    ) -> Optional[Path]:
+        """
+        Reprocess an archived file by restoring its newest copy into the
+        watch folder of the converter that archived it.
+        
+        The file's source hash, and the hashes recorded with it for the
+        same upload, are dropped from the content index first, so the
+        restored file is converted and uploaded again rather than skipped
+        as a duplicate.
+        
+        Args:
+            name: Original file name
+            converter_name: Only consider copies archived by this converter
+            
+        Returns:
+            Path of the restored file (None if not archived or the
+            converter is no longer loaded)
+        """
+        if self._archive is None:
+            return None
+        watch_paths = {c.name: c.watch_path for c in self._converters}
+        for entry in self._archive.find(name, converter_name):
+            watch_path = watch_paths.get(entry.group)
+            if watch_path is not None:
+                return await asyncio.to_thread(self._restore, entry, watch_path)
+        return None
+    
+    def _restore(self, entry: ArchiveEntry, watch_path: Path) -> Path:
+        """Forget the archived content's hashes, then restore it (worker thread)."""
+        if self._content_index is not None:
+            digest = hash_bytes(self._archive.read(entry))
+            self._content_index.discard(ContentHashIndex.SOURCE, digest)
+        return self._archive.restore(entry, watch_path)
 
 
 class _FileEventHandler(FileSystemEventHandler):
@@ -18,6 +18,7 @@ from dataclasses import dataclass, asdict, field
 from typing import Optional, Dict, Any, List
 
 from .async_ipc_server import get_socket_address
+from .instance_registry import InstanceRecord, InstanceRegistry
 from ..core.security import load_secret
 from .ipc_protocol import (
     PROTOCOL_VERSION,
@@ -35,8 +36,22 @@ class InstanceInfo:
     """Information about a discovered service instance"""
     instance_id: str
     socket_name: str
-    connected: bool = False
+    connected: bool = False  # Running and reachable (live heartbeat or IPC probe)
     status: Optional[Dict[str, Any]] = None
+    pid: Optional[int] = None
+    health_port: Optional[int] = None
+    
+    @classmethod
+    def from_record(cls, record: InstanceRecord) -> 'InstanceInfo':
+        """Create from a live registry heartbeat record"""
+        return cls(
+            instance_id=record.instance_id,
+            socket_name=record.socket_name,
+            connected=True,
+            status=asdict(ServiceStatus.from_dict(record.summary)),
+            pid=record.pid,
+            health_port=record.health_port,
+        )
 
 
 @dataclass
@@ -418,67 +433,90 @@ class AsyncIPCClient:
 
 async def discover_services_async(
     instance_ids: Optional[List[str]] = None,
-    timeout: float = 0.5
+    timeout: float = 0.5,
+    registry: Optional[InstanceRegistry] = None,
+    probe_missing: bool = False,
 ) -> List[InstanceInfo]:
     """
     Discover running service instances.
     
+    Reads the instance registry (heartbeat records published by running
+    services) - no IPC connections are opened. Instances whose heartbeat
+    is stale are treated as not running.
+    
     Args:
-        instance_ids: List of instance IDs to check (default: ['default'])
-        timeout: Connection timeout per instance
+        instance_ids: Instance IDs to look for (default: all registered)
+        timeout: Connection timeout per instance when probing
+        registry: Registry to read (default: shared local registry)
+        probe_missing: Also probe requested instances that have no live
+            record over IPC (for services that predate the registry)
         
     Returns:
         List of InstanceInfo for discovered services
     """
-    if instance_ids is None:
-        instance_ids = ["default"]
-    
-    discovered = []
+    registry = registry or InstanceRegistry()
+    discovered = [InstanceInfo.from_record(r) for r in registry.live(instance_ids)]
     
-    for instance_id in instance_ids:
-        client = AsyncIPCClient(instance_id)
-        try:
-            if await client.connect(timeout=timeout):
-                info = InstanceInfo(
-                    instance_id=instance_id,
-                    socket_name=client.socket_name,
-                    connected=True
-                )
-                
-                # Try to get status
-                status = await client.get_status()
-                if status:
-                    info.status = asdict(status)
-                
-                discovered.append(info)
-                await client.disconnect()
-        except Exception as e:
-            logger.debug(f"Error discovering {instance_id}: {e}")
+    if probe_missing:
+        found = {info.instance_id for info in discovered}
+        for instance_id in instance_ids or ["default"]:
+            if instance_id not in found:
+                info = await _probe_instance(instance_id, timeout)
+                if info is not None:
+                    discovered.append(info)
     
     return discovered
 
 
+async def _probe_instance(instance_id: str, timeout: float) -> Optional[InstanceInfo]:
+    """Discover one instance by connecting to it over IPC"""
+    client = AsyncIPCClient(instance_id)
+    try:
+        if await client.connect(timeout=timeout):
+            info = InstanceInfo(
+                instance_id=instance_id,
+                socket_name=client.socket_name,
+                connected=True
+            )
+            
+            # Try to get status
+            status = await client.get_status()
+            if status:
+                info.status = asdict(status)
+            
+            await client.disconnect()
+            return info
+    except Exception as e:
+        logger.debug(f"Error discovering {instance_id}: {e}")
+    return None
+
+
 class ServiceDiscoveryAsync:
     """
     Async service discovery helper.
     
-    Monitors for service instances and notifies on changes.
+    Monitors for service instances and notifies on changes. Each poll is a
+    registry read (one directory stat when nothing changed), so the interval
+    can be short; instances disappear once their heartbeat goes stale.
     """
     
     def __init__(
         self,
         instance_ids: Optional[List[str]] = None,
-        poll_interval: float = 5.0
+        poll_interval: float = 1.0,
+        registry: Optional[InstanceRegistry] = None,
     ) -> None:
         """
         Initialize async service discovery.
         
         Args:
-            instance_ids: Instance IDs to monitor
+            instance_ids: Instance IDs to monitor (default: all registered)
             poll_interval: Polling interval in seconds
+            registry: Registry to read (default: shared local registry)
         """
-        self.instance_ids = instance_ids or ["default"]
+        self.instance_ids = instance_ids
         self.poll_interval = poll_interval
+        self.registry = registry or InstanceRegistry()
         
         self._running = False
         self._task: Optional[asyncio.Task] = None
@@ -516,7 +554,7 @@ class ServiceDiscoveryAsync:
             try:
                 discovered = await discover_services_async(
                     self.instance_ids,
-                    timeout=0.5
+                    registry=self.registry
                 )
                 
                 # Convert to dict
@@ -9,6 +9,7 @@ Benefits over sync PendingWatcher:
 - Non-blocking file I/O
 - Automatic retry with exponential backoff
 - Graceful shutdown (complete in-flight uploads)
+- Duplicate suppression via a shared content-hash index
 
 Performance improvement:
 - 100 reports with 200ms latency: ~20s (sync) → ~4s (async with 5 concurrent)
@@ -19,6 +20,7 @@ See CLIENT_ASYNC_ARCHITECTURE.md for design details.
 import asyncio
 import json
 import logging
+import time
 from pywats.core.logging import get_logger
 from datetime import datetime, timedelta
 from enum import Enum
@@ -34,6 +36,9 @@ except ImportError:
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
+from .content_index import ContentHashIndex, hash_report
+from .file_archive import FileArchive
+
 if TYPE_CHECKING:
     from pywats import AsyncWATS
 
@@ -75,11 +80,15 @@ class AsyncPendingQueue:
     FILTER_QUEUED = "*.queued"
     FILTER_PROCESSING = "*.processing"
     FILTER_ERROR = "*.error"
+    FILTER_COMPLETED = "*.completed"
     
     # Timeouts
     PROCESSING_TIMEOUT = timedelta(minutes=30)
     ERROR_RETRY_DELAY = timedelta(minutes=5)
     PERIODIC_CHECK_INTERVAL = 60.0  # seconds
+    MAX_ERROR_ATTEMPTS = 5  # Error files stay in .error after this many attempts
+    ARCHIVE_COMPACT_INTERVAL = 300.0  # Seconds between archive compactions
+    ARCHIVE_GROUP = "pending_queue"  # Segment series for report files
     
     # Queue limits
     DEFAULT_MAX_QUEUE_SIZE = 10000  # Default max reports in queue (0 = unlimited)
@@ -89,7 +98,10 @@ class AsyncPendingQueue:
         api: 'AsyncWATS',
         reports_dir: Path,
         max_concurrent: int = 5,
-        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE  # Use 10000 default instead of unlimited
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,  # Use 10000 default instead of unlimited
+        content_index: Optional[ContentHashIndex] = None,
+        archive: Optional[FileArchive] = None,
+        archive_min_age: timedelta = timedelta(hours=24),
     ) -> None:
         """
         Initialize async pending queue.
@@ -99,11 +111,20 @@ class AsyncPendingQueue:
             reports_dir: Directory containing queued report files
             max_concurrent: Maximum concurrent uploads
             max_queue_size: Maximum reports allowed in queue (default: 10000, 0 = unlimited)
+            content_index: Content-hash index for duplicate suppression
+                (None = disabled)
+            archive: Compressed archive that .completed files and error
+                files past their last retry are rolled into (None = disabled)
+            archive_min_age: Leave completed/failed files younger than this
         """
         self.api = api
         self.reports_dir = Path(reports_dir)
         self._max_queue_size = max_queue_size
         self._max_concurrent = max_concurrent
+        self._content_index = content_index
+        self._archive = archive
+        self._archive_min_age = archive_min_age
+        self._archive_compacted_at: Optional[float] = None  # time.monotonic()
         
         # Concurrency control
         self._semaphore = asyncio.Semaphore(max_concurrent)
@@ -130,7 +151,9 @@ class AsyncPendingQueue:
             "queued_files": 0,
             "stuck_files": 0,
             "active_uploads": 0,
-            "max_queue_size": max_queue_size
+            "max_queue_size": max_queue_size,
+            "duplicates_skipped": 0,
+            "duplicate_bytes_saved": 0,
         }
         
         # Ensure directory exists
@@ -146,7 +169,10 @@ class AsyncPendingQueue:
     def stats(self) -> Dict[str, Any]:
         """Get queue statistics"""
         self._update_stats()
-        return self._stats.copy()
+        stats = self._stats.copy()
+        if self._content_index is not None:
+            stats["content_index"] = self._content_index.stats.to_dict()
+        return stats
     
     @property
     def is_running(self) -> bool:
@@ -230,6 +256,9 @@ class AsyncPendingQueue:
                 # Retry error files
                 await self._retry_error_files()
                 
+                # Roll finished files into the archive
+                await self._compact_archive()
+                
         except asyncio.CancelledError:
             logger.info("Queue cancelled")
         finally:
@@ -373,6 +402,7 @@ class AsyncPendingQueue:
         
         State machine:
         .queued -> .processing -> .completed (success)
+        .queued -> .processing -> .completed (duplicate, not uploaded)
         .queued -> .processing -> .error (failure)
         """
         if not file_path.exists():
@@ -396,13 +426,37 @@ class AsyncPendingQueue:
             content = await self._read_file(processing_path)
             report_data = json.loads(content)
             
+            # Skip reports already uploaded within the retention window
+            report_hash = None
+            if self._content_index is not None:
+                report_hash = await asyncio.to_thread(hash_report, report_data)
+                duplicate = self._content_index.lookup(
+                    ContentHashIndex.REPORT, report_hash, len(content)
+                )
+                if duplicate is not None:
+                    processing_path.rename(processing_path.with_suffix('.completed'))
+                    self._stats["duplicates_skipped"] += 1
+                    self._stats["duplicate_bytes_saved"] += len(content)
+                    logger.info(
+                        f"Skipped duplicate: {file_path.name} "
+                        f"(already uploaded as {duplicate.ref or 'unknown'})"
+                    )
+                    return
+            
             # Submit to WATS (async HTTP)
-            await self.api.report.submit_raw(report_data)
+            report_id = await self.api.report.submit_raw(report_data)
             
             # Success - mark as completed
             completed_path = processing_path.with_suffix('.completed')
             processing_path.rename(completed_path)
             
+            if self._content_index is not None:
+                await self._content_index.add_many_async([(
+                    ContentHashIndex.REPORT,
+                    report_hash,
+                    str(report_id) if report_id is not None else file_path.name,
+                )])
+            
             self._stats["total_submitted"] += 1
             self._stats["successful"] += 1
             
@@ -504,7 +558,7 @@ class AsyncPendingQueue:
                         continue  # Not ready for retry yet
                     
                     # Max 5 retries
-                    if attempts >= 5:
+                    if attempts >= self.MAX_ERROR_ATTEMPTS:
                         logger.warning(f"Max retries exceeded: {file_path.name}")
                         continue
                     
@@ -522,6 +576,56 @@ class AsyncPendingQueue:
             except Exception as e:
                 logger.exception(f"Retry error for {file_path.name}: {e}")
     
+    async def _compact_archive(self) -> None:
+        """
+        Move .completed files, and error files that used up their retries,
+        into the compressed archive once they are older than archive_min_age.
+        """
+        if self._archive is None:
+            return
+        now = time.monotonic()
+        if (self._archive_compacted_at is not None
+                and now - self._archive_compacted_at < self.ARCHIVE_COMPACT_INTERVAL):
+            return
+        self._archive_compacted_at = now
+        try:
+            completed, failed = await asyncio.to_thread(self._archivable_files)
+            archived = 0
+            if completed:
+                archived += len(await asyncio.to_thread(
+                    self._archive.archive_files, completed, self.ARCHIVE_GROUP, FileArchive.COMPLETED
+                ))
+            if failed:
+                archived += len(await asyncio.to_thread(
+                    self._archive.archive_files, failed, self.ARCHIVE_GROUP, FileArchive.ERROR
+                ))
+            if archived:
+                logger.info(f"Archived {archived} finished report file(s)")
+        except Exception as e:
+            logger.exception(f"Archive compaction error: {e}")
+    
+    def _archivable_files(self) -> tuple[List[Path], List[Path]]:
+        """(completed files, exhausted error files with their .info) old enough to archive"""
+        cutoff = time.time() - self._archive_min_age.total_seconds()
+        
+        def old_enough(path: Path) -> bool:
+            try:
+                return path.stat().st_mtime < cutoff
+            except OSError:
+                return False
+        
+        completed = [p for p in self.reports_dir.glob(self.FILTER_COMPLETED) if old_enough(p)]
+        failed: List[Path] = []
+        for file_path in self.reports_dir.glob(self.FILTER_ERROR):
+            info_path = file_path.with_suffix('.error.info')
+            try:
+                attempts = json.loads(info_path.read_text()).get('attempts', 0)
+            except (OSError, ValueError, AttributeError):
+                continue  # No info yet: still retried
+            if attempts >= self.MAX_ERROR_ATTEMPTS and old_enough(file_path):
+                failed.extend([file_path, info_path])
+        return completed, failed
+    
     # =========================================================================
     # Utilities
     # =========================================================================
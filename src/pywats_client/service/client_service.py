@@ -196,7 +196,8 @@ def main(instance_id: str = "default"):
         instance_id=instance_id,
         log_level="INFO",
         log_format="text",
-        enable_console=True
+        enable_console=True,
+        queued=True
     )
     
     # Create and start service
@@ -0,0 +1,316 @@
+"""
+Content-Hash Index - duplicate suppression for the conversion pipeline
+
+Test equipment often rewrites or re-drops a result file that has already
+been converted and uploaded. ContentHashIndex remembers, for a bounded
+retention window, the SHA-256 of every source file and every report that
+made it to the server, so the converter pool and pending queue can skip
+the repeat work and link the duplicate to the earlier upload instead.
+
+Two kinds of entries:
+- ``source``: hash of the raw input file (checked before conversion)
+- ``report``: hash of the converted report without its id (checked
+  before upload; catches re-exports of the same result under a new name)
+
+Persistence:
+    The index is a JSON Lines append log (one ``{"k", "t", "r"}`` object per
+    recorded hash, ``{"k", "t", "d": 1}`` for a discarded one). It is
+    replayed on start-up, dropping entries older than the retention window,
+    and rewritten atomically once it holds more expired/superseded lines
+    than live ones.
+
+Usage:
+    index = ContentHashIndex(data_path / "content_index.jsonl")
+    duplicate = index.lookup(ContentHashIndex.SOURCE, hash_file(path))
+    if duplicate:
+        print(f"already uploaded as {duplicate.ref}")
+    ...
+    index.add(ContentHashIndex.SOURCE, digest, ref=report_id)
+
+    # On the event loop: one log write, in a worker thread
+    await index.add_many_async([(ContentHashIndex.SOURCE, digest, report_id)])
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from pywats.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Read size for hashing source files
+_HASH_CHUNK = 1024 * 1024
+
+
+def hash_bytes(data: bytes) -> str:
+    """SHA-256 hex digest of in-memory content (same digest as hash_file)."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: Union[str, Path]) -> str:
+    """SHA-256 hex digest of a file's content (read in chunks)."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_report(report: Any) -> Optional[str]:
+    """
+    SHA-256 hex digest of a report's content, ignoring its id.
+
+    Accepts a report model (anything with ``model_dump``) or a WSJF dict.
+    Both are hashed as canonical JSON, so a converted report and the same
+    report read back from the pending queue hash the same. Returns None for
+    reports that cannot be hashed without loading them (streamed documents).
+    """
+    if hasattr(report, 'model_dump'):
+        data = report.model_dump(mode="json", by_alias=True, exclude_none=True)
+    elif isinstance(report, dict):
+        data = report
+    else:
+        return None
+
+    content = {k: v for k, v in data.items() if k != "id"}
+    canonical = json.dumps(content, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class ContentHashEntry:
+    """A recorded hash."""
+    kind: str
+    digest: str
+    recorded_at: float
+    ref: Optional[str] = None  # Report id or file name of the original upload
+
+
+@dataclass
+class ContentHashStats:
+    """Index counters (duplicates found = work saved)."""
+    entries: int = 0
+    lookups: int = 0
+    source_duplicates: int = 0
+    report_duplicates: int = 0
+    bytes_saved: int = 0
+    expired: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class ContentHashIndex:
+    """
+    Persistent, time-bounded index of uploaded content hashes.
+
+    Thread-safe. Lookups are in-memory; additions append one line per hash
+    to the log (add_many_async does it off the event loop).
+
+    Args:
+        path: JSON Lines file (created on first add)
+        retention: How long a hash suppresses duplicates (default: 7 days)
+        max_entries: Upper bound on entries; oldest are evicted first
+    """
+
+    SOURCE = "source"
+    REPORT = "report"
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        retention: timedelta = timedelta(days=7),
+        max_entries: int = 100_000,
+    ) -> None:
+        self.path = Path(path)
+        self.retention = retention
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, ContentHashEntry]" = OrderedDict()  # Oldest first
+        self._log_lines = 0
+        self._lock = threading.Lock()
+        self._stats = ContentHashStats()
+        self._load()
+
+    # =========================================================================
+    # Lookup / record
+    # =========================================================================
+
+    def lookup(self, kind: str, digest: Optional[str], size: int = 0) -> Optional[ContentHashEntry]:
+        """
+        Return the entry for a hash seen within the retention window.
+
+        Args:
+            kind: SOURCE or REPORT
+            digest: Hex digest (None never matches)
+            size: Bytes of work a hit saves (for stats)
+        """
+        if digest is None:
+            return None
+        with self._lock:
+            self._stats.lookups += 1
+            entry = self._entries.get(self._key(kind, digest))
+            if entry is None:
+                return None
+            if entry.recorded_at < self._cutoff():
+                self._expire()
+                return None
+            if kind == self.SOURCE:
+                self._stats.source_duplicates += 1
+            else:
+                self._stats.report_duplicates += 1
+            self._stats.bytes_saved += size
+            return entry
+
+    def add(self, kind: str, digest: Optional[str], ref: Optional[str] = None) -> None:
+        """Record a hash (refreshes its timestamp if already present)."""
+        self.add_many([(kind, digest, ref)])
+
+    def add_many(self, records: Iterable[Tuple[str, Optional[str], Optional[str]]]) -> None:
+        """Record several (kind, digest, ref) hashes with one log write."""
+        now = time.time()
+        entries = [
+            ContentHashEntry(kind=kind, digest=digest, recorded_at=now, ref=ref)
+            for kind, digest, ref in records
+            if digest is not None
+        ]
+        if not entries:
+            return
+        with self._lock:
+            for entry in entries:
+                key = self._key(entry.kind, entry.digest)
+                self._entries.pop(key, None)
+                self._entries[key] = entry
+            self._append(entries)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if self._log_lines > 2 * max(len(self._entries), 1000):
+                self._compact()
+
+    async def add_many_async(self, records: Iterable[Tuple[str, Optional[str], Optional[str]]]) -> None:
+        """add_many() in a worker thread, for callers on the event loop."""
+        await asyncio.to_thread(self.add_many, list(records))
+
+    def discard(self, kind: str, digest: Optional[str]) -> int:
+        """
+        Forget a hash and every hash recorded with the same ref (the rest of
+        that upload), so the content is processed again.
+
+        Returns:
+            Number of entries removed
+        """
+        if digest is None:
+            return 0
+        with self._lock:
+            entry = self._entries.get(self._key(kind, digest))
+            if entry is None:
+                return 0
+            removed = [entry] if entry.ref is None else [
+                e for e in self._entries.values() if e.ref == entry.ref
+            ]
+            for e in removed:
+                del self._entries[self._key(e.kind, e.digest)]
+            self._append(removed, discarded=True)
+            return len(removed)
+
+    def compact(self) -> None:
+        """Drop expired entries and rewrite the log."""
+        with self._lock:
+            self._expire()
+            self._compact()
+
+    @property
+    def stats(self) -> ContentHashStats:
+        """Counters since start-up (entries is the current size)."""
+        with self._lock:
+            self._stats.entries = len(self._entries)
+            return ContentHashStats(**asdict(self._stats))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # =========================================================================
+    # Internals
+    # =========================================================================
+
+    @staticmethod
+    def _key(kind: str, digest: str) -> str:
+        return f"{kind}:{digest}"
+
+    def _cutoff(self) -> float:
+        return time.time() - self.retention.total_seconds()
+
+    def _expire(self) -> None:
+        cutoff = self._cutoff()
+        while self._entries:
+            key, oldest = next(iter(self._entries.items()))
+            if oldest.recorded_at >= cutoff:
+                break
+            del self._entries[key]
+            self._stats.expired += 1
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        cutoff = self._cutoff()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    self._log_lines += 1
+                    try:
+                        record = json.loads(line)
+                        kind, digest = record["k"].split(":", 1)
+                        entry = ContentHashEntry(kind, digest, float(record["t"]), record.get("r"))
+                    except (ValueError, KeyError, TypeError):
+                        continue  # Torn last line after a crash
+                    key = self._key(kind, digest)
+                    self._entries.pop(key, None)
+                    if record.get("d") or entry.recorded_at < cutoff:
+                        continue
+                    self._entries[key] = entry
+        except OSError as e:
+            logger.warning(f"Could not read content index {self.path}: {e}")
+            return
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        logger.debug(f"Content index loaded: {len(self._entries)} entries from {self.path}")
+
+    def _append(self, entries: List[ContentHashEntry], discarded: bool = False) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write("".join(self._encode(entry, discarded) for entry in entries))
+            self._log_lines += len(entries)
+        except OSError as e:
+            logger.warning(f"Could not persist content hash: {e}")
+
+    def _compact(self) -> None:
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for entry in self._entries.values():
+                    f.write(self._encode(entry))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self._log_lines = len(self._entries)
+        except OSError as e:
+            logger.warning(f"Could not compact content index: {e}")
+
+    @staticmethod
+    def _encode(entry: ContentHashEntry, discarded: bool = False) -> str:
+        record: Dict[str, Any] = {"k": f"{entry.kind}:{entry.digest}", "t": round(entry.recorded_at, 3)}
+        if discarded:
+            record["d"] = 1
+        elif entry.ref:
+            record["r"] = entry.ref
+        return json.dumps(record, separators=(',', ':')) + "\n"
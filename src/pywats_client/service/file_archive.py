@@ -0,0 +1,654 @@
+"""
+File Archive - compressed, indexed storage for processed files
+
+Long-running stations accumulate millions of small files: converted source
+files in each converter's Done/Error folders and ``.completed`` / failed
+reports in the pending queue. FileArchive rolls them into compressed
+segments, one series per day and converter, so the folders the pipeline
+scans stay small and disk usage stays bounded.
+
+Layout:
+    <root>/<YYYY-MM-DD>/<group>.<n>.zip   segments (ZIP_DEFLATED); a new
+                                          segment is started when the
+                                          current one reaches segment_size
+    <root>/index.jsonl                    one line per archived file
+    <root>/incoming/<group>/<category>/   files staged for the next batch
+
+Files are filed under the day they were last modified and stored as
+``<category>/<name>`` inside the segment. The index maps file names to
+their segment and member, so a single file is found without opening any
+segment and read back through the zip central directory.
+
+Retention:
+    Segments of days older than the retention window are deleted, then the
+    oldest segments are deleted until the archive fits its size quota. The
+    index is rewritten atomically whenever segments are removed.
+
+Safety:
+    A segment on disk is never modified in place. A batch is appended to a
+    copy of the current segment, which is fsynced and renamed over it, so
+    a crash leaves either the old or the new segment. Source files are
+    deleted only after the new segment, its directory and the index lines
+    are on disk. A crash before that leaves the sources in place; they are
+    archived again (under a new member name) on the next pass.
+
+    Appending copies the segment, so callers that archive one file at a
+    time (the ZIP post-process action) stage files with stage_file() and
+    let compact_staged() archive them in batches.
+
+Usage:
+    archive = FileArchive(data_path / "archive", retention=timedelta(days=90))
+    archive.compact_directory(converter.archive_path, converter.name,
+                              min_age=timedelta(hours=24))
+    entry = archive.find("result_0042.csv")[0]
+    archive.restore(entry, converter.watch_path)  # Reprocess
+"""
+
+import glob
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+import zipfile
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+from urllib.parse import quote, unquote
+
+from pywats.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Files per batch in compact_directory (bounds how long the lock is held)
+_BATCH_SIZE = 500
+_DAY_FORMAT = "%Y-%m-%d"
+_SEGMENT_PATTERN = re.compile(r"^(?P<group>.+)\.(?P<number>\d+)\.zip$")
+# Staged file names: <32 hex chars>_<original name>
+_STAGED_PATTERN = re.compile(r"^[0-9a-f]{32}_(?P<name>.+)$")
+
+
+def _fsync_directory(path: Path) -> None:
+    """Persist a directory's entries (renames, new files); no-op on Windows."""
+    if os.name == 'nt':
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@dataclass
+class ArchiveEntry:
+    """An archived file."""
+    name: str  # Original file name
+    group: str  # Converter name (or other producer, e.g. "pending_queue")
+    category: str  # done, error, completed
+    segment: str  # Segment path relative to the archive root
+    member: str  # Member name inside the segment
+    size: int
+    mtime: float
+    archived_at: float
+
+
+@dataclass
+class ArchiveStats:
+    """Archive counters (bytes_archived - bytes_stored = disk saved)."""
+    entries: int = 0
+    segments: int = 0
+    total_bytes: int = 0
+    files_archived: int = 0
+    bytes_archived: int = 0
+    bytes_stored: int = 0
+    files_restored: int = 0
+    segments_expired: int = 0
+    segments_evicted: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class FileArchive:
+    """
+    Day/converter-segmented archive of processed files.
+
+    Thread-safe. Writes are serialised; lookups and stats are in-memory.
+
+    Args:
+        root: Archive directory (created on first write)
+        retention: How long archived files are kept (None = forever)
+        max_bytes: Size quota for all segments (0 = unlimited)
+        segment_size: Start a new segment once one reaches this size
+            (also bounds the copy made for each appended batch)
+        compresslevel: zlib level for new members (1 fastest - 9 smallest)
+    """
+
+    DONE = "done"
+    ERROR = "error"
+    COMPLETED = "completed"
+
+    DEFAULT_SEGMENT_SIZE = 16 * 1024 * 1024
+    MAINTENANCE_INTERVAL = 3600.0  # Seconds between retention passes on write
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        retention: Optional[timedelta] = timedelta(days=90),
+        max_bytes: int = 0,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        compresslevel: int = 6,
+    ) -> None:
+        self.root = Path(root)
+        self.index_path = self.root / "index.jsonl"
+        self.staging_path = self.root / "incoming"
+        self.retention = retention
+        self.max_bytes = max_bytes
+        self.segment_size = segment_size
+        self.compresslevel = compresslevel
+        self._entries: Dict[str, List[ArchiveEntry]] = defaultdict(list)  # name -> oldest first
+        self._entry_count = 0
+        # Segment path relative to root -> (day, mtime, size); kept current on write/delete
+        self._segments: Dict[str, Tuple[date, float, int]] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = ArchiveStats()
+        self._maintained_at = 0.0
+        self._load()
+
+    # =========================================================================
+    # Archiving
+    # =========================================================================
+
+    def archive_file(
+        self,
+        path: Union[str, Path],
+        group: str,
+        category: str = DONE,
+    ) -> Optional[ArchiveEntry]:
+        """Archive one file and delete it (None if it could not be archived)."""
+        entries = self.archive_files([path], group, category)
+        return entries[0] if entries else None
+
+    def archive_files(
+        self,
+        paths: Iterable[Union[str, Path]],
+        group: str,
+        category: str = DONE,
+    ) -> List[ArchiveEntry]:
+        """
+        Archive files into the group's segments for their day, then delete them.
+
+        Args:
+            paths: Files to archive (missing files are skipped)
+            group: Segment series (converter name)
+            category: Folder inside the segment (DONE, ERROR, COMPLETED)
+
+        Returns:
+            Entries for the files that were archived
+        """
+        return self._archive([(Path(path), Path(path).name) for path in paths], group, category)
+
+    def stage_file(
+        self,
+        path: Union[str, Path],
+        group: str,
+        category: str = DONE,
+    ) -> Path:
+        """
+        Move a file into the staging area; compact_staged() archives it.
+
+        Cheap (a rename on the same volume), so it suits archiving one file
+        at a time. The file keeps its name and modification time.
+
+        Returns:
+            Path of the staged file
+        """
+        path = Path(path)
+        directory = self.staging_path / quote(group, safe='') / category
+        directory.mkdir(parents=True, exist_ok=True)
+        target = directory / f"{uuid.uuid4().hex}_{path.name}"
+        try:
+            os.replace(path, target)
+        except OSError:
+            # Other volume: copy durably, then remove the source
+            temp = target.with_name(f".{target.name}.tmp")
+            shutil.copy2(path, temp)
+            with open(temp, 'rb') as f:
+                os.fsync(f.fileno())
+            os.replace(temp, target)
+            _fsync_directory(directory)
+            path.unlink()
+        return target
+
+    def compact_staged(self) -> int:
+        """
+        Archive every staged file.
+
+        Returns:
+            Number of files archived
+        """
+        archived = 0
+        try:
+            group_dirs = [p for p in self.staging_path.iterdir() if p.is_dir()]
+        except FileNotFoundError:
+            return 0
+        for group_dir in group_dirs:
+            group = unquote(group_dir.name)
+            for category_dir in (p for p in group_dir.iterdir() if p.is_dir()):
+                files: List[Tuple[Path, str]] = []
+                for path in category_dir.iterdir():
+                    match = _STAGED_PATTERN.match(path.name)
+                    if match and path.is_file():
+                        files.append((path, match.group("name")))
+                for start in range(0, len(files), _BATCH_SIZE):
+                    archived += len(self._archive(files[start:start + _BATCH_SIZE], group, category_dir.name))
+        return archived
+
+    def compact_directory(
+        self,
+        directory: Optional[Union[str, Path]],
+        group: str,
+        category: str = DONE,
+        min_age: timedelta = timedelta(hours=24),
+        now: Optional[float] = None,
+    ) -> int:
+        """
+        Archive the files in a folder that were last modified before min_age.
+
+        Args:
+            directory: Folder to compact (None or missing = nothing to do)
+            group: Segment series (converter name)
+            category: Folder inside the segment
+            min_age: Leave files younger than this in place
+            now: Reference time (default: time.time())
+
+        Returns:
+            Number of files archived
+        """
+        if directory is None:
+            return 0
+        cutoff = (time.time() if now is None else now) - min_age.total_seconds()
+        candidates: List[Path] = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if entry.is_file(follow_symlinks=False) and entry.stat().st_mtime < cutoff:
+                            candidates.append(Path(entry.path))
+                    except OSError:
+                        continue
+        except FileNotFoundError:
+            return 0
+        except OSError as e:
+            logger.warning(f"Could not scan {directory} for archiving: {e}")
+            return 0
+
+        archived = 0
+        for start in range(0, len(candidates), _BATCH_SIZE):
+            archived += len(self.archive_files(candidates[start:start + _BATCH_SIZE], group, category))
+        if archived:
+            logger.info(f"Archived {archived} file(s) from {directory}")
+        return archived
+
+    # =========================================================================
+    # Retrieval
+    # =========================================================================
+
+    def find(self, name: str, group: Optional[str] = None) -> List[ArchiveEntry]:
+        """Archived copies of a file name, newest first."""
+        with self._lock:
+            entries = list(self._entries.get(name, ()))
+        if group is not None:
+            entries = [entry for entry in entries if entry.group == group]
+        return sorted(entries, key=lambda entry: entry.archived_at, reverse=True)
+
+    def read(self, entry: ArchiveEntry) -> bytes:
+        """Content of an archived file."""
+        with zipfile.ZipFile(self.root / entry.segment) as zf:
+            return zf.read(entry.member)
+
+    def restore(
+        self,
+        entry: ArchiveEntry,
+        directory: Union[str, Path],
+        name: Optional[str] = None,
+    ) -> Path:
+        """
+        Extract an archived file (e.g. into a watch folder for reprocessing).
+
+        The file appears atomically under its original name (or ``name``)
+        and keeps its original modification time. The archived copy is kept.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        target = directory / (name or entry.name)
+        temp = directory / f".{target.name}.restore"
+        with zipfile.ZipFile(self.root / entry.segment) as zf:
+            with zf.open(entry.member) as src, open(temp, 'wb') as dst:
+                while True:
+                    chunk = src.read(1024 * 1024)
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+        os.utime(temp, (entry.mtime, entry.mtime))
+        os.replace(temp, target)
+        with self._lock:
+            self._stats.files_restored += 1
+        return target
+
+    # =========================================================================
+    # Retention
+    # =========================================================================
+
+    def enforce_limits(self, now: Optional[float] = None) -> int:
+        """
+        Delete segments outside the retention window, then the oldest
+        segments until the archive fits max_bytes.
+
+        Returns:
+            Number of segments deleted
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            self._maintained_at = time.monotonic()
+            segments = sorted(self._segments.items(), key=lambda item: (item[1][0], item[1][1]))
+            removed: Set[str] = set()
+
+            if self.retention is not None:
+                oldest_day = date.fromtimestamp(now - self.retention.total_seconds())
+                for relative, (day, _, _) in segments:
+                    if day < oldest_day and self._delete_segment(relative):
+                        removed.add(relative)
+                        self._stats.segments_expired += 1
+
+            if self.max_bytes > 0:
+                for relative, _ in segments:
+                    if self._total_bytes <= self.max_bytes:
+                        break
+                    if relative not in removed and self._delete_segment(relative):
+                        removed.add(relative)
+                        self._stats.segments_evicted += 1
+
+            if removed:
+                self._drop_segments(removed)
+                self._compact()
+                logger.info(f"Archive retention removed {len(removed)} segment(s)")
+            return len(removed)
+
+    @property
+    def stats(self) -> ArchiveStats:
+        """Counters since start-up (entries, segments and total_bytes are current)."""
+        with self._lock:
+            self._stats.entries = self._entry_count
+            self._stats.segments = len(self._segments)
+            self._stats.total_bytes = self._total_bytes
+            return ArchiveStats(**asdict(self._stats))
+
+    def __len__(self) -> int:
+        return self._entry_count
+
+    # =========================================================================
+    # Internals
+    # =========================================================================
+
+    def _archive(
+        self,
+        files: List[Tuple[Path, str]],
+        group: str,
+        category: str,
+    ) -> List[ArchiveEntry]:
+        """Archive (path, name) pairs, deleting each source once it is durable."""
+        by_day: Dict[str, List[Tuple[Path, str, os.stat_result]]] = defaultdict(list)
+        for path, name in files:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            day = datetime.fromtimestamp(stat.st_mtime).strftime(_DAY_FORMAT)
+            by_day[day].append((path, name, stat))
+
+        archived: List[Tuple[ArchiveEntry, Path]] = []
+        with self._lock:
+            for day, day_files in sorted(by_day.items()):
+                try:
+                    archived.extend(self._write_day(day, group, category, day_files))
+                except OSError as e:
+                    logger.warning(f"Could not archive {len(day_files)} file(s) for {group}/{day}: {e}")
+            maintain = time.monotonic() - self._maintained_at >= self.MAINTENANCE_INTERVAL
+
+        # Sources go only once their segment and index lines are on disk
+        for entry, path in archived:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Archived {entry.name} but could not delete the source: {e}")
+
+        if maintain:
+            self.enforce_limits()
+        return [entry for entry, _ in archived]
+
+    def _write_day(
+        self,
+        day: str,
+        group: str,
+        category: str,
+        files: List[Tuple[Path, str, os.stat_result]],
+    ) -> List[Tuple[ArchiveEntry, Path]]:
+        """Append files to the group's current segment(s) for a day."""
+        directory = self.root / day
+        new_day = not directory.exists()
+        directory.mkdir(parents=True, exist_ok=True)
+        safe_group = re.sub(r'[^\w.-]', '_', group)
+        number = self._last_segment_number(directory, safe_group)
+
+        written: List[Tuple[ArchiveEntry, Path]] = []
+        pending = list(files)
+        while pending:
+            segment = directory / f"{safe_group}.{number}.zip"
+            relative = f"{day}/{segment.name}"
+            size = segment.stat().st_size if segment.exists() else 0
+            if size >= self.segment_size:
+                number += 1
+                continue
+
+            # Append to a copy; the segment itself is only ever replaced
+            temp = segment.with_name(f".{segment.name}.tmp")
+            batch: List[Tuple[ArchiveEntry, Path]] = []
+            stored = 0
+            try:
+                if size:
+                    shutil.copyfile(segment, temp)
+                else:
+                    temp.unlink(missing_ok=True)
+                with zipfile.ZipFile(
+                    temp, 'a', compression=zipfile.ZIP_DEFLATED,
+                    compresslevel=self.compresslevel,
+                ) as zf:
+                    members = set(zf.namelist())
+                    while pending and size < self.segment_size:
+                        path, name, stat = pending.pop(0)
+                        member = self._member_name(members, category, name)
+                        try:
+                            zf.write(path, member)
+                        except OSError as e:
+                            logger.warning(f"Could not archive {name}: {e}")
+                            continue
+                        members.add(member)
+                        compressed = zf.getinfo(member).compress_size
+                        size += compressed
+                        stored += compressed
+                        batch.append((ArchiveEntry(
+                            name=name, group=group, category=category,
+                            segment=relative, member=member, size=stat.st_size,
+                            mtime=stat.st_mtime, archived_at=time.time(),
+                        ), path))
+                if not batch:
+                    temp.unlink(missing_ok=True)
+                    continue
+                with open(temp, 'rb') as f:
+                    os.fsync(f.fileno())
+                os.replace(temp, segment)
+                _fsync_directory(directory)
+                if new_day:
+                    _fsync_directory(self.root)
+                    new_day = False
+            except zipfile.BadZipFile:
+                temp.unlink(missing_ok=True)
+                logger.warning(f"Archive segment {relative} is damaged; starting a new one")
+                number += 1
+                continue
+
+            self._append([entry for entry, _ in batch])
+            stat = segment.stat()
+            previous = self._segments.get(relative)
+            self._total_bytes += stat.st_size - (previous[2] if previous else 0)
+            self._segments[relative] = (
+                datetime.strptime(day, _DAY_FORMAT).date(), stat.st_mtime, stat.st_size,
+            )
+            for entry, _ in batch:
+                self._entries[entry.name].append(entry)
+                self._entry_count += 1
+                self._stats.files_archived += 1
+                self._stats.bytes_archived += entry.size
+            self._stats.bytes_stored += stored
+            written.extend(batch)
+        return written
+
+    @staticmethod
+    def _member_name(members: Set[str], category: str, name: str) -> str:
+        member = f"{category}/{name}"
+        stem, suffix = os.path.splitext(name)
+        copy = 1
+        while member in members:
+            member = f"{category}/{stem}~{copy}{suffix}"
+            copy += 1
+        return member
+
+    @staticmethod
+    def _last_segment_number(directory: Path, safe_group: str) -> int:
+        numbers = [0]
+        for path in directory.glob(f"{glob.escape(safe_group)}.*.zip"):
+            match = _SEGMENT_PATTERN.match(path.name)
+            if match and match.group("group") == safe_group:
+                numbers.append(int(match.group("number")))
+        return max(numbers)
+
+    def _scan_segments(self) -> Dict[str, Tuple[date, float, int]]:
+        """(day, mtime, size) of every segment on disk (start-up only)."""
+        segments: Dict[str, Tuple[date, float, int]] = {}
+        try:
+            days = list(os.scandir(self.root))
+        except FileNotFoundError:
+            return segments
+        for day_entry in days:
+            try:
+                day = datetime.strptime(day_entry.name, _DAY_FORMAT).date()
+            except ValueError:
+                continue
+            if not day_entry.is_dir():
+                continue
+            for entry in os.scandir(day_entry.path):
+                if not entry.name.endswith('.zip'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                segments[f"{day_entry.name}/{entry.name}"] = (day, stat.st_mtime, stat.st_size)
+        return segments
+
+    def _delete_segment(self, relative: str) -> bool:
+        path = self.root / relative
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not delete archive segment {relative}: {e}")
+            return False
+        _, _, size = self._segments.pop(relative, (None, 0.0, 0))
+        self._total_bytes -= size
+        try:
+            path.parent.rmdir()  # Only succeeds once the day is empty
+        except OSError:
+            pass
+        return True
+
+    def _drop_segments(self, segments: Set[str]) -> None:
+        for name in list(self._entries):
+            kept = [entry for entry in self._entries[name] if entry.segment not in segments]
+            self._entry_count -= len(self._entries[name]) - len(kept)
+            if kept:
+                self._entries[name] = kept
+            else:
+                del self._entries[name]
+
+    def _load(self) -> None:
+        self._segments = self._scan_segments()
+        self._total_bytes = sum(size for _, _, size in self._segments.values())
+        if not self.index_path.exists():
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        entry = ArchiveEntry(
+                            name=record["n"], group=record["g"], category=record["c"],
+                            segment=record["s"], member=record["m"], size=int(record["z"]),
+                            mtime=float(record["t"]), archived_at=float(record["a"]),
+                        )
+                    except (ValueError, KeyError, TypeError):
+                        continue  # Torn last line after a crash
+                    if entry.segment in self._segments:
+                        self._entries[entry.name].append(entry)
+                        self._entry_count += 1
+        except OSError as e:
+            logger.warning(f"Could not read archive index {self.index_path}: {e}")
+            return
+        logger.debug(f"Archive index loaded: {self._entry_count} files from {self.index_path}")
+
+    def _append(self, entries: List[ArchiveEntry]) -> None:
+        if not entries:
+            return
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        created = not self.index_path.exists()
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            f.write(''.join(self._encode(entry) for entry in entries))
+            f.flush()
+            os.fsync(f.fileno())
+        if created:
+            _fsync_directory(self.index_path.parent)
+
+    def _compact(self) -> None:
+        tmp_path = self.index_path.with_suffix(self.index_path.suffix + '.tmp')
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            entries = sorted(
+                (entry for versions in self._entries.values() for entry in versions),
+                key=lambda entry: entry.archived_at,
+            )
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for entry in entries:
+                    f.write(self._encode(entry))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            logger.warning(f"Could not compact archive index: {e}")
+
+    @staticmethod
+    def _encode(entry: ArchiveEntry) -> str:
+        record = {
+            "n": entry.name, "g": entry.group, "c": entry.category,
+            "s": entry.segment, "m": entry.member, "z": entry.size,
+            "t": round(entry.mtime, 3), "a": round(entry.archived_at, 3),
+        }
+        return json.dumps(record, separators=(',', ':')) + "\n"
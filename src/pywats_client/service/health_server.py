@@ -19,6 +19,7 @@ Metrics Endpoint:
     returns JSON summary with:
     - HTTP cache statistics (hit rate, size, evictions)
     - Converter queue statistics (size, active workers)
+    - Adaptive upload concurrency (limit, in-flight, AIMD decisions)
     - Service metadata (timestamp, version)
 
 Usage:
@@ -155,6 +156,12 @@ class HealthRequestHandler(BaseHTTPRequestHandler):
                 # Return Prometheus metrics
                 try:
                     from prometheus_client import generate_latest
+                    upload_concurrency = self._upload_concurrency_snapshot()
+                    if upload_concurrency and hasattr(metrics_collector, 'update_upload_concurrency'):
+                        metrics_collector.update_upload_concurrency(upload_concurrency)
+                    converter_queues = self._converter_queues_snapshot()
+                    if converter_queues and hasattr(metrics_collector, 'update_converter_queues'):
+                        metrics_collector.update_converter_queues(converter_queues)
                     metrics_data = generate_latest(metrics_collector.registry)
                     self.send_response(200)
                     self.send_header("Content-Type", "text/plain; version=0.0.4")
@@ -202,8 +209,32 @@ class HealthRequestHandler(BaseHTTPRequestHandler):
                     "total_processed": getattr(converter_pool, 'total_processed', 0)
                 }
         
+        # Get adaptive upload concurrency decisions if available
+        upload_concurrency = self._upload_concurrency_snapshot()
+        if upload_concurrency:
+            summary["upload_concurrency"] = upload_concurrency
+        
+        # Get per-converter queue state and wait-time histograms if available
+        converter_queues = self._converter_queues_snapshot()
+        if converter_queues:
+            summary["converter_queues"] = converter_queues
+        
         return summary
     
+    def _upload_concurrency_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Adaptive upload limiter state from the converter pool, if any"""
+        converter_pool = getattr(self.health_server, '_converter_pool', None)
+        limiter = getattr(converter_pool, 'upload_limiter', None)
+        if limiter is None:
+            return None
+        return limiter.snapshot()
+    
+    def _converter_queues_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Per-converter queue state from the converter pool, if any"""
+        converter_pool = getattr(self.health_server, '_converter_pool', None)
+        converter_queues = getattr(converter_pool, 'converter_queues', None)
+        return converter_queues if isinstance(converter_queues, dict) else None
+    
     def _get_health_status(self) -> HealthStatus:
         """Get current health status from the health server"""
         if self.health_server and self.health_server.health_check:
@@ -0,0 +1,253 @@
+"""
+Service Instance Registry
+
+Connectionless discovery of running service instances. Each service
+publishes a small heartbeat record (pid, IPC endpoint, health port and a
+status summary) to a shared local directory; GUIs and tools read that
+directory instead of opening an IPC connection to every candidate instance.
+
+Layout:
+    <registry dir>/<instance_id>.json   one record per instance, replaced
+                                        atomically on every heartbeat
+
+A record is dead when its heartbeat is older than ``stale_after`` heartbeat
+intervals, or when its process no longer exists. Reads are cheap: every
+publish renames a file into the directory, which bumps the directory's
+mtime, so an unchanged directory is served from cache with a single stat.
+"""
+
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pywats.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# A directory mtime this recent may hide a second rename in the same clock tick
+_MTIME_SETTLE_NS = 50_000_000
+
+
+def default_registry_path() -> Path:
+    """Registry directory next to the instance lock files."""
+    if os.name == 'nt':
+        base = Path(os.environ.get('TEMP', '')) / 'pyWATS_Client'
+    else:
+        base = Path('/tmp') / 'pywats_client'
+    return base / 'registry'
+
+
+def _is_process_running(pid: int) -> bool:
+    """Check if a local process exists (always True where unsupported)."""
+    if os.name == 'nt':
+        return True  # Stale heartbeats cover dead processes on Windows
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # Exists but owned by another user
+
+
+@dataclass
+class InstanceRecord:
+    """Heartbeat record published by a running service instance"""
+    instance_id: str
+    pid: int
+    socket_name: str
+    health_port: Optional[int] = None
+    started: Optional[str] = None
+    heartbeat: float = 0.0  # time.time() of the last publish
+    interval: float = 5.0  # Publisher's heartbeat interval (seconds)
+    summary: Dict[str, Any] = field(default_factory=dict)
+
+    def age(self, now: Optional[float] = None) -> float:
+        """Seconds since the last heartbeat"""
+        return (time.time() if now is None else now) - self.heartbeat
+
+    def is_stale(self, stale_after: float, now: Optional[float] = None) -> bool:
+        """True if more than stale_after intervals passed without a heartbeat"""
+        return self.age(now) > self.interval * stale_after
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'InstanceRecord':
+        known = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
+        return cls(**known)
+
+
+class InstanceRegistry:
+    """
+    Shared directory of instance heartbeat records.
+
+    Usage (service side):
+        registry = InstanceRegistry()
+        registry.publish(InstanceRecord(instance_id="default", pid=os.getpid(),
+                                        socket_name="pyWATS_Service_default",
+                                        heartbeat=time.time()))
+
+    Usage (discovery side):
+        for record in InstanceRegistry().live():
+            print(record.instance_id, record.summary)
+    """
+
+    DEFAULT_STALE_AFTER = 3.0  # Heartbeat intervals before a record is dead
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        stale_after: float = DEFAULT_STALE_AFTER,
+    ) -> None:
+        """
+        Initialize registry.
+
+        Args:
+            directory: Registry directory (default: next to instance locks)
+            stale_after: Missed heartbeat intervals before a record is dead
+        """
+        self.directory = Path(directory) if directory else default_registry_path()
+        self.stale_after = stale_after
+        # file name -> ((mtime_ns, size), record)
+        self._files: Dict[str, Tuple[Tuple[int, int], InstanceRecord]] = {}
+        self._dir_mtime_ns: Optional[int] = None
+        self._scanned_ns = 0
+
+    # =========================================================================
+    # Publishing
+    # =========================================================================
+
+    def publish(self, record: InstanceRecord) -> None:
+        """Write (atomically replace) an instance's record"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        target = self._path(record.instance_id)
+        temp = target.with_name(f".{target.name}.{record.pid}.tmp")
+        temp.write_text(json.dumps(record.to_dict()), encoding='utf-8')
+        os.replace(temp, target)
+
+    def remove(self, instance_id: str, pid: Optional[int] = None) -> bool:
+        """
+        Remove an instance's record.
+
+        Args:
+            instance_id: Instance to remove
+            pid: Only remove if the record belongs to this process (so a
+                stopping instance never removes its successor's record)
+
+        Returns:
+            True if a record was removed
+        """
+        path = self._path(instance_id)
+        if pid is not None:
+            record = self._load(path)
+            if record is not None and record.pid != pid:
+                return False
+        try:
+            path.unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    # =========================================================================
+    # Reading
+    # =========================================================================
+
+    def read_all(self) -> List[InstanceRecord]:
+        """All records, live or not (re-reads only changed files)"""
+        try:
+            dir_mtime_ns = os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            self._files.clear()
+            self._dir_mtime_ns = None
+            return []
+
+        settled = self._scanned_ns - dir_mtime_ns > _MTIME_SETTLE_NS
+        if dir_mtime_ns != self._dir_mtime_ns or not settled:
+            self._scan()
+            self._dir_mtime_ns = dir_mtime_ns
+            self._scanned_ns = time.time_ns()
+        return [record for _, record in self._files.values()]
+
+    def live(
+        self,
+        instance_ids: Optional[Iterable[str]] = None,
+        now: Optional[float] = None,
+    ) -> List[InstanceRecord]:
+        """
+        Records of running instances.
+
+        Args:
+            instance_ids: Restrict to these instances (default: all)
+            now: Reference time (default: time.time())
+        """
+        wanted = set(instance_ids) if instance_ids is not None else None
+        now = time.time() if now is None else now
+        return [
+            record for record in self.read_all()
+            if (wanted is None or record.instance_id in wanted)
+            and self.is_alive(record, now)
+        ]
+
+    def get(self, instance_id: str) -> Optional[InstanceRecord]:
+        """Live record for one instance"""
+        records = self.live([instance_id])
+        return records[0] if records else None
+
+    def is_alive(self, record: InstanceRecord, now: Optional[float] = None) -> bool:
+        """True if the record's heartbeat is fresh and its process exists"""
+        return not record.is_stale(self.stale_after, now) and _is_process_running(record.pid)
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Delete records of dead instances; returns the number removed"""
+        removed = 0
+        for record in self.read_all():
+            if not self.is_alive(record, now) and self.remove(record.instance_id, record.pid):
+                logger.info(f"Removed stale registry record for instance {record.instance_id}")
+                removed += 1
+        return removed
+
+    # =========================================================================
+    # Internal
+    # =========================================================================
+
+    def _path(self, instance_id: str) -> Path:
+        return self.directory / f"{instance_id}.json"
+
+    def _scan(self) -> None:
+        files: Dict[str, Tuple[Tuple[int, int], InstanceRecord]] = {}
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            entries = []
+        for entry in entries:
+            if not entry.name.endswith('.json'):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            signature = (stat.st_mtime_ns, stat.st_size)
+            cached = self._files.get(entry.name)
+            if cached is not None and cached[0] == signature:
+                files[entry.name] = cached
+                continue
+            record = self._load(Path(entry.path))
+            if record is not None:
+                files[entry.name] = (signature, record)
+        self._files = files
+
+    @staticmethod
+    def _load(path: Path) -> Optional[InstanceRecord]:
+        try:
+            return InstanceRecord.from_dict(json.loads(path.read_text(encoding='utf-8')))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            logger.debug(f"Ignoring unreadable registry record {path.name}: {e}")
+            return None
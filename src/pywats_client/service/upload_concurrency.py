@@ -0,0 +1,334 @@
+"""
+Adaptive upload concurrency for the converter pool
+
+The converter pool caps whole conversions with a fixed semaphore, which is
+the wrong knob for the upload step: a slow server gets the same number of
+concurrent submits as an idle one. AdaptiveConcurrencyLimiter gates only
+``api.report.submit`` and moves its limit with AIMD (additive increase,
+multiplicative decrease), the scheme TCP congestion control uses:
+
+- Every ``window`` completed submits the limiter evaluates the window.
+- Error rate above ``error_rate_threshold``, or average latency above the
+  target, multiplies the limit by ``decrease_factor``.
+- A healthy window in which the limit was actually reached adds
+  ``increase_step``. Idle capacity is not grown.
+- An OPEN circuit breaker drops the limit straight to ``min_limit``, and it
+  is held there while the breaker is OPEN or HALF_OPEN.
+
+Latency target: ``latency_target`` when configured, otherwise
+``latency_tolerance`` times a baseline learned from the fastest windows.
+
+Decisions are kept in ``snapshot()`` (served by the health server's
+/metrics endpoint).
+
+Usage:
+    limiter = AdaptiveConcurrencyLimiter(
+        AdaptiveConcurrencyConfig(max_limit=10),
+        circuit_state=lambda: breaker.state,
+    )
+    async with limiter.slot() as slot:
+        await api.report.submit(report)
+        slot.success()
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Optional
+
+from pywats.core.circuit_breaker import CircuitState
+from pywats.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class AdaptiveConcurrencyConfig:
+    """Configuration for AdaptiveConcurrencyLimiter."""
+
+    min_limit: int = 1
+    """Lowest concurrency; also the limit while the circuit is not CLOSED."""
+
+    max_limit: int = 10
+    """Highest concurrency the limiter will grow to."""
+
+    initial_limit: Optional[int] = None
+    """Starting limit (default: half of max_limit)."""
+
+    window: int = 10
+    """Completed submits per evaluation."""
+
+    increase_step: int = 1
+    """Additive increase after a healthy, saturated window."""
+
+    decrease_factor: float = 0.5
+    """Multiplicative decrease after an unhealthy window."""
+
+    error_rate_threshold: float = 0.2
+    """Error rate in a window above which the limit is decreased."""
+
+    latency_target: Optional[float] = None
+    """Absolute latency target in seconds (None = learned baseline)."""
+
+    latency_tolerance: float = 2.0
+    """Allowed window latency as a multiple of the learned baseline."""
+
+    baseline_drift: float = 0.05
+    """Per-window upward drift of the learned baseline, so it can follow a
+    server that has become permanently slower."""
+
+    def __post_init__(self) -> None:
+        if self.min_limit < 1:
+            raise ValueError("min_limit must be >= 1")
+        if self.max_limit < self.min_limit:
+            raise ValueError("max_limit must be >= min_limit")
+        if not 0.0 < self.decrease_factor < 1.0:
+            raise ValueError("decrease_factor must be between 0 and 1")
+        if self.window < 1:
+            raise ValueError("window must be >= 1")
+
+
+class _Slot:
+    """Outcome recorder for one acquired slot (see AdaptiveConcurrencyLimiter.slot)."""
+
+    def __init__(self) -> None:
+        self.succeeded = False
+
+    def success(self) -> None:
+        self.succeeded = True
+
+
+class _SlotContext:
+    def __init__(self, limiter: "AdaptiveConcurrencyLimiter") -> None:
+        self._limiter = limiter
+        self._slot = _Slot()
+        self._started = 0.0
+
+    async def __aenter__(self) -> _Slot:
+        await self._limiter.acquire()
+        self._started = time.monotonic()
+        return self._slot
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        latency = time.monotonic() - self._started
+        # Cancellation says nothing about the server
+        if exc_type is not None and issubclass(exc_type, asyncio.CancelledError):
+            self._limiter.release()
+            return
+        self._limiter.release(latency, success=self._slot.succeeded and exc_type is None)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Concurrency limiter whose limit follows observed upload health (AIMD).
+
+    Not thread-safe; use from a single event loop.
+
+    Args:
+        config: Limiter configuration (defaults if None)
+        circuit_state: Optional callable returning the HTTP circuit breaker state
+    """
+
+    def __init__(
+        self,
+        config: Optional[AdaptiveConcurrencyConfig] = None,
+        circuit_state: Optional[Callable[[], Optional[CircuitState]]] = None,
+    ) -> None:
+        self.config = config or AdaptiveConcurrencyConfig()
+        self._circuit_state = circuit_state
+
+        initial = self.config.initial_limit or max(1, self.config.max_limit // 2)
+        self._limit = min(max(initial, self.config.min_limit), self.config.max_limit)
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+        # Current window
+        self._window_count = 0
+        self._window_errors = 0
+        self._window_latency = 0.0
+        self._window_saturated = False
+
+        # Learned state
+        self._baseline_latency: Optional[float] = None
+        self._last_latency: Optional[float] = None
+
+        # Decision log
+        self._last_decision = "initial"
+        self._last_decision_at: Optional[float] = None
+        self._decisions: Dict[str, int] = {"increase": 0, "decrease": 0, "hold": 0, "circuit_open": 0}
+
+    # =========================================================================
+    # Slots
+    # =========================================================================
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit."""
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        """Number of acquired slots."""
+        return self._in_flight
+
+    def slot(self) -> _SlotContext:
+        """
+        Async context manager holding one slot.
+
+        Call ``success()`` on the yielded object once the operation has
+        succeeded; leaving the block without it (or with an exception)
+        records an error.
+        """
+        return _SlotContext(self)
+
+    async def acquire(self) -> None:
+        """Wait for a free slot under the current limit."""
+        self._check_circuit()
+        if self._in_flight < self._limit and not self._waiters:
+            self._take()
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was handed over just before cancellation; pass it on
+                self._in_flight -= 1
+                self._wake()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self, latency: Optional[float] = None, success: bool = True) -> None:
+        """
+        Release a slot, recording its outcome.
+
+        Args:
+            latency: Duration of the operation in seconds (None = not recorded)
+            success: Whether the operation succeeded
+        """
+        self._in_flight -= 1
+        if latency is not None:
+            self._record(latency, success)
+        self._wake()
+
+    def _take(self) -> None:
+        self._in_flight += 1
+        if self._in_flight >= self._limit:
+            self._window_saturated = True
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self._limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._take()
+                waiter.set_result(None)
+
+    # =========================================================================
+    # AIMD
+    # =========================================================================
+
+    def _record(self, latency: float, success: bool) -> None:
+        self._last_latency = latency
+        self._window_count += 1
+        self._window_latency += latency
+        if not success:
+            self._window_errors += 1
+
+        if self._check_circuit():
+            return
+        if self._window_count >= self.config.window:
+            self._evaluate_window()
+
+    def _check_circuit(self) -> bool:
+        """Clamp to min_limit while the breaker is not CLOSED. Returns True if clamped."""
+        state = self._circuit_state() if self._circuit_state else None
+        if state not in (CircuitState.OPEN, CircuitState.HALF_OPEN):
+            return False
+        if self._limit != self.config.min_limit:
+            self._decide("circuit_open", self.config.min_limit, f"circuit {state.value}")
+        self._reset_window()
+        return True
+
+    def _evaluate_window(self) -> None:
+        avg_latency = self._window_latency / self._window_count
+        error_rate = self._window_errors / self._window_count
+        target = self.latency_target
+
+        if error_rate > self.config.error_rate_threshold:
+            self._decrease(f"error rate {error_rate:.0%}")
+        elif target is not None and avg_latency > target:
+            self._decrease(f"latency {avg_latency:.3f}s > {target:.3f}s")
+        elif self._window_saturated and self._limit < self.config.max_limit:
+            self._decide(
+                "increase",
+                min(self._limit + self.config.increase_step, self.config.max_limit),
+                f"latency {avg_latency:.3f}s",
+            )
+        else:
+            self._decide("hold", self._limit, f"latency {avg_latency:.3f}s")
+
+        # Only healthy windows teach the baseline
+        if error_rate <= self.config.error_rate_threshold:
+            if self._baseline_latency is None:
+                self._baseline_latency = avg_latency
+            else:
+                drifted = self._baseline_latency * (1.0 + self.config.baseline_drift)
+                self._baseline_latency = min(drifted, avg_latency)
+
+        self._reset_window()
+
+    def _decrease(self, reason: str) -> None:
+        new_limit = max(self.config.min_limit, int(self._limit * self.config.decrease_factor))
+        self._decide("decrease", new_limit, reason)
+
+    def _decide(self, decision: str, new_limit: int, reason: str) -> None:
+        self._decisions[decision] += 1
+        self._last_decision = decision
+        self._last_decision_at = time.time()
+        if new_limit != self._limit:
+            logger.info(f"Upload concurrency {self._limit} -> {new_limit} ({decision}: {reason})")
+            self._limit = new_limit
+            self._wake()
+        else:
+            logger.debug(f"Upload concurrency held at {self._limit} ({decision}: {reason})")
+
+    def _reset_window(self) -> None:
+        self._window_count = 0
+        self._window_errors = 0
+        self._window_latency = 0.0
+        self._window_saturated = self._in_flight >= self._limit
+
+    @property
+    def latency_target(self) -> Optional[float]:
+        """Latency above which a window is considered overloaded."""
+        if self.config.latency_target is not None:
+            return self.config.latency_target
+        if self._baseline_latency is None:
+            return None
+        return self._baseline_latency * self.config.latency_tolerance
+
+    # =========================================================================
+    # Metrics
+    # =========================================================================
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current limit, load and decision history (for /metrics)."""
+        state = self._circuit_state() if self._circuit_state else None
+        return {
+            "limit": self._limit,
+            "min_limit": self.config.min_limit,
+            "max_limit": self.config.max_limit,
+            "in_flight": self._in_flight,
+            "waiting": len(self._waiters),
+            "last_latency": self._last_latency,
+            "baseline_latency": self._baseline_latency,
+            "latency_target": self.latency_target,
+            "circuit_state": state.value if isinstance(state, CircuitState) else None,
+            "last_decision": self._last_decision,
+            "last_decision_at": self._last_decision_at,
+            "decisions": dict(self._decisions),
+        }
@@ -3,4 +3,4 @@
 Internal development utilities for maintaining the pyWATS codebase.
 """
 
-__all__ = ["endpoint_scanner"]
+__all__ = ["endpoint_scanner", "perf"]
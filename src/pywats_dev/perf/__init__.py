@@ -0,0 +1,36 @@
+"""Performance tooling - server stand-in and load generation.
+
+Measures client throughput without a live WATS server:
+
+    >>> import asyncio
+    >>> from pywats_dev.perf import WATSStandInServer, StandInBehavior, LoadGenerator
+    >>> server = WATSStandInServer(StandInBehavior(latency=0.02, error_rate=0.01))
+    >>> result = asyncio.run(LoadGenerator(server).run(mode="pending_queue", rate=100, count=500))
+    >>> print(result.summary())
+
+Record production traffic once and replay it offline (see cassette module):
+
+    >>> replay = ReplayTransport(Cassette.load("traffic.jsonl.zst"), speed=0)
+"""
+
+from .stand_in import WATSStandInServer, StandInBehavior
+from .load_generator import LoadGenerator, LoadResult
+from .cassette import (
+    Cassette,
+    Interaction,
+    RecordingTransport,
+    ReplayTransport,
+    ReplayMismatchError,
+)
+
+__all__ = [
+    "WATSStandInServer",
+    "StandInBehavior",
+    "LoadGenerator",
+    "LoadResult",
+    "Cassette",
+    "Interaction",
+    "RecordingTransport",
+    "ReplayTransport",
+    "ReplayMismatchError",
+]
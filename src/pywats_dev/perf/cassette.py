@@ -0,0 +1,395 @@
+"""HTTP record/replay for deterministic performance runs.
+
+A cassette is a sequence of full request/response interactions stored as
+JSON Lines, compressed with zstd (``.zst``, requires ``zstandard``) or gzip
+(``.gz``), or left uncompressed (``.jsonl``).
+
+Record traffic by wrapping the real transport:
+
+    >>> recorder = RecordingTransport(httpx.AsyncHTTPTransport())
+    >>> async with AsyncWATS(base_url=url, token=token, transport=recorder) as api:
+    ...     await run_workload(api)
+    >>> recorder.cassette.save("traffic.jsonl.zst")
+
+Replay it offline, with recorded server latency or as fast as possible:
+
+    >>> replay = ReplayTransport(Cassette.load("traffic.jsonl.zst"), speed=1.0)
+    >>> async with AsyncWATS(base_url=url, token="x", transport=replay) as api:
+    ...     await run_workload(api)
+
+``speed`` only scales response latency; the client decides when requests
+are sent. With ``pace=True`` each request is also held until its recorded
+offset (scaled by ``speed``) from the first replayed request, reproducing
+the recorded arrival pattern.
+
+Authorization and cookie headers are redacted when recording.
+"""
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import io
+import json
+import time
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Literal, Optional, Tuple, Union
+
+import httpx
+
+from pywats.core.logging import get_logger
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+logger = get_logger(__name__)
+
+CASSETTE_VERSION = 1
+
+# Headers never written to a cassette
+REDACTED_HEADERS = frozenset({"authorization", "cookie", "set-cookie", "proxy-authorization"})
+# Headers describing the wire encoding; bodies are stored decoded
+_ENCODING_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+
+MatchMode = Literal["request", "sequence"]
+
+
+class ReplayMismatchError(LookupError):
+    """Raised when a replayed request has no recorded interaction."""
+
+
+def _encode_body(content: bytes) -> Tuple[str, str]:
+    """Encode a body for JSON storage as (text, encoding)."""
+    try:
+        return content.decode("utf-8"), "utf-8"
+    except UnicodeDecodeError:
+        return base64.b64encode(content).decode("ascii"), "base64"
+
+
+def _decode_body(text: str, encoding: str) -> bytes:
+    """Inverse of _encode_body."""
+    return base64.b64decode(text) if encoding == "base64" else text.encode("utf-8")
+
+
+def _clean_headers(headers: httpx.Headers) -> Dict[str, str]:
+    """Headers as a plain dict with secrets and wire-encoding headers removed."""
+    return {
+        key: ("<redacted>" if key in REDACTED_HEADERS else value)
+        for key, value in headers.items()
+        if key not in _ENCODING_HEADERS
+    }
+
+
+def _body_digest(content: bytes) -> str:
+    return hashlib.blake2b(content, digest_size=8).hexdigest() if content else ""
+
+
+@dataclass
+class Interaction:
+    """One recorded request/response pair."""
+    method: str
+    url: str
+    status_code: int
+    request_headers: Dict[str, str] = field(default_factory=dict)
+    request_body: str = ""
+    request_body_encoding: str = "utf-8"
+    response_headers: Dict[str, str] = field(default_factory=dict)
+    response_body: str = ""
+    response_body_encoding: str = "utf-8"
+    offset: float = 0.0  # Seconds from start of recording until the request was sent
+    elapsed: float = 0.0  # Seconds until the response was fully received
+
+    @property
+    def request_content(self) -> bytes:
+        return _decode_body(self.request_body, self.request_body_encoding)
+
+    @property
+    def response_content(self) -> bytes:
+        return _decode_body(self.response_body, self.response_body_encoding)
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        """Match key: method, full URL path + query, request body digest."""
+        return self.method, self.url, _body_digest(self.request_content)
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        """Build the recorded response for a replayed request."""
+        return httpx.Response(
+            self.status_code,
+            headers=self.response_headers,
+            content=self.response_content,
+            request=request,
+        )
+
+
+class Cassette:
+    """
+    Ordered collection of recorded interactions.
+
+    Args:
+        interactions: Initial interactions
+        metadata: Free-form metadata stored in the cassette header line
+    """
+
+    def __init__(
+        self,
+        interactions: Optional[List[Interaction]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.interactions: List[Interaction] = list(interactions or [])
+        self.metadata: Dict[str, Any] = dict(metadata or {})
+
+    def __len__(self) -> int:
+        return len(self.interactions)
+
+    def __iter__(self) -> Iterator[Interaction]:
+        return iter(self.interactions)
+
+    def append(self, interaction: Interaction) -> None:
+        self.interactions.append(interaction)
+
+    # =========================================================================
+    # Persistence
+    # =========================================================================
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """
+        Write the cassette; compression is chosen from the file suffix.
+
+        Args:
+            path: Target file (``.zst``, ``.gz`` or uncompressed)
+
+        Returns:
+            The written path
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        header = {"version": CASSETTE_VERSION, "count": len(self.interactions), **self.metadata}
+        lines = [json.dumps({"cassette": header}, separators=(",", ":"))]
+        lines.extend(json.dumps(asdict(i), separators=(",", ":")) for i in self.interactions)
+        payload = ("\n".join(lines) + "\n").encode("utf-8")
+
+        with _open_write(path) as f:
+            f.write(payload)
+        logger.debug(f"Saved cassette with {len(self.interactions)} interactions to {path}")
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "Cassette":
+        """
+        Read a cassette written by save().
+
+        Args:
+            path: Cassette file
+
+        Returns:
+            Cassette instance
+
+        Raises:
+            ValueError: If the file is not a supported cassette
+        """
+        path = Path(path)
+        with _open_read(path) as f:
+            text = io.TextIOWrapper(f, encoding="utf-8")
+            first = text.readline()
+            if not first:
+                return cls()
+            header = json.loads(first).get("cassette")
+            if not isinstance(header, dict) or header.get("version") != CASSETTE_VERSION:
+                raise ValueError(f"Unsupported cassette format: {path}")
+            interactions = [Interaction(**json.loads(line)) for line in text if line.strip()]
+
+        metadata = {k: v for k, v in header.items() if k not in ("version", "count")}
+        return cls(interactions, metadata)
+
+
+def _open_write(path: Path):
+    if path.suffix == ".zst":
+        if not HAS_ZSTD:
+            raise ImportError("zstandard is required for .zst cassettes: pip install zstandard")
+        return zstandard.ZstdCompressor(level=10).stream_writer(open(path, "wb"), closefd=True)
+    if path.suffix == ".gz":
+        return gzip.open(path, "wb")
+    return open(path, "wb")
+
+
+def _open_read(path: Path):
+    if path.suffix == ".zst":
+        if not HAS_ZSTD:
+            raise ImportError("zstandard is required for .zst cassettes: pip install zstandard")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """
+    Transport wrapper that records every interaction into a cassette.
+
+    Response bodies are read fully and stored decoded; the response handed
+    back to the client is rebuilt from the recorded bytes so recording and
+    replay see identical content.
+
+    Args:
+        inner: Transport performing the real requests
+        cassette: Cassette to append to (new one if None)
+    """
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, cassette: Optional[Cassette] = None) -> None:
+        self.inner = inner
+        self.cassette = cassette if cassette is not None else Cassette()
+        self._started = time.perf_counter()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request_content = await request.aread()
+        sent = time.perf_counter()
+        response = await self.inner.handle_async_request(request)
+        try:
+            response_content = await response.aread()
+        finally:
+            await response.aclose()
+        elapsed = time.perf_counter() - sent
+
+        request_body, request_encoding = _encode_body(request_content)
+        response_body, response_encoding = _encode_body(response_content)
+        interaction = Interaction(
+            method=request.method,
+            url=request.url.raw_path.decode("ascii"),
+            status_code=response.status_code,
+            request_headers=_clean_headers(request.headers),
+            request_body=request_body,
+            request_body_encoding=request_encoding,
+            response_headers=_clean_headers(response.headers),
+            response_body=response_body,
+            response_body_encoding=response_encoding,
+            offset=sent - self._started,
+            elapsed=elapsed,
+        )
+        self.cassette.append(interaction)
+        return interaction.to_response(request)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Transport serving responses from a cassette.
+
+    Requests are matched on method, path + query and request body digest;
+    repeated identical requests are served in recorded order. With
+    ``match="sequence"`` interactions are served strictly in order
+    regardless of the request.
+
+    Args:
+        cassette: Recorded interactions
+        speed: Time scaling - 1.0 reproduces recorded response times,
+            2.0 halves them, 0 serves as fast as possible
+        pace: Also hold each request until its recorded offset from the
+            first replayed request (scaled by speed), so a workload sending
+            faster than the recording keeps the recorded request spacing
+        match: "request" (default) or "sequence"
+        strict: Raise ReplayMismatchError for unmatched requests; when False
+            they are answered with HTTP 404
+        repeat: Serve the last matching interaction again once a key's
+            recordings are used up (for workloads looping over a recording)
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        speed: float = 1.0,
+        match: MatchMode = "request",
+        pace: bool = False,
+        strict: bool = True,
+        repeat: bool = False,
+    ) -> None:
+        if speed < 0:
+            raise ValueError("speed must be >= 0")
+        self.cassette = cassette
+        self.speed = speed
+        self.match = match
+        self.pace = pace
+        self.strict = strict
+        self.repeat = repeat
+        self.served = 0
+        self.unmatched = 0
+
+        # Indexes into cassette.interactions; served entries are skipped lazily
+        interactions = cassette.interactions
+        self._used = bytearray(len(interactions))
+        self._sequence: Deque[int] = deque(range(len(interactions)))
+        self._by_key: Dict[Tuple[str, str, str], Deque[int]] = defaultdict(deque)
+        self._by_url: Dict[Tuple[str, str], Deque[int]] = defaultdict(deque)
+        for index, interaction in enumerate(interactions):
+            self._by_key[interaction.key].append(index)
+            self._by_url[(interaction.method, interaction.url)].append(index)
+        self._first_offset = min((i.offset for i in interactions), default=0.0)
+        self._started: Optional[float] = None  # perf_counter() of the first request
+        self._lock = asyncio.Lock()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        content = await request.aread()
+        async with self._lock:
+            interaction = self._next(request, content)
+            if self._started is None:
+                self._started = time.perf_counter()
+
+        if interaction is None:
+            self.unmatched += 1
+            message = f"No recorded interaction for {request.method} {request.url.raw_path.decode('ascii')}"
+            if self.strict:
+                raise ReplayMismatchError(message)
+            logger.warning(message)
+            return httpx.Response(404, json={"message": message}, request=request)
+
+        if self.speed > 0:
+            delay = interaction.elapsed / self.speed
+            if self.pace:
+                due = self._started + (interaction.offset - self._first_offset) / self.speed
+                delay += max(0.0, due - time.perf_counter())
+            if delay > 0:
+                await asyncio.sleep(delay)
+        self.served += 1
+        return interaction.to_response(request)
+
+    def _next(self, request: httpx.Request, content: bytes) -> Optional[Interaction]:
+        """Take the interaction answering this request."""
+        if self.match == "sequence":
+            index = self._take(self._sequence)
+            return self.cassette.interactions[index] if index is not None else None
+
+        url = request.url.raw_path.decode("ascii")
+        # Exact body match first, then same endpoint with a different body
+        # (e.g. reports carrying fresh timestamps or UUIDs)
+        for queue in (
+            self._by_key.get((request.method, url, _body_digest(content))),
+            self._by_url.get((request.method, url)),
+        ):
+            index = self._take(queue) if queue else None
+            if index is not None:
+                return self.cassette.interactions[index]
+        return None
+
+    def _take(self, queue: Deque[int]) -> Optional[int]:
+        """Pop the next unserved index (the last one is kept when repeating)."""
+        while queue and self._used[queue[0]]:
+            queue.popleft()
+        if not queue:
+            return None
+        if self.repeat and len(queue) == 1:
+            return queue[0]
+        index = queue.popleft()
+        self._used[index] = 1
+        return index
+
+    @property
+    def remaining(self) -> int:
+        """Recorded interactions not yet served."""
+        return len(self._used) - sum(self._used)
@@ -0,0 +1,59 @@
+"""CLI command for load testing the client against the server stand-in."""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from .stand_in import StandInBehavior, WATSStandInServer
+from .load_generator import LoadGenerator
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Measure pyWATS client throughput against an in-process WATS server stand-in"
+    )
+    parser.add_argument(
+        "--mode",
+        "-m",
+        choices=["api", "pending_queue", "converter_pool", "all"],
+        default="all",
+        help="Client path to exercise (default: all)"
+    )
+    parser.add_argument("--rate", "-r", type=float, default=100.0, help="Target reports per second (default: 100)")
+    parser.add_argument("--count", "-c", type=int, default=1000, help="Reports per run (default: 1000)")
+    parser.add_argument("--concurrency", type=int, default=10, help="Client concurrency (default: 10)")
+    parser.add_argument("--latency", type=float, default=0.02, help="Server latency in seconds (default: 0.02)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Server latency jitter in seconds (default: 0)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with 500 (default: 0)")
+    parser.add_argument("--throttle-rps", type=float, default=None, help="Server-side rate limit returning 429")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    args = parser.parse_args()
+
+    server = WATSStandInServer(StandInBehavior(
+        latency=args.latency,
+        latency_jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rps=args.throttle_rps,
+    ))
+    generator = LoadGenerator(server, max_concurrent=args.concurrency)
+    modes = ["api", "pending_queue", "converter_pool"] if args.mode == "all" else [args.mode]
+
+    async def run_all():
+        return [await generator.run(mode=mode, rate=args.rate, count=args.count) for mode in modes]
+
+    results = asyncio.run(run_all())
+
+    if args.json:
+        print(json.dumps([r.to_dict() for r in results], indent=2))
+    else:
+        for result in results:
+            print(result.summary())
+
+    sys.exit(0 if all(r.accepted == r.sent for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
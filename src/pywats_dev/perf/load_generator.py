@@ -0,0 +1,366 @@
+"""Load generator for client throughput measurements.
+
+Drives synthetic UUT reports (pywats.tools.test_uut.create_test_uut_report)
+through one of three client paths at a target rate and reports throughput,
+latency percentiles and process RSS:
+
+- ``api``: AsyncWATS.report.submit() called directly
+- ``pending_queue``: reports written as .queued files and uploaded by
+  AsyncPendingQueue
+- ``converter_pool``: source files handed to AsyncConverterPool as if they
+  were dropped in a watch folder, converted and submitted by the pool
+
+Latency is measured end to end: from the moment a report is handed to the
+client path until the server stand-in accepts it.
+
+Example:
+    >>> server = WATSStandInServer(StandInBehavior(latency=0.02))
+    >>> result = asyncio.run(LoadGenerator(server).run(mode="api", rate=200, count=2000))
+    >>> print(result.summary())
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional
+
+from pywats import AsyncWATS
+from pywats.core.logging import get_logger
+from pywats.core.retry import RetryConfig
+from pywats.tools.test_uut import create_test_uut_report
+
+from .stand_in import WATSStandInServer
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+logger = get_logger(__name__)
+
+LoadMode = Literal["api", "pending_queue", "converter_pool"]
+
+
+def _current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes (None if unavailable)."""
+    if HAS_PSUTIL:
+        return psutil.Process(os.getpid()).memory_info().rss
+    try:
+        import resource
+        # ru_maxrss is KiB on Linux (peak, not current - best effort fallback)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except (ImportError, AttributeError):
+        return None
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+@dataclass
+class LoadResult:
+    """Outcome of a load run."""
+    mode: str
+    target_rate: float
+    sent: int
+    accepted: int
+    duration_seconds: float
+    latencies_ms: List[float] = field(default_factory=list, repr=False)
+    peak_rss_bytes: Optional[int] = None
+    server_stats: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        """Accepted reports per second."""
+        return self.accepted / self.duration_seconds if self.duration_seconds > 0 else 0.0
+
+    @property
+    def p50_ms(self) -> float:
+        """Median end-to-end latency in milliseconds."""
+        return _percentile(sorted(self.latencies_ms), 50)
+
+    @property
+    def p99_ms(self) -> float:
+        """99th percentile end-to-end latency in milliseconds."""
+        return _percentile(sorted(self.latencies_ms), 99)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary as a JSON-serializable dict."""
+        return {
+            "mode": self.mode,
+            "target_rate": self.target_rate,
+            "sent": self.sent,
+            "accepted": self.accepted,
+            "duration_seconds": round(self.duration_seconds, 3),
+            "throughput_per_second": round(self.throughput, 1),
+            "p50_ms": round(self.p50_ms, 2),
+            "p99_ms": round(self.p99_ms, 2),
+            "peak_rss_mb": round(self.peak_rss_bytes / 1024 / 1024, 1) if self.peak_rss_bytes else None,
+            "server": dict(self.server_stats),
+        }
+
+    def summary(self) -> str:
+        """Human-readable one-line summary."""
+        rss = f", RSS {self.peak_rss_bytes / 1024 / 1024:.0f} MB" if self.peak_rss_bytes else ""
+        return (
+            f"[{self.mode}] {self.accepted}/{self.sent} accepted in {self.duration_seconds:.2f}s "
+            f"({self.throughput:.1f}/s, target {self.target_rate:.0f}/s), "
+            f"p50 {self.p50_ms:.1f} ms, p99 {self.p99_ms:.1f} ms{rss}"
+        )
+
+
+class LoadGenerator:
+    """
+    Paced report generator against a WATSStandInServer.
+
+    Args:
+        server: Server stand-in receiving the traffic
+        part_number: Part number used for generated reports
+        max_concurrent: Concurrency passed to the client component under test
+        work_dir: Directory for queue/watch files (temporary if None)
+    """
+
+    def __init__(
+        self,
+        server: WATSStandInServer,
+        part_number: str = "PN-LOAD-001",
+        max_concurrent: int = 10,
+        work_dir: Optional[Path] = None,
+    ) -> None:
+        self.server = server
+        self.part_number = part_number
+        self.max_concurrent = max_concurrent
+        self.work_dir = work_dir
+        self._run_id = 0
+
+    def create_api(self) -> AsyncWATS:
+        """Create an AsyncWATS client bound to the stand-in server."""
+        return AsyncWATS(
+            base_url=self.server.base_url,
+            token="bG9hZDp0ZXN0",
+            transport=self.server.transport(),
+            enable_throttling=False,
+            enable_cache=False,
+            retry_config=RetryConfig(max_attempts=3, base_delay=0.05, max_delay=0.5),
+        )
+
+    def make_report(self, serial_number: str) -> Dict[str, Any]:
+        """Build one WSJF report dict."""
+        report = create_test_uut_report(part_number=self.part_number, serial_number=serial_number)
+        return report.model_dump(mode="json", by_alias=True, exclude_none=True)
+
+    async def run(
+        self,
+        mode: LoadMode = "api",
+        rate: float = 100.0,
+        count: int = 1000,
+        drain_timeout: float = 60.0,
+    ) -> LoadResult:
+        """
+        Send ``count`` reports at ``rate`` per second through ``mode``.
+
+        Args:
+            mode: Client path to exercise
+            rate: Target send rate (reports per second)
+            count: Number of reports to send
+            drain_timeout: Seconds to wait for in-flight reports after the last send
+
+        Returns:
+            LoadResult with throughput, latency percentiles and peak RSS
+        """
+        self._run_id += 1
+        prefix = f"LOAD{self._run_id}-"
+        self.server.reset_stats()
+
+        # Pre-build payloads so report generation doesn't skew the pacing
+        payloads = [self.make_report(f"{prefix}{i:07d}") for i in range(count)]
+        sent_at: Dict[str, float] = {}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            work_dir = Path(self.work_dir or tmp)
+            api = self.create_api()
+            driver = {
+                "api": self._drive_api,
+                "pending_queue": self._drive_pending_queue,
+                "converter_pool": self._drive_converter_pool,
+            }[mode]
+
+            peak_rss = _current_rss()
+            sampler_stop = asyncio.Event()
+
+            async def sample_rss() -> None:
+                nonlocal peak_rss
+                while not sampler_stop.is_set():
+                    rss = _current_rss()
+                    if rss is not None and (peak_rss is None or rss > peak_rss):
+                        peak_rss = rss
+                    try:
+                        await asyncio.wait_for(sampler_stop.wait(), timeout=0.1)
+                    except asyncio.TimeoutError:
+                        pass
+
+            sampler = asyncio.create_task(sample_rss())
+            started = time.perf_counter()
+            try:
+                async with api:
+                    await driver(api, payloads, rate, sent_at, work_dir, drain_timeout)
+            finally:
+                sampler_stop.set()
+                await sampler
+
+        accepted = {sn: t for sn, t in self.server.accepted_at.items() if sn.startswith(prefix)}
+        finished = max(accepted.values()) if accepted else time.perf_counter()
+        latencies = [(t - sent_at[sn]) * 1000.0 for sn, t in accepted.items() if sn in sent_at]
+
+        result = LoadResult(
+            mode=mode,
+            target_rate=rate,
+            sent=len(sent_at),
+            accepted=len(accepted),
+            duration_seconds=finished - started,
+            latencies_ms=latencies,
+            peak_rss_bytes=peak_rss,
+            server_stats=dict(self.server.stats),
+        )
+        logger.info(result.summary())
+        return result
+
+    # =========================================================================
+    # Pacing
+    # =========================================================================
+
+    @staticmethod
+    async def _paced(payloads: List[Dict[str, Any]], rate: float):
+        """Yield payloads on a fixed schedule of ``rate`` per second."""
+        interval = 1.0 / rate if rate > 0 else 0.0
+        start = time.perf_counter()
+        for i, payload in enumerate(payloads):
+            delay = start + i * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield payload
+
+    async def _wait_accepted(self, sent_at: Dict[str, float], timeout: float) -> None:
+        """Wait until every sent serial number was accepted (or timeout)."""
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            if all(sn in self.server.accepted_at for sn in sent_at):
+                return
+            await asyncio.sleep(0.02)
+        missing = sum(1 for sn in sent_at if sn not in self.server.accepted_at)
+        logger.warning(f"Load run drained with {missing} reports not accepted")
+
+    # =========================================================================
+    # Drivers
+    # =========================================================================
+
+    async def _drive_api(self, api, payloads, rate, sent_at, work_dir, drain_timeout) -> None:
+        """Submit directly through AsyncWATS with bounded concurrency."""
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        tasks = set()
+
+        async def submit(payload: Dict[str, Any]) -> None:
+            try:
+                await api.report.submit(payload)
+            except Exception as e:
+                logger.debug(f"Submit failed for {payload['sn']}: {e}")
+            finally:
+                semaphore.release()
+
+        async for payload in self._paced(payloads, rate):
+            await semaphore.acquire()
+            sent_at[payload["sn"]] = time.perf_counter()
+            task = asyncio.create_task(submit(payload))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.wait(tasks, timeout=drain_timeout)
+
+    async def _drive_pending_queue(self, api, payloads, rate, sent_at, work_dir, drain_timeout) -> None:
+        """Write .queued files and let AsyncPendingQueue upload them."""
+        from pywats_client.service.async_pending_queue import AsyncPendingQueue
+
+        queue_dir = work_dir / "pending"
+        queue = AsyncPendingQueue(api, queue_dir, max_concurrent=self.max_concurrent, max_queue_size=0)
+        runner = asyncio.create_task(queue.run())
+        try:
+            async for payload in self._paced(payloads, rate):
+                tmp_path = queue_dir / f"{payload['sn']}.tmp"
+                await asyncio.to_thread(tmp_path.write_text, json.dumps(payload), encoding="utf-8")
+                sent_at[payload["sn"]] = time.perf_counter()
+                tmp_path.rename(tmp_path.with_suffix(".queued"))
+            await self._wait_accepted(sent_at, drain_timeout)
+        finally:
+            await queue.stop()
+            runner.cancel()
+            await asyncio.gather(runner, return_exceptions=True)
+
+    async def _drive_converter_pool(self, api, payloads, rate, sent_at, work_dir, drain_timeout) -> None:
+        """Drop source files and feed them to AsyncConverterPool like its watcher would."""
+        from pywats_client.core.config import ClientConfig
+        from pywats_client.service.async_converter_pool import AsyncConverterPool
+
+        watch_dir = work_dir / "drop"
+        watch_dir.mkdir(parents=True, exist_ok=True)
+        converter = _create_load_test_converter(watch_dir)
+        pool = AsyncConverterPool(
+            ClientConfig(), api, max_concurrent=self.max_concurrent, enable_sandbox=False
+        )
+        pool._startup_scan_enabled = False
+        runner = asyncio.create_task(pool.run())
+        try:
+            async for payload in self._paced(payloads, rate):
+                source = watch_dir / f"{payload['sn']}.json"
+                await asyncio.to_thread(source.write_text, json.dumps(payload), encoding="utf-8")
+                sent_at[payload["sn"]] = time.perf_counter()
+                pool._on_file_created(source, converter)
+            await self._wait_accepted(sent_at, drain_timeout)
+        finally:
+            await pool.stop()
+            runner.cancel()
+            await asyncio.gather(runner, return_exceptions=True)
+
+
+def _create_load_test_converter(watch_path: Path) -> Any:
+    """Create a pass-through converter (class built lazily - pywats_client is optional)."""
+    from pywats_client.converters.file_converter import FileConverter
+    from pywats_client.converters.models import ConverterResult, PostProcessAction
+
+    class LoadTestConverter(FileConverter):
+        """Pass-through converter: source files already contain WSJF JSON."""
+
+        def __init__(self, watch_path: Path) -> None:
+            super().__init__()
+            self.watch_path = watch_path
+            self.watch_recursive = False
+            self.supported_extensions = [".json"]
+            self.post_process_action = PostProcessAction.DELETE
+            self.archive_path = None
+            self.error_path = None
+            self.priority = 5
+
+        @property
+        def name(self) -> str:
+            return "LoadTestConverter"
+
+        def matches_file(self, file_path: Path) -> bool:
+            return file_path.suffix == ".json"
+
+        def process_archive_queue(self) -> None:
+            pass
+
+        def convert(self, source, context) -> "ConverterResult":
+            report = json.loads(source.path.read_text(encoding="utf-8"))
+            return ConverterResult.success_result(report=report, post_action=PostProcessAction.DELETE)
+
+    return LoadTestConverter(watch_path)
@@ -0,0 +1,436 @@
+"""In-process WATS server stand-in.
+
+Serves the subset of WATS routes used by report submission, header queries,
+product/process lookups and the most common analytics calls, entirely in
+memory. Plug it into AsyncWATS through an httpx transport:
+
+    >>> server = WATSStandInServer(StandInBehavior(latency=0.02, error_rate=0.01))
+    >>> api = AsyncWATS(base_url=server.base_url, token="x", transport=server.transport())
+
+Latency, error injection and throttling are configurable so client
+throughput can be measured without a live server.
+"""
+
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+from collections import Counter, deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import unquote
+
+import httpx
+
+from pywats.core.routes import Routes
+
+
+# WSJF result codes -> header result strings
+_RESULT_NAMES = {"P": "Passed", "F": "Failed", "E": "Error", "T": "Terminated"}
+
+# OData comparison clause: <field> <op> <literal>
+_CLAUSE_RE = re.compile(r"^\s*(\w+)\s+(eq|ne|ge|gt|le|lt)\s+(.+?)\s*$", re.IGNORECASE)
+
+Handler = Callable[[httpx.Request, Dict[str, str]], Awaitable[httpx.Response]]
+
+
+@dataclass
+class StandInBehavior:
+    """Server behavior knobs.
+
+    Attributes:
+        latency: Base response latency in seconds
+        latency_jitter: Random extra latency in seconds (uniform 0..jitter)
+        error_rate: Fraction of requests answered with HTTP 500 (0.0-1.0)
+        throttle_rps: Requests per second accepted before answering HTTP 429
+            (None disables throttling)
+        max_top: Server-side cap on $top for header queries (None = no cap)
+        seed: Random seed for reproducible latency/error sequences
+    """
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    error_rate: float = 0.0
+    throttle_rps: Optional[float] = None
+    max_top: Optional[int] = None
+    seed: Optional[int] = None
+
+
+def _parse_datetime(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp (with optional trailing Z) as UTC."""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _parse_literal(text: str) -> Any:
+    """Parse an OData literal: 'string', number or datetime."""
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] == "'":
+        return text[1:-1].replace("''", "'")
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    return _parse_datetime(text)
+
+
+def _compile_filter(odata_filter: Optional[str]) -> List[Tuple[str, str, Any]]:
+    """
+    Compile an 'and'-joined OData filter into (field, op, value) clauses.
+
+    Only the simple comparisons produced by filter_builders are supported;
+    anything else raises ValueError (answered as HTTP 400).
+    """
+    if not odata_filter:
+        return []
+    clauses = []
+    for part in re.split(r"\s+and\s+", odata_filter.strip(), flags=re.IGNORECASE):
+        match = _CLAUSE_RE.match(part)
+        if not match:
+            raise ValueError(f"Unsupported filter clause: {part!r}")
+        field_name, op, literal = match.groups()
+        clauses.append((field_name, op.lower(), _parse_literal(literal)))
+    return clauses
+
+
+def _matches(record: Dict[str, Any], clauses: List[Tuple[str, str, Any]]) -> bool:
+    """Evaluate compiled filter clauses against a stored header."""
+    for field_name, op, expected in clauses:
+        actual = record.get(field_name)
+        if isinstance(expected, datetime):
+            actual = record.get(f"_{field_name}_dt")
+        if actual is None:
+            return False
+        if op == "eq" and not actual == expected:
+            return False
+        if op == "ne" and not actual != expected:
+            return False
+        if op == "ge" and not actual >= expected:
+            return False
+        if op == "gt" and not actual > expected:
+            return False
+        if op == "le" and not actual <= expected:
+            return False
+        if op == "lt" and not actual < expected:
+            return False
+    return True
+
+
+def _public(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Strip private index fields from a stored header."""
+    return {k: v for k, v in record.items() if not k.startswith("_")}
+
+
+class WATSStandInServer:
+    """
+    In-memory stand-in for a WATS server.
+
+    State (reports, products, processes) lives in plain dicts so tests and
+    load runs can seed and inspect it directly. Every handled request is
+    counted in ``stats`` and accepted reports are timestamped in
+    ``accepted_at`` (serial number -> time.perf_counter()) for end-to-end
+    latency measurement.
+
+    Example:
+        >>> server = WATSStandInServer()
+        >>> server.add_product("PN-001", name="Widget")
+        >>> async with AsyncWATS(base_url=server.base_url, token="x",
+        ...                      transport=server.transport()) as api:
+        ...     product = await api.product.get_product("PN-001")
+    """
+
+    base_url = "http://wats-stand-in.local"
+
+    def __init__(self, behavior: Optional[StandInBehavior] = None) -> None:
+        self.behavior = behavior or StandInBehavior()
+        self._random = random.Random(self.behavior.seed)
+
+        # Server state
+        self.reports: Dict[str, Dict[str, Any]] = {}
+        self.headers: List[Dict[str, Any]] = []
+        self.products: Dict[str, Dict[str, Any]] = {}
+        self.processes: List[Dict[str, Any]] = [
+            {"code": 10, "name": "SW Debug", "isTestOperation": True},
+            {"code": 100, "name": "End of line test", "isTestOperation": True},
+            {"code": 500, "name": "Repair", "isRepairOperation": True},
+        ]
+        self.version = "24.1.0"
+
+        # Instrumentation
+        self.stats: Counter = Counter()
+        self.accepted_at: Dict[str, float] = {}
+        self._request_times: Deque[float] = deque()
+
+        self._exact: Dict[Tuple[str, str], Handler] = {}
+        self._prefix: List[Tuple[str, str, Handler]] = []
+        self._register_routes()
+
+    # =========================================================================
+    # Public API
+    # =========================================================================
+
+    def transport(self) -> httpx.MockTransport:
+        """Create an httpx transport that routes requests to this server."""
+        return httpx.MockTransport(self.handle)
+
+    def route(self, method: str, path: str, prefix: bool = False) -> Callable[[Handler], Handler]:
+        """
+        Register an extra route handler (decorator).
+
+        Args:
+            method: HTTP method
+            path: Exact path, or path prefix when prefix=True (the remainder
+                is passed to the handler as params["tail"])
+            prefix: Match on path prefix instead of exact path
+        """
+        def decorator(handler: Handler) -> Handler:
+            if prefix:
+                self._prefix.append((method.upper(), path.rstrip("/") + "/", handler))
+                self._prefix.sort(key=lambda entry: len(entry[1]), reverse=True)
+            else:
+                self._exact[(method.upper(), path)] = handler
+            return handler
+        return decorator
+
+    def add_product(self, part_number: str, **fields: Any) -> Dict[str, Any]:
+        """Add (or replace) a product."""
+        product = {"partNumber": part_number, "name": part_number, "state": 1, **fields}
+        self.products[part_number] = product
+        return product
+
+    def seed_headers(
+        self,
+        count: int,
+        start: datetime,
+        end: datetime,
+        part_numbers: Optional[List[str]] = None,
+        fail_rate: float = 0.05,
+    ) -> None:
+        """
+        Populate the header index with synthetic reports spread over a window.
+
+        Args:
+            count: Number of headers to create
+            start: Start of the time window
+            end: End of the time window
+            part_numbers: Part numbers to cycle through
+            fail_rate: Fraction of failed results
+        """
+        part_numbers = part_numbers or ["PN-LOAD-001"]
+        span = (end - start).total_seconds()
+        for i in range(count):
+            started = start + timedelta(seconds=span * i / max(count, 1))
+            self._index_header({
+                "id": str(uuid.uuid4()),
+                "sn": f"SEED-{i:08d}",
+                "pn": part_numbers[i % len(part_numbers)],
+                "rev": "A",
+                "processCode": 100,
+                "result": "F" if self._random.random() < fail_rate else "P",
+                "machineName": "STAND-IN",
+                "start": started.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+            })
+
+    def reset_stats(self) -> None:
+        """Clear request counters and acceptance timestamps."""
+        self.stats.clear()
+        self.accepted_at.clear()
+        self._request_times.clear()
+
+    # =========================================================================
+    # Dispatch
+    # =========================================================================
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        """Handle a single request (httpx.MockTransport handler)."""
+        method = request.method.upper()
+        path = unquote(request.url.path)
+        self.stats["requests"] += 1
+
+        await self._simulate_latency()
+
+        if self._is_throttled():
+            self.stats["throttled"] += 1
+            return httpx.Response(429, headers={"Retry-After": "1"}, json={"message": "Too many requests"})
+
+        if self.behavior.error_rate and self._random.random() < self.behavior.error_rate:
+            self.stats["injected_errors"] += 1
+            return httpx.Response(500, json={"message": "Injected server error"})
+
+        handler, params, label = self._resolve(method, path)
+        if handler is None:
+            self.stats["not_found"] += 1
+            return httpx.Response(404, json={"message": f"No route for {method} {path}"})
+
+        self.stats[label] += 1
+        try:
+            return await handler(request, params)
+        except ValueError as e:
+            self.stats["bad_request"] += 1
+            return httpx.Response(400, json={"message": str(e)})
+
+    def _resolve(self, method: str, path: str) -> Tuple[Optional[Handler], Dict[str, str], str]:
+        """Find the handler for a request path (handler, params, stats label)."""
+        handler = self._exact.get((method, path))
+        if handler is not None:
+            return handler, {}, f"{method} {path}"
+        for route_method, prefix, handler in self._prefix:
+            if route_method == method and path.startswith(prefix):
+                return handler, {"tail": path[len(prefix):]}, f"{method} {prefix}*"
+        return None, {}, ""
+
+    async def _simulate_latency(self) -> None:
+        """Sleep for the configured latency."""
+        delay = self.behavior.latency
+        if self.behavior.latency_jitter:
+            delay += self._random.uniform(0.0, self.behavior.latency_jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _is_throttled(self) -> bool:
+        """Sliding one-second window request counter."""
+        if not self.behavior.throttle_rps:
+            return False
+        now = time.monotonic()
+        window = self._request_times
+        while window and now - window[0] > 1.0:
+            window.popleft()
+        if len(window) >= self.behavior.throttle_rps:
+            return True
+        window.append(now)
+        return False
+
+    # =========================================================================
+    # Routes
+    # =========================================================================
+
+    def _register_routes(self) -> None:
+        """Register the built-in route handlers."""
+        self.route("GET", Routes.App.VERSION)(self._get_version)
+        self.route("GET", Routes.App.PROCESSES)(self._get_processes)
+        self.route("GET", Routes.Process.Internal.GET_PROCESSES)(self._get_processes_internal)
+        self.route("GET", Routes.Product.QUERY)(self._get_products)
+        self.route("GET", Routes.Product.BASE, prefix=True)(self._get_product)
+        self.route("POST", Routes.Report.WSJF)(self._post_wsjf)
+        self.route("GET", Routes.Report.QUERY_HEADER)(self._query_headers)
+        self.route("GET", f"{Routes.Report.BASE}/Wsjf", prefix=True)(self._get_wsjf)
+        for analytics_route in (Routes.App.DYNAMIC_YIELD, Routes.App.VOLUME_YIELD, Routes.App.HIGH_VOLUME):
+            self.route("GET", analytics_route)(self._yield)
+            self.route("POST", analytics_route)(self._yield)
+
+    async def _get_version(self, request: httpx.Request, params: Dict[str, str]) -> httpx.Response:
+        return httpx.Response(200, json=self.version)
+
+    async def _get_processes(self, request: httpx.Request, params: Dict[str, str]) -> httpx.Response:
+        return httpx.Response(200, json=self.processes)
+
+    async def _get_processes_internal(self, request: httpx.Request, params: Dict[str, str]) -> httpx.Response:
+        return httpx.Response(200, json=[
+            {
+                "Code": p.get("code"),
+                "Name": p.get("name"),
+                "Description": p.get("description"),
+                "State": 1,
+                "IsTestOperation": p.get("isTestOperation", False),
+                "IsRepairOperation": p.get("isRepairOperation", False),
+                "IsWIPOperation": p.get("isWipOperation", False),
+            }
+            for p in self.processes
+        ])
+
+    async def _get_products(self, request: httpx.Request, params: Dict[str, str]) -> httpx.Response:
+        return httpx.Response(200, json=list(self.products.values()))
+
+    async def _get_product(self, request: httpx.Request, params: Dict[str, str]) -> httpx.Response:
+        product = self.products.get(params["tail"])
+        if product is None:
+            return httpx.Response(404, json={"message": "Product not found"})
+        return httpx.Response(200, json=product)
+
+    async def _post_wsjf(self, request: httpx.Request, params: Dict[str, str]) -> httpx.Response:
+        report = json.loads(request.content or b"{}")
+        if not isinstance(report, dict) or not report.get("pn") or not report.get("sn"):
+            raise ValueError("Report must contain pn and sn")
+        report_id = str(report.get("id") or uuid.uuid4())
+        report["id"] = report_id
+        self.reports[report_id] = report
+        self._index_header(report)
+        self.accepted_at[report["sn"]] = time.perf_counter()
+        self.stats["reports_accepted"] += 1
+        return httpx.Response(200, json=[{"ID": report_id}])
+
+    async def _get_wsjf(self, request: httpx.Request, params: Dict[str, str]) -> httpx.Response:
+        report = self.reports.get(params["tail"])
+        if report is None:
+            return httpx.Response(404, json={"message": "Report not found"})
+        return httpx.Response(200, json=report)
+
+    async def _query_headers(self, request: httpx.Request, params: Dict[str, str]) -> httpx.Response:
+        query = request.url.params
+        clauses = _compile_filter(query.get("$filter"))
+        report_type = "R" if query.get("reportType") == "R" else "T"
+        rows = [
+            h for h in self.headers
+            if h["reportType"] == report_type and _matches(h, clauses)
+        ]
+
+        orderby = query.get("$orderby")
+        if orderby:
+            field_name, _, direction = orderby.partition(" ")
+            key = f"_{field_name}_dt" if f"_{field_name}_dt" in (rows[0] if rows else {}) else field_name
+            rows.sort(key=lambda h: (h.get(key) is None, h.get(key)), reverse=direction.strip().lower() == "desc")
+
+        skip = int(query.get("$skip", 0))
+        top = int(query["$top"]) if "$top" in query else None
+        if self.behavior.max_top is not None:
+            top = min(top, self.behavior.max_top) if top is not None else self.behavior.max_top
+        rows = rows[skip:skip + top] if top is not None else rows[skip:]
+
+        self.stats["headers_returned"] += len(rows)
+        return httpx.Response(200, json=[_public(h) for h in rows])
+
+    async def _yield(self, request: httpx.Request, params: Dict[str, str]) -> httpx.Response:
+        groups: Dict[str, List[int]] = {}
+        for header in self.headers:
+            counts = groups.setdefault(header["partNumber"], [0, 0])
+            counts[0] += 1
+            counts[1] += header["result"] == "Passed"
+        return httpx.Response(200, json=[
+            {
+                "partNumber": pn,
+                "unitCount": total,
+                "fpCount": passed,
+                "fpy": passed / total if total else None,
+            }
+            for pn, (total, passed) in sorted(groups.items())
+        ])
+
+    # =========================================================================
+    # Helpers
+    # =========================================================================
+
+    def _index_header(self, report: Dict[str, Any]) -> None:
+        """Derive a query header from a WSJF report and add it to the index."""
+        start = report.get("start") or datetime.now(timezone.utc).isoformat()
+        header = {
+            "uuid": report["id"],
+            "serialNumber": report["sn"],
+            "partNumber": report["pn"],
+            "revision": report.get("rev"),
+            "reportType": "R" if report.get("type") == "R" else "T",
+            "processCode": report.get("processCode"),
+            "result": _RESULT_NAMES.get(report.get("result", "P"), report.get("result")),
+            "stationName": report.get("machineName"),
+            "start": start,
+            "startUtc": start,
+            "_start_dt": _parse_datetime(start),
+        }
+        self.headers.append(header)
@@ -255,7 +255,7 @@ class AsyncEventBus:
                 )
                 await self.publish_queued(retry_event)
             elif self._error_policy:
-                await self._error_policy.handle_failure_async(event, e)
+                await self._error_policy.handle_failure_async(event, e, handler.name)
             
             return None
     
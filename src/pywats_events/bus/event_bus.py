@@ -286,7 +286,7 @@ class EventBus:
                 )
                 self.publish_async(retry_event)
             elif self._error_policy:
-                self._error_policy.handle_failure(event, e)
+                self._error_policy.handle_failure(event, e, handler.name)
             
             return None
     
@@ -8,7 +8,11 @@ They are protocol-agnostic and can originate from any transport adapter
 
 from __future__ import annotations
 
-import uuid
+import itertools
+import os
+import random
+import secrets
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional, TYPE_CHECKING
@@ -17,7 +21,54 @@ if TYPE_CHECKING:
     from pywats_events.models.event_types import EventType
 
 
-@dataclass
+# =============================================================================
+# Event IDs
+# =============================================================================
+
+# Per-process random bits + a counter starting at a random 48-bit value make
+# IDs unique without calling uuid4(): two processes collide only if all 26
+# process bits match and their counter ranges overlap (74 random bits)
+_PROCESS_BITS = 0
+_sequence = itertools.count()
+
+
+def _reseed() -> None:
+    """Draw new per-process random bits and counter start."""
+    global _PROCESS_BITS, _sequence
+    _PROCESS_BITS = secrets.randbits(26)
+    _sequence = itertools.count(secrets.randbits(48))
+
+
+_reseed()
+if hasattr(os, "register_at_fork"):
+    # A forked child would otherwise repeat the parent's IDs
+    os.register_at_fork(after_in_child=_reseed)
+
+
+def new_event_id(created: Optional[float] = None) -> str:
+    """
+    Generate a time-ordered event ID.
+    
+    The ID is formatted like a UUIDv7 (48-bit Unix milliseconds, then
+    per-process random bits and a 48-bit counter with a random start), so it
+    sorts by creation time within a process and parses as a UUID wherever a
+    uuid4 string was accepted.
+    
+    Args:
+        created: Creation time (``time.time()``), defaults to now
+    """
+    return _format_id(time.time() if created is None else created, next(_sequence))
+
+
+def _format_id(created: float, seq: int) -> str:
+    millis = int(created * 1000) & 0xFFFFFFFFFFFF
+    return (
+        f"{millis >> 16:08x}-{millis & 0xFFFF:04x}-"
+        f"7{_PROCESS_BITS >> 14:03x}-{0x8000 | (_PROCESS_BITS & 0x3FFF):04x}-"
+        f"{seq & 0xFFFFFFFFFFFF:012x}"
+    )
+
+
 class EventMetadata:
     """
     Metadata for event tracing, correlation, and debugging.
@@ -28,6 +79,13 @@ class EventMetadata:
     - Debugging and audit trails
     - Performance monitoring
     
+    Construction is cheap: the event ID and timestamp are only formatted
+    when first read, and copies made by ``increment_retry``/``with_causation``
+    share ``custom`` until one of them accesses it (copy-on-write). Once a
+    reference to ``custom`` has been handed out (read, assigned or passed
+    in), copies take their own dict instead, so writes through an earlier
+    reference never reach a copy.
+    
     Attributes:
         event_id: Unique identifier for this event instance
         correlation_id: ID linking related events (e.g., request/response)
@@ -41,44 +99,132 @@ class EventMetadata:
         custom: Additional custom metadata
     """
     
-    event_id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    correlation_id: Optional[str] = None
-    causation_id: Optional[str] = None
-    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
-    source: str = "unknown"
-    source_topic: Optional[str] = None
-    retry_count: int = 0
-    trace_id: Optional[str] = None
-    span_id: Optional[str] = None
-    custom: Dict[str, Any] = field(default_factory=dict)
+    __slots__ = (
+        "correlation_id", "causation_id", "source", "source_topic",
+        "retry_count", "trace_id", "span_id",
+        "_event_id", "_seq", "_created", "_timestamp",
+        "_custom", "_custom_shared", "_custom_exposed",
+    )
+    
+    def __init__(
+        self,
+        event_id: Optional[str] = None,
+        correlation_id: Optional[str] = None,
+        causation_id: Optional[str] = None,
+        timestamp: Optional[datetime] = None,
+        source: str = "unknown",
+        source_topic: Optional[str] = None,
+        retry_count: int = 0,
+        trace_id: Optional[str] = None,
+        span_id: Optional[str] = None,
+        custom: Optional[Dict[str, Any]] = None,
+    ):
+        self.correlation_id = correlation_id
+        self.causation_id = causation_id
+        self.source = source
+        self.source_topic = source_topic
+        self.retry_count = retry_count
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self._event_id = event_id
+        self._seq = next(_sequence) if event_id is None else 0
+        self._created = time.time() if timestamp is None else 0.0
+        self._timestamp = timestamp
+        self._custom = custom
+        self._custom_shared = False
+        self._custom_exposed = custom is not None
+    
+    @property
+    def event_id(self) -> str:
+        """Unique identifier (formatted on first access)."""
+        if self._event_id is None:
+            created = self._created or self.timestamp.timestamp()
+            self._event_id = _format_id(created, self._seq)
+        return self._event_id
+    
+    @event_id.setter
+    def event_id(self, value: str) -> None:
+        self._event_id = value
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Creation time (UTC, materialized on first access)."""
+        if self._timestamp is None:
+            self._timestamp = datetime.fromtimestamp(self._created, timezone.utc)
+        return self._timestamp
+    
+    @timestamp.setter
+    def timestamp(self, value: datetime) -> None:
+        self._timestamp = value
+    
+    @property
+    def custom(self) -> Dict[str, Any]:
+        """Custom metadata (copied first if shared with another copy)."""
+        if self._custom is None:
+            self._custom = {}
+        elif self._custom_shared:
+            self._custom = dict(self._custom)
+            self._custom_shared = False
+        self._custom_exposed = True
+        return self._custom
+    
+    @custom.setter
+    def custom(self, value: Dict[str, Any]) -> None:
+        self._custom = value
+        self._custom_shared = False
+        self._custom_exposed = True
+    
+    def _share_custom(self) -> Optional[Dict[str, Any]]:
+        """
+        ``custom`` for a copy: shared (copy-on-write) while no reference to it
+        has been handed out, otherwise a copy of its own.
+        """
+        if self._custom is None:
+            return None
+        if self._custom_exposed:
+            return dict(self._custom)
+        self._custom_shared = True
+        return self._custom
+    
+    def _copy(self) -> "EventMetadata":
+        """Shallow copy sharing identity, timestamp and custom (copy-on-write)."""
+        copy = EventMetadata.__new__(EventMetadata)
+        copy.correlation_id = self.correlation_id
+        copy.causation_id = self.causation_id
+        copy.source = self.source
+        copy.source_topic = self.source_topic
+        copy.retry_count = self.retry_count
+        copy.trace_id = self.trace_id
+        copy.span_id = self.span_id
+        copy._event_id = self.event_id  # Fix the ID before the copies diverge
+        copy._seq = self._seq
+        copy._created = self._created
+        copy._timestamp = self._timestamp
+        copy._custom = self._share_custom()
+        copy._custom_shared = copy._custom is not None and copy._custom is self._custom
+        copy._custom_exposed = False
+        return copy
     
     def increment_retry(self) -> "EventMetadata":
         """Create a copy with incremented retry count."""
-        return EventMetadata(
-            event_id=self.event_id,
-            correlation_id=self.correlation_id,
-            causation_id=self.causation_id,
-            timestamp=self.timestamp,
-            source=self.source,
-            source_topic=self.source_topic,
-            retry_count=self.retry_count + 1,
-            trace_id=self.trace_id,
-            span_id=self.span_id,
-            custom=self.custom.copy(),
-        )
+        copy = self._copy()
+        copy.retry_count = self.retry_count + 1
+        return copy
     
     def with_causation(self, causing_event: "Event") -> "EventMetadata":
         """Create metadata linking to a causing event."""
-        return EventMetadata(
-            event_id=str(uuid.uuid4()),
-            correlation_id=self.correlation_id or causing_event.metadata.event_id,
-            causation_id=causing_event.metadata.event_id,
-            timestamp=datetime.now(timezone.utc),
+        causing_id = causing_event.metadata.event_id
+        derived = EventMetadata(
+            correlation_id=self.correlation_id or causing_id,
+            causation_id=causing_id,
             source=self.source,
             trace_id=self.trace_id or causing_event.metadata.trace_id,
-            span_id=str(uuid.uuid4())[:8],
-            custom=self.custom.copy(),
+            span_id=f"{random.getrandbits(32):08x}",
         )
+        if self._custom:
+            derived._custom = self._share_custom()
+            derived._custom_shared = derived._custom is self._custom
+        return derived
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
@@ -101,11 +247,9 @@ class EventMetadata:
         timestamp = data.get("timestamp")
         if isinstance(timestamp, str):
             timestamp = datetime.fromisoformat(timestamp)
-        elif timestamp is None:
-            timestamp = datetime.now(timezone.utc)
             
         return cls(
-            event_id=data.get("event_id", str(uuid.uuid4())),
+            event_id=data.get("event_id"),
             correlation_id=data.get("correlation_id"),
             causation_id=data.get("causation_id"),
             timestamp=timestamp,
@@ -116,6 +260,20 @@ class EventMetadata:
             span_id=data.get("span_id"),
             custom=data.get("custom", {}),
         )
+    
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, EventMetadata):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+    
+    __hash__ = None  # Mutable
+    
+    def __repr__(self) -> str:
+        return (
+            f"EventMetadata(event_id={self.event_id!r}, "
+            f"correlation_id={self.correlation_id!r}, "
+            f"source={self.source!r}, retry_count={self.retry_count})"
+        )
 
 
 @dataclass
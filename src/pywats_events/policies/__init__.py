@@ -2,5 +2,6 @@
 
 from pywats_events.policies.retry_policy import RetryPolicy
 from pywats_events.policies.error_policy import ErrorPolicy, DeadLetterQueue
+from pywats_events.policies.dead_letter_log import PersistentDeadLetterQueue, ReplayResult
 
-__all__ = ["RetryPolicy", "ErrorPolicy", "DeadLetterQueue"]
+__all__ = ["RetryPolicy", "ErrorPolicy", "DeadLetterQueue", "PersistentDeadLetterQueue", "ReplayResult"]
@@ -0,0 +1,605 @@
+"""
+Disk-backed dead letter queue.
+
+PersistentDeadLetterQueue keeps failed events in an append-only segment log
+so they survive restarts and are never dropped silently, and replays them
+back into an EventBus or AsyncEventBus at a bounded rate.
+
+Log layout (one directory):
+    dlq-000001.log, dlq-000002.log, ...
+
+Each segment is JSON Lines. An entry record holds the full event plus the
+failure; removing an entry (pop, clear, replay) appends an ``ack`` record
+to the segment that holds it, so every segment is self-contained. The
+active segment is rotated at ``segment_max_bytes``; a segment is deleted
+once all of its entries are acknowledged.
+
+Only an index (sequence -> segment/offset, event type, handler) is kept in
+memory; events are read back from disk when inspected or replayed. On an
+AsyncEventBus, disk I/O runs in worker threads: ErrorPolicy adds entries
+through add_async(), and replay_async() reads and acknowledges off the loop.
+
+Example:
+    >>> dlq = PersistentDeadLetterQueue("data/dlq")
+    >>> bus = AsyncEventBus(error_policy=ErrorPolicy(dead_letter_queue=dlq))
+    >>> ...
+    >>> # After the outage: at most 50 events/s, only the report handler's
+    >>> result = await dlq.replay_async(bus, handler_name="ReportHandler", rate=50)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Union, TYPE_CHECKING
+
+from pywats.core.logging import get_logger
+
+from pywats_events.models.event import Event
+from pywats_events.policies.error_policy import DeadLetterEntry, DeadLetterQueue
+
+if TYPE_CHECKING:
+    from pywats_events.bus.async_event_bus import AsyncEventBus
+    from pywats_events.bus.event_bus import EventBus
+
+
+logger = get_logger(__name__)
+
+_SEGMENT_PREFIX = "dlq-"
+_SEGMENT_SUFFIX = ".log"
+
+
+class PersistedError(Exception):
+    """
+    Failure restored from the log (the original exception is not picklable
+    in general, so its type name and message are kept instead).
+    """
+
+    def __init__(self, error_type: str, message: str):
+        super().__init__(message)
+        self.error_type = error_type
+
+
+@dataclass
+class ReplayResult:
+    """Outcome of a bulk replay."""
+    replayed: int = 0
+    failed: int = 0  # publish() itself raised; entry kept in the queue
+    duration: float = 0.0
+
+
+class _Location(NamedTuple):
+    """Where an entry lives, plus the fields it is indexed by."""
+    segment: int
+    offset: int
+    length: int
+    event_type: str
+    handler_name: Optional[str]
+
+
+class PersistentDeadLetterQueue(DeadLetterQueue):
+    """
+    Dead letter queue backed by an append-only segment log.
+
+    Drop-in replacement for DeadLetterQueue (same add/pop/peek/get_entries/
+    clear API), usable as ``ErrorPolicy(dead_letter_queue=...)``. Thread-safe.
+
+    Args:
+        directory: Directory for the segment files (created if missing)
+        max_size: Maximum entries (None = unbounded). When exceeded the
+            oldest entry is removed, logged and counted in ``dropped``.
+        segment_max_bytes: Size at which the active segment is rotated
+        fsync: fsync after every append (durable across power loss, slower)
+        on_add: Callback when entry is added
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        max_size: Optional[int] = None,
+        segment_max_bytes: int = 4 * 1024 * 1024,
+        fsync: bool = False,
+        on_add: Optional[Callable[[DeadLetterEntry], None]] = None,
+    ):
+        super().__init__(max_size=max_size or 1, on_add=on_add)
+        self._max_size = max_size
+        self._directory = Path(directory)
+        self._segment_max_bytes = segment_max_bytes
+        self._fsync = fsync
+        self._lock = threading.RLock()
+
+        # Index (oldest first) and secondary indexes (ordered sets of seqs)
+        self._index: "OrderedDict[int, _Location]" = OrderedDict()
+        self._by_type: Dict[str, Dict[int, None]] = {}
+        self._by_handler: Dict[Optional[str], Dict[int, None]] = {}
+        self._segment_live: Dict[int, int] = {}
+
+        self._next_seq = 1
+        self._active_segment = 0
+        self._active_size = 0
+        self.dropped = 0
+
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    # =========================================================================
+    # Queue API
+    # =========================================================================
+
+    @property
+    def size(self) -> int:
+        """Number of entries in the queue."""
+        return len(self._index)
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether the queue is empty."""
+        return not self._index
+
+    @property
+    def directory(self) -> Path:
+        """Directory holding the segment files."""
+        return self._directory
+
+    def add(
+        self,
+        event: "Event",
+        error: Exception,
+        handler_name: Optional[str] = None,
+    ) -> DeadLetterEntry:
+        """
+        Append a failed event to the log.
+
+        Args:
+            event: The failed event
+            error: The exception that caused the failure
+            handler_name: Name of the handler that failed
+
+        Returns:
+            The created dead letter entry
+        """
+        entry = self._add(event, error, handler_name)
+        self._notify(entry)
+        return entry
+
+    async def add_async(
+        self,
+        event: "Event",
+        error: Exception,
+        handler_name: Optional[str] = None,
+    ) -> DeadLetterEntry:
+        """add() with the log append in a worker thread (on_add runs on the loop)."""
+        entry = await asyncio.to_thread(self._add, event, error, handler_name)
+        self._notify(entry)
+        return entry
+
+    def _add(
+        self,
+        event: "Event",
+        error: Exception,
+        handler_name: Optional[str],
+    ) -> DeadLetterEntry:
+        entry = DeadLetterEntry(
+            event=event,
+            error=error,
+            handler_name=handler_name,
+            retry_count=event.metadata.retry_count,
+        )
+
+        with self._lock:
+            seq = self._next_seq
+            self._next_seq += 1
+            record = {
+                "seq": seq,
+                "ts": entry.timestamp.isoformat(),
+                "handler": handler_name,
+                "retry_count": entry.retry_count,
+                "error_type": getattr(error, "error_type", type(error).__name__),
+                "error_message": str(error),
+                "event": event.to_dict(),
+            }
+            self._append_entry(seq, record, str(event.event_type), handler_name)
+
+            if self._max_size is not None:
+                while len(self._index) > self._max_size:
+                    oldest = next(iter(self._index))
+                    self._ack(oldest)
+                    self.dropped += 1
+                    self._logger.warning(
+                        f"Dead letter queue full ({self._max_size}), dropped entry {oldest}"
+                    )
+
+        self._logger.warning(
+            f"Event {event.id[:8]} added to dead letter queue: {error}"
+        )
+        return entry
+
+    def _notify(self, entry: DeadLetterEntry) -> None:
+        if self._on_add:
+            try:
+                self._on_add(entry)
+            except Exception as e:
+                self._logger.error(f"DLQ callback error: {e}")
+
+    def pop(self) -> Optional[DeadLetterEntry]:
+        """
+        Remove and return the oldest entry.
+
+        Returns:
+            The oldest entry, or None if empty
+        """
+        with self._lock:
+            if not self._index:
+                return None
+            seq = next(iter(self._index))
+            entry = self._read(seq)
+            self._ack(seq)
+            return entry
+
+    def peek(self) -> Optional[DeadLetterEntry]:
+        """
+        Return the oldest entry without removing it.
+
+        Returns:
+            The oldest entry, or None if empty
+        """
+        with self._lock:
+            if not self._index:
+                return None
+            return self._read(next(iter(self._index)))
+
+    def get_entries(
+        self,
+        limit: Optional[int] = None,
+        event_type: Optional[str] = None,
+        handler_name: Optional[str] = None,
+    ) -> List[DeadLetterEntry]:
+        """
+        Get entries from the queue.
+
+        Args:
+            limit: Maximum entries to return
+            event_type: Filter by event type
+            handler_name: Filter by failing handler
+
+        Returns:
+            List of entries (newest first)
+        """
+        with self._lock:
+            seqs = list(reversed(self._select(event_type, handler_name)))
+            if limit:
+                seqs = seqs[:limit]
+            return [self._read(seq) for seq in seqs]
+
+    def count(
+        self,
+        event_type: Optional[str] = None,
+        handler_name: Optional[str] = None,
+    ) -> int:
+        """Number of entries matching the filters (index only, no disk reads)."""
+        with self._lock:
+            return len(self._select(event_type, handler_name))
+
+    def event_types(self) -> Dict[str, int]:
+        """Entry count per event type."""
+        with self._lock:
+            return {key: len(seqs) for key, seqs in self._by_type.items()}
+
+    def handler_names(self) -> Dict[Optional[str], int]:
+        """Entry count per failing handler."""
+        with self._lock:
+            return {key: len(seqs) for key, seqs in self._by_handler.items()}
+
+    def clear(self) -> int:
+        """
+        Clear all entries from the queue.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            count = len(self._index)
+            for seq in list(self._index):
+                self._ack(seq)
+        self._logger.info(f"Cleared {count} entries from dead letter queue")
+        return count
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    # =========================================================================
+    # Replay
+    # =========================================================================
+
+    def replay(
+        self,
+        bus: "EventBus",
+        event_type: Optional[str] = None,
+        handler_name: Optional[str] = None,
+        rate: Optional[float] = 100.0,
+        limit: Optional[int] = None,
+        reset_retries: bool = True,
+    ) -> ReplayResult:
+        """
+        Republish entries into a synchronous EventBus, oldest first.
+
+        ``EventBus.publish`` runs the handlers before returning, so replay
+        never gets ahead of them; ``rate`` additionally caps events/second.
+        An entry is removed once published. Events that fail again are
+        dead-lettered anew by the bus's error policy.
+
+        Args:
+            bus: Bus to publish into
+            event_type: Only replay this event type
+            handler_name: Only replay events this handler failed
+            rate: Maximum events per second (None = unthrottled)
+            limit: Maximum events to replay
+            reset_retries: Give replayed events a fresh retry budget
+
+        Returns:
+            ReplayResult
+        """
+        result = ReplayResult()
+        started = time.monotonic()
+        for seq in self._replay_seqs(event_type, handler_name, limit):
+            event = self._replay_event(seq, reset_retries)
+            if event is None:
+                continue
+            self._throttle(started, result.replayed + result.failed, rate, time.sleep)
+            try:
+                bus.publish(event)
+            except Exception as e:
+                result.failed += 1
+                self._logger.error(f"Replay of entry {seq} failed: {e}")
+                continue
+            self._ack_if_present(seq)
+            result.replayed += 1
+        result.duration = time.monotonic() - started
+        self._log_replay(result)
+        return result
+
+    async def replay_async(
+        self,
+        bus: "AsyncEventBus",
+        event_type: Optional[str] = None,
+        handler_name: Optional[str] = None,
+        rate: Optional[float] = 100.0,
+        limit: Optional[int] = None,
+        reset_retries: bool = True,
+    ) -> ReplayResult:
+        """
+        Republish entries into an AsyncEventBus, oldest first.
+
+        Each event is awaited through ``AsyncEventBus.publish`` (handlers
+        complete before the next event), throttled to ``rate`` events/second.
+        Entries are read and acknowledged in a worker thread.
+        See replay() for arguments.
+        """
+        result = ReplayResult()
+        started = time.monotonic()
+        for seq in self._replay_seqs(event_type, handler_name, limit):
+            event = await asyncio.to_thread(self._replay_event, seq, reset_retries)
+            if event is None:
+                continue
+            await self._throttle_async(started, result.replayed + result.failed, rate)
+            try:
+                await bus.publish(event)
+            except Exception as e:
+                result.failed += 1
+                self._logger.error(f"Replay of entry {seq} failed: {e}")
+                continue
+            await asyncio.to_thread(self._ack_if_present, seq)
+            result.replayed += 1
+        result.duration = time.monotonic() - started
+        self._log_replay(result)
+        return result
+
+    def _replay_seqs(
+        self,
+        event_type: Optional[str],
+        handler_name: Optional[str],
+        limit: Optional[int],
+    ) -> List[int]:
+        """Entries present when replay started (re-failures are not replayed again)."""
+        with self._lock:
+            seqs = self._select(event_type, handler_name)
+        return seqs[:limit] if limit else seqs
+
+    def _replay_event(self, seq: int, reset_retries: bool) -> Optional[Event]:
+        """The entry's event, or None if it was removed since replay started."""
+        with self._lock:
+            if seq not in self._index:
+                return None
+            event = self._read(seq).event
+        if reset_retries:
+            event.metadata.retry_count = 0
+        return event
+
+    @staticmethod
+    def _throttle(started: float, done: int, rate: Optional[float], sleep: Callable[[float], None]) -> None:
+        if rate:
+            delay = started + done / rate - time.monotonic()
+            if delay > 0:
+                sleep(delay)
+
+    @staticmethod
+    async def _throttle_async(started: float, done: int, rate: Optional[float]) -> None:
+        if rate:
+            delay = started + done / rate - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    def _log_replay(self, result: ReplayResult) -> None:
+        self._logger.info(
+            f"Replayed {result.replayed} dead-lettered events in {result.duration:.1f}s "
+            f"({result.failed} failed, {len(self._index)} remaining)"
+        )
+
+    # =========================================================================
+    # Index
+    # =========================================================================
+
+    def _select(self, event_type: Optional[str], handler_name: Optional[str]) -> List[int]:
+        """Matching sequence numbers, oldest first."""
+        if event_type is not None and handler_name is not None:
+            by_handler = self._by_handler.get(handler_name, {})
+            return [seq for seq in self._by_type.get(event_type, {}) if seq in by_handler]
+        if event_type is not None:
+            return list(self._by_type.get(event_type, {}))
+        if handler_name is not None:
+            return list(self._by_handler.get(handler_name, {}))
+        return list(self._index)
+
+    def _index_add(self, seq: int, location: _Location) -> None:
+        self._index[seq] = location
+        self._by_type.setdefault(location.event_type, {})[seq] = None
+        self._by_handler.setdefault(location.handler_name, {})[seq] = None
+        self._segment_live[location.segment] = self._segment_live.get(location.segment, 0) + 1
+
+    def _index_remove(self, seq: int) -> Optional[_Location]:
+        location = self._index.pop(seq, None)
+        if location is None:
+            return None
+        for secondary, key in ((self._by_type, location.event_type), (self._by_handler, location.handler_name)):
+            seqs = secondary[key]
+            del seqs[seq]
+            if not seqs:
+                del secondary[key]
+        self._segment_live[location.segment] -= 1
+        return location
+
+    # =========================================================================
+    # Segment log
+    # =========================================================================
+
+    def _segment_path(self, segment: int) -> Path:
+        return self._directory / f"{_SEGMENT_PREFIX}{segment:06d}{_SEGMENT_SUFFIX}"
+
+    def _segments(self) -> List[int]:
+        segments = []
+        for path in self._directory.glob(f"{_SEGMENT_PREFIX}*{_SEGMENT_SUFFIX}"):
+            try:
+                segments.append(int(path.stem[len(_SEGMENT_PREFIX):]))
+            except ValueError:
+                continue
+        return sorted(segments)
+
+    def _write(self, segment: int, record: Dict[str, Any]) -> tuple[int, int]:
+        """Append a record; returns (offset, length)."""
+        line = (json.dumps(record, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+        with open(self._segment_path(segment), "ab") as f:
+            offset = f.tell()
+            f.write(line)
+            if self._fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        return offset, len(line)
+
+    def _append_entry(
+        self,
+        seq: int,
+        record: Dict[str, Any],
+        event_type: str,
+        handler_name: Optional[str],
+    ) -> None:
+        if self._active_segment == 0 or self._active_size >= self._segment_max_bytes:
+            self._rotate()
+        offset, length = self._write(self._active_segment, record)
+        self._active_size = offset + length
+        self._index_add(seq, _Location(self._active_segment, offset, length, event_type, handler_name))
+
+    def _rotate(self) -> None:
+        previous = self._active_segment
+        self._active_segment = (self._segments() or [0])[-1] + 1
+        self._active_size = 0
+        self._segment_live.setdefault(self._active_segment, 0)
+        if previous:
+            self._collect(previous)
+
+    def _ack(self, seq: int) -> None:
+        location = self._index_remove(seq)
+        if location is None:
+            return
+        if self._segment_live[location.segment] == 0 and location.segment != self._active_segment:
+            self._collect(location.segment)
+        else:
+            self._write(location.segment, {"ack": seq})
+
+    def _ack_if_present(self, seq: int) -> None:
+        with self._lock:
+            self._ack(seq)
+
+    def _collect(self, segment: int) -> None:
+        """Delete a sealed segment once nothing in it is live."""
+        if self._segment_live.get(segment, 0) > 0:
+            return
+        self._segment_live.pop(segment, None)
+        try:
+            self._segment_path(segment).unlink(missing_ok=True)
+        except OSError as e:
+            self._logger.warning(f"Could not delete DLQ segment {segment}: {e}")
+
+    def _read(self, seq: int) -> DeadLetterEntry:
+        location = self._index[seq]
+        with open(self._segment_path(location.segment), "rb") as f:
+            f.seek(location.offset)
+            record = json.loads(f.read(location.length))
+        return DeadLetterEntry(
+            event=Event.from_dict(record["event"]),
+            error=PersistedError(record["error_type"], record["error_message"]),
+            timestamp=datetime.fromisoformat(record["ts"]),
+            handler_name=record.get("handler"),
+            retry_count=record.get("retry_count", 0),
+        )
+
+    def _load(self) -> None:
+        """Rebuild the index from the segment files."""
+        segments = self._segments()
+        for segment in segments:
+            acked = set()
+            entries: List[tuple[int, _Location]] = []
+            path = self._segment_path(segment)
+            try:
+                with open(path, "rb") as f:
+                    offset = 0
+                    for line in f:
+                        length = len(line)
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            offset += length
+                            continue  # Torn last line after a crash
+                        if "ack" in record:
+                            acked.add(record["ack"])
+                        elif "seq" in record:
+                            event = record.get("event", {})
+                            entries.append((record["seq"], _Location(
+                                segment, offset, length,
+                                str(event.get("event_type", "custom")), record.get("handler"),
+                            )))
+                        offset += length
+            except OSError as e:
+                self._logger.warning(f"Could not read DLQ segment {path}: {e}")
+                continue
+
+            self._segment_live.setdefault(segment, 0)
+            for seq, location in entries:
+                self._next_seq = max(self._next_seq, seq + 1)
+                if seq not in acked:
+                    self._index_add(seq, location)
+            if self._segment_live[segment] == 0:
+                self._collect(segment)
+
+        # Always start a fresh segment (a torn tail is never appended to)
+        self._active_segment = 0
+        if self._index:
+            self._logger.info(
+                f"Dead letter queue restored {len(self._index)} entries from {self._directory}"
+            )
@@ -145,6 +145,20 @@ class DeadLetterQueue:
         
         return entry
     
+    async def add_async(
+        self,
+        event: "Event",
+        error: Exception,
+        handler_name: Optional[str] = None,
+    ) -> DeadLetterEntry:
+        """
+        Add a failed event from the event loop (see add()).
+        
+        In memory, so this is add(); queues that do I/O override it to keep
+        the loop free.
+        """
+        return self.add(event, error, handler_name)
+    
     def pop(self) -> Optional[DeadLetterEntry]:
         """
         Remove and return the oldest entry.
@@ -403,7 +417,7 @@ class ErrorPolicy:
             dead_letter_queue: DLQ for failed events
             circuit_breaker: Circuit breaker for failure protection
         """
-        self._dlq = dead_letter_queue or DeadLetterQueue()
+        self._dlq = dead_letter_queue if dead_letter_queue is not None else DeadLetterQueue()
         self._circuit_breaker = circuit_breaker
         self._failure_callbacks: List[Callable[["Event", Exception], None]] = []
         self._logger = get_logger(__name__)
@@ -485,7 +499,7 @@ class ErrorPolicy:
         )
         
         # Add to dead letter queue
-        self._dlq.add(event, error, handler_name)
+        await self._dlq.add_async(event, error, handler_name)
         
         # Update circuit breaker
         if self._circuit_breaker:
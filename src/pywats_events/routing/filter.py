@@ -6,7 +6,9 @@ from __future__ import annotations
 
 import logging
 from pywats.core.logging import get_logger
-from typing import Callable, List, Optional, TYPE_CHECKING
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple, TYPE_CHECKING
+
+from pywats_events.routing.router import FieldPredicate, RoutingKey, _field_value
 
 if TYPE_CHECKING:
     from pywats_events.models.event import Event
@@ -16,6 +18,46 @@ if TYPE_CHECKING:
 logger = get_logger(__name__)
 
 
+class _CompiledFilter:
+    """Field constraints of an EventFilter merged into set lookups."""
+    
+    __slots__ = ("include", "exclude", "residual")
+    
+    def __init__(self, predicates: List[Callable[["Event"], bool]]):
+        # (field, key) -> allowed values (intersection of all includes)
+        self.include: Dict[Tuple[str, Optional[str]], FrozenSet[Any]] = {}
+        # (field, key) -> rejected values (union of all excludes)
+        self.exclude: Dict[Tuple[str, Optional[str]], FrozenSet[Any]] = {}
+        self.residual: List[Callable[["Event"], bool]] = []
+        
+        for predicate in predicates:
+            if not isinstance(predicate, FieldPredicate):
+                self.residual.append(predicate)
+                continue
+            target = (predicate.field, predicate.key)
+            if predicate.negate:
+                self.exclude[target] = self.exclude.get(target, frozenset()) | predicate.values
+            elif target in self.include:
+                self.include[target] = self.include[target] & predicate.values
+            else:
+                self.include[target] = predicate.values
+    
+    def matches_fields(self, event: "Event") -> bool:
+        for (field, key), values in self.include.items():
+            try:
+                if _field_value(event, field, key) not in values:
+                    return False
+            except TypeError:  # Unhashable payload value
+                return False
+        for (field, key), values in self.exclude.items():
+            try:
+                if _field_value(event, field, key) in values:
+                    return False
+            except TypeError:
+                pass
+        return True
+
+
 class EventFilter:
     """
     Composable filter for events.
@@ -31,11 +73,22 @@ class EventFilter:
         >>> 
         >>> if filter.matches(event):
         ...     process_failed_test(event)
+    
+    Type, source and payload-value conditions are compiled into set lookups
+    (repeated conditions on one field are merged) and checked before custom
+    ``where`` predicates. A filter can be used as a RoutingRule predicate,
+    in which case EventRouter indexes it by those conditions.
     """
     
     def __init__(self):
         """Initialize empty filter (matches everything)."""
         self._predicates: List[Callable[["Event"], bool]] = []
+        self._compiled: Optional[_CompiledFilter] = None
+    
+    def _add(self, predicate: Callable[["Event"], bool]) -> "EventFilter":
+        self._predicates.append(predicate)
+        self._compiled = None
+        return self
     
     def by_type(self, *event_types: "EventType") -> "EventFilter":
         """
@@ -47,9 +100,7 @@ class EventFilter:
         Returns:
             Self for chaining
         """
-        type_set = set(event_types)
-        self._predicates.append(lambda e: e.event_type in type_set)
-        return self
+        return self._add(FieldPredicate("event_type", event_types))
     
     def exclude_type(self, *event_types: "EventType") -> "EventFilter":
         """
@@ -61,9 +112,7 @@ class EventFilter:
         Returns:
             Self for chaining
         """
-        type_set = set(event_types)
-        self._predicates.append(lambda e: e.event_type not in type_set)
-        return self
+        return self._add(FieldPredicate("event_type", event_types, negate=True))
     
     def by_source(self, *sources: str) -> "EventFilter":
         """
@@ -75,9 +124,7 @@ class EventFilter:
         Returns:
             Self for chaining
         """
-        source_set = set(sources)
-        self._predicates.append(lambda e: e.source in source_set)
-        return self
+        return self._add(FieldPredicate("source", sources))
     
     def exclude_source(self, *sources: str) -> "EventFilter":
         """
@@ -89,9 +136,7 @@ class EventFilter:
         Returns:
             Self for chaining
         """
-        source_set = set(sources)
-        self._predicates.append(lambda e: e.source not in source_set)
-        return self
+        return self._add(FieldPredicate("source", sources, negate=True))
     
     def where(self, predicate: Callable[["Event"], bool]) -> "EventFilter":
         """
@@ -103,8 +148,7 @@ class EventFilter:
         Returns:
             Self for chaining
         """
-        self._predicates.append(predicate)
-        return self
+        return self._add(predicate)
     
     def has_payload_key(self, key: str) -> "EventFilter":
         """
@@ -116,8 +160,7 @@ class EventFilter:
         Returns:
             Self for chaining
         """
-        self._predicates.append(lambda e: key in e.payload)
-        return self
+        return self._add(lambda e: key in e.payload)
     
     def payload_equals(self, key: str, value: any) -> "EventFilter":
         """
@@ -130,8 +173,10 @@ class EventFilter:
         Returns:
             Self for chaining
         """
-        self._predicates.append(lambda e: e.payload.get(key) == value)
-        return self
+        try:
+            return self._add(FieldPredicate("payload", (value,), key=key))
+        except TypeError:  # Unhashable value
+            return self._add(lambda e: e.payload.get(key) == value)
     
     def payload_in(self, key: str, values: List[any]) -> "EventFilter":
         """
@@ -144,9 +189,7 @@ class EventFilter:
         Returns:
             Self for chaining
         """
-        value_set = set(values)
-        self._predicates.append(lambda e: e.payload.get(key) in value_set)
-        return self
+        return self._add(FieldPredicate("payload", values, key=key))
     
     def matches(self, event: "Event") -> bool:
         """
@@ -161,7 +204,14 @@ class EventFilter:
         if not self._predicates:
             return True
         
-        for predicate in self._predicates:
+        compiled = self._compiled
+        if compiled is None:
+            compiled = self._compiled = _CompiledFilter(self._predicates)
+        
+        if not compiled.matches_fields(event):
+            return False
+        
+        for predicate in compiled.residual:
             try:
                 if not predicate(event):
                     return False
@@ -175,6 +225,13 @@ class EventFilter:
         """Allow filter to be used as a callable."""
         return self.matches(event)
     
+    def routing_keys(self) -> List[RoutingKey]:
+        """Positive field constraints, for EventRouter indexing."""
+        compiled = self._compiled
+        if compiled is None:
+            compiled = self._compiled = _CompiledFilter(self._predicates)
+        return [(field, key, values) for (field, key), values in compiled.include.items()]
+    
     def __and__(self, other: "EventFilter") -> "EventFilter":
         """Combine filters with AND logic."""
         combined = EventFilter()
@@ -1,12 +1,19 @@
 """
 Event router for directing events to appropriate handlers.
+
+Predicates built with ``by_type``, ``by_source`` and ``by_payload`` (alone,
+combined with ``all_of``, or as an ``EventFilter``) describe which field values
+they accept. The router compiles these into hash tables keyed by field value,
+so routing only evaluates the rules that can match an event's type, source or
+payload value. Arbitrary predicates are checked as a residual step.
 """
 
 from __future__ import annotations
 
+import heapq
 import logging
 from pywats.core.logging import get_logger
-from typing import Callable, Dict, List, Optional, TYPE_CHECKING
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from pywats_events.models.event import Event
@@ -17,6 +24,97 @@ if TYPE_CHECKING:
 logger = get_logger(__name__)
 
 
+# (field, payload key, accepted values) - field is "event_type", "source" or "payload"
+RoutingKey = Tuple[str, Optional[str], FrozenSet[Any]]
+
+# Preferred index field when a predicate constrains several
+_INDEX_PREFERENCE = {"event_type": 0, "source": 1, "payload": 2}
+
+
+def _field_value(event: "Event", field: str, key: Optional[str]) -> Any:
+    """Read the value a routing key constrains."""
+    if field == "event_type":
+        return event.event_type
+    if field == "source":
+        return event.source
+    return event.payload.get(key)
+
+
+class FieldPredicate:
+    """
+    Predicate matching one event field against a set of values.
+    
+    Unlike a lambda, it exposes ``routing_keys()`` so EventRouter and
+    EventFilter can turn it into a hash lookup.
+    """
+    
+    __slots__ = ("field", "key", "values", "negate")
+    
+    def __init__(
+        self,
+        field: str,
+        values: Iterable[Any],
+        key: Optional[str] = None,
+        negate: bool = False,
+    ):
+        """
+        Initialize predicate.
+        
+        Args:
+            field: "event_type", "source" or "payload"
+            values: Accepted values (must be hashable)
+            key: Payload key when field is "payload"
+            negate: Match values NOT in the set instead
+        """
+        if field not in _INDEX_PREFERENCE:
+            raise ValueError(f"Unknown routing field: {field}")
+        self.field = field
+        self.key = key
+        self.values: FrozenSet[Any] = frozenset(values)
+        self.negate = negate
+    
+    def __call__(self, event: "Event") -> bool:
+        try:
+            found = _field_value(event, self.field, self.key) in self.values
+        except TypeError:  # Unhashable payload value can't equal a set member
+            found = False
+        return found != self.negate
+    
+    def routing_keys(self) -> List[RoutingKey]:
+        """Constraints usable for indexing (none when negated)."""
+        if self.negate:
+            return []
+        return [(self.field, self.key, self.values)]
+    
+    def __repr__(self) -> str:
+        target = f"payload[{self.key!r}]" if self.field == "payload" else self.field
+        op = "not in" if self.negate else "in"
+        return f"FieldPredicate({target} {op} {set(self.values)!r})"
+
+
+class AllOf:
+    """Predicate matching when every sub-predicate matches (indexable)."""
+    
+    __slots__ = ("predicates",)
+    
+    def __init__(self, *predicates: Callable[["Event"], bool]):
+        self.predicates = predicates
+    
+    def __call__(self, event: "Event") -> bool:
+        return all(predicate(event) for predicate in self.predicates)
+    
+    def routing_keys(self) -> List[RoutingKey]:
+        keys: List[RoutingKey] = []
+        for predicate in self.predicates:
+            get_keys = getattr(predicate, "routing_keys", None)
+            if get_keys is not None:
+                keys.extend(get_keys())
+        return keys
+    
+    def __repr__(self) -> str:
+        return f"AllOf({', '.join(map(repr, self.predicates))})"
+
+
 class RoutingRule:
     """
     A rule for routing events.
@@ -50,6 +148,19 @@ class RoutingRule:
             logger.warning(f"Rule {self.name} predicate error: {e}", exc_info=True)
             return False
     
+    def routing_key(self) -> Optional[RoutingKey]:
+        """
+        Best constraint to index this rule by, or None if the predicate
+        exposes none (the rule is then evaluated for every event).
+        """
+        get_keys = getattr(self.predicate, "routing_keys", None)
+        if get_keys is None:
+            return None
+        keys = get_keys()
+        if not keys:
+            return None
+        return min(keys, key=lambda k: (_INDEX_PREFERENCE[k[0]], len(k[2])))
+    
     def __repr__(self) -> str:
         return f"RoutingRule(name={self.name}, priority={self.priority})"
 
@@ -58,7 +169,10 @@ class EventRouter:
     """
     Router for directing events based on rules.
     
-    Allows complex routing logic beyond simple type-based routing.
+    Allows complex routing logic beyond simple type-based routing. Rules
+    whose predicates come from ``by_type``/``by_source``/``by_payload``
+    (see module docstring) are looked up by hash; other rules are
+    evaluated for every event, in priority order with the indexed ones.
     
     Example:
         >>> router = EventRouter()
@@ -88,6 +202,10 @@ class EventRouter:
         self._rules: List[tuple[RoutingRule, "BaseHandler"]] = []
         self._default_handler: Optional["BaseHandler"] = None
         self._logger = get_logger(__name__)
+        
+        # Compiled index: positions into self._rules, rebuilt lazily
+        self._index: Optional[Dict[Tuple[str, Optional[str]], Dict[Any, List[int]]]] = None
+        self._residual: List[int] = []
     
     def add_rule(
         self,
@@ -106,6 +224,7 @@ class EventRouter:
         """
         self._rules.append((rule, handler))
         self._rules.sort(key=lambda x: x[0].priority)
+        self._index = None
         return self
     
     def set_default_handler(self, handler: "BaseHandler") -> "EventRouter":
@@ -131,7 +250,8 @@ class EventRouter:
         Returns:
             Handler to use, or None if no match
         """
-        for rule, handler in self._rules:
+        for position in self._candidates(event):
+            rule, handler = self._rules[position]
             if rule.matches(event):
                 self._logger.debug(f"Event {event.id[:8]} matched rule: {rule.name}")
                 return handler
@@ -155,7 +275,8 @@ class EventRouter:
             List of matching handlers
         """
         handlers = []
-        for rule, handler in self._rules:
+        for position in self._candidates(event):
+            rule, handler = self._rules[position]
             if rule.matches(event):
                 handlers.append(handler)
         return handlers
@@ -164,6 +285,43 @@ class EventRouter:
         """Remove all routing rules."""
         self._rules.clear()
         self._default_handler = None
+        self._index = None
+    
+    # =========================================================================
+    # Compiled index
+    # =========================================================================
+    
+    def _compile(self) -> Dict[Tuple[str, Optional[str]], Dict[Any, List[int]]]:
+        """Bucket rule positions by their routing key values."""
+        index: Dict[Tuple[str, Optional[str]], Dict[Any, List[int]]] = {}
+        residual: List[int] = []
+        for position, (rule, _) in enumerate(self._rules):
+            routing_key = rule.routing_key()
+            if routing_key is None:
+                residual.append(position)
+                continue
+            field, key, values = routing_key
+            buckets = index.setdefault((field, key), {})
+            for value in values:
+                buckets.setdefault(value, []).append(position)
+        self._index = index
+        self._residual = residual
+        return index
+    
+    def _candidates(self, event: "Event") -> Iterator[int]:
+        """Positions of rules that may match, in priority order."""
+        index = self._index if self._index is not None else self._compile()
+        lists = [self._residual] if self._residual else []
+        for (field, key), buckets in index.items():
+            try:
+                bucket = buckets.get(_field_value(event, field, key))
+            except TypeError:  # Unhashable payload value
+                continue
+            if bucket:
+                lists.append(bucket)
+        if len(lists) == 1:
+            return iter(lists[0])
+        return heapq.merge(*lists)
     
     @property
     def rule_count(self) -> int:
@@ -184,8 +342,7 @@ def by_type(*event_types: "EventType") -> Callable[["Event"], bool]:
     Returns:
         Predicate function
     """
-    type_set = set(event_types)
-    return lambda event: event.event_type in type_set
+    return FieldPredicate("event_type", event_types)
 
 
 def by_source(*sources: str) -> Callable[["Event"], bool]:
@@ -198,8 +355,7 @@ def by_source(*sources: str) -> Callable[["Event"], bool]:
     Returns:
         Predicate function
     """
-    source_set = set(sources)
-    return lambda event: event.source in source_set
+    return FieldPredicate("source", sources)
 
 
 def by_payload(key: str, value: any) -> Callable[["Event"], bool]:
@@ -213,7 +369,26 @@ def by_payload(key: str, value: any) -> Callable[["Event"], bool]:
     Returns:
         Predicate function
     """
-    return lambda event: event.payload.get(key) == value
+    try:
+        return FieldPredicate("payload", (value,), key=key)
+    except TypeError:  # Unhashable value, can't be indexed
+        return lambda event: event.payload.get(key) == value
+
+
+def all_of(*predicates: Callable[["Event"], bool]) -> Callable[["Event"], bool]:
+    """
+    Create predicate that matches when all predicates match.
+    
+    Indexed predicates among them (``by_type`` etc.) let the router index
+    the combined rule.
+    
+    Args:
+        predicates: Predicates to combine
+        
+    Returns:
+        Predicate function
+    """
+    return AllOf(*predicates)
 
 
 def by_payload_exists(key: str) -> Callable[["Event"], bool]:
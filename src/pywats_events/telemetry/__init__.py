@@ -1,6 +1,6 @@
 """Telemetry, metrics, and tracing for event system."""
 
 from pywats_events.telemetry.metrics import EventMetrics
-from pywats_events.telemetry.tracing import EventTracer
+from pywats_events.telemetry.tracing import EventTracer, TraceRingBuffer
 
-__all__ = ["EventMetrics", "EventTracer"]
+__all__ = ["EventMetrics", "EventTracer", "TraceRingBuffer"]
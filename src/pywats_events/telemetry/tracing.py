@@ -1,17 +1,25 @@
 """
 Distributed tracing support for event system.
+
+Recording is kept off the dispatch path: spans stamp ``time.monotonic_ns()``
+(no wall-clock reads, no formatting), and a finished trace is pushed into a
+preallocated ring buffer in O(1). A background exporter thread drains the
+buffer in batches, samples, converts timestamps to wall-clock ISO strings
+and calls the exporters.
 """
 
 from __future__ import annotations
 
 import logging
 from pywats.core.logging import get_logger
-import uuid
+import random
+import threading
+import time
 from contextlib import contextmanager
 from contextvars import ContextVar
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, Generator, List, Optional, TYPE_CHECKING
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from pywats_events.models.event import Event
@@ -25,37 +33,55 @@ _current_trace: ContextVar[Optional["TraceContext"]] = ContextVar(
     "current_trace", default=None
 )
 
+# Wall-clock anchor for converting monotonic timestamps at export time
+_WALL_ANCHOR_NS = time.time_ns()
+_MONOTONIC_ANCHOR_NS = time.monotonic_ns()
+
+
+def _to_datetime(monotonic_ns: int) -> datetime:
+    """Convert a monotonic_ns() reading to a UTC datetime."""
+    wall_ns = _WALL_ANCHOR_NS + (monotonic_ns - _MONOTONIC_ANCHOR_NS)
+    return datetime.fromtimestamp(wall_ns / 1e9, timezone.utc)
+
+
+def _new_id(bits: int) -> str:
+    """Random hex identifier (cheaper than uuid4 on the hot path)."""
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
 
 @dataclass
 class Span:
     """
     A span in a distributed trace.
     
-    Represents a unit of work within a trace.
+    Represents a unit of work within a trace. Times are ``monotonic_ns()``
+    readings; ``start_time``/``end_time`` convert them on access.
     """
     span_id: str
     name: str
     trace_id: str
     parent_span_id: Optional[str] = None
-    start_time: datetime = None
-    end_time: Optional[datetime] = None
+    start_ns: int = field(default_factory=time.monotonic_ns)
+    end_ns: Optional[int] = None
     status: str = "ok"
-    attributes: Dict[str, Any] = None
-    events: List[Dict[str, Any]] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    events: List[Tuple[str, int, Optional[Dict[str, Any]]]] = field(default_factory=list)
     
-    def __post_init__(self):
-        if self.start_time is None:
-            self.start_time = datetime.now(timezone.utc)
-        if self.attributes is None:
-            self.attributes = {}
-        if self.events is None:
-            self.events = []
+    @property
+    def start_time(self) -> datetime:
+        """Span start (UTC)."""
+        return _to_datetime(self.start_ns)
+    
+    @property
+    def end_time(self) -> Optional[datetime]:
+        """Span end (UTC), None while open."""
+        return _to_datetime(self.end_ns) if self.end_ns is not None else None
     
     @property
     def duration_ms(self) -> Optional[float]:
         """Span duration in milliseconds."""
-        if self.start_time and self.end_time:
-            return (self.end_time - self.start_time).total_seconds() * 1000
+        if self.end_ns is not None:
+            return (self.end_ns - self.start_ns) / 1e6
         return None
     
     def set_attribute(self, key: str, value: Any) -> None:
@@ -64,30 +90,34 @@ class Span:
     
     def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
         """Add an event to the span."""
-        self.events.append({
-            "name": name,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "attributes": attributes or {},
-        })
+        self.events.append((name, time.monotonic_ns(), attributes))
     
     def end(self, status: str = "ok") -> None:
         """End the span."""
-        self.end_time = datetime.now(timezone.utc)
+        self.end_ns = time.monotonic_ns()
         self.status = status
     
     def to_dict(self) -> Dict:
         """Convert to dictionary for export."""
+        end_time = self.end_time
         return {
             "span_id": self.span_id,
             "trace_id": self.trace_id,
             "parent_span_id": self.parent_span_id,
             "name": self.name,
             "start_time": self.start_time.isoformat(),
-            "end_time": self.end_time.isoformat() if self.end_time else None,
+            "end_time": end_time.isoformat() if end_time else None,
             "duration_ms": self.duration_ms,
             "status": self.status,
             "attributes": self.attributes,
-            "events": self.events,
+            "events": [
+                {
+                    "name": name,
+                    "timestamp": _to_datetime(timestamp_ns).isoformat(),
+                    "attributes": attributes or {},
+                }
+                for name, timestamp_ns, attributes in self.events
+            ],
         }
 
 
@@ -100,20 +130,25 @@ class TraceContext:
     
     def __init__(self, trace_id: Optional[str] = None):
         """Initialize trace context."""
-        self.trace_id = trace_id or str(uuid.uuid4())
+        self.trace_id = trace_id or _new_id(128)
         self._spans: List[Span] = []
-        self._current_span: Optional[Span] = None
+        self._stack: List[Span] = []  # Open spans, innermost last
     
     @property
     def current_span(self) -> Optional[Span]:
         """Get current active span."""
-        return self._current_span
+        return self._stack[-1] if self._stack else None
     
     @property
     def all_spans(self) -> List[Span]:
         """Get all spans in the trace."""
         return self._spans.copy()
     
+    @property
+    def has_error(self) -> bool:
+        """Whether any span ended with an error status."""
+        return any(span.status == "error" for span in self._spans)
+    
     def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Span:
         """
         Start a new span.
@@ -125,18 +160,18 @@ class TraceContext:
         Returns:
             New span
         """
-        parent_span_id = self._current_span.span_id if self._current_span else None
+        parent = self.current_span
         
         span = Span(
-            span_id=str(uuid.uuid4())[:16],
+            span_id=_new_id(64),
             name=name,
             trace_id=self.trace_id,
-            parent_span_id=parent_span_id,
-            attributes=attributes or {},
+            parent_span_id=parent.span_id if parent else None,
+            attributes=attributes if attributes is not None else {},
         )
         
         self._spans.append(span)
-        self._current_span = span
+        self._stack.append(span)
         return span
     
     def end_span(self, status: str = "ok") -> Optional[Span]:
@@ -149,26 +184,11 @@ class TraceContext:
         Returns:
             Ended span
         """
-        if self._current_span:
-            self._current_span.end(status)
-            ended = self._current_span
-            
-            # Pop to parent span
-            if len(self._spans) > 1:
-                # Find parent
-                parent_id = ended.parent_span_id
-                if parent_id:
-                    for span in reversed(self._spans):
-                        if span.span_id == parent_id:
-                            self._current_span = span
-                            break
-                else:
-                    self._current_span = None
-            else:
-                self._current_span = None
-            
-            return ended
-        return None
+        if not self._stack:
+            return None
+        ended = self._stack.pop()  # Current span becomes its parent
+        ended.end(status)
+        return ended
     
     def to_dict(self) -> Dict:
         """Convert trace to dictionary for export."""
@@ -178,14 +198,68 @@ class TraceContext:
         }
 
 
+class TraceRingBuffer:
+    """
+    Fixed-capacity ring of finished traces.
+    
+    Slots are preallocated; ``push`` is O(1) and never allocates. When the
+    exporter falls behind, the oldest unexported trace is overwritten and
+    counted in ``dropped``. Thread-safe.
+    """
+    
+    def __init__(self, capacity: int = 8192):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self._slots: List[Optional[TraceContext]] = [None] * capacity
+        self._capacity = capacity
+        self._head = 0  # Next slot to read
+        self._size = 0
+        self._lock = threading.Lock()
+        self.dropped = 0
+    
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+    
+    def push(self, context: TraceContext) -> int:
+        """Store a trace; returns the number of traces buffered."""
+        with self._lock:
+            tail = (self._head + self._size) % self._capacity
+            self._slots[tail] = context
+            if self._size == self._capacity:
+                self._head = (self._head + 1) % self._capacity
+                self.dropped += 1
+            else:
+                self._size += 1
+            return self._size
+    
+    def drain(self, max_items: int) -> List[TraceContext]:
+        """Remove and return up to max_items traces, oldest first."""
+        with self._lock:
+            count = min(max_items, self._size)
+            batch = []
+            for _ in range(count):
+                batch.append(self._slots[self._head])
+                self._slots[self._head] = None
+                self._head = (self._head + 1) % self._capacity
+            self._size -= count
+            return batch
+    
+    def __len__(self) -> int:
+        return self._size
+
+
 class EventTracer:
     """
     Event tracer for distributed tracing.
     
-    Provides tracing capabilities for event processing.
+    Provides tracing capabilities for event processing. Finished traces are
+    buffered and exported by a background thread (see module docstring);
+    call ``flush()`` to export synchronously and ``shutdown()`` when done.
     
     Example:
-        >>> tracer = EventTracer()
+        >>> tracer = EventTracer(sample_rate=0.1)
+        >>> tracer.add_exporter(log_exporter)
         >>> 
         >>> with tracer.trace_event(event) as span:
         ...     span.set_attribute("handler", "ReportHandler")
@@ -193,16 +267,44 @@ class EventTracer:
         ...     span.set_attribute("result", "success")
     """
     
-    def __init__(self, service_name: str = "pywats_events"):
+    def __init__(
+        self,
+        service_name: str = "pywats_events",
+        buffer_size: int = 8192,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        sample_rate: float = 1.0,
+    ):
         """
         Initialize tracer.
         
         Args:
             service_name: Name of the service for traces
+            buffer_size: Finished traces held for export (oldest overwritten)
+            batch_size: Traces exported per batch; a full batch wakes the exporter
+            flush_interval: Max seconds a trace waits in the buffer
+            sample_rate: Fraction of successful traces exported (error
+                traces are always exported)
         """
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
         self._service_name = service_name
-        self._exporters: List[callable] = []
+        self._exporters: List[Tuple[Callable, bool]] = []
         self._logger = get_logger(__name__)
+        
+        self._buffer = TraceRingBuffer(buffer_size)
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = flush_interval
+        self._sample_rate = sample_rate
+        
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._export_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        
+        self._exported = 0
+        self._sampled_out = 0
+        self._export_errors = 0
     
     @staticmethod
     def get_current_trace() -> Optional[TraceContext]:
@@ -214,14 +316,19 @@ class EventTracer:
         """Set the current trace context."""
         _current_trace.set(context)
     
-    def add_exporter(self, exporter: callable) -> None:
+    def add_exporter(self, exporter: Callable, batch: bool = False) -> None:
         """
         Add a trace exporter.
         
+        Exporters run on the background exporter thread.
+        
         Args:
-            exporter: Function(trace_dict) to export traces
+            exporter: Function(trace_dict) to export traces, or
+                Function(list_of_trace_dicts) when batch=True
+            batch: Call the exporter once per batch
         """
-        self._exporters.append(exporter)
+        self._exporters.append((exporter, batch))
+        self._ensure_worker()
     
     @contextmanager
     def trace(self, name: str, trace_id: Optional[str] = None) -> Generator[TraceContext, None, None]:
@@ -299,28 +406,109 @@ class EventTracer:
         Yields:
             Span for event processing
         """
-        trace_id = event.metadata.trace_id or str(uuid.uuid4())
+        trace_id = event.metadata.trace_id
         
         with self.trace(f"event:{event.event_type.value}", trace_id=trace_id) as context:
             span = context.current_span
             if span:
-                span.set_attribute("event.id", event.id)
-                span.set_attribute("event.type", str(event.event_type))
-                span.set_attribute("event.source", event.source)
+                attributes = span.attributes
+                attributes["event.id"] = event.id
+                attributes["event.type"] = str(event.event_type)
+                attributes["event.source"] = event.source
                 if event.metadata.correlation_id:
-                    span.set_attribute("correlation_id", event.metadata.correlation_id)
+                    attributes["correlation_id"] = event.metadata.correlation_id
             yield span
     
+    # =========================================================================
+    # Export (background)
+    # =========================================================================
+    
     def _export(self, context: TraceContext) -> None:
-        """Export trace to all exporters."""
-        trace_dict = context.to_dict()
+        """Hand a finished trace to the exporter thread (O(1), no formatting)."""
+        if not self._exporters:
+            return
+        if self._buffer.push(context) >= self._batch_size:
+            self._wakeup.set()
+    
+    def flush(self) -> int:
+        """
+        Export everything buffered now, on the calling thread.
         
-        for exporter in self._exporters:
+        Returns:
+            Number of traces exported
+        """
+        exported = 0
+        while True:
+            batch = self._buffer.drain(self._batch_size)
+            if not batch:
+                return exported
+            exported += self._export_batch(batch)
+    
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop the exporter thread after exporting what is buffered."""
+        self._stopping = True
+        self._wakeup.set()
+        if self._worker:
+            self._worker.join(timeout=timeout)
+            self._worker = None
+        self.flush()
+    
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Export counters."""
+        return {
+            "buffered": len(self._buffer),
+            "exported": self._exported,
+            "sampled_out": self._sampled_out,
+            "dropped": self._buffer.dropped,
+            "export_errors": self._export_errors,
+        }
+    
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        self._stopping = False
+        self._worker = threading.Thread(
+            target=self._worker_loop,
+            name=f"EventTracer-{self._service_name}-Exporter",
+            daemon=True,
+        )
+        self._worker.start()
+    
+    def _worker_loop(self) -> None:
+        while not self._stopping:
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
             try:
-                exporter(trace_dict)
+                self.flush()
             except Exception as e:
                 self._logger.error(f"Trace export error: {e}")
     
+    def _export_batch(self, batch: List[TraceContext]) -> int:
+        """Sample, format and export one batch."""
+        traces = []
+        for context in batch:
+            if self._sample_rate < 1.0 and not context.has_error and random.random() >= self._sample_rate:
+                self._sampled_out += 1
+                continue
+            traces.append(context.to_dict())
+        if not traces:
+            return 0
+        
+        with self._export_lock:
+            for exporter, batched in self._exporters:
+                try:
+                    if batched:
+                        exporter(traces)
+                    else:
+                        for trace_dict in traces:
+                            exporter(trace_dict)
+                except Exception as e:
+                    self._export_errors += 1
+                    self._logger.error(f"Trace export error: {e}")
+            self._exported += len(traces)
+        return len(traces)
+    
     def __repr__(self) -> str:
         return f"EventTracer(service={self._service_name})"
 
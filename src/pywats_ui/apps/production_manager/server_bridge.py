@@ -1,7 +1,14 @@
 """Bridge between the Qt UI and the async MI service.
 
-Runs async WATS API calls in a background thread and delivers
-results back to the Qt event loop via signals.
+Runs async WATS API calls on one long-lived asyncio loop in a background
+thread and delivers results back to the Qt event loop via signals. The
+loop owns a single pooled HTTP client for API calls and one for the
+media (Blob) endpoints, so connections and TLS sessions are reused.
+
+Loads are deduplicated (an identical load already in flight is not
+repeated) and superseded (a load for another definition cancels the
+previous one of the same kind), so fast browsing never queues up stale
+requests or delivers them after newer results.
 
 Connection priority (highest to lowest):
 1. Explicit configure(base_url, token)
@@ -11,38 +18,159 @@ Connection priority (highest to lowest):
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
+import contextvars
+import itertools
 import logging
 import os
+import threading
 import traceback
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
 
-from PySide6.QtCore import QObject, QThread, Signal
+from PySide6.QtCore import QObject, Signal
 
 logger = logging.getLogger(__name__)
 
+# Session of the request running in the current task (set by _execute)
+_request_session: contextvars.ContextVar[Optional["_Session"]] = contextvars.ContextVar(
+    "_request_session", default=None
+)
+
 
-class _Worker(QObject):
-    """Executes a single async callable in its own event loop."""
+class _AsyncRunner:
+    """Runs one asyncio event loop in a daemon thread."""
 
-    finished = Signal(object)  # result
-    error = Signal(str)        # error message
+    def __init__(self) -> None:
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, coro: Awaitable[Any]) -> concurrent.futures.Future:
+        """Schedule a coroutine on the loop, starting it if needed."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def stop(self, cleanup: Optional[Callable[[], Awaitable[None]]] = None,
+             timeout: float = 3.0) -> None:
+        """Cancel outstanding tasks, run cleanup, and stop the loop."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or thread is None:
+            return
 
-    def __init__(self, coro_factory: Any) -> None:
-        super().__init__()
-        self._coro_factory = coro_factory
+        async def _shutdown() -> None:
+            current = asyncio.current_task()
+            tasks = [t for t in asyncio.all_tasks() if t is not current]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if cleanup is not None:
+                await cleanup()
 
-    def run(self) -> None:
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                result = loop.run_until_complete(self._coro_factory())
-            finally:
-                loop.close()
-            self.finished.emit(result)
+            asyncio.run_coroutine_threadsafe(_shutdown(), loop).result(timeout)
         except Exception as exc:
-            logger.error("Worker error: %s\n%s", exc, traceback.format_exc())
-            self.error.emit(str(exc))
+            logger.warning("Bridge loop shutdown incomplete: %s", exc)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning("Bridge loop thread did not stop within %.1fs", timeout)
+        else:
+            loop.close()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._run, args=(loop, ready),
+                    name="ServerBridgeLoop", daemon=True,
+                )
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    @staticmethod
+    def _run(loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        loop.run_forever()
+
+
+class _Session:
+    """Clients shared by all requests for one set of credentials."""
+
+    def __init__(self, base_url: str, token: str) -> None:
+        from pywats.core.async_client import AsyncHttpClient
+
+        self.base_url = base_url
+        self.token = token
+        # No response cache: the UI reloads after every change and must
+        # see the server state, not a cached list.
+        self.http = AsyncHttpClient(base_url=base_url, token=token,
+                                    enable_cache=False)
+        self._mi_service: Any = None
+        self._report_service: Any = None
+        self._media: Any = None
+
+    @property
+    def mi_service(self) -> Any:
+        if self._mi_service is None:
+            from pywats.domains.manual_inspection import (
+                AsyncManualInspectionRepository,
+                AsyncManualInspectionService,
+            )
+            repo = AsyncManualInspectionRepository(
+                http_client=self.http,
+                base_url=self.base_url,
+            )
+            self._mi_service = AsyncManualInspectionService(repo)
+        return self._mi_service
+
+    @property
+    def report_service(self) -> Any:
+        if self._report_service is None:
+            from pywats.domains.report import AsyncReportRepository, AsyncReportService
+            self._report_service = AsyncReportService(
+                AsyncReportRepository(http_client=self.http)
+            )
+        return self._report_service
+
+    @property
+    def media(self) -> Any:
+        """Pooled client for the Blob endpoints (multipart, no JSON defaults)."""
+        if self._media is None:
+            import httpx
+            self._media = httpx.AsyncClient(headers={
+                "Authorization": f"Basic {self.token}",
+                "Referer": self.base_url,
+            })
+        return self._media
+
+    async def close(self) -> None:
+        await self.http.close()
+        if self._media is not None:
+            await self._media.aclose()
+            self._media = None
+
+
+class _Request:
+    """A submitted call awaiting delivery on the Qt thread."""
+
+    __slots__ = ("signal", "future", "key", "group")
+
+    def __init__(self, signal: Any, key: Optional[Hashable],
+                 group: Optional[str]) -> None:
+        self.signal = signal
+        self.future: Optional[concurrent.futures.Future] = None
+        self.key = key
+        self.group = group
 
 
 class ServerBridge(QObject):
@@ -67,31 +195,51 @@ class ServerBridge(QObject):
     error_occurred = Signal(str)            # error message
     connected = Signal(str)                 # base_url on successful connection
 
+    # Internal: (request id, result, error message) from the loop thread
+    _request_done = Signal(int, object, object)
+
     def __init__(self, parent: Optional[QObject] = None) -> None:
         super().__init__(parent)
         self._base_url: Optional[str] = None
         self._token: Optional[str] = None
-        self._threads: List[QThread] = []
+        self._runner = _AsyncRunner()
+        self._session: Optional[_Session] = None
+        self._requests: Dict[int, _Request] = {}
+        self._loads: Dict[str, int] = {}  # group -> request id of latest load
+        self._ids = itertools.count(1)
+        self._request_done.connect(self._on_request_done)
 
     def shutdown(self) -> None:
-        """Wait for all running background threads to finish.
+        """Cancel pending requests, close the HTTP clients and stop the loop.
 
-        Uses a 3-second graceful timeout, then force-terminates
-        any threads that haven't stopped.
+        Waits up to 3 seconds for in-flight requests to unwind.
         """
-        for thread in list(self._threads):
-            thread.quit()
-            if not thread.wait(3000):  # 3 second timeout
-                logger.warning(
-                    "Thread did not stop gracefully, force terminating"
-                )
-                thread.terminate()
-                thread.wait(1000)  # Brief wait after terminate
-        self._threads.clear()
+        self.cancel_pending()
+        session, self._session = self._session, None
+        self._runner.stop(session.close if session else None, timeout=3.0)
+
+    def cancel_pending(self) -> None:
+        """Cancel every request that has not delivered its result yet."""
+        for request_id in list(self._requests):
+            self._cancel(request_id)
+
+    @property
+    def pending_count(self) -> int:
+        """Number of requests in flight."""
+        return len(self._requests)
 
     def configure(self, base_url: str, token: str) -> None:
         """Set server connection details explicitly."""
-        self._base_url = base_url.rstrip("/")
+        base_url = base_url.rstrip("/")
+        if (base_url, token) != (self._base_url, self._token):
+            # Results for the old server must not reach the UI
+            self.cancel_pending()
+            # Swapped here on the Qt thread; requests get the session they
+            # were submitted with, so the loop thread never writes bridge state
+            session, self._session = self._session, _Session(base_url, token)
+            if session is not None and self._runner.is_running:
+                self._runner.submit(session.close())
+        self._base_url = base_url
         self._token = token
         self.connected.emit(self._base_url)
 
@@ -147,33 +295,37 @@ class ServerBridge(QObject):
         return False
 
     # ----------------------------------------------------------------
-    # Public API — each launches a background thread
+    # Public API — each schedules a call on the background loop
     # ----------------------------------------------------------------
 
     def load_definitions(self, is_global: bool = False) -> None:
         """Fetch all definitions from the server."""
-        self._run_async(
+        self._load(
+            "definitions", is_global,
             lambda: self._fetch_definitions(is_global),
             self.definitions_loaded,
         )
 
     def load_definition(self, definition_id: str) -> None:
         """Fetch a single definition's detail."""
-        self._run_async(
+        self._load(
+            "definition", definition_id,
             lambda: self._fetch_definition(definition_id),
             self.definition_loaded,
         )
 
     def load_xaml(self, definition_id: str) -> None:
         """Fetch XAML content for a definition."""
-        self._run_async(
+        self._load(
+            "xaml", definition_id,
             lambda: self._fetch_xaml(definition_id),
             self.xaml_loaded,
         )
 
     def load_relations(self, definition_id: str) -> None:
         """Fetch relations for a definition."""
-        self._run_async(
+        self._load(
+            "relations", definition_id,
             lambda: self._fetch_relations(definition_id),
             self.relations_loaded,
         )
@@ -233,7 +385,8 @@ class ServerBridge(QObject):
 
     def load_media(self, definition_id: str) -> None:
         """Fetch media/documents for a definition."""
-        self._run_async(
+        self._load(
+            "media", definition_id,
             lambda: self._fetch_media(definition_id),
             self.media_loaded,
         )
@@ -265,28 +418,28 @@ class ServerBridge(QObject):
     # ----------------------------------------------------------------
 
     async def _fetch_definitions(self, is_global: bool) -> list:
-        svc = self._create_service()
+        svc = self._mi_service()
         defs = await svc.list_definitions(is_global=is_global)
         return [d.model_dump(by_alias=True) for d in defs]
 
     async def _fetch_definition(self, definition_id: str) -> dict:
-        svc = self._create_service()
+        svc = self._mi_service()
         defn = await svc.get_definition(definition_id)
         if defn is None:
             return {}
         return defn.model_dump(by_alias=True)
 
     async def _fetch_xaml(self, definition_id: str) -> dict:
-        svc = self._create_service()
+        svc = self._mi_service()
         return await svc.get_xaml(definition_id)
 
     async def _fetch_relations(self, definition_id: str) -> list:
-        svc = self._create_service()
+        svc = self._mi_service()
         rels = await svc.list_relations(definition_id)
         return [r.model_dump(by_alias=True) for r in rels]
 
     async def _push_xaml(self, definition_id: str, xaml: str) -> str:
-        svc = self._create_service()
+        svc = self._mi_service()
         payload = {
             "TestSequenceDefinitionId": definition_id,
             "Definition": xaml,
@@ -295,7 +448,7 @@ class ServerBridge(QObject):
         return f"XAML saved for {definition_id}"
 
     async def _fetch_copy(self, definition_id: str) -> dict:
-        svc = self._create_service()
+        svc = self._mi_service()
         copy = await svc.copy_definition(definition_id)
         if copy is None:
             return {}
@@ -303,7 +456,7 @@ class ServerBridge(QObject):
 
     async def _push_status(self, definition_id: str, new_status: int,
                             full_definition: Optional[dict] = None) -> dict:
-        svc = self._create_service()
+        svc = self._mi_service()
         # The PUT endpoint needs the full definition object, not just id+Status.
         # Merge the new status into the current definition if available.
         if full_definition:
@@ -321,7 +474,7 @@ class ServerBridge(QObject):
 
     async def _push_new_relation(self, definition_id: str, entity_schema: str,
                                  entity_key: str, entity_value: str) -> str:
-        svc = self._create_service()
+        svc = self._mi_service()
         await svc.create_relation(
             definition_id=definition_id,
             entity_schema=entity_schema,
@@ -332,153 +485,154 @@ class ServerBridge(QObject):
         return f"Relation created for {definition_id}"
 
     async def _push_delete_relation(self, relation_payload: dict) -> str:
-        svc = self._create_service()
+        svc = self._mi_service()
         await svc.delete_relation(relation_payload)
         return "Relation deleted"
 
     async def _fetch_media(self, definition_id: str) -> list:
         """Fetch MI media list via GET /api/internal/Blob/mi."""
-        import httpx
-        url = f"{self._base_url}/api/internal/Blob/mi"
+        session = self._current_session()
+        url = f"{session.base_url}/api/internal/Blob/mi"
         params = {"definitionId": definition_id}
-        headers = {
-            "Authorization": f"Basic {self._token}",
-            "Referer": self._base_url or "",
-        }
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(url, params=params, headers=headers)
-            if resp.status_code == 200:
-                return resp.json()
-            logger.error("Fetch media failed: %s", resp.status_code)
-            return []
+        resp = await session.media.get(url, params=params)
+        if resp.status_code == 200:
+            return resp.json()
+        logger.error("Fetch media failed: %s", resp.status_code)
+        return []
 
     async def _push_media(self, definition_id: str, file_path: str) -> str:
         """Upload MI media via POST /api/internal/Blob/mi."""
-        import httpx
-        url = f"{self._base_url}/api/internal/Blob/mi"
+        session = self._current_session()
+        url = f"{session.base_url}/api/internal/Blob/mi"
         params = {"definitionId": definition_id}
-        headers = {
-            "Authorization": f"Basic {self._token}",
-            "Referer": self._base_url or "",
-        }
         filename = os.path.basename(file_path)
         with open(file_path, "rb") as f:
             files = {"file": (filename, f, "application/pdf")}
-            async with httpx.AsyncClient() as client:
-                resp = await client.post(url, params=params, headers=headers,
-                                        files=files)
-                if resp.status_code in (200, 201, 204):
-                    return f"Media uploaded: {filename}"
-                raise RuntimeError(f"Upload failed ({resp.status_code}): {resp.text}")
+            resp = await session.media.post(url, params=params, files=files)
+        if resp.status_code in (200, 201, 204):
+            return f"Media uploaded: {filename}"
+        raise RuntimeError(f"Upload failed ({resp.status_code}): {resp.text}")
 
     async def _push_delete_media(self, definition_id: str,
                                  media_info: dict) -> str:
         """Delete MI media via DELETE /api/internal/Blob/mi."""
-        import httpx
-        url = f"{self._base_url}/api/internal/Blob/mi"
+        session = self._current_session()
+        url = f"{session.base_url}/api/internal/Blob/mi"
         media_id = media_info.get("Id", media_info.get("BlobId", ""))
         params = {"definitionId": definition_id, "mediaId": media_id}
-        headers = {
-            "Authorization": f"Basic {self._token}",
-            "Referer": self._base_url or "",
-        }
-        async with httpx.AsyncClient() as client:
-            resp = await client.delete(url, params=params, headers=headers)
-            if resp.status_code in (200, 204):
-                return "Media deleted"
-            raise RuntimeError(f"Delete failed ({resp.status_code}): {resp.text}")
+        resp = await session.media.delete(url, params=params)
+        if resp.status_code in (200, 204):
+            return "Media deleted"
+        raise RuntimeError(f"Delete failed ({resp.status_code}): {resp.text}")
 
     async def _fetch_download_media(self, definition_id: str,
                                     media_info: dict, save_path: str) -> str:
         """Download MI media file to local path."""
-        import httpx
-        url = f"{self._base_url}/api/internal/Blob/mi"
+        session = self._current_session()
+        url = f"{session.base_url}/api/internal/Blob/mi"
         media_id = media_info.get("Id", media_info.get("BlobId", ""))
         params = {"definitionId": definition_id, "mediaId": media_id,
                   "download": "true"}
-        headers = {
-            "Authorization": f"Basic {self._token}",
-            "Referer": self._base_url or "",
-        }
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(url, params=params, headers=headers)
-            if resp.status_code == 200:
-                with open(save_path, "wb") as f:
-                    f.write(resp.content)
-                return f"Media downloaded to {save_path}"
-            raise RuntimeError(f"Download failed ({resp.status_code}): {resp.text}")
+        resp = await session.media.get(url, params=params)
+        if resp.status_code == 200:
+            with open(save_path, "wb") as f:
+                f.write(resp.content)
+            return f"Media downloaded to {save_path}"
+        raise RuntimeError(f"Download failed ({resp.status_code}): {resp.text}")
 
     async def _push_report(self, report: Any) -> str:
         """Submit a UUT report via the report service."""
         import json as _json
-        from pywats.core.async_client import AsyncHttpClient
-        from pywats.domains.report import AsyncReportRepository, AsyncReportService
 
         # Debug: dump serialized JSON
         if hasattr(report, 'model_dump'):
             data = report.model_dump(mode="json", by_alias=True, exclude_none=True)
             logger.info("Report JSON:\n%s", _json.dumps(data, indent=2, default=str))
 
-        http_client = AsyncHttpClient(
-            base_url=self._base_url or "",
-            token=self._token or "",
-        )
-        repo = AsyncReportRepository(http_client=http_client)
-        svc = AsyncReportService(repo)
-        report_id = await svc.submit_report(report)
+        report_id = await self._current_session().report_service.submit_report(report)
         if report_id:
             return f"Report submitted: {report_id}"
         return "Report submitted (no ID returned)"
 
-    def _create_service(self) -> Any:
-        """Create a fresh async MI service instance."""
-        from pywats.core.async_client import AsyncHttpClient
-        from pywats.domains.manual_inspection import (
-            AsyncManualInspectionRepository,
-            AsyncManualInspectionService,
-        )
+    def _current_session(self) -> _Session:
+        """Shared clients the running request was submitted with."""
+        session = _request_session.get() or self._session
+        if session is None:
+            raise RuntimeError("Server not configured")
+        return session
 
-        http_client = AsyncHttpClient(
-            base_url=self._base_url or "",
-            token=self._token or "",
-        )
-        repo = AsyncManualInspectionRepository(
-            http_client=http_client,
-            base_url=self._base_url,
-        )
-        return AsyncManualInspectionService(repo)
+    def _mi_service(self) -> Any:
+        """The shared async MI service instance."""
+        return self._current_session().mi_service
 
     # ----------------------------------------------------------------
-    # Thread management
+    # Request management
     # ----------------------------------------------------------------
 
-    def _run_async(self, coro_factory: Any, success_signal: Signal) -> None:
-        """Run an async callable in a background thread."""
+    def _load(self, group: str, args: Hashable,
+              coro_factory: Callable[[], Awaitable[Any]],
+              success_signal: Any) -> None:
+        """Run a read, deduplicated and superseded within its group.
+
+        An identical load still in flight is not repeated (its result is
+        delivered on the same signal); a load with different arguments
+        cancels it, so only the latest selection's result arrives.
+        """
+        key = (group, args)
+        current = self._requests.get(self._loads.get(group, 0))
+        if current is not None:
+            if current.key == key:
+                return
+            self._cancel(self._loads[group])
+        request_id = self._run_async(coro_factory, success_signal, key, group)
+        if request_id is not None:
+            self._loads[group] = request_id
+
+    def _run_async(self, coro_factory: Callable[[], Awaitable[Any]],
+                   success_signal: Any, key: Optional[Hashable] = None,
+                   group: Optional[str] = None) -> Optional[int]:
+        """Schedule an async callable on the bridge loop."""
         if not self.is_configured:
             self.error_occurred.emit("Server not configured")
+            return None
+
+        if group is None:
+            # A change invalidates in-flight loads for deduplication: the
+            # next load must observe it rather than join an older one.
+            self._loads.clear()
+
+        request_id = next(self._ids)
+        request = _Request(success_signal, key, group)
+        self._requests[request_id] = request
+        request.future = self._runner.submit(
+            self._execute(request_id, self._session, coro_factory))
+        return request_id
+
+    async def _execute(self, request_id: int, session: Optional[_Session],
+                       coro_factory: Callable[[], Awaitable[Any]]) -> None:
+        _request_session.set(session)  # Task-local: one task per request
+        try:
+            result = await coro_factory()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.error("Bridge request error: %s\n%s", exc, traceback.format_exc())
+            self._request_done.emit(request_id, None, str(exc))
+        else:
+            self._request_done.emit(request_id, result, None)
+
+    def _cancel(self, request_id: int) -> None:
+        request = self._requests.pop(request_id, None)
+        if request is not None and request.future is not None:
+            request.future.cancel()
+
+    def _on_request_done(self, request_id: int, result: Any,
+                         error: Optional[str]) -> None:
+        """Deliver a result on the Qt thread (dropped if cancelled)."""
+        request = self._requests.pop(request_id, None)
+        if request is None:
             return
-
-        thread = QThread()
-        worker = _Worker(coro_factory)
-        worker.moveToThread(thread)
-
-        thread.started.connect(worker.run)
-        worker.finished.connect(lambda result: success_signal.emit(result))
-        worker.error.connect(self.error_occurred.emit)
-
-        # Cleanup — must use thread.finished to avoid "wait on itself"
-        def cleanup() -> None:
-            if thread in self._threads:
-                self._threads.remove(thread)
-            worker.deleteLater()
-            thread.deleteLater()
-
-        # When worker done → quit the thread's event loop
-        worker.finished.connect(thread.quit)
-        worker.error.connect(thread.quit)
-
-        # When thread actually stops → safe to clean up
-        thread.finished.connect(cleanup)
-
-        self._threads.append(thread)
-        thread.start()
+        if error is not None:
+            self.error_occurred.emit(error)
+        else:
+            request.signal.emit(result)
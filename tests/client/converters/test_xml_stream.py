@@ -0,0 +1,221 @@
+"""
+Tests for the streaming XML layer and the converters built on it
+
+Tests cover:
+1. XmlStream children/complete and detaching of processed elements
+2. Seica XML validate/convert
+3. WATS Standard XML (WSXF) validate/convert
+4. ATML validate on a TestResultsCollection
+"""
+
+import io
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pytest
+
+from pywats_client.converters.context import ConverterContext
+from pywats_client.converters.models import ConversionStatus, ConverterSource
+from pywats_client.converters.standard.atml_converter import ATMLConverter
+from pywats_client.converters.standard.seica_xml_converter import SeicaXMLConverter
+from pywats_client.converters.standard.wats_standard_xml_converter import WATSStandardXMLConverter
+from pywats_client.converters.xml_stream import XmlStream, local_name
+
+
+# =============================================================================
+# Test Helpers
+# =============================================================================
+
+def write(tmp_path: Path, text: str, name: str = "report.xml") -> ConverterSource:
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return ConverterSource.from_file(path)
+
+
+SEICA_XML = (
+    '<R><ST NM="PN1_B2" OP="op" NMP="board"/>'
+    '<BI BC="1" BCP="SN1" SD="01-01-2024 10:00:00">'
+    '<TEST F="R" NM="R1" MR="100" ML="90" MH="110" MU="Ohm" TR="0" TT="5"/>'
+    '<TEST F="C" NM="C1" MR="1" ML="0.5" MH="1.5" MU="uF" TR="0" TT="5"/>'
+    '</BI><ET ED="01-01-2024 10:01:00" NF="0"/></R>'
+)
+
+WSXF_XML = """<?xml version="1.0" encoding="utf-8"?>
+<Reports xmlns="http://wats.virinco.com/schemas/WATS/Report/wsxf">
+  <Report SN="SN12345" PN="PN-001" Rev="A" Result="Failed" Start="2024-01-15T10:00:00">
+    <UUT UserLoginName="JohnDoe" ExecutionTime="10.5"><Comment>note</Comment></UUT>
+    <Process Code="10" Name="Functional Test"/>
+    <MiscInfo Description="TestInfo">Some value</MiscInfo>
+    <Step Name="MainSequence" StepType="SequenceCall" Status="Failed">
+      <Step Name="VoltageTest" StepType="ET_NLT" Status="Failed">
+        <NumericLimit NumericValue="13" LowLimit="11.5" HighLimit="12.5" Units="V" CompOperator="GELE"/>
+      </Step>
+      <Step Name="SelfTest" StepType="ET_PFT" Status="Passed"><PassFail Status="Passed"/></Step>
+    </Step>
+  </Report>
+  <Report SN="second"/>
+</Reports>"""
+
+ATML_XML = """<?xml version="1.0"?>
+<trc:TestResultsCollection xmlns:trc="urn:IEEE-1636.1:2013:TestResultsCollection"
+    xmlns:tr="urn:IEEE-1636.1:2013:TestResults" xmlns:c="urn:IEEE-1671:2010:Common">
+  <trc:TestResults>
+    <tr:UUT>
+      <c:SerialNumber>SN42</c:SerialNumber>
+      <c:Definition><c:Identification><c:IdentificationNumbers>
+        <c:IdentificationNumber number="PN7"/>
+      </c:IdentificationNumbers></c:Identification></c:Definition>
+    </tr:UUT>
+    <tr:ResultSet name="Main">
+      <tr:Test name="T1"><tr:Outcome value="Passed"/></tr:Test>
+      <tr:Outcome value="Failed"/>
+    </tr:ResultSet>
+  </trc:TestResults>
+</trc:TestResultsCollection>"""
+
+
+# =============================================================================
+# XmlStream
+# =============================================================================
+
+class TestXmlStream:
+    """Pull-style iteration over an iterparse stream."""
+
+    def test_children_and_complete(self):
+        data = b'<a x="1"><b n="1"><c>t</c></b><b n="2"/><d>text</d></a>'
+
+        with XmlStream(io.BytesIO(data)) as xml:
+            assert xml.root.get("x") == "1"
+            seen = []
+            for child in xml.children(xml.root):
+                if child.tag == "d":
+                    seen.append(("d", xml.complete(child).text))
+                else:
+                    seen.append((child.tag, child.get("n")))
+
+        assert seen == [("b", "1"), ("b", "2"), ("d", "text")]
+
+    def test_processed_children_are_detached(self):
+        data = b"<root>" + b"<item><v>1</v></item>" * 20000 + b"</root>"
+
+        with XmlStream(io.BytesIO(data)) as xml:
+            root = xml.root
+            sizes = [len(root) for _ in xml.children(root)]
+
+        # Only the parser's read-ahead is ever attached, not the whole document
+        assert len(sizes) == 20000
+        assert max(sizes) < 2000
+        assert len(root) == 0
+
+    def test_nested_children(self):
+        data = b"<r><g><t i='1'/><t i='2'/></g><g><t i='3'/></g></r>"
+
+        with XmlStream(io.BytesIO(data)) as xml:
+            ids = [
+                test.get("i")
+                for group in xml.children(xml.root)
+                for test in xml.children(group)
+            ]
+
+        assert ids == ["1", "2", "3"]
+
+    def test_stops_reading_early(self):
+        # Content after the first child is never parsed
+        data = b"<r><first/><unclosed>"
+
+        with XmlStream(io.BytesIO(data)) as xml:
+            first = next(xml.children(xml.root))
+
+        assert first.tag == "first"
+
+    def test_truncated_document(self):
+        with XmlStream(io.BytesIO(b"<r><a/>")) as xml:
+            with pytest.raises(ET.ParseError):
+                list(xml.children(xml.root))
+
+    def test_namespaces(self):
+        data = b'<p:r xmlns:p="urn:x"><p:c/></p:r>'
+
+        with XmlStream(io.BytesIO(data)) as xml:
+            assert local_name(xml.root.tag) == "r"
+            assert xml.namespaces == {"p": "urn:x"}
+
+
+# =============================================================================
+# Converters
+# =============================================================================
+
+class TestSeicaStreaming:
+
+    def test_validate_and_convert(self, tmp_path):
+        source = write(tmp_path, SEICA_XML)
+        converter = SeicaXMLConverter()
+
+        validation = converter.validate(source, ConverterContext())
+        result = converter.convert(source, ConverterContext())
+
+        assert validation.can_convert
+        assert validation.detected_serial_number == "SN1"
+        assert result.status == ConversionStatus.SUCCESS
+        assert result.report.sn == "SN1"
+        assert result.report.result == "P"
+        steps = result.report.get_root_sequence_call().steps
+        assert [(s.name, [t.name for t in s.steps]) for s in steps] == [("R", ["R1"]), ("C", ["C1"])]
+
+    def test_missing_st(self, tmp_path):
+        source = write(tmp_path, '<R><BI BCP="SN1"/></R>')
+
+        result = SeicaXMLConverter().convert(source, ConverterContext())
+
+        assert result.status == ConversionStatus.FAILED
+        assert "ST" in result.error
+
+
+class TestWATSStandardXMLStreaming:
+
+    def test_validate(self, tmp_path):
+        validation = WATSStandardXMLConverter().validate(write(tmp_path, WSXF_XML), ConverterContext())
+
+        assert validation.confidence == 0.98
+        assert validation.detected_serial_number == "SN12345"
+        assert validation.detected_result == "Failed"
+
+    def test_convert_first_report(self, tmp_path):
+        result = WATSStandardXMLConverter().convert(write(tmp_path, WSXF_XML), ConverterContext())
+        report = result.report
+
+        assert result.status == ConversionStatus.SUCCESS
+        assert report["serialNumber"] == "SN12345"
+        assert report["operator"] == "JohnDoe"
+        assert report["comment"] == "note"
+        assert report["processCode"] == "10"
+        assert report["miscInfos"] == [{"name": "TestInfo", "value": "Some value"}]
+        main = report["root"]["stepResults"][0]
+        assert main["type"] == "SEQ"
+        voltage, self_test = main["stepResults"]
+        assert (voltage["type"], voltage["numericValue"], voltage["unit"]) == ("NT", 13.0, "V")
+        assert self_test["passFailStatus"] is True
+        assert report["root"]["status"] == "Failed"
+
+    def test_no_reports(self, tmp_path):
+        result = WATSStandardXMLConverter().convert(write(tmp_path, "<Reports/>"), ConverterContext())
+
+        assert result.status == ConversionStatus.FAILED
+        assert result.error == "No Report elements found"
+
+
+class TestATMLStreaming:
+
+    def test_validate_collection(self, tmp_path):
+        validation = ATMLConverter().validate(write(tmp_path, ATML_XML), ConverterContext())
+
+        assert validation.confidence == 0.9
+        assert validation.detected_serial_number == "SN42"
+        assert validation.detected_part_number == "PN7"
+        assert validation.detected_result == "Failed"
+
+    def test_prefixes_are_not_confused(self):
+        converter = ATMLConverter()
+        converter._ns = {"c": "urn:c", "trc": "urn:trc"}
+
+        assert converter._qualify("trc:TestResults/c:Datum") == "{urn:trc}TestResults/{urn:c}Datum"
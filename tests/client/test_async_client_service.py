@@ -5,6 +5,8 @@ Tests the async service lifecycle, timers, and component integration.
 """
 
 import asyncio
+import json
+import os
 import pytest
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch, PropertyMock
@@ -233,6 +235,108 @@ class TestAsyncClientServiceIPC:
         assert creds["token"] == "test-token"
 
 
+class TestAsyncClientServiceHeartbeat:
+    """Test instance registry heartbeats"""
+    
+    @patch('pywats_client.service.async_client_service.ClientConfig')
+    def test_publish_heartbeat(self, mock_config_cls, mock_config, tmp_path):
+        """Heartbeat publishes a live record with ServiceStatus counters"""
+        from pywats_client.service.instance_registry import InstanceRegistry
+        mock_config_cls.load_for_instance.return_value = mock_config
+        
+        service = AsyncClientService(instance_id="station1")
+        service._registry = InstanceRegistry(tmp_path)
+        service._pending_queue = MagicMock(stats={"queued_files": 4, "successful": 7})
+        
+        service._publish_heartbeat()
+        record = service._registry.get("station1")
+        
+        assert record.pid == os.getpid()
+        assert record.socket_name == "pyWATS_Service_station1"
+        assert record.summary["status"] == "Stopped"
+        assert record.summary["pending_count"] == 4
+        assert record.summary["completed_count"] == 7
+
+
+class TestAsyncClientServiceConfigWatch:
+    """Test event-driven config reload"""
+    
+    @pytest.fixture
+    def config_service(self, tmp_path):
+        """Service whose config lives in a real file"""
+        from pywats_client.core.config import ClientConfig
+        config = ClientConfig(instance_id="station1")
+        config.save(tmp_path / "config_station1.json")
+        
+        with patch('pywats_client.service.async_client_service.ClientConfig') as mock_config_cls:
+            mock_config_cls.load_for_instance.return_value = config
+            service = AsyncClientService(instance_id="station1")
+        service.CONFIG_DEBOUNCE = 0.05
+        return service
+    
+    @staticmethod
+    def write_config(service, **changes):
+        data = service.config.to_dict()
+        data.update(changes)
+        service.config.config_path.write_text(json.dumps(data))
+    
+    @staticmethod
+    async def wait_until(condition, timeout=5.0):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not condition():
+            assert loop.time() < deadline, "timed out"
+            await asyncio.sleep(0.01)
+    
+    @pytest.mark.asyncio
+    async def test_change_is_applied_without_polling(self, config_service):
+        """A file change is reloaded well inside the polling interval"""
+        task = asyncio.create_task(config_service._config_watch_loop())
+        await asyncio.sleep(0.1)  # Observer started
+        try:
+            self.write_config(config_service, location="Line 2")
+            await self.wait_until(lambda: config_service.config.location == "Line 2", timeout=2.0)
+        finally:
+            config_service._shutdown_event.set()
+            await asyncio.wait_for(task, timeout=5)
+        
+        assert config_service.config.config_path.name == "config_station1.json"
+    
+    @pytest.mark.asyncio
+    async def test_burst_of_writes_reloads_once(self, config_service):
+        """Writes within the debounce window collapse into one reload"""
+        config_service._reload_config = AsyncMock(return_value=True)
+        task = asyncio.create_task(config_service._config_watch_loop())
+        await asyncio.sleep(0.1)
+        try:
+            for i in range(5):
+                self.write_config(config_service, location=f"Line {i}")
+                await asyncio.sleep(0.01)
+            await self.wait_until(lambda: config_service._reload_config.await_count >= 1)
+            await asyncio.sleep(0.3)
+        finally:
+            config_service._shutdown_event.set()
+            await asyncio.wait_for(task, timeout=5)
+        
+        assert config_service._reload_config.await_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_invalid_config_not_applied(self, config_service):
+        """Unparseable or invalid files leave the running config in place"""
+        original = config_service.config
+        
+        config_service.config.config_path.write_text('{"instance_id": "stat')
+        assert await config_service._reload_config() is False
+        
+        self.write_config(config_service, log_level="LOUD")
+        assert await config_service._reload_config() is False
+        assert config_service.config is original
+        
+        self.write_config(config_service, log_level="DEBUG")
+        assert await config_service._reload_config() is True
+        assert config_service.config.log_level == "DEBUG"
+
+
 class TestAsyncClientServiceHealth:
     """Test health status"""
     
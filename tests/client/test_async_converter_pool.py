@@ -238,11 +238,12 @@ class TestAsyncConverterPoolConcurrency:
             test_file.write_text(f"<test{i}/>")
             items.append(AsyncConversionItem(test_file, mock_converter))
         
-        # Process all with semaphore - need to create queue items
+        # Admit each item on a semaphore slot, as run() does
         from pywats.queue import QueueItem
-        queue_items = [QueueItem.create(item, priority=5) for item in items]
-        tasks = [pool._process_with_limit(item, qi) for item, qi in zip(items, queue_items)]
-        await asyncio.gather(*tasks)
+        for item in items:
+            await pool._semaphore.acquire()
+            pool._admit(QueueItem.create(item, priority=5))
+        await asyncio.gather(*list(pool._active_tasks))
         
         assert max_concurrent_seen <= 2
 
@@ -373,6 +374,132 @@ class TestAsyncConverterPoolConfigReload:
         assert len(pool._converters) == 0
 
 
+class TestAsyncConverterPoolIncrementalReload:
+    """Test diff-based reload of converters and watchers"""
+    
+    @pytest.fixture
+    def folders(self, temp_watch_dir):
+        paths = {name: temp_watch_dir / name for name in ("a", "b", "c")}
+        for path in paths.values():
+            path.mkdir()
+        return paths
+    
+    @pytest.fixture
+    def reload_pool(self, pool, mock_config):
+        """Pool whose converters are built from plain dict configs"""
+        def create(conv_config):
+            converter = MagicMock()
+            converter.name = conv_config["name"]
+            converter.watch_path = Path(conv_config["watch_folder"])
+            converter.watch_recursive = False
+            converter.supported_extensions = [".csv"]
+            converter.matches_file = lambda path: path.suffix == ".csv"
+            return converter
+        
+        pool._create_converter = AsyncMock(side_effect=create)
+        pool._running = True
+        yield pool
+        for observer in pool._observers.values():
+            observer.stop()
+    
+    @staticmethod
+    def configs(folders, **overrides):
+        return [
+            {"name": name, "watch_folder": str(path), **overrides.get(name, {})}
+            for name, path in folders.items()
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_unchanged_converters_keep_watchers(self, reload_pool, mock_config, folders):
+        """Reloading an identical config rebuilds nothing"""
+        mock_config.converters = self.configs(folders)
+        await reload_pool.reload_config(mock_config)
+        converters = list(reload_pool._converters)
+        observers = dict(reload_pool._observers)
+        
+        stats = await reload_pool.reload_config(mock_config)
+        
+        assert stats == {'added': 0, 'changed': 0, 'removed': 0, 'unchanged': 3}
+        assert reload_pool._converters == converters
+        assert reload_pool._observers == observers
+        assert all(observer.is_alive() for observer in observers.values())
+        assert reload_pool._create_converter.await_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_changed_converter_is_rebuilt_and_gap_scanned(self, reload_pool, mock_config, folders):
+        """Only the changed converter restarts, and its folder is rescanned"""
+        mock_config.converters = self.configs(folders)
+        await reload_pool.reload_config(mock_config)
+        old_a, old_b, old_c = reload_pool._converters
+        old_b_observer = reload_pool._observers[id(old_b)]
+        old_a_observer = reload_pool._observers[id(old_a)]
+        stop_watcher = reload_pool._stop_watcher
+        
+        async def stop_then_drop(converter):
+            await stop_watcher(converter)
+            # Dropped in the gap: the old watcher is gone, the new one not started
+            (folders["b"] / "dropped.csv").write_text("data")
+        
+        reload_pool._stop_watcher = stop_then_drop
+        mock_config.converters = self.configs(folders, b={"priority": 1})
+        stats = await reload_pool.reload_config(mock_config)
+        
+        assert stats == {'added': 0, 'changed': 1, 'removed': 0, 'unchanged': 2}
+        new_a, new_b, new_c = reload_pool._converters
+        assert new_a is old_a and new_c is old_c and new_b is not old_b
+        assert reload_pool._observers[id(new_a)] is old_a_observer
+        assert id(old_b) not in reload_pool._observers
+        assert not old_b_observer.is_alive()
+        assert reload_pool._observers[id(new_b)].is_alive()
+        
+        # Gap scan queued the file dropped while the watcher was replaced
+        assert reload_pool._queue.size == 1
+        item = (await reload_pool._queue.get(timeout=1)).data
+        assert item.file_path == folders["b"] / "dropped.csv"
+        assert item.converter is new_b
+    
+    @pytest.mark.asyncio
+    async def test_gap_window_open_before_watchers_start(self, reload_pool, mock_config, folders):
+        """Files a new watcher sees before the gap scan are recorded in the scan set"""
+        mock_config.converters = self.configs(folders)
+        await reload_pool.reload_config(mock_config)
+        await asyncio.sleep(0)
+        reload_pool._startup_scan_complete = True  # Earlier window has closed
+        dropped = folders["b"] / "dropped.csv"
+        dropped.write_text("data")
+        recorded = []
+        start_watcher = reload_pool._start_watcher
+        
+        def start_and_see_file(converter):
+            start_watcher(converter)
+            # Watchdog event for a file arriving before the scan runs
+            reload_pool._on_file_created(dropped, converter)
+            recorded.append(dropped in reload_pool._startup_scan_files)
+        
+        reload_pool._start_watcher = start_and_see_file
+        mock_config.converters = self.configs(folders, b={"priority": 1})
+        await reload_pool.reload_config(mock_config)
+        
+        assert recorded == [True]
+        assert reload_pool._queue.size == 1
+    
+    @pytest.mark.asyncio
+    async def test_removed_converter_watcher_stopped(self, reload_pool, mock_config, folders):
+        """Converters dropped from the config stop watching"""
+        mock_config.converters = self.configs(folders)
+        await reload_pool.reload_config(mock_config)
+        old_c = reload_pool._converters[2]
+        observer = reload_pool._observers[id(old_c)]
+        
+        mock_config.converters = self.configs(folders)[:2]
+        stats = await reload_pool.reload_config(mock_config)
+        
+        assert stats == {'added': 0, 'changed': 0, 'removed': 1, 'unchanged': 2}
+        assert old_c not in reload_pool._converters
+        assert len(reload_pool._observers) == 2
+        assert not observer.is_alive()
+
+
 class TestAsyncConverterPoolSandbox:
     """Test sandboxed execution"""
     
@@ -494,6 +621,70 @@ class TestAsyncConverterPoolQueueProcessing:
         assert "Converter error" in item.error
 
 
+class TestAsyncConverterPoolAdmission:
+    """Test that run() only dequeues what it can start"""
+
+    @pytest.fixture
+    def flooded_pool(self, mock_config, mock_api, temp_watch_dir, mock_converter):
+        pool = AsyncConverterPool(mock_config, mock_api, max_concurrent=3)
+        for i in range(200):
+            pool._queue.put_nowait(
+                data=AsyncConversionItem(temp_watch_dir / f"f{i}.xml", mock_converter),
+                priority=5,
+            )
+        return pool
+
+    async def start(self, pool, process_item):
+        with patch.object(pool, '_load_converters', new=AsyncMock()), \
+             patch.object(pool, '_scan_existing_files', new=AsyncMock()), \
+             patch.object(pool, '_start_watchers', new=AsyncMock()), \
+             patch.object(pool, '_process_item', new=process_item):
+            run_task = asyncio.create_task(pool.run())
+            await asyncio.sleep(0.05)
+        return run_task
+
+    @pytest.mark.asyncio
+    async def test_backlog_stays_pending(self, flooded_pool):
+        """Test that a backlog never becomes more tasks than slots"""
+        release = asyncio.Event()
+
+        async def blocked(item):
+            await release.wait()
+
+        run_task = await self.start(flooded_pool, blocked)
+
+        assert len(flooded_pool._active_tasks) == 3
+        assert flooded_pool._queue.processing_count == 3
+        assert flooded_pool._queue.pending_count == 197
+
+        release.set()
+        await flooded_pool.stop()
+        await asyncio.wait_for(run_task, 2.0)
+
+    @pytest.mark.asyncio
+    async def test_drains_with_bounded_concurrency(self, flooded_pool):
+        """Test that all items are processed with at most max_concurrent tasks"""
+        peak = 0
+
+        async def process(item):
+            nonlocal peak
+            peak = max(peak, len(flooded_pool._active_tasks))
+            await asyncio.sleep(0)
+
+        run_task = await self.start(flooded_pool, process)
+        for _ in range(100):
+            if flooded_pool._queue.pending_count == 0 and not flooded_pool._active_tasks:
+                break
+            await asyncio.sleep(0.01)
+
+        assert flooded_pool._queue.pending_count == 0
+        assert peak <= 3
+
+        await flooded_pool.stop()
+        await asyncio.wait_for(run_task, 2.0)
+        assert flooded_pool._semaphore._value == 3  # Every slot returned
+
+
 class TestAsyncConverterPoolPostProcessing:
     """Test post-processing actions"""
     
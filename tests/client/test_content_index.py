@@ -0,0 +1,227 @@
+"""
+Tests for ContentHashIndex
+
+Tests duplicate suppression in the converter pool and pending queue.
+"""
+
+import asyncio
+import json
+import threading
+import time
+import pytest
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from pywats_client.converters.models import PostProcessAction
+from pywats_client.service.async_converter_pool import (
+    AsyncConverterPool,
+    AsyncConversionItem,
+    AsyncConversionItemState,
+)
+from pywats_client.service.async_pending_queue import AsyncPendingQueue
+from pywats_client.service.content_index import (
+    ContentHashIndex,
+    hash_file,
+    hash_report,
+)
+
+
+@pytest.fixture
+def index(tmp_path):
+    return ContentHashIndex(tmp_path / "content_index.jsonl")
+
+
+class TestHashing:
+    """Hash helpers"""
+
+    def test_report_hash_ignores_id(self):
+        a = hash_report({"id": "1", "sn": "SN1", "root": {"steps": []}})
+        b = hash_report({"root": {"steps": []}, "sn": "SN1", "id": "2"})
+
+        assert a == b
+        assert a != hash_report({"id": "1", "sn": "SN2", "root": {"steps": []}})
+
+    def test_unhashable_report(self):
+        assert hash_report(object()) is None
+
+    def test_file_hash(self, tmp_path):
+        (tmp_path / "a").write_bytes(b"x" * 10)
+        (tmp_path / "b").write_bytes(b"x" * 10)
+
+        assert hash_file(tmp_path / "a") == hash_file(tmp_path / "b")
+
+
+class TestContentHashIndex:
+    """Persistence and retention"""
+
+    def test_lookup_and_stats(self, index):
+        assert index.lookup(ContentHashIndex.SOURCE, "abc") is None
+
+        index.add(ContentHashIndex.SOURCE, "abc", ref="R1")
+        entry = index.lookup(ContentHashIndex.SOURCE, "abc", size=100)
+
+        assert entry.ref == "R1"
+        assert index.lookup(ContentHashIndex.REPORT, "abc") is None
+        stats = index.stats
+        assert (stats.source_duplicates, stats.bytes_saved, stats.entries) == (1, 100, 1)
+
+    def test_persisted_across_instances(self, tmp_path, index):
+        index.add(ContentHashIndex.REPORT, "abc", ref="R1")
+
+        reopened = ContentHashIndex(tmp_path / "content_index.jsonl")
+
+        assert reopened.lookup(ContentHashIndex.REPORT, "abc").ref == "R1"
+
+    def test_retention_window(self, tmp_path):
+        index = ContentHashIndex(tmp_path / "idx.jsonl", retention=timedelta(seconds=10))
+        index.add(ContentHashIndex.SOURCE, "old")
+
+        with patch("pywats_client.service.content_index.time.time", return_value=time.time() + 60):
+            assert index.lookup(ContentHashIndex.SOURCE, "old") is None
+            assert len(ContentHashIndex(tmp_path / "idx.jsonl", retention=timedelta(seconds=10))) == 0
+
+    def test_max_entries(self, tmp_path):
+        index = ContentHashIndex(tmp_path / "idx.jsonl", max_entries=3)
+        for i in range(5):
+            index.add(ContentHashIndex.SOURCE, str(i))
+
+        assert len(index) == 3
+        assert index.lookup(ContentHashIndex.SOURCE, "0") is None
+        assert index.lookup(ContentHashIndex.SOURCE, "4") is not None
+
+    def test_compact_and_torn_line(self, tmp_path, index):
+        for _ in range(3):
+            index.add(ContentHashIndex.SOURCE, "same")
+        with open(index.path, "a") as f:
+            f.write('{"k": "source:tor')
+
+        reopened = ContentHashIndex(index.path)
+        reopened.compact()
+
+        assert len(index.path.read_text().splitlines()) == 1
+        assert reopened.lookup(ContentHashIndex.SOURCE, "same") is not None
+
+    async def test_add_many_async_writes_once_off_the_loop(self, index):
+        threads = []
+        append = index._append
+        index._append = lambda entries: (threads.append((threading.current_thread(), len(entries))),
+                                         append(entries))
+
+        await index.add_many_async([
+            (ContentHashIndex.SOURCE, "abc", "R1"),
+            (ContentHashIndex.REPORT, None, "R1"),  # Unhashable: skipped
+            (ContentHashIndex.REPORT, "def", "R1"),
+        ])
+
+        assert [count for _, count in threads] == [2]
+        assert threads[0][0] is not threading.current_thread()
+        assert index.lookup(ContentHashIndex.REPORT, "def").ref == "R1"
+        assert len(index.path.read_text().splitlines()) == 2
+
+
+@pytest.fixture
+def converter(tmp_path):
+    converter = MagicMock()
+    converter.name = "TestConverter"
+    converter.post_process_action = PostProcessAction.DELETE
+    converter.error_path = None
+    return converter
+
+
+@pytest.fixture
+def pool(index):
+    api = AsyncMock()
+    api.report.submit = AsyncMock(return_value="report-1")
+    return AsyncConverterPool(MagicMock(), api, max_concurrent=4, content_index=index)
+
+
+def drop(tmp_path: Path, name: str, content: str = "<result>1</result>") -> Path:
+    path = tmp_path / name
+    path.write_text(content)
+    return path
+
+
+class TestConverterPoolDuplicates:
+    """AsyncConverterPool._process_item"""
+
+    async def process(self, pool, item, report=None):
+        with patch.object(pool, "_convert_unsandboxed", new=AsyncMock(return_value=report or {"sn": "SN1"})), \
+             patch.object(pool, "_should_use_sandbox", return_value=False):
+            await pool._process_item(item)
+
+    @pytest.mark.asyncio
+    async def test_same_file_skipped_before_conversion(self, pool, tmp_path, converter):
+        first = AsyncConversionItem(drop(tmp_path, "a.xml"), converter)
+        await self.process(pool, first)
+        second = AsyncConversionItem(drop(tmp_path, "a.xml"), converter)
+
+        with patch.object(pool, "_convert_unsandboxed", new=AsyncMock()) as convert:
+            await pool._process_item(second)
+
+        convert.assert_not_called()
+        assert second.state == AsyncConversionItemState.COMPLETED
+        assert second.duplicate_of == "report-1"
+        assert not second.file_path.exists()  # Post-processed like any other file
+        assert pool.stats["duplicates_skipped"] == 1
+        assert pool.stats["duplicate_bytes_saved"] == len("<result>1</result>")
+        pool.api.report.submit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_same_report_skipped_before_upload(self, pool, tmp_path, converter):
+        await self.process(pool, AsyncConversionItem(drop(tmp_path, "a.xml", "v1"), converter))
+        # Different bytes (e.g. rewritten timestamp in a comment), same report
+        second = AsyncConversionItem(drop(tmp_path, "b.xml", "v2"), converter)
+
+        await self.process(pool, second)
+
+        assert second.duplicate_of == "report-1"
+        assert pool.api.report.submit.await_count == 1
+        assert pool.stats["content_index"]["report_duplicates"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_drops_upload_once(self, pool, tmp_path, converter):
+        async def slow_submit(report):
+            await asyncio.sleep(0.05)
+            return "report-1"
+        pool.api.report.submit = slow_submit
+        items = []
+        for i in range(3):
+            (tmp_path / str(i)).mkdir()
+            items.append(AsyncConversionItem(drop(tmp_path / str(i), "a.xml"), converter))
+
+        await asyncio.gather(*(self.process(pool, item) for item in items))
+
+        assert sorted(item.duplicate_of is None for item in items) == [False, False, True]
+
+    @pytest.mark.asyncio
+    async def test_failed_upload_not_recorded(self, pool, tmp_path, converter):
+        pool.api.report.submit = AsyncMock(side_effect=Exception("API error"))
+        await self.process(pool, AsyncConversionItem(drop(tmp_path, "a.xml"), converter))
+
+        pool.api.report.submit = AsyncMock(return_value="report-2")
+        retry = AsyncConversionItem(drop(tmp_path, "a.xml"), converter)
+        await self.process(pool, retry)
+
+        assert retry.duplicate_of is None
+        pool.api.report.submit.assert_awaited_once()
+
+
+class TestPendingQueueDuplicates:
+    """AsyncPendingQueue._submit_report"""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_report_not_uploaded(self, tmp_path, index):
+        api = AsyncMock()
+        api.report.submit_raw = AsyncMock(return_value="report-1")
+        queue = AsyncPendingQueue(api, tmp_path / "reports", content_index=index)
+        for name, report_id in (("a", "id-1"), ("b", "id-2")):
+            (queue.reports_dir / f"{name}.queued").write_text(json.dumps({"id": report_id, "sn": "SN1"}))
+
+        await queue._submit_report(queue.reports_dir / "a.queued")
+        await queue._submit_report(queue.reports_dir / "b.queued")
+
+        api.report.submit_raw.assert_awaited_once()
+        assert (queue.reports_dir / "b.completed").exists()
+        assert queue.stats["duplicates_skipped"] == 1
+        assert queue.stats["content_index"]["report_duplicates"] == 1
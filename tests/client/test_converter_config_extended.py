@@ -203,6 +203,35 @@ class TestConverterConfigPriority:
             assert config.priority == priority
 
 
+class TestConverterConfigScheduling:
+    """Test fair scheduling settings"""
+    
+    def test_scheduling_defaults(self):
+        """Test defaults: equal share, no caps"""
+        config = ConverterConfig(name="Test", module_path="test.module")
+        
+        assert config.weight == 1.0
+        assert config.max_in_flight == 0
+        assert config.max_queue_depth == 0
+    
+    def test_invalid_scheduling_settings(self):
+        """Test non-positive weight and negative limits are rejected"""
+        config = ConverterConfig(
+            name="Test",
+            module_path="test.module",
+            watch_folder="/tmp/watch",
+            weight=0,
+            max_in_flight=-1,
+            max_queue_depth=-1
+        )
+        
+        errors = config.validate()
+        
+        assert "weight must be positive" in errors
+        assert "max_in_flight must be non-negative" in errors
+        assert "max_queue_depth must be non-negative" in errors
+
+
 class TestConverterConfigFilePatterns:
     """Test file_patterns configuration"""
     
@@ -0,0 +1,236 @@
+"""
+Tests for FairQueue
+
+Tests weighted fair scheduling across flows, per-flow limits and wait-time
+histograms, and their use in the converter pool.
+"""
+
+import asyncio
+import pytest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+from pywats_client.exceptions import QueueFullError
+from pywats_client.queue import FairQueue
+from pywats_client.service.async_converter_pool import AsyncConverterPool
+from pywats_client.service.health_server import HealthRequestHandler
+
+
+def fill(queue: FairQueue, flow: str, count: int, priority: int = 5) -> None:
+    for i in range(count):
+        queue.add(f"{flow}{i}", priority=priority, metadata={"flow": flow})
+
+
+def drain(queue: FairQueue, count: int = None) -> list:
+    """Dequeue (and finish) items, returning their data in order"""
+    order = []
+    while count is None or len(order) < count:
+        item = queue.get_next()
+        if item is None:
+            break
+        order.append(item.data)
+        item.mark_completed()
+        queue.update(item)
+    return order
+
+
+class TestFairQueueScheduling:
+    """Test dequeue order"""
+
+    def test_backlog_does_not_starve_other_flows(self):
+        """Flows of equal priority alternate regardless of backlog size"""
+        queue = FairQueue()
+        fill(queue, "chatty", 1000)
+        fill(queue, "quiet", 3)
+
+        order = drain(queue, 6)
+
+        assert order == ["chatty0", "quiet0", "chatty1", "quiet1", "chatty2", "quiet2"]
+
+    def test_weights_share_dequeues(self):
+        """A flow with weight 3 gets three dequeues per one of weight 1"""
+        queue = FairQueue()
+        queue.configure_flow("a", weight=3.0)
+        fill(queue, "a", 100)
+        fill(queue, "b", 100)
+
+        order = drain(queue, 40)
+
+        assert sum(1 for data in order if data.startswith("a")) == 30
+
+    def test_priority_beats_fairness(self):
+        """Better priority is served first, as in MemoryQueue"""
+        queue = FairQueue()
+        fill(queue, "a", 3, priority=5)
+        fill(queue, "b", 2, priority=1)
+
+        assert drain(queue) == ["b0", "b1", "a0", "a1", "a2"]
+
+    def test_idle_flow_does_not_bank_credit(self):
+        """A flow that was empty re-enters at the current virtual time"""
+        queue = FairQueue()
+        fill(queue, "busy", 100)
+        fill(queue, "late", 1)
+        drain(queue, 50)
+
+        fill(queue, "late", 10)
+        order = drain(queue, 6)
+
+        assert sum(1 for data in order if data.startswith("late")) == 3
+
+
+class TestFairQueueLimits:
+    """Test per-flow in-flight caps and depth limits"""
+
+    def test_in_flight_cap(self):
+        """A flow at its cap is skipped until an item finishes"""
+        queue = FairQueue()
+        queue.configure_flow("a", max_in_flight=2)
+        fill(queue, "a", 5)
+
+        first, second = queue.get_next(), queue.get_next()
+        for item in (first, second):
+            item.mark_processing()
+            queue.update(item)
+        assert queue.get_next() is None
+
+        first.mark_completed()
+        queue.update(first)
+        assert queue.get_next().data == "a2"
+
+    def test_depth_limit(self):
+        """add() rejects items beyond the flow's depth limit"""
+        queue = FairQueue()
+        queue.configure_flow("a", max_depth=2)
+        fill(queue, "a", 2)
+
+        with pytest.raises(QueueFullError):
+            queue.add("a2", metadata={"flow": "a"})
+        fill(queue, "b", 5)  # Other flows are unaffected
+
+        assert queue.fill_ratio("a") == 1.0
+        assert queue.flow_stats()["a"]["rejected"] == 1
+        drain(queue, 1)
+        assert queue.fill_ratio("a") == 0.5
+
+    def test_duplicate_id_is_queued_once(self):
+        """Re-adding a pending or in-flight id returns the existing item"""
+        queue = FairQueue()
+        first = queue.add("x", item_id="file.csv", metadata={"flow": "a"})
+
+        assert queue.add("x2", item_id="file.csv", metadata={"flow": "a"}) is first
+        item = queue.get_next()
+        assert queue.add("x3", item_id="file.csv", metadata={"flow": "a"}) is first
+
+        item.mark_completed()
+        queue.update(item)
+        assert queue.add("x4", item_id="file.csv", metadata={"flow": "a"}).data == "x4"
+
+    def test_retry_requeues_in_flow(self):
+        """An item updated back to pending is queued again"""
+        queue = FairQueue()
+        fill(queue, "a", 1)
+        item = queue.get_next()
+        item.mark_failed("boom")
+        queue.update(item)
+
+        assert queue.retry_failed() == 1
+        assert queue.get_next() is item
+        assert queue.flow_stats()["a"]["dispatched"] == 2
+
+    def test_remove_and_clear(self):
+        """Removed items leave the flow's counts"""
+        queue = FairQueue()
+        fill(queue, "a", 3)
+        item = queue.get_next()
+        queue.remove(item.id)
+
+        stats = queue.flow_stats()["a"]
+        assert (stats["pending"], stats["in_flight"]) == (2, 0)
+        assert queue.clear() == 2
+        assert queue.get_next() is None
+        assert queue.flow_stats()["a"]["pending"] == 0
+
+
+class TestFairQueueStats:
+    """Test wait-time histograms"""
+
+    def test_wait_histogram(self):
+        """Every dequeue is recorded in its flow's cumulative histogram"""
+        queue = FairQueue(wait_buckets=(1.0, 10.0))
+        fill(queue, "a", 3)
+        drain(queue)
+
+        wait = queue.flow_stats()["a"]["wait_seconds"]
+
+        assert wait["count"] == 3
+        assert wait["buckets"] == {"1": 3, "10": 3, "+Inf": 3}
+        assert wait["sum"] < 1.0
+
+
+class TestConverterPoolFairScheduling:
+    """Test fair scheduling in AsyncConverterPool"""
+
+    @pytest.fixture
+    def pool(self, tmp_path):
+        return AsyncConverterPool(MagicMock(), AsyncMock(), max_concurrent=4)
+
+    @staticmethod
+    def make_converter(name: str, folder: Path) -> MagicMock:
+        folder.mkdir()
+        converter = MagicMock()
+        converter.name = name
+        converter.priority = 5
+        converter.watch_path = folder
+        converter.watch_recursive = False
+        converter.supported_extensions = [".csv"]
+        converter.matches_file = lambda path: path.suffix == ".csv"
+        return converter
+
+    @pytest.mark.asyncio
+    async def test_quiet_converter_not_starved(self, pool, tmp_path):
+        """A converter with a large backlog shares slots with the others"""
+        chatty = self.make_converter("Chatty", tmp_path / "chatty")
+        quiet = self.make_converter("Quiet", tmp_path / "quiet")
+        for i in range(50):
+            pool._on_file_created(chatty.watch_path / f"{i}.csv", chatty)
+        pool._on_file_created(quiet.watch_path / "q.csv", quiet)
+
+        batch = await pool._queue.get_batch(max_items=4, timeout=0)
+
+        assert [item.data.converter.name for item in batch].count("Quiet") == 1
+        assert pool.converter_queues["Quiet"]["wait_seconds"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_full_queue_defers_and_rescans(self, pool, tmp_path):
+        """Files beyond max_queue_depth wait on disk and are rescanned on drain"""
+        converter = self.make_converter("Line1", tmp_path / "line1")
+        pool._converters = [converter]
+        pool._configure_flow(converter, {"max_queue_depth": 2})
+        for i in range(4):
+            (converter.watch_path / f"{i}.csv").write_text("data")
+
+        stats = await pool._scan_existing_files()
+        assert (stats["queued"], stats["deferred"]) == (2, 2)
+        assert "Line1" in pool._backlogged
+
+        # Process the queued files; a completion triggers a rescan of the folder
+        pool._running = True
+        pool._process_item = AsyncMock()
+        for queue_item in await pool._queue.get_batch(max_items=2, timeout=0):
+            await pool._process_admitted(queue_item.data, queue_item)
+        await asyncio.sleep(0.05)
+
+        assert "Line1" not in pool._backlogged
+        assert pool.converter_queues["Line1"]["pending"] == 2
+
+    def test_health_metrics_summary(self, pool):
+        """Per-converter queue state is published in the metrics summary"""
+        pool._fair_queue.configure_flow("Line1", weight=2.0)
+        handler = HealthRequestHandler.__new__(HealthRequestHandler)
+        handler.health_server = MagicMock(spec=["_converter_pool"])
+        handler.health_server._converter_pool = pool
+
+        summary = handler._collect_metrics_summary()
+
+        assert summary["converter_queues"]["Line1"]["weight"] == 2.0
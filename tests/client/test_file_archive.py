@@ -0,0 +1,304 @@
+"""
+Tests for FileArchive
+
+Tests compressed archiving, retrieval and retention, and compaction of the
+converter pool's Done/Error folders and the pending queue's finished files.
+"""
+
+import asyncio
+import json
+import os
+import time
+import zipfile
+import pytest
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+from pywats_client.converters.models import PostProcessAction
+from pywats_client.service.async_converter_pool import AsyncConverterPool, AsyncConversionItem
+from pywats_client.service.async_pending_queue import AsyncPendingQueue
+from pywats_client.service.content_index import ContentHashIndex, hash_file
+from pywats_client.service.file_archive import FileArchive
+
+DAY = 86400
+
+
+def drop(folder: Path, name: str, content: str = "data", age_days: float = 0) -> Path:
+    folder.mkdir(parents=True, exist_ok=True)
+    path = folder / name
+    path.write_text(content)
+    if age_days:
+        stamp = time.time() - age_days * DAY
+        os.utime(path, (stamp, stamp))
+    return path
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return FileArchive(tmp_path / "archive")
+
+
+class TestFileArchive:
+    """Archiving and retrieval"""
+
+    def test_files_rolled_into_day_segment(self, archive, tmp_path):
+        """Files of one day and converter share a compressed segment"""
+        done = tmp_path / "done"
+        paths = [drop(done, f"r{i}.csv", "x" * 10_000, age_days=2) for i in range(3)]
+
+        entries = archive.archive_files(paths, "Line 1")
+
+        assert not any(path.exists() for path in paths)
+        assert {entry.segment for entry in entries} == {entries[0].segment}
+        assert entries[0].segment.endswith("/Line_1.0.zip")
+        with zipfile.ZipFile(archive.root / entries[0].segment) as zf:
+            assert sorted(zf.namelist()) == ["done/r0.csv", "done/r1.csv", "done/r2.csv"]
+        stats = archive.stats
+        assert stats.files_archived == 3
+        assert stats.bytes_stored < stats.bytes_archived
+
+    def test_find_and_restore(self, archive, tmp_path):
+        """A single file is found by name and restored for reprocessing"""
+        source = drop(tmp_path / "done", "r1.csv", "v1", age_days=1)
+        mtime = source.stat().st_mtime
+        archive.archive_file(source, "Line1")
+        archive.archive_file(drop(tmp_path / "done", "r1.csv", "v2"), "Line1", FileArchive.ERROR)
+
+        newest, oldest = archive.find("r1.csv")
+        restored = archive.restore(oldest, tmp_path / "watch")
+
+        assert archive.read(newest) == b"v2"
+        assert restored == tmp_path / "watch" / "r1.csv"
+        assert restored.read_text() == "v1"
+        assert restored.stat().st_mtime == pytest.approx(mtime, abs=0.01)
+        assert archive.find("r1.csv", group="Other") == []
+
+    def test_same_name_gets_unique_member(self, archive, tmp_path):
+        """Re-archiving a name into the same segment keeps both copies"""
+        archive.archive_file(drop(tmp_path, "r.csv", "a"), "Line1")
+        archive.archive_file(drop(tmp_path, "r.csv", "b"), "Line1")
+
+        members = sorted(entry.member for entry in archive.find("r.csv"))
+
+        assert members == ["done/r.csv", "done/r~1.csv"]
+
+    def test_segments_rotate_at_size(self, tmp_path):
+        """A new segment is started once the current one is full"""
+        archive = FileArchive(tmp_path / "archive", segment_size=500)
+        paths = [drop(tmp_path / "done", f"{i}.bin") for i in range(3)]
+        for path in paths:
+            path.write_bytes(os.urandom(800))
+
+        entries = archive.archive_files(paths, "Line1")
+
+        assert len({entry.segment for entry in entries}) == 3
+
+    def test_index_survives_restart(self, archive, tmp_path):
+        """The index is replayed on start-up"""
+        archive.archive_file(drop(tmp_path, "r.csv"), "Line1")
+
+        reopened = FileArchive(archive.root)
+
+        assert len(reopened) == 1
+        assert reopened.read(reopened.find("r.csv")[0]) == b"data"
+
+    def test_segment_replaced_not_modified(self, archive, tmp_path):
+        """Appending writes a new segment file and leaves no temp copy behind"""
+        first = archive.archive_file(drop(tmp_path, "a.csv"), "Line1")
+        segment = archive.root / first.segment
+        inode = segment.stat().st_ino
+
+        archive.archive_file(drop(tmp_path, "b.csv"), "Line1")
+
+        assert segment.stat().st_ino != inode
+        assert [p.name for p in segment.parent.iterdir()] == [segment.name]
+        with zipfile.ZipFile(segment) as zf:
+            assert sorted(zf.namelist()) == ["done/a.csv", "done/b.csv"]
+
+    def test_staged_files_archived_in_batch(self, archive, tmp_path):
+        """Staged files keep their name and are archived by compact_staged"""
+        staged = archive.stage_file(drop(tmp_path, "r.csv", age_days=2), "Line 1/A")
+
+        assert archive.find("r.csv") == []
+        assert archive.compact_staged() == 1
+        assert not staged.exists()
+        entry = archive.find("r.csv")[0]
+        assert (entry.group, entry.member) == ("Line 1/A", "done/r.csv")
+        assert archive.compact_staged() == 0
+
+    def test_stats_track_segments_without_rescan(self, tmp_path):
+        """Segment count and size are kept current on write and delete"""
+        archive = FileArchive(tmp_path / "archive", retention=timedelta(days=7))
+        archive.archive_file(drop(tmp_path, "old.csv", age_days=3), "Line1")
+        archive.archive_file(drop(tmp_path, "new.csv"), "Line1")
+        on_disk = sum(p.stat().st_size for p in archive.root.glob("*/*.zip"))
+
+        stats = archive.stats
+        assert (stats.segments, stats.total_bytes) == (2, on_disk)
+        assert FileArchive(archive.root).stats.total_bytes == on_disk
+
+        archive.enforce_limits(now=time.time() + 5 * DAY)
+        stats = archive.stats
+        assert (stats.segments, stats.total_bytes) == (1, sum(p.stat().st_size for p in archive.root.glob("*/*.zip")))
+
+    def test_compact_directory_leaves_recent_files(self, archive, tmp_path):
+        """Only files older than min_age are archived"""
+        done = tmp_path / "done"
+        drop(done, "old.csv", age_days=2)
+        drop(done, "new.csv")
+
+        count = archive.compact_directory(done, "Line1", min_age=timedelta(days=1))
+
+        assert count == 1
+        assert [path.name for path in done.iterdir()] == ["new.csv"]
+        assert archive.compact_directory(tmp_path / "missing", "Line1") == 0
+
+
+class TestFileArchiveRetention:
+    """Retention window and size quota"""
+
+    def test_expired_days_removed(self, tmp_path):
+        archive = FileArchive(tmp_path / "archive", retention=timedelta(days=7))
+        archive.archive_file(drop(tmp_path, "old.csv", age_days=3), "Line1")
+        archive.archive_file(drop(tmp_path, "new.csv"), "Line1")
+
+        assert archive.enforce_limits(now=time.time() + 5 * DAY) == 1
+        assert archive.find("old.csv") == []
+        assert len(archive.find("new.csv")) == 1
+        assert len(FileArchive(archive.root)) == 1  # Index was rewritten
+        assert archive.stats.segments_expired == 1
+
+    def test_quota_evicts_oldest(self, tmp_path):
+        archive = FileArchive(tmp_path / "archive", retention=None, max_bytes=1500)
+        for age in (3, 2, 1):
+            path = drop(tmp_path, f"{age}.bin")
+            path.write_bytes(os.urandom(1000))
+            stamp = time.time() - age * DAY
+            os.utime(path, (stamp, stamp))
+            archive.archive_file(path, "Line1")
+
+        assert archive.enforce_limits() == 2
+        assert [entry.name for entry in archive.find("1.bin")] == ["1.bin"]
+        assert archive.stats.total_bytes <= 1500
+
+
+class TestArchiveCompaction:
+    """Use of the archive by the converter pool and pending queue"""
+
+    @pytest.fixture
+    def converter(self, tmp_path):
+        converter = MagicMock()
+        converter.name = "Line1"
+        converter.watch_path = tmp_path / "watch"
+        converter.archive_path = tmp_path / "done"
+        converter.error_path = tmp_path / "error"
+        converter.post_process_action = PostProcessAction.ZIP
+        return converter
+
+    @pytest.fixture
+    def pool(self, archive):
+        return AsyncConverterPool(MagicMock(), AsyncMock(), archive=archive,
+                                  archive_min_age=timedelta(hours=1))
+
+    @pytest.mark.asyncio
+    async def test_zip_action_stages_for_archive(self, pool, archive, tmp_path, converter):
+        """The ZIP post-process action stages the file; compaction archives it"""
+        source = drop(converter.watch_path, "r.csv")
+
+        await pool._post_process(AsyncConversionItem(source, converter))
+
+        assert not source.exists()
+        assert archive.find("r.csv") == []
+        await pool._compact_archive()
+        assert archive.find("r.csv")[0].group == "Line1"
+
+    @pytest.mark.asyncio
+    async def test_run_compacts_once_queue_drained(self, pool, archive, tmp_path, converter):
+        """Finished items stay in the queue, yet the idle pool still compacts"""
+        pool.ARCHIVE_COMPACT_INTERVAL = 0
+        pool._converters = [converter]
+        pool._load_converters = AsyncMock()
+        pool._scan_existing_files = AsyncMock(return_value={})
+        pool._start_watchers = AsyncMock()
+        pool._process_item = AsyncMock(side_effect=pool._post_process)
+        source = drop(converter.watch_path, "r.csv")
+        pool._queue.put_nowait(
+            data=AsyncConversionItem(source, converter), priority=5,
+            item_id=str(source), metadata={'file': str(source), 'converter': converter.name},
+        )
+
+        task = asyncio.create_task(pool.run())
+        try:
+            for _ in range(50):
+                if archive.find("r.csv"):
+                    break
+                await asyncio.sleep(0.1)
+        finally:
+            await pool.stop()
+            await asyncio.wait_for(task, 5)
+
+        assert pool._process_item.await_count == 1
+        assert archive.find("r.csv")[0].group == "Line1"
+
+    @pytest.mark.asyncio
+    async def test_idle_compaction_and_restore(self, pool, archive, tmp_path, converter):
+        """Old Done/Error files are compacted and can be restored to the watch folder"""
+        pool._converters = [converter]
+        drop(converter.archive_path, "done.csv", age_days=1)
+        drop(converter.error_path, "bad.csv", age_days=1)
+        drop(converter.archive_path, "recent.csv")
+
+        await pool._compact_archive()
+        drop(converter.archive_path, "later.csv", age_days=1)
+        await pool._compact_archive()  # Rate-limited
+
+        assert [entry.category for entry in archive.find("bad.csv")] == [FileArchive.ERROR]
+        assert sorted(p.name for p in converter.archive_path.iterdir()) == ["later.csv", "recent.csv"]
+        assert pool.stats["archive"]["files_archived"] == 2
+
+        restored = await pool.restore_archived("done.csv")
+        assert restored == converter.watch_path / "done.csv"
+        assert await pool.restore_archived("missing.csv") is None
+
+    @pytest.mark.asyncio
+    async def test_restore_drops_content_hashes(self, archive, tmp_path, converter):
+        """A restored file is processed again instead of skipped as a duplicate"""
+        index = ContentHashIndex(tmp_path / "content_index.jsonl")
+        pool = AsyncConverterPool(MagicMock(), AsyncMock(), archive=archive,
+                                  archive_min_age=timedelta(hours=1), content_index=index)
+        pool._converters = [converter]
+        source = drop(converter.archive_path, "done.csv", "result 1", age_days=1)
+        digest = hash_file(source)
+        index.add_many([(ContentHashIndex.SOURCE, digest, "R1"),
+                        (ContentHashIndex.REPORT, "report-hash", "R1"),
+                        (ContentHashIndex.SOURCE, "other", "R2")])
+        await pool._compact_archive()
+
+        restored = await pool.restore_archived("done.csv")
+
+        assert hash_file(restored) == digest
+        assert index.lookup(ContentHashIndex.SOURCE, digest) is None
+        assert index.lookup(ContentHashIndex.REPORT, "report-hash") is None
+        assert index.lookup(ContentHashIndex.SOURCE, "other") is not None
+        reopened = ContentHashIndex(index.path)
+        assert reopened.lookup(ContentHashIndex.SOURCE, digest) is None
+        assert len(reopened) == 1
+
+    @pytest.mark.asyncio
+    async def test_pending_queue_archives_finished_reports(self, archive, tmp_path):
+        """Completed reports and errors past their last retry are archived"""
+        queue = AsyncPendingQueue(AsyncMock(), tmp_path / "reports", archive=archive,
+                                  archive_min_age=timedelta(hours=1))
+        reports = queue.reports_dir
+        drop(reports, "a.completed", age_days=1)
+        drop(reports, "b.completed")
+        for name, attempts in (("c", queue.MAX_ERROR_ATTEMPTS), ("d", 1)):
+            drop(reports, f"{name}.error", age_days=1)
+            drop(reports, f"{name}.error.info", json.dumps({"attempts": attempts}), age_days=1)
+
+        await queue._compact_archive()
+
+        assert sorted(p.name for p in reports.iterdir()) == ["b.completed", "d.error", "d.error.info"]
+        assert archive.find("a.completed")[0].category == FileArchive.COMPLETED
+        assert archive.find("c.error.info")[0].group == AsyncPendingQueue.ARCHIVE_GROUP
@@ -0,0 +1,161 @@
+"""
+Tests for the service instance registry and registry-based discovery.
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+from pywats_client.service.async_ipc_client import (
+    ServiceDiscoveryAsync,
+    discover_services_async,
+)
+from pywats_client.service.instance_registry import InstanceRecord, InstanceRegistry
+
+
+def make_record(instance_id="default", pid=None, heartbeat=None, **kwargs):
+    return InstanceRecord(
+        instance_id=instance_id,
+        pid=pid if pid is not None else os.getpid(),
+        socket_name=f"pyWATS_Service_{instance_id}",
+        heartbeat=time.time() if heartbeat is None else heartbeat,
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return InstanceRegistry(tmp_path / "registry")
+
+
+@pytest.fixture
+def dead_pid():
+    """PID of a process that has exited."""
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+class TestInstanceRegistry:
+    """Tests for InstanceRegistry"""
+
+    def test_publish_and_read(self, registry):
+        """Published records are returned as live"""
+        registry.publish(make_record("a", summary={"pending_count": 3}))
+        registry.publish(make_record("b"))
+
+        live = {r.instance_id: r for r in registry.live()}
+
+        assert set(live) == {"a", "b"}
+        assert live["a"].summary == {"pending_count": 3}
+        assert registry.get("b").socket_name == "pyWATS_Service_b"
+        assert registry.get("missing") is None
+
+    def test_stale_heartbeat_is_dead(self, registry):
+        """Records older than stale_after intervals are not live"""
+        registry.publish(make_record("old", heartbeat=time.time() - 60, interval=5.0))
+        registry.publish(make_record("new"))
+
+        assert [r.instance_id for r in registry.live()] == ["new"]
+        assert registry.prune() == 1
+        assert [r.instance_id for r in registry.read_all()] == ["new"]
+
+    @pytest.mark.skipif(os.name == "nt", reason="PID liveness is POSIX-only")
+    def test_dead_process_is_dead(self, registry, dead_pid):
+        """A fresh heartbeat from an exited process is not live"""
+        registry.publish(make_record("crashed", pid=dead_pid))
+
+        assert registry.live() == []
+
+    def test_remove_only_own_record(self, registry):
+        """remove(pid=...) leaves a successor's record alone"""
+        registry.publish(make_record("a", pid=os.getpid()))
+
+        assert not registry.remove("a", pid=os.getpid() + 1)
+        assert registry.remove("a", pid=os.getpid())
+        assert registry.live() == []
+
+    def test_unchanged_directory_is_not_reparsed(self, registry):
+        """Reads re-parse only records whose files changed"""
+        registry.publish(make_record("a"))
+        registry.publish(make_record("b"))
+        registry.read_all()
+        registry._scanned_ns = time.time_ns() + 10**9  # Directory mtime has settled
+
+        with patch.object(InstanceRegistry, "_load", wraps=InstanceRegistry._load) as load:
+            registry.read_all()
+            assert load.call_count == 0
+
+            registry.publish(make_record("a", summary={"pending_count": 1}))
+            registry.read_all()
+            assert load.call_count == 1
+
+    def test_ignores_corrupt_records(self, registry):
+        """Unreadable files are skipped"""
+        registry.publish(make_record("good"))
+        (registry.directory / "bad.json").write_text("{not json")
+
+        assert [r.instance_id for r in registry.live()] == ["good"]
+
+    def test_missing_directory(self, tmp_path):
+        """A registry that was never written is empty"""
+        assert InstanceRegistry(tmp_path / "none").live() == []
+
+
+class TestRegistryDiscovery:
+    """Tests for registry-based service discovery"""
+
+    async def test_discover_reads_registry_without_connecting(self, registry):
+        """Discovery returns live records and opens no IPC connections"""
+        registry.publish(make_record("a", health_port=8080, summary={"status": "Running", "pending_count": 2}))
+
+        with patch("pywats_client.service.async_ipc_client.AsyncIPCClient") as client_cls:
+            discovered = await discover_services_async(registry=registry)
+
+        client_cls.assert_not_called()
+        assert len(discovered) == 1
+        info = discovered[0]
+        assert info.instance_id == "a"
+        assert info.connected
+        assert info.pid == os.getpid()
+        assert info.health_port == 8080
+        assert info.status["status"] == "Running"
+        assert info.status["pending_count"] == 2
+
+    async def test_discover_filters_instance_ids(self, registry):
+        """Only requested instances are returned"""
+        registry.publish(make_record("a"))
+        registry.publish(make_record("b"))
+
+        discovered = await discover_services_async(["b", "c"], registry=registry)
+
+        assert [i.instance_id for i in discovered] == ["b"]
+
+    async def test_discovery_notifies_on_changes(self, registry):
+        """Callbacks fire when instances appear and when they go stale"""
+        updates = []
+        discovery = ServiceDiscoveryAsync(poll_interval=0.02, registry=registry)
+        discovery.add_callback(lambda infos: updates.append(sorted(i.instance_id for i in infos)))
+
+        await discovery.start()
+        try:
+            registry.publish(make_record("a", interval=0.05))
+            for _ in range(100):
+                if updates and updates[-1] == ["a"]:
+                    break
+                await asyncio.sleep(0.02)
+            assert updates[-1] == ["a"]
+
+            # No more heartbeats: the record goes stale after 3 intervals
+            for _ in range(100):
+                if updates[-1] == []:
+                    break
+                await asyncio.sleep(0.02)
+            assert updates[-1] == []
+        finally:
+            await discovery.stop()
@@ -4,14 +4,17 @@ Tests for pywats_client.io module
 Tests file I/O utilities for attachments.
 """
 
+import io
 import pytest
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 import tempfile
 import os
 
+from pywats.domains.report import WSJFDocument
 from pywats_client.io import (
     AttachmentIO,
+    WSJFDocumentIO,
     FileInfo,
     load_attachment,
     save_attachment,
@@ -420,6 +423,37 @@ class TestConvenienceFunctions:
         assert output_path.read_bytes() == b"content"
 
 
+class TestWSJFDocumentIO:
+    """Tests for WSJFDocumentIO save and from_file."""
+    
+    def test_save_for_pending_queue(self, tmp_path):
+        """Test saving a document atomically and opening it again."""
+        data = b'{"pn":"PCBA-1","sn":"SN-1"}'
+        document = WSJFDocument(io.BytesIO(b"xx" + data), len(data), start=2)
+        
+        path = WSJFDocumentIO.save(document, tmp_path / "reports" / "SN-1.queued")
+        
+        assert path.read_bytes() == data
+        assert list(path.parent.iterdir()) == [path]
+        with WSJFDocumentIO.from_file(path) as queued:
+            assert queued.size == len(data)
+            assert queued.to_dict() == {"pn": "PCBA-1", "sn": "SN-1"}
+    
+    def test_save_truncated_document_leaves_no_file(self, tmp_path):
+        """Test that a failed save removes its temp file."""
+        document = WSJFDocument(io.BytesIO(b"{}"), 10)
+        
+        with pytest.raises(IOError):
+            WSJFDocumentIO.save(document, tmp_path / "SN-1.queued")
+        
+        assert list(tmp_path.iterdir()) == []
+    
+    def test_from_file_not_found(self, tmp_path):
+        """Test opening a missing file."""
+        with pytest.raises(FileNotFoundError):
+            WSJFDocumentIO.from_file(tmp_path / "missing.queued")
+
+
 class TestModuleExports:
     """Tests for module exports."""
     
@@ -429,6 +463,7 @@ class TestModuleExports:
         
         expected = [
             "AttachmentIO",
+            "WSJFDocumentIO",
             "FileInfo",
             "load_attachment",
             "save_attachment",
@@ -0,0 +1,162 @@
+"""
+Tests for the file-backed journals and stores in pywats_client.core.persistence
+
+The pywats helpers they plug into are tested in memory under tests/domains;
+these tests cover durability across a simulated crash and restart.
+"""
+
+import asyncio
+import json
+import threading
+from typing import List, Set
+
+import pytest
+
+from pywats.domains.asset import AssetCountAggregator
+from pywats.domains.production import SerialNumberReservoir
+from pywats_client.core.persistence import FileCountJournal, FileStateStore
+
+
+class FakeCountServer:
+    """Records update_count calls; serials in ``failing`` are rejected."""
+
+    def __init__(self) -> None:
+        self.calls: List[dict] = []
+        self.failing: Set[str] = set()
+        self.totals = {}
+
+    async def update_count(self, asset_id=None, serial_number=None, total_count=None,
+                           increment_by=None, increment_children=False) -> bool:
+        if serial_number in self.failing:
+            raise ConnectionError("server unavailable")
+        self.calls.append({"serial_number": serial_number, "increment_by": increment_by})
+        self.totals[serial_number] = self.totals.get(serial_number, 0) + increment_by
+        return True
+
+
+class TestFileCountJournal:
+    """Write-ahead journal for AssetCountAggregator"""
+
+    async def test_failed_totals_are_retried(self, tmp_path):
+        server = FakeCountServer()
+        server.failing.add("FIX-2")
+        journal = tmp_path / "counts.journal"
+        aggregator = AssetCountAggregator(server.update_count, FileCountJournal(journal), flush_interval=60)
+
+        await aggregator.add(serial_number="FIX-1")
+        await aggregator.add(serial_number="FIX-2", amount=4)
+        assert await aggregator.flush() is False
+        assert aggregator.pending == {(None, "FIX-2", False): 4}
+
+        server.failing.clear()
+        await aggregator.add(serial_number="FIX-2")
+        assert await aggregator.flush() is True
+
+        assert server.totals == {"FIX-1": 1, "FIX-2": 5}
+        assert list(tmp_path.iterdir()) == []
+        await aggregator.close()
+
+    async def test_unsent_increments_survive_crash(self, tmp_path):
+        journal = tmp_path / "counts.journal"
+        crashed = AssetCountAggregator(FakeCountServer().update_count, FileCountJournal(journal), flush_interval=60)
+        for _ in range(7):
+            await crashed.add(serial_number="FIX-1")
+        crashed._timer.cancel()  # Simulated crash: no close()
+        crashed.journal._close()
+
+        server = FakeCountServer()
+        restarted = AssetCountAggregator(server.update_count, FileCountJournal(journal), flush_interval=60)
+        await restarted.recover()
+        assert restarted.pending == {(None, "FIX-1", False): 7}
+        await restarted.close()
+
+        assert server.totals == {"FIX-1": 7}
+
+    async def test_crash_during_flush_replays_only_unacknowledged(self, tmp_path):
+        journal = tmp_path / "counts.journal"
+        server = FakeCountServer()
+        server.failing.add("FIX-2")
+        crashed = AssetCountAggregator(server.update_count, FileCountJournal(journal), flush_interval=60)
+        await crashed.add(serial_number="FIX-1", amount=2)
+        await crashed.add(serial_number="FIX-2", amount=3)
+        await crashed.flush()  # FIX-1 acknowledged, FIX-2 left in the sealed segment
+        await crashed.add(serial_number="FIX-3")
+        crashed._timer.cancel()
+        crashed.journal._close()
+
+        restarted = AssetCountAggregator(server.update_count, FileCountJournal(journal), flush_interval=60)
+        await restarted.recover()
+
+        assert restarted.pending == {(None, "FIX-2", False): 3, (None, "FIX-3", False): 1}
+        server.failing.clear()
+        await restarted.close()
+        assert server.totals == {"FIX-1": 2, "FIX-2": 3, "FIX-3": 1}
+
+    async def test_torn_tail_line_is_ignored(self, tmp_path):
+        journal = tmp_path / "counts.journal"
+        journal.write_text('{"a":null,"s":"FIX-1","c":false,"n":1}\n{"a":null,"s":"FIX-1","c"')
+
+        aggregator = AssetCountAggregator(FakeCountServer().update_count, FileCountJournal(journal))
+        await aggregator.recover()
+
+        assert aggregator.pending == {(None, "FIX-1", False): 1}
+
+    async def test_writes_run_off_the_event_loop(self, tmp_path):
+        journal = FileCountJournal(tmp_path / "counts.journal")
+        threads = []
+        append = journal._append
+        journal._append = lambda line: (threads.append(threading.current_thread()), append(line))
+        aggregator = AssetCountAggregator(FakeCountServer().update_count, journal, flush_interval=60)
+
+        await aggregator.add(serial_number="FIX-1")
+        await aggregator.close()
+
+        assert threads and threading.current_thread() not in threads
+
+
+class TestFileStateStore:
+    """JSON state file for StateStore users"""
+
+    async def test_missing_file_loads_nothing(self, tmp_path):
+        assert await FileStateStore(tmp_path / "state.json").load() is None
+
+    async def test_round_trip(self, tmp_path):
+        path = tmp_path / "sub" / "state.json"
+        await FileStateStore(path).save({"version": 1, "items": [1, 2]})
+
+        assert await FileStateStore(path).load() == {"version": 1, "items": [1, 2]}
+        assert json.loads(path.read_text())["items"] == [1, 2]
+
+    async def test_unreadable_file_raises(self, tmp_path):
+        path = tmp_path / "state.json"
+        path.write_text("{not json")
+        with pytest.raises(ValueError):
+            await FileStateStore(path).load()
+
+    async def test_reservoir_restart_neither_loses_nor_reissues(self, tmp_path):
+        state = tmp_path / "serials.json"
+        taken = []
+
+        async def take(type_name, count):
+            start = len(taken)
+            taken.extend(range(start, start + count))
+            return [f"SN-{i:06d}" for i in range(start, start + count)]
+
+        first = SerialNumberReservoir(take, FileStateStore(state), block_size=10, low_water=0)
+        issued = [s for _ in range(4) for s in await first.take("SN")]
+        await first.close()
+
+        second = SerialNumberReservoir(take, FileStateStore(state), block_size=10, low_water=0)
+        later = [s for _ in range(6) for s in await second.take("SN")]
+        await second.close()
+
+        assert issued + later == [f"SN-{i:06d}" for i in range(10)]
+        assert len(taken) == 10
+        assert json.loads(state.read_text())["pools"] == {}
+
+    async def test_reservoir_refuses_corrupt_state(self, tmp_path):
+        state = tmp_path / "serials.json"
+        state.write_text("{not json")
+        reservoir = SerialNumberReservoir(lambda t, n: None, FileStateStore(state))
+        with pytest.raises(RuntimeError):
+            await reservoir.take("SN")
@@ -0,0 +1,222 @@
+"""
+Tests for AdaptiveConcurrencyLimiter
+
+Tests AIMD adjustment of the converter pool's upload concurrency.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from pywats.core.circuit_breaker import CircuitState
+from pywats_client.service.async_converter_pool import AsyncConverterPool
+from pywats_client.service.health_server import HealthRequestHandler
+from pywats_client.service.upload_concurrency import (
+    AdaptiveConcurrencyConfig,
+    AdaptiveConcurrencyLimiter,
+)
+
+
+def make_limiter(circuit=None, **config) -> AdaptiveConcurrencyLimiter:
+    config.setdefault("window", 4)
+    config.setdefault("max_limit", 8)
+    config.setdefault("initial_limit", 4)
+    return AdaptiveConcurrencyLimiter(
+        AdaptiveConcurrencyConfig(**config),
+        circuit_state=(lambda: circuit[0]) if circuit else None,
+    )
+
+
+async def run_window(limiter: AdaptiveConcurrencyLimiter, latency: float, success: bool = True) -> None:
+    """Complete exactly one window with the limit fully used."""
+    held = limiter.limit
+    for _ in range(held):
+        await limiter.acquire()
+    for _ in range(limiter.config.window - 1):
+        limiter.release(latency, success)
+        await limiter.acquire()
+    limiter.release(latency, success)  # Evaluates the window
+    for _ in range(held - 1):
+        limiter.release()
+
+
+class TestAIMD:
+    """Additive increase, multiplicative decrease"""
+
+    @pytest.mark.asyncio
+    async def test_increases_when_healthy_and_saturated(self):
+        limiter = make_limiter()
+
+        await run_window(limiter, 0.1)
+
+        assert limiter.limit == 5
+        assert limiter.snapshot()["decisions"]["increase"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_does_not_grow_idle_capacity(self):
+        limiter = make_limiter()
+
+        for _ in range(8):
+            await limiter.acquire()
+            limiter.release(0.1, True)
+
+        assert limiter.limit == 4
+        assert limiter.snapshot()["last_decision"] == "hold"
+
+    @pytest.mark.asyncio
+    async def test_decreases_on_errors(self):
+        limiter = make_limiter(initial_limit=8)
+
+        await run_window(limiter, 0.1, success=False)
+
+        assert limiter.limit < 8
+        assert limiter.snapshot()["last_decision"] == "decrease"
+
+    @pytest.mark.asyncio
+    async def test_decreases_on_latency_above_target(self):
+        limiter = make_limiter(initial_limit=8, latency_target=1.0)
+
+        await run_window(limiter, 2.0)
+
+        assert limiter.limit == 4
+
+    @pytest.mark.asyncio
+    async def test_learned_baseline(self):
+        limiter = make_limiter(initial_limit=2, max_limit=2)
+
+        await run_window(limiter, 0.1)
+        assert limiter.latency_target == pytest.approx(0.2)
+
+        await run_window(limiter, 0.5)
+        assert limiter.limit == 1
+
+    @pytest.mark.asyncio
+    async def test_never_below_min_or_above_max(self):
+        limiter = make_limiter(initial_limit=2, min_limit=2, max_limit=3)
+
+        for _ in range(5):
+            await run_window(limiter, 0.1)
+        assert limiter.limit == 3
+        for _ in range(5):
+            await run_window(limiter, 0.1, success=False)
+        assert limiter.limit == 2
+
+    @pytest.mark.asyncio
+    async def test_circuit_open_clamps_to_min(self):
+        circuit = [CircuitState.CLOSED]
+        limiter = make_limiter(circuit=circuit)
+
+        circuit[0] = CircuitState.OPEN
+        await limiter.acquire()
+        limiter.release(0.1, False)
+
+        snapshot = limiter.snapshot()
+        assert limiter.limit == 1
+        assert snapshot["last_decision"] == "circuit_open"
+        assert snapshot["circuit_state"] == "open"
+
+        circuit[0] = CircuitState.CLOSED
+        await run_window(limiter, 0.1)
+        assert limiter.limit == 2
+
+    def test_invalid_config(self):
+        with pytest.raises(ValueError):
+            AdaptiveConcurrencyConfig(min_limit=5, max_limit=2)
+
+
+class TestSlots:
+    """Concurrency enforcement"""
+
+    @pytest.mark.asyncio
+    async def test_waits_at_limit(self):
+        limiter = make_limiter(initial_limit=2)
+        await limiter.acquire()
+        await limiter.acquire()
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        assert limiter.snapshot()["waiting"] == 1
+
+        limiter.release()
+        await asyncio.wait_for(waiter, 1.0)
+        assert limiter.in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak(self):
+        limiter = make_limiter(initial_limit=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        limiter.release()
+
+        assert limiter.in_flight == 0
+        assert limiter.snapshot()["waiting"] == 0
+
+    @pytest.mark.asyncio
+    async def test_slot_records_outcome(self):
+        limiter = make_limiter(window=1, initial_limit=1, max_limit=1)
+
+        with pytest.raises(RuntimeError):
+            async with limiter.slot():
+                raise RuntimeError("boom")
+
+        assert limiter.in_flight == 0
+        assert limiter.snapshot()["last_decision"] == "decrease"
+
+
+class TestPoolIntegration:
+    """AsyncConverterPool and health server wiring"""
+
+    @pytest.fixture
+    def pool(self):
+        api = AsyncMock()
+        api.report.submit = AsyncMock(return_value="id")
+        return AsyncConverterPool(MagicMock(), api, max_concurrent=6)
+
+    @pytest.mark.asyncio
+    async def test_submit_goes_through_limiter(self, pool):
+        await pool._submit({"report": "data"})
+
+        pool.api.report.submit.assert_awaited_once()
+        assert pool.upload_limiter.snapshot()["last_latency"] is not None
+        assert pool.stats["upload_concurrency"]["max_limit"] == 6
+
+    @pytest.mark.asyncio
+    async def test_failed_submit_counts_as_error(self, pool):
+        pool.api.report.submit = AsyncMock(side_effect=ConnectionError("server unavailable"))
+        pool.upload_limiter.config.window = 1
+
+        with pytest.raises(ConnectionError):
+            await pool._submit({"report": "data"})
+
+        assert pool.upload_limiter.snapshot()["last_decision"] == "decrease"
+
+    @pytest.mark.asyncio
+    async def test_submit_without_id_counts_as_success(self, pool):
+        pool.api.report.submit = AsyncMock(return_value=None)
+        pool.upload_limiter.config.window = 1
+
+        assert await pool._submit({"report": "data"}) is None
+
+        assert pool.upload_limiter.snapshot()["last_decision"] != "decrease"
+
+    def test_disabled(self):
+        pool = AsyncConverterPool(MagicMock(), AsyncMock(), adaptive_uploads=False)
+
+        assert pool.upload_limiter is None
+        assert "upload_concurrency" not in pool.stats
+
+    def test_health_metrics_summary(self, pool):
+        handler = HealthRequestHandler.__new__(HealthRequestHandler)
+        handler.health_server = MagicMock(spec=["_converter_pool"])
+        handler.health_server._converter_pool = pool
+
+        summary = handler._collect_metrics_summary()
+
+        assert summary["upload_concurrency"]["limit"] == 3
+        assert summary["upload_concurrency"]["last_decision"] == "initial"
@@ -5,11 +5,13 @@ Tests the core logging configuration API including:
 - configure_logging() function
 - FileRotatingHandler class
 - LoggingContext context manager
+- Queued (background writer) logging and RateLimitFilter
 """
 
 import json
 import logging
 import tempfile
+import threading
 from pathlib import Path
 from typing import Dict, Any
 
@@ -23,6 +25,9 @@ from pywats.core.logging import (
     set_logging_context,
     clear_logging_context,
     get_logging_context,
+    shutdown_logging,
+    QueuedHandler,
+    RateLimitFilter,
 )
 
 
@@ -479,3 +484,170 @@ class TestLoggingContext:
         
         # Should restore original value
         assert get_logging_context()["user"] == "bob"
+
+
+class TestQueuedLogging:
+    """Tests for configure_logging(queued=True)."""
+    
+    def setup_method(self):
+        """Reset logging configuration before each test."""
+        logging.getLogger().handlers.clear()
+        clear_logging_context()
+    
+    def teardown_method(self):
+        """Stop the background writer and reset configuration."""
+        shutdown_logging()
+        root_logger = logging.getLogger()
+        root_logger.handlers.clear()
+        root_logger.setLevel(logging.WARNING)
+        logging.getLogger('pywats').setLevel(logging.WARNING)
+        clear_logging_context()
+    
+    def test_root_gets_single_queue_handler(self):
+        """Test only the queue handler is attached to the root logger."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            configure_logging(file_path=Path(tmpdir) / "test.log", queued=True)
+            
+            handlers = logging.getLogger().handlers
+            assert len(handlers) == 1
+            assert isinstance(handlers[0], QueuedHandler)
+            
+            shutdown_logging()
+    
+    def test_records_written_by_background_thread(self):
+        """Test records reach the file handler from the listener thread."""
+        written_by = []
+        
+        class RecordingHandler(logging.Handler):
+            def emit(self, record):
+                written_by.append(threading.current_thread())
+        
+        configure_logging(handlers=[RecordingHandler()], queued=True)
+        get_logger("pywats.test").info("Queued message")
+        shutdown_logging()
+        
+        assert len(written_by) == 1
+        assert written_by[0] is not threading.current_thread()
+    
+    def test_json_output_keeps_context_and_extras(self):
+        """Test context and extras survive the thread hop."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = Path(tmpdir) / "test.log"
+            configure_logging(format="json", file_path=log_path, queued=True)
+            
+            logger = get_logger("pywats.test")
+            with LoggingContext(station="ST-1"):
+                logger.info("Report %s submitted", "SN-1", extra={"report_id": 42})
+            try:
+                raise ValueError("boom")
+            except ValueError:
+                logger.exception("Failed")
+            
+            shutdown_logging()
+            
+            lines = log_path.read_text(encoding="utf-8").splitlines()
+            first = json.loads(lines[0])
+            assert first["message"] == "Report SN-1 submitted"
+            assert first["context"] == {"station": "ST-1"}
+            assert first["report_id"] == 42
+            
+            second = json.loads(lines[1])
+            assert "context" not in second
+            assert "ValueError: boom" in second["exception"]
+    
+    def test_unencodable_extra_falls_back_to_minimal_record(self):
+        """Test circular or non-str-keyed extras still produce a JSON line."""
+        from pywats.core.logging import StructuredFormatter
+        
+        circular = {}
+        circular["self"] = circular
+        for value in (circular, {("a", 1): "tuple key"}):
+            record = logging.LogRecord("pywats.test", logging.INFO, "t.py", 1, "kept", (), None)
+            record.payload = value
+            
+            output = json.loads(StructuredFormatter().format(record))
+            
+            assert output["message"] == "kept"
+            assert "payload" not in output
+    
+    def test_bounded_queue_drops_instead_of_blocking(self):
+        """Test a full bounded queue drops records and counts them."""
+        import queue
+        
+        handler = QueuedHandler(queue.Queue(maxsize=1))
+        record = logging.LogRecord("pywats.test", logging.INFO, "t.py", 1, "m", (), None)
+        
+        handler.handle(record)
+        handler.handle(record)
+        
+        assert handler.dropped == 1
+    
+    def test_reconfigure_stops_previous_listener(self):
+        """Test configuring again replaces the previous background writer."""
+        first = []
+        
+        class RecordingHandler(logging.Handler):
+            def emit(self, record):
+                first.append(record.getMessage())
+        
+        configure_logging(handlers=[RecordingHandler()], queued=True)
+        configure_logging(handlers=[logging.NullHandler()], queued=True)
+        get_logger("pywats.test").warning("After reconfigure")
+        shutdown_logging()
+        
+        assert first == []
+
+
+class TestRateLimitFilter:
+    """Tests for RateLimitFilter."""
+    
+    @staticmethod
+    def _record(msg="Repeated %s", lineno=10):
+        return logging.LogRecord("pywats.test", logging.WARNING, "t.py", lineno, msg, ("x",), None)
+    
+    def test_repeats_within_window_are_suppressed(self):
+        """Test identical messages inside the window are dropped."""
+        rate_filter = RateLimitFilter(interval=60.0)
+        
+        assert rate_filter.filter(self._record()) is True
+        assert rate_filter.filter(self._record()) is False
+        assert rate_filter.filter(self._record()) is False
+    
+    def test_different_messages_pass(self):
+        """Test different call sites are tracked separately."""
+        rate_filter = RateLimitFilter(interval=60.0)
+        
+        assert rate_filter.filter(self._record(lineno=10)) is True
+        assert rate_filter.filter(self._record(lineno=11)) is True
+    
+    def test_different_arguments_pass(self):
+        """Test one call site logging different values is not throttled."""
+        rate_filter = RateLimitFilter(interval=60.0)
+        
+        def record(arg):
+            return logging.LogRecord("pywats.test", logging.INFO, "t.py", 10, "Converted %s", (arg,), None)
+        
+        assert rate_filter.filter(record("a.csv")) is True
+        assert rate_filter.filter(record("b.csv")) is True
+        assert rate_filter.filter(record("a.csv")) is False
+    
+    def test_suppressed_count_reported_after_window(self):
+        """Test the next record after the window carries the suppressed count."""
+        rate_filter = RateLimitFilter(interval=0.0)
+        rate_filter.interval = 60.0
+        rate_filter.filter(self._record())
+        rate_filter.filter(self._record())
+        rate_filter.filter(self._record())
+        
+        rate_filter.interval = 0.0
+        record = self._record()
+        assert rate_filter.filter(record) is True
+        assert record.suppressed == 2
+    
+    def test_tracked_keys_are_bounded(self):
+        """Test the filter never tracks more than max_keys messages."""
+        rate_filter = RateLimitFilter(interval=60.0, max_keys=10)
+        for lineno in range(100):
+            rate_filter.filter(self._record(lineno=lineno))
+        
+        assert len(rate_filter._seen) == 10
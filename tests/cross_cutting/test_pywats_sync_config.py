@@ -177,3 +177,17 @@ def test_pywats_backward_compatible():
     # Should have default sync config
     assert api._sync_config is not None
     assert isinstance(api._sync_config, SyncConfig)
+
+
+def test_pywats_close_closes_services():
+    """Test close() stops background work of the services that were used."""
+    api = pyWATS(base_url=TEST_URL, token=TEST_TOKEN)
+    closed = []
+    for name in ("asset", "production"):
+        async def close(name=name):
+            closed.append(name)
+        getattr(api, name)._async.close = close
+
+    api.close()
+
+    assert closed == ["asset", "production"]
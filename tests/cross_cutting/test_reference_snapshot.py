@@ -0,0 +1,269 @@
+"""Tests for indexed, persistable reference snapshots."""
+import asyncio
+import time
+from typing import List
+
+import pytest
+
+from pywats.core.reference_snapshot import ReferenceSnapshot
+from pywats.core.state_store import StateStore
+from pywats.domains.process import AsyncProcessService, ProcessInfo
+from pywats.domains.product import AsyncProductService, Product
+from pywats.domains.product.enums import ProductState
+
+
+def make_processes() -> List[ProcessInfo]:
+    return [
+        ProcessInfo(code=100, name="End of line test", is_test_operation=True),
+        ProcessInfo(code=110, name="PCBA test", is_test_operation=True),
+        ProcessInfo(code=500, name="Repair", is_repair_operation=True),
+    ]
+
+
+class FakeLoader:
+    """Returns a mutable list; can be switched to fail (server offline)."""
+
+    def __init__(self, entries: list, delay: float = 0.0) -> None:
+        self.entries = entries
+        self.delay = delay
+        self.calls = 0
+        self.offline = False
+
+    async def __call__(self) -> list:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.offline:
+            raise ConnectionError("server unreachable")
+        return [e.model_copy() for e in self.entries]
+
+
+class CountingStore(StateStore):
+    """In-memory store counting saves; can be made unreadable."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.saves = 0
+        self.unreadable = False
+
+    async def load(self):
+        if self.unreadable:
+            raise ValueError("corrupt state")
+        return await super().load()
+
+    async def save(self, state):
+        self.saves += 1
+        await super().save(state)
+
+
+def process_snapshot(loader, store=None, refresh_interval=300.0) -> ReferenceSnapshot:
+    return ReferenceSnapshot(
+        "processes", loader, ProcessInfo,
+        key=lambda p: p.code,
+        indexes={"name": lambda p: p.name.lower() if p.name else None},
+        views={"test": lambda p: p.is_test_operation},
+        store=store,
+        refresh_interval=refresh_interval,
+    )
+
+
+class TestReferenceSnapshot:
+    """Tests for indexing, deltas, upserts and persistence."""
+
+    async def test_index_lookups(self):
+        snapshot = process_snapshot(FakeLoader(make_processes()))
+        await snapshot.ensure_loaded()
+
+        assert snapshot.get(500).name == "Repair"
+        assert snapshot.lookup("name", "pcba test").code == 110
+        assert snapshot.lookup("name", "missing") is None
+        assert [p.code for p in snapshot.view("test")] == [100, 110]
+
+    async def test_refresh_applies_delta(self):
+        loader = FakeLoader(make_processes())
+        snapshot = process_snapshot(loader)
+        await snapshot.ensure_loaded()
+        unchanged = snapshot.get(100)
+
+        loader.entries[1] = ProcessInfo(code=110, name="ICT", is_test_operation=True)
+        del loader.entries[2]
+        loader.entries.append(ProcessInfo(code=200, name="Final", is_wip_operation=True))
+        delta = await snapshot.refresh()
+
+        assert (delta.added, delta.changed, delta.removed) == (1, 1, 1)
+        assert snapshot.get(100) is unchanged
+        assert snapshot.lookup("name", "ict").code == 110
+        assert snapshot.lookup("name", "pcba test") is None
+        assert snapshot.get(500) is None
+
+    async def test_unchanged_refresh_keeps_version(self):
+        store = CountingStore()
+        snapshot = process_snapshot(FakeLoader(make_processes()), store)
+        await snapshot.ensure_loaded()
+        version = snapshot.version
+
+        delta = await snapshot.refresh()
+
+        assert delta.unchanged
+        assert snapshot.version == version
+        assert store.saves == 1
+
+    async def test_warm_start_from_store(self):
+        store = StateStore()
+        first = process_snapshot(FakeLoader(make_processes()), store)
+        await first.ensure_loaded()
+
+        loader = FakeLoader(make_processes())
+        second = process_snapshot(loader, store)
+        await second.ensure_loaded()
+
+        assert loader.calls == 0
+        assert second.lookup("name", "repair").code == 500
+
+    async def test_stale_snapshot_refreshes_in_background(self):
+        store = StateStore()
+        await process_snapshot(FakeLoader(make_processes()), store).ensure_loaded()
+        state = await store.load()
+        state["saved_at"] = time.time() - 3600
+        await store.save(state)
+
+        loader = FakeLoader(make_processes(), delay=0.02)
+        loader.entries.append(ProcessInfo(code=200, name="Final"))
+        snapshot = process_snapshot(loader, store, refresh_interval=60)
+        await snapshot.ensure_loaded()
+
+        assert snapshot.get(200) is None  # Served from the store immediately
+        await snapshot.close()
+        assert snapshot.get(200) is not None
+        assert loader.calls == 1
+
+    async def test_offline_serves_snapshot(self):
+        store = StateStore()
+        await process_snapshot(FakeLoader(make_processes()), store).ensure_loaded()
+
+        loader = FakeLoader([])
+        loader.offline = True
+        snapshot = process_snapshot(loader, store)
+        await snapshot.ensure_loaded()
+        delta = await snapshot.refresh()
+
+        assert delta.unchanged
+        assert len(snapshot.items()) == 3
+
+    async def test_offline_without_snapshot_raises(self):
+        loader = FakeLoader([])
+        loader.offline = True
+        with pytest.raises(ConnectionError):
+            await process_snapshot(loader).ensure_loaded()
+
+    async def test_unreadable_snapshot_is_downloaded_again(self):
+        store = CountingStore()
+        store.unreadable = True
+        loader = FakeLoader(make_processes())
+
+        snapshot = process_snapshot(loader, store)
+        await snapshot.ensure_loaded()
+
+        assert loader.calls == 1
+        assert store.saves == 1
+
+    async def test_upsert_is_visible_before_refresh(self):
+        loader = FakeLoader(make_processes())
+        snapshot = process_snapshot(loader)
+        await snapshot.ensure_loaded()
+
+        snapshot.upsert([ProcessInfo(code=200, name="Final")])
+
+        assert snapshot.lookup("name", "final").code == 200
+        assert snapshot.age is None  # Stale: the next access refreshes
+
+    async def test_upsert_during_download_survives_it(self):
+        loader = FakeLoader(make_processes(), delay=0.02)
+        snapshot = process_snapshot(loader)
+        await snapshot.ensure_loaded()
+
+        refresh = asyncio.create_task(snapshot.refresh())
+        await asyncio.sleep(0.005)
+        snapshot.upsert([ProcessInfo(code=200, name="Final")])  # Not in the running download
+        await refresh
+
+        assert snapshot.get(200) is not None
+
+    async def test_concurrent_refreshes_share_download(self):
+        loader = FakeLoader(make_processes(), delay=0.01)
+        snapshot = process_snapshot(loader)
+
+        await asyncio.gather(*(snapshot.ensure_loaded() for _ in range(10)))
+
+        assert loader.calls == 1
+
+
+class ProcessRepository:
+    def __init__(self, loader: FakeLoader) -> None:
+        self.get_processes = loader
+
+
+class ProductRepository:
+    def __init__(self, loader: FakeLoader) -> None:
+        self.get_all = loader
+        self.saved = []
+
+    async def save(self, product):
+        self.saved.append(product)
+        return product
+
+
+class TestServiceSnapshots:
+    """Process and product service integration."""
+
+    async def test_process_lookups_use_snapshot(self):
+        loader = FakeLoader(make_processes())
+        service = AsyncProcessService(ProcessRepository(loader))
+        service.enable_reference_snapshot(StateStore())
+
+        assert (await service.get_process_by_code(500)).name == "Repair"
+        assert (await service.get_test_operation("End of line test")).code == 100
+        assert [p.code for p in await service.get_repair_operations()] == [500]
+        assert loader.calls == 1
+        await service.close()
+
+    async def test_product_active_list_and_lookup(self):
+        loader = FakeLoader([
+            Product(part_number="PN-1", state=ProductState.ACTIVE),
+            Product(part_number="PN-2", state=ProductState.INACTIVE),
+        ])
+        service = AsyncProductService(ProductRepository(loader))
+        service.enable_reference_snapshot(StateStore())
+
+        assert [p.part_number for p in await service.get_active_products()] == ["PN-1"]
+        assert (await service.find_product("PN-2")).state == ProductState.INACTIVE
+        assert await service.find_product("PN-3") is None
+        assert loader.calls == 1
+        await service.close()
+
+    async def test_created_product_is_found_at_once(self):
+        loader = FakeLoader([Product(part_number="PN-1")])
+        service = AsyncProductService(ProductRepository(loader))
+        service.enable_reference_snapshot()
+        await service.get_products()
+
+        await service.create_product("PN-2")
+        assert await service.find_product("PN-2") is not None  # Before any refresh
+        loader.entries.append(Product(part_number="PN-2"))
+        await service.close()  # Background refresh started by the read
+
+        assert await service.find_product("PN-2") is not None
+        assert loader.calls == 2
+
+    async def test_product_saved_before_first_load_is_found(self):
+        store = StateStore()
+        loader = FakeLoader([Product(part_number="PN-1")])
+        warm = AsyncProductService(ProductRepository(loader))
+        warm.enable_reference_snapshot(store, refresh_interval=0)
+        await warm.get_products()
+
+        service = AsyncProductService(ProductRepository(loader))
+        service.enable_reference_snapshot(store)
+        await service.create_product("PN-2")
+
+        assert await service.find_product("PN-2") is not None
+        await service.close()
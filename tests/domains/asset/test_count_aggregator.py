@@ -0,0 +1,203 @@
+"""Tests for coalesced asset count increments (AssetCountAggregator)."""
+import asyncio
+from typing import List, Set
+
+import pytest
+
+from pywats.domains.asset import AssetCountAggregator, AsyncAssetService, CountJournal
+
+
+class FakeCountServer:
+    """Records update_count calls; serials in ``failing`` are rejected."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.calls: List[dict] = []
+        self.failing: Set[str] = set()
+        self.totals = {}
+
+    async def update_count(self, asset_id=None, serial_number=None, total_count=None,
+                           increment_by=None, increment_children=False) -> bool:
+        await asyncio.sleep(self.delay)
+        if serial_number in self.failing:
+            raise ConnectionError("server unavailable")
+        self.calls.append({"serial_number": serial_number, "increment_by": increment_by,
+                           "increment_children": increment_children})
+        self.totals[serial_number] = self.totals.get(serial_number, 0) + increment_by
+        return True
+
+
+class TestAssetCountAggregator:
+    """Tests for aggregation, triggers and journal recovery."""
+
+    async def test_increments_are_coalesced_per_asset(self):
+        server = FakeCountServer()
+        aggregator = AssetCountAggregator(server.update_count, flush_interval=60)
+
+        for _ in range(500):
+            await aggregator.add(serial_number="FIX-1")
+        for _ in range(300):
+            await aggregator.add(serial_number="FIX-2", amount=2)
+        await aggregator.flush()
+
+        assert server.totals == {"FIX-1": 500, "FIX-2": 600}
+        assert len(server.calls) == 2
+        assert aggregator.pending == {}
+        await aggregator.close()
+
+    async def test_children_flag_is_a_separate_total(self):
+        server = FakeCountServer()
+        aggregator = AssetCountAggregator(server.update_count, flush_interval=60)
+
+        await aggregator.add(serial_number="FIX-1")
+        await aggregator.add(serial_number="FIX-1", increment_children=True)
+        await aggregator.close()
+
+        assert sorted(c["increment_children"] for c in server.calls) == [False, True]
+
+    async def test_size_trigger(self):
+        server = FakeCountServer()
+        aggregator = AssetCountAggregator(server.update_count, flush_interval=60, max_pending=10)
+
+        for _ in range(10):
+            await aggregator.add(serial_number="FIX-1")
+        await asyncio.sleep(0.01)
+
+        assert server.totals == {"FIX-1": 10}
+        await aggregator.close()
+
+    async def test_time_trigger(self):
+        server = FakeCountServer()
+        aggregator = AssetCountAggregator(server.update_count, flush_interval=0.02)
+
+        await aggregator.add(serial_number="FIX-1", amount=3)
+        await asyncio.sleep(0.08)
+
+        assert server.totals == {"FIX-1": 3}
+        await aggregator.close()
+
+    async def test_increments_during_flush_are_kept(self):
+        server = FakeCountServer(delay=0.02)
+        aggregator = AssetCountAggregator(server.update_count, flush_interval=60)
+
+        await aggregator.add(serial_number="FIX-1")
+        flush = asyncio.create_task(aggregator.flush())
+        await asyncio.sleep(0.005)
+        await aggregator.add(serial_number="FIX-1")
+        await flush
+
+        assert aggregator.pending == {(None, "FIX-1", False): 1}
+        await aggregator.close()
+        assert server.totals == {"FIX-1": 2}
+
+    async def test_failed_totals_are_retried(self):
+        server = FakeCountServer()
+        server.failing.add("FIX-2")
+        aggregator = AssetCountAggregator(server.update_count, flush_interval=60)
+
+        await aggregator.add(serial_number="FIX-1")
+        await aggregator.add(serial_number="FIX-2", amount=4)
+        assert await aggregator.flush() is False
+        assert aggregator.pending == {(None, "FIX-2", False): 4}
+
+        server.failing.clear()
+        await aggregator.add(serial_number="FIX-2")
+        assert await aggregator.flush() is True
+
+        assert server.totals == {"FIX-1": 1, "FIX-2": 5}
+        await aggregator.close()
+
+    async def test_journal_sees_appends_seals_and_acks_in_order(self):
+        class RecordingJournal(CountJournal):
+            def __init__(self):
+                self.calls = []
+
+            async def recover(self):
+                return {4: {(None, "OLD", False): 2}}
+
+            async def append(self, key, amount):
+                self.calls.append(("append", key[1], amount))
+
+            async def seal(self, segment):
+                self.calls.append(("seal", segment))
+
+            async def acknowledge(self, segment, key, amount, finished):
+                self.calls.append(("ack", segment, key[1], amount, finished))
+
+        server = FakeCountServer()
+        journal = RecordingJournal()
+        aggregator = AssetCountAggregator(server.update_count, journal, flush_interval=60)
+
+        await aggregator.add(serial_number="FIX-1", amount=3)
+        await aggregator.close()
+
+        assert journal.calls == [
+            ("append", "FIX-1", 3),
+            ("seal", 5),
+            ("ack", 4, "OLD", 2, True),
+            ("ack", 5, "FIX-1", 3, True),
+        ]
+        assert server.totals == {"OLD": 2, "FIX-1": 3}
+
+    async def test_rejects_increment_without_asset(self):
+        aggregator = AssetCountAggregator(FakeCountServer().update_count)
+        with pytest.raises(ValueError):
+            await aggregator.add()
+
+    def test_invalid_configuration(self):
+        with pytest.raises(ValueError):
+            AssetCountAggregator(FakeCountServer().update_count, flush_interval=0)
+        with pytest.raises(ValueError):
+            AssetCountAggregator(FakeCountServer().update_count, max_pending=0)
+
+
+class CountRepository:
+    def __init__(self, server: FakeCountServer) -> None:
+        self.server = server
+        self.operations: List[str] = []
+
+    async def update_count(self, **kwargs) -> bool:
+        self.operations.append("increment")
+        return await self.server.update_count(**kwargs)
+
+    async def reset_running_count(self, asset_id=None, serial_number=None, comment=None) -> bool:
+        self.operations.append("reset")
+        return True
+
+
+class TestAssetServiceCountAggregation:
+    """increment_count integration."""
+
+    async def test_increment_count_is_aggregated(self):
+        repo = CountRepository(FakeCountServer())
+        service = AsyncAssetService(repo)
+        service.enable_count_aggregation(flush_interval=60)
+
+        for _ in range(20):
+            assert await service.increment_count(serial_number="FIX-1") is True
+        assert repo.operations == []
+
+        await service.close()
+        assert repo.server.totals == {"FIX-1": 20}
+        assert repo.operations == ["increment"]
+
+    async def test_reset_flushes_pending_increments_first(self):
+        repo = CountRepository(FakeCountServer())
+        service = AsyncAssetService(repo)
+        service.enable_count_aggregation(flush_interval=60)
+
+        await service.increment_count(serial_number="FIX-1")
+        await service.reset_running_count(serial_number="FIX-1")
+
+        assert repo.operations == ["increment", "reset"]
+        await service.close()
+
+    async def test_without_aggregation_calls_server(self):
+        repo = CountRepository(FakeCountServer())
+        service = AsyncAssetService(repo)
+
+        await service.increment_count(serial_number="FIX-1")
+        await service.increment_count(serial_number="FIX-1")
+
+        assert repo.operations == ["increment", "increment"]
+        assert await service.flush_counts() is True
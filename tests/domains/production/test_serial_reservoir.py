@@ -0,0 +1,189 @@
+"""Tests for the client-side serial number reservoir."""
+import asyncio
+from typing import List, Optional
+
+import pytest
+
+from pywats.core.state_store import StateStore
+from pywats.domains.production import AsyncProductionService, SerialNumberReservoir
+
+
+class FakeSerialServer:
+    """Hands out sequential serial numbers per type, like SerialNumbers/Take."""
+
+    def __init__(self, delay: float = 0.0, limit: Optional[int] = None) -> None:
+        self.delay = delay
+        self.limit = limit
+        self.next = {}
+        self.calls: List[tuple] = []
+
+    async def take(self, type_name: str, count: int, *args) -> List[str]:
+        self.calls.append((type_name, count) + args)
+        await asyncio.sleep(self.delay)
+        start = self.next.get(type_name, 0)
+        if self.limit is not None:
+            count = max(0, min(count, self.limit - start))
+        self.next[type_name] = start + count
+        return [f"{type_name}-{i:06d}" for i in range(start, start + count)]
+
+
+class TestSerialNumberReservoir:
+    """Tests for block prefetch, background refill and persistence."""
+
+    async def test_serves_from_block(self):
+        server = FakeSerialServer()
+        reservoir = SerialNumberReservoir(server.take, block_size=10, low_water=0)
+
+        serials = [(await reservoir.take("SN"))[0] for _ in range(10)]
+
+        assert serials == [f"SN-{i:06d}" for i in range(10)]
+        assert server.calls == [("SN", 10)]
+        await reservoir.close()
+
+    async def test_background_refill_below_low_water(self):
+        server = FakeSerialServer(delay=0.01)
+        reservoir = SerialNumberReservoir(server.take, block_size=10, low_water=5)
+
+        for _ in range(6):
+            await reservoir.take("SN")
+        await asyncio.sleep(0.05)
+
+        assert len(server.calls) == 2
+        assert reservoir.available("SN") == 14
+        await reservoir.close()
+
+    async def test_concurrent_takers_share_refill(self):
+        server = FakeSerialServer(delay=0.01)
+        reservoir = SerialNumberReservoir(server.take, block_size=20, low_water=0)
+
+        results = await asyncio.gather(*(reservoir.take("SN") for _ in range(20)))
+
+        serials = [r[0] for r in results]
+        assert len(set(serials)) == 20
+        assert server.calls == [("SN", 20)]
+        await reservoir.close()
+
+    async def test_concurrent_takers_each_get_full_count(self):
+        server = FakeSerialServer(delay=0.01)
+        reservoir = SerialNumberReservoir(server.take, block_size=10, low_water=0)
+
+        first, second = await asyncio.gather(reservoir.take("SN", 8), reservoir.take("SN", 8))
+
+        assert len(first) == len(second) == 8
+        assert not set(first) & set(second)
+        await reservoir.close()
+
+    async def test_large_request_fetches_enough(self):
+        server = FakeSerialServer()
+        reservoir = SerialNumberReservoir(server.take, block_size=10, low_water=0)
+
+        serials = await reservoir.take("SN", 25)
+
+        assert serials == [f"SN-{i:06d}" for i in range(25)]
+        await reservoir.close()
+
+    async def test_types_are_independent(self):
+        server = FakeSerialServer()
+        reservoir = SerialNumberReservoir(server.take, block_size=5, low_water=0)
+
+        assert await reservoir.take("A") == ["A-000000"]
+        assert await reservoir.take("B") == ["B-000000"]
+        assert reservoir.available("A") == 4
+        await reservoir.close()
+
+    async def test_exhausted_server_returns_partial(self):
+        server = FakeSerialServer(limit=3)
+        reservoir = SerialNumberReservoir(server.take, block_size=10, low_water=0)
+
+        assert await reservoir.take("SN", 5) == ["SN-000000", "SN-000001", "SN-000002"]
+        assert await reservoir.take("SN") == []
+        await reservoir.close()
+
+    async def test_restart_neither_loses_nor_reissues(self):
+        store = StateStore()
+        server = FakeSerialServer()
+        first = SerialNumberReservoir(server.take, store, block_size=10, low_water=0)
+        issued = [s for _ in range(4) for s in await first.take("SN")]
+        await first.close()
+
+        # Simulated restart: new reservoir over the same store
+        second = SerialNumberReservoir(server.take, store, block_size=10, low_water=0)
+        await second.load()
+        assert second.available("SN") == 6
+        later = [s for _ in range(6) for s in await second.take("SN")]
+        await second.close()
+
+        assert set(issued).isdisjoint(later)
+        assert issued + later == [f"SN-{i:06d}" for i in range(10)]
+        assert len(server.calls) == 1
+        assert (await store.load())["pools"] == {}
+
+    async def test_state_saved_before_serial_returned(self):
+        store = StateStore()
+        reservoir = SerialNumberReservoir(FakeSerialServer().take, store, block_size=5, low_water=0)
+
+        serial = (await reservoir.take("SN"))[0]
+
+        assert serial not in (await store.load())["pools"]["SN"]
+        await reservoir.close()
+
+    async def test_unreadable_state_is_not_ignored(self):
+        class UnreadableStore(StateStore):
+            async def load(self):
+                raise ValueError("corrupt state")
+
+        server = FakeSerialServer()
+        reservoir = SerialNumberReservoir(server.take, UnreadableStore())
+        with pytest.raises(RuntimeError):
+            await reservoir.take("SN")
+        assert server.calls == []
+
+    def test_invalid_configuration(self):
+        with pytest.raises(ValueError):
+            SerialNumberReservoir(FakeSerialServer().take, block_size=0)
+        with pytest.raises(ValueError):
+            SerialNumberReservoir(FakeSerialServer().take, block_size=5, low_water=6)
+
+
+class SerialRepository:
+    def __init__(self, server: FakeSerialServer) -> None:
+        self.server = server
+
+    async def take_serial_numbers(self, type_name, count=1, reference_sn=None,
+                                  reference_pn=None, station_name=None):
+        return await self.server.take(type_name, count, reference_sn, reference_pn, station_name)
+
+
+class TestProductionServiceReservoir:
+    """allocate_serial_numbers integration."""
+
+    async def test_allocate_uses_reservoir(self):
+        server = FakeSerialServer()
+        service = AsyncProductionService(SerialRepository(server))
+        service.enable_serial_reservoir(StateStore(), block_size=10, low_water=0)
+
+        serials = [(await service.allocate_serial_numbers("SN"))[0] for _ in range(3)]
+
+        assert serials == ["SN-000000", "SN-000001", "SN-000002"]
+        assert len(server.calls) == 1
+        await service.close()
+
+    async def test_referenced_allocation_bypasses_reservoir(self):
+        server = FakeSerialServer()
+        service = AsyncProductionService(SerialRepository(server))
+        service.enable_serial_reservoir(block_size=10, low_water=0)
+
+        await service.allocate_serial_numbers("SN", station_name="ST-1")
+
+        assert server.calls == [("SN", 1, None, None, "ST-1")]
+        assert service.serial_reservoir.available("SN") == 0
+        await service.close()
+
+    async def test_without_reservoir_calls_server(self):
+        server = FakeSerialServer()
+        service = AsyncProductionService(SerialRepository(server))
+
+        await service.allocate_serial_numbers("SN")
+        await service.allocate_serial_numbers("SN")
+
+        assert len(server.calls) == 2
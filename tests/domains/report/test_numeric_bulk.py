@@ -0,0 +1,167 @@
+"""Tests for bulk numeric step construction (SequenceCall.add_numeric_steps)."""
+import random
+import timeit
+
+import pytest
+
+from pywats.domains.report.enums import ImportMode
+from pywats.domains.report.import_mode import set_import_mode
+from pywats.domains.report.report_models.uut.step import StepStatus
+from pywats.domains.report.report_models.uut.steps import SequenceCall
+from pywats.shared.enums import CompOp
+
+
+@pytest.fixture
+def active_mode():
+    set_import_mode(ImportMode.Active)
+    yield
+    set_import_mode(ImportMode.Import)
+
+
+def make_rows(count: int, seed: int = 1):
+    """Random rows covering every operator, string values and missing limits."""
+    rng = random.Random(seed)
+    ops = list(CompOp)
+    rows = []
+    for i in range(count):
+        low = rng.choice([None, rng.uniform(0, 5), "2.5", "bad"])
+        high = rng.choice([None, rng.uniform(5, 10), "7.5 "])
+        value = rng.choice([rng.uniform(-1, 11), rng.randint(0, 10), " 4.0", "n/a"])
+        rows.append({
+            "name": f" Step {i} ",
+            "value": value,
+            "unit": rng.choice(["V", " A ", "NA"]),
+            "comp_op": rng.choice(ops),
+            "low_limit": low,
+            "high_limit": high,
+            "status": rng.choice([None, None, "P", "F", StepStatus.Skipped, "Passed"]),
+        })
+    return rows
+
+
+def build_both(rows, **kwargs):
+    one_by_one = SequenceCall(name="Main")
+    for row in rows:
+        one_by_one.add_numeric_step(**row, **kwargs)
+
+    bulk = SequenceCall(name="Main")
+    bulk.add_numeric_steps(
+        names=[r["name"] for r in rows],
+        values=[r["value"] for r in rows],
+        units=[r["unit"] for r in rows],
+        comp_ops=[r["comp_op"] for r in rows],
+        low_limits=[r["low_limit"] for r in rows],
+        high_limits=[r["high_limit"] for r in rows],
+        statuses=[r["status"] for r in rows],
+        **kwargs,
+    )
+    return one_by_one, bulk
+
+
+def assert_identical(expected: SequenceCall, actual: SequenceCall) -> None:
+    assert actual.model_dump() == expected.model_dump()
+    assert actual.model_dump_json(by_alias=True) == expected.model_dump_json(by_alias=True)
+    assert actual.status == expected.status
+    for e, a in zip(expected.steps, actual.steps):
+        assert a.model_fields_set == e.model_fields_set
+        assert a.measurement.model_fields_set == e.measurement.model_fields_set
+        assert a.status == e.status and type(a.status) is type(e.status)
+        assert a.parent is actual
+
+
+class TestAddNumericSteps:
+    """Bulk path must match add_numeric_step row for row."""
+
+    def test_identical_in_import_mode(self):
+        expected, actual = build_both(make_rows(300))
+        assert_identical(expected, actual)
+
+    def test_identical_in_active_mode(self, active_mode):
+        expected, actual = build_both(make_rows(300, seed=2))
+        assert_identical(expected, actual)
+        assert any(s.status == StepStatus.Failed for s in actual.steps)
+
+    def test_active_failure_propagates_to_parent(self, active_mode):
+        seq = SequenceCall(name="Main")
+        seq.add_numeric_steps(
+            names=["R1", "R2"], values=[100.0, 150.0],
+            comp_ops=CompOp.GELE, low_limits=95.0, high_limits=105.0,
+        )
+
+        assert [s.status for s in seq.steps] == ["P", StepStatus.Failed]
+        assert seq.status == StepStatus.Failed
+
+    def test_explicit_failure_does_not_propagate(self, active_mode):
+        row = {"name": "R1", "value": 1.0, "unit": "V", "comp_op": CompOp.LOG,
+               "low_limit": None, "high_limit": None}
+        expected, actual = build_both([
+            dict(row, status="F"),
+            dict(row, name="R2", status=StepStatus.Failed),
+        ])
+        assert_identical(expected, actual)
+        assert actual.status == StepStatus.Passed
+
+    def test_no_propagation_when_disabled(self, active_mode):
+        expected, actual = build_both(make_rows(50, seed=3), fail_parent_on_failure=False)
+        assert_identical(expected, actual)
+        assert actual.status == StepStatus.Passed
+
+    def test_scalars_are_broadcast(self):
+        seq = SequenceCall(name="Main")
+        steps = seq.add_numeric_steps(names=["A", "B", "C"], values=[1, 2, 3], units="V",
+                                      comp_ops="GELE", low_limits=0, high_limits=5)
+
+        assert [s.unit for s in steps] == ["V"] * 3
+        assert [s.high_limit for s in steps] == [5.0] * 3
+        assert [s.value for s in steps] == [1.0, 2.0, 3.0]
+
+    def test_group_applies_to_all(self):
+        expected, actual = build_both(make_rows(5), group="S")
+        assert_identical(expected, actual)
+
+    def test_column_length_mismatch(self):
+        with pytest.raises(ValueError, match="values"):
+            SequenceCall(name="Main").add_numeric_steps(names=["A", "B"], values=[1.0])
+
+    def test_invalid_entries_name_the_row(self):
+        seq = SequenceCall(name="Main")
+        with pytest.raises(ValueError, match=r"names\[1\]"):
+            seq.add_numeric_steps(names=["A", "  "], values=[1.0, 2.0])
+        with pytest.raises(ValueError, match=r"comp_ops\[0\]"):
+            seq.add_numeric_steps(names=["A"], values=[1.0], comp_ops=["BOGUS"])
+        with pytest.raises(ValueError, match=r"values\[0\]"):
+            seq.add_numeric_steps(names=["A"], values=[object()])
+        assert len(seq.steps) == 0
+
+    def test_empty_block(self):
+        assert SequenceCall(name="Main").add_numeric_steps(names=[], values=[]) == []
+
+    def test_round_trip(self):
+        seq = SequenceCall(name="Main")
+        seq.add_numeric_steps(names=["A", "B"], values=[1.5, 2.5], comp_ops=CompOp.LT, low_limits=2.0)
+
+        restored = SequenceCall.model_validate_json(seq.model_dump_json(by_alias=True))
+
+        assert [s.value for s in restored.steps] == [1.5, 2.5]
+
+    def test_faster_than_step_by_step(self):
+        rows = make_rows(2000, seed=4)
+        columns = dict(
+            names=[r["name"] for r in rows], values=[r["value"] for r in rows],
+            comp_ops=[r["comp_op"] for r in rows], low_limits=[r["low_limit"] for r in rows],
+            high_limits=[r["high_limit"] for r in rows],
+        )
+
+        def one_by_one():
+            seq = SequenceCall(name="Main")
+            for row in rows:
+                seq.add_numeric_step(**row)
+
+        def bulk():
+            SequenceCall(name="Main").add_numeric_steps(**columns)
+
+        # Best of three, GC disabled like timeit
+        single = min(timeit.repeat(one_by_one, number=1, repeat=3))
+        block = min(timeit.repeat(bulk, number=1, repeat=3))
+
+        assert block < single
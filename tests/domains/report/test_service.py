@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional, Union
 
 import pytest
@@ -126,3 +127,80 @@ async def test_submit_report_uses_repository(report_service: AsyncReportService)
     assert report_id == "FAKE-ID"
     repo = report_service._repository
     assert repo.wsjf_calls[-1] is uut
+
+
+class PagedHeaderRepository(DummyReportRepository):
+    """Repository serving a fixed header list with $skip/$top semantics."""
+
+    def __init__(self, count: int):
+        super().__init__()
+        base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        self.headers = [
+            ReportHeader(serialNumber=f"SN-{i:04d}", startUtc=base + timedelta(hours=i))
+            for i in range(count)
+        ]
+        self.calls: List[Dict[str, Any]] = []
+
+    async def query_headers(self, report_type="uut", expand=None, odata_filter=None,
+                            top=None, orderby=None, skip=None) -> List[ReportHeader]:
+        self.calls.append({"filter": odata_filter, "top": top, "skip": skip})
+        rows = self.headers
+        if odata_filter and " lt " in odata_filter:
+            lower = datetime.strptime(odata_filter.split("start ge ")[1][:20], "%Y-%m-%dT%H:%M:%SZ")
+            upper = datetime.strptime(odata_filter.split("start lt ")[1][:20], "%Y-%m-%dT%H:%M:%SZ")
+            lower, upper = lower.replace(tzinfo=timezone.utc), upper.replace(tzinfo=timezone.utc)
+            rows = [h for h in rows if lower <= h.start_utc < upper]
+        skip = skip or 0
+        return rows[skip:skip + top] if top is not None else rows[skip:]
+
+
+@pytest.mark.asyncio
+async def test_iter_headers_pages_with_skip_top():
+    repo = PagedHeaderRepository(23)
+    service = AsyncReportService(repo)
+
+    serials = [h.serial_number async for h in service.iter_headers(page_size=10, prefetch=1)]
+
+    assert serials == [f"SN-{i:04d}" for i in range(23)]
+    # One page past the end may be prefetched speculatively
+    assert [(c["skip"], c["top"]) for c in repo.calls][:3] == [(0, 10), (10, 10), (20, 10)]
+    assert len(repo.calls) <= 4
+
+
+@pytest.mark.asyncio
+async def test_iter_headers_max_headers():
+    repo = PagedHeaderRepository(100)
+    service = AsyncReportService(repo)
+
+    headers = [h async for h in service.iter_headers(page_size=10, max_headers=15)]
+
+    assert len(headers) == 15
+    assert max(c["skip"] for c in repo.calls) == 10
+
+
+@pytest.mark.asyncio
+async def test_iter_headers_date_windows():
+    repo = PagedHeaderRepository(72)  # three days of hourly headers
+    service = AsyncReportService(repo)
+    start = datetime(2026, 1, 1)
+
+    serials = [h.serial_number async for h in service.iter_headers(
+        odata_filter="partNumber eq 'PN-1'",
+        start_date=start,
+        end_date=start + timedelta(days=3),
+        window=timedelta(days=1),
+        page_size=10,
+    )]
+
+    assert serials == [f"SN-{i:04d}" for i in range(72)]
+    assert all(c["filter"].startswith("partNumber eq 'PN-1' and start ge") for c in repo.calls)
+    # Windows paginate internally: 24 headers -> 3 pages per window
+    assert len(repo.calls) == 9
+
+
+@pytest.mark.asyncio
+async def test_iter_headers_window_requires_range():
+    service = AsyncReportService(PagedHeaderRepository(0))
+    with pytest.raises(ValueError):
+        async for _ in service.iter_headers(window=timedelta(days=1)):
+            pass
@@ -0,0 +1,203 @@
+"""Tests for date-sharded header queries (ShardedHeaderQuery)."""
+import asyncio
+import re
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from uuid import uuid4
+
+import pytest
+
+from pywats.domains.report import AsyncReportService, ReportHeader, ShardedHeaderQuery
+
+
+BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def make_headers(count: int, spacing: timedelta, burst_at: Optional[int] = None, burst: int = 0,
+                 burst_spacing: timedelta = timedelta(seconds=1)):
+    """Headers spaced evenly, optionally with a burst of extra headers at one slot."""
+    headers = []
+    for i in range(count):
+        start = BASE + spacing * i
+        headers.append(ReportHeader(uuid=uuid4(), serialNumber=f"SN-{i:05d}", startUtc=start))
+        if i == burst_at:
+            headers.extend(
+                ReportHeader(uuid=uuid4(), serialNumber=f"SN-{i:05d}-{b:03d}", startUtc=start + burst_spacing * b)
+                for b in range(burst)
+            )
+    return headers
+
+
+class FakeServer:
+    """Evaluates the 'start ge X and start le Y' filters issued by shards."""
+
+    _pattern = re.compile(r"start ge (\S+) and start le (\S+)")
+
+    def __init__(self, headers: List[ReportHeader], delay: float = 0.0, top_cap: Optional[int] = None):
+        self.headers = headers
+        self.delay = delay
+        self.top_cap = top_cap
+        self.filters: List[str] = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def fetch(self, odata_filter: Optional[str], top: int) -> List[ReportHeader]:
+        self.filters.append(odata_filter)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            lower, upper = (
+                datetime.strptime(v, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+                for v in self._pattern.search(odata_filter).groups()
+            )
+            rows = [h for h in self.headers if lower <= h.start_utc <= upper]
+            rows.sort(key=lambda h: h.start_utc)
+            return rows[:min(top, self.top_cap or top)]
+        finally:
+            self.in_flight -= 1
+
+
+async def collect(query) -> List[ReportHeader]:
+    return [h async for h in query]
+
+
+class TestShardedHeaderQuery:
+    """Tests for shard planning, merging and adaptation."""
+
+    async def test_returns_every_header_once_in_order(self):
+        """Boundary duplicates are removed and output is start-ordered."""
+        headers = make_headers(240, timedelta(minutes=30))  # Boundaries hit exact timestamps
+        server = FakeServer(headers)
+        query = ShardedHeaderQuery(server.fetch, BASE, BASE + timedelta(days=5), shards=10, shard_limit=500)
+
+        result = await collect(query)
+
+        assert [h.serial_number for h in result] == [h.serial_number for h in headers]
+        assert query.stats.duplicates > 0
+        assert query.stats.headers == 240
+
+    async def test_descending_order(self):
+        headers = make_headers(100, timedelta(hours=1))
+        server = FakeServer(headers)
+        query = ShardedHeaderQuery(
+            server.fetch, BASE, BASE + timedelta(days=5), orderby="start desc", shards=4, shard_limit=500
+        )
+
+        result = await collect(query)
+
+        assert [h.serial_number for h in result] == [h.serial_number for h in reversed(headers)]
+
+    async def test_merge_on_other_field(self):
+        """Non-time orderby is k-way merged across shards."""
+        headers = make_headers(50, timedelta(hours=1))
+        for h, sn in zip(headers, reversed([h.serial_number for h in headers])):
+            h.serial_number = sn
+        server = FakeServer(headers)
+        query = ShardedHeaderQuery(
+            server.fetch, BASE, BASE + timedelta(days=3), orderby="serialNumber", shards=5, shard_limit=500
+        )
+
+        result = await collect(query)
+
+        assert [h.serial_number for h in result] == sorted(h.serial_number for h in headers)
+
+    async def test_concurrency_is_bounded(self):
+        server = FakeServer(make_headers(100, timedelta(hours=1)), delay=0.01)
+        query = ShardedHeaderQuery(
+            server.fetch, BASE, BASE + timedelta(days=5), shards=20, max_concurrent=3, shard_limit=500
+        )
+
+        await collect(query)
+
+        assert server.peak == 3
+
+    async def test_saturated_shard_is_split(self):
+        """A shard hitting shard_limit is split so no header is lost."""
+        headers = make_headers(48, timedelta(hours=1), burst_at=10, burst=120)
+        server = FakeServer(headers)
+        query = ShardedHeaderQuery(server.fetch, BASE, BASE + timedelta(days=2), shards=2, shard_limit=100)
+
+        result = await collect(query)
+
+        assert len(result) == len(headers)
+        assert query.stats.splits > 0
+
+    async def test_unsplittable_shard_is_reported_truncated(self):
+        """Headers packed into one second cannot be split further."""
+        headers = make_headers(1, timedelta(hours=1), burst_at=0, burst=50, burst_spacing=timedelta(milliseconds=1))
+        server = FakeServer(headers)
+        query = ShardedHeaderQuery(server.fetch, BASE, BASE + timedelta(hours=1), shards=1, shard_limit=20)
+
+        result = await collect(query)
+
+        assert len(result) == 20
+        assert query.stats.truncated == 1
+
+    async def test_shard_size_adapts_to_density(self):
+        """Sparse data leads to fewer, longer shards than the initial split."""
+        headers = make_headers(30, timedelta(days=1))
+        server = FakeServer(headers)
+        query = ShardedHeaderQuery(
+            server.fetch, BASE, BASE + timedelta(days=30), shards=30, max_concurrent=1, shard_limit=100
+        )
+
+        result = await collect(query)
+
+        assert len(result) == 30
+        assert query.stats.shards < 30
+
+    async def test_break_cancels_running_shards(self):
+        server = FakeServer(make_headers(100, timedelta(hours=1)), delay=0.02)
+        query = ShardedHeaderQuery(server.fetch, BASE, BASE + timedelta(days=5), shards=10, shard_limit=500)
+
+        stream = query.stream()
+        async for _ in stream:
+            break
+        await stream.aclose()
+
+        assert server.in_flight == 0
+
+    def test_rejects_unknown_orderby_field(self):
+        with pytest.raises(ValueError):
+            ShardedHeaderQuery(lambda f, t: None, BASE, BASE + timedelta(days=1), orderby="bogus")
+
+
+class ShardRepository:
+    """Repository adapter over FakeServer for AsyncReportService."""
+
+    def __init__(self, server: FakeServer):
+        self.server = server
+        self.calls = []
+
+    async def query_headers(self, report_type="uut", expand=None, odata_filter=None,
+                            top=None, orderby=None, skip=None):
+        self.calls.append({"orderby": orderby, "top": top})
+        return await self.server.fetch(odata_filter, top)
+
+
+class TestServiceShardedQueries:
+    """AsyncReportService integration of sharded queries."""
+
+    async def test_iter_headers_sharded(self):
+        headers = make_headers(96, timedelta(hours=1))
+        repo = ShardRepository(FakeServer(headers))
+        service = AsyncReportService(repo)
+
+        result = [h async for h in service.iter_headers_sharded(
+            BASE, BASE + timedelta(days=4), odata_filter="partNumber eq 'PN-1'", shards=4, shard_limit=200,
+        )]
+
+        assert len(result) == 96
+        assert all(f.startswith("partNumber eq 'PN-1' and start ge") for f in repo.server.filters)
+        assert all(c["top"] == 200 and c["orderby"] == "start" for c in repo.calls)
+
+    async def test_get_headers_by_date_range_sharded(self):
+        headers = make_headers(96, timedelta(hours=1))
+        repo = ShardRepository(FakeServer(headers))
+        service = AsyncReportService(repo)
+
+        result = await service.get_headers_by_date_range(BASE, BASE + timedelta(days=4), shards=4)
+
+        assert [h.serial_number for h in result] == [h.serial_number for h in headers]
+        assert len(repo.calls) >= 4
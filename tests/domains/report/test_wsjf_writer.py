@@ -0,0 +1,183 @@
+"""Tests for the streaming WSJF writer."""
+import io
+import json
+import math
+
+import httpx
+import pytest
+
+from pywats.core.async_client import AsyncHttpClient
+from pywats.core.retry import RetryConfig
+from pywats.domains.report import (
+    AsyncReportRepository,
+    UUTReport,
+    WSJFDocument,
+    WSJFStreamWriter,
+)
+from pywats.domains.report.enums import ImportMode
+from pywats.domains.report.import_mode import set_import_mode
+from pywats.shared.enums import CompOp
+
+
+@pytest.fixture
+def active_mode():
+    set_import_mode(ImportMode.Active)
+    yield
+    set_import_mode(ImportMode.Import)
+
+
+def make_header() -> UUTReport:
+    report = UUTReport(
+        id="1172432c-e824-4982-9f48-5d2dca2ba07b", pn="PCBA-1", sn="SN-1", rev="A",
+        process_code=10, station_name="ICT-1", location="Lab", purpose="Test",
+        result="P", start="2026-01-01T08:00:00+00:00",
+    )
+    report.add_misc_info(description="Fixture", value="F7")
+    report.get_root_sequence_call()
+    return report
+
+
+def fill(root) -> None:
+    """Same content for a SequenceCall and a StreamSequence."""
+    ict = root.add_sequence_call("ICT", report_text="in-circuit")
+    for i in range(50):
+        ict.add_numeric_step(name=f"R{i}", value=100.0 + i * 0.2, unit="Ohm",
+                             comp_op=CompOp.GELE, low_limit=95.0, high_limit=105.0)
+    ict.add_numeric_steps(names=["C1", "C2"], values=[1.0, 2.0], units="uF")
+    multi = ict.add_multi_numeric_step(name="Rails")
+    multi.add_measurement(name="3V3", value=3.3, unit="V", comp_op=CompOp.GELE, low_limit=3.2, high_limit=3.4)
+    multi.add_measurement(name="5V", value=5.0, unit="V", comp_op=CompOp.GELE, low_limit=4.9, high_limit=5.1)
+    if hasattr(ict, "close"):
+        ict.close()
+    root.add_boolean_step(name="LED")
+    root.add_string_step(name="FW", value="1.2.3")
+    empty = root.add_sequence_call("Empty")
+    if hasattr(empty, "close"):
+        empty.close()
+
+
+def expected_dict(**finish) -> dict:
+    report = make_header()
+    fill(report.root)
+    if "result" in finish:
+        report.result = finish["result"]
+    return report.model_dump(mode="json", by_alias=True, exclude_none=True)
+
+
+def stream(target=None, **finish) -> WSJFDocument:
+    writer = WSJFStreamWriter(make_header(), target=target)
+    fill(writer.root)
+    return writer.finish(**finish)
+
+
+class TestWSJFStreamWriter:
+    """Streamed output must equal the model path."""
+
+    def test_matches_model_dump(self):
+        document = stream()
+
+        assert document.to_dict() == expected_dict()
+        assert (document.pn, document.sn) == ("PCBA-1", "SN-1")
+
+    def test_failures_patch_statuses_and_result(self, active_mode):
+        document = stream(result="Failed")
+        data = document.to_dict()
+
+        assert data == expected_dict(result="F")
+        assert data["result"] == "F"
+        assert data["root"]["status"] == "F"
+        assert [s["status"] for s in data["root"]["steps"][:2]] == ["F", "P"]
+
+    def test_writes_to_given_stream_at_offset(self):
+        target = io.BytesIO(b"junk")
+        target.seek(4)
+
+        document = stream(target=target)
+
+        assert json.loads(document.read_bytes()) == expected_dict()
+        assert target.getvalue().startswith(b"junk{")
+
+    def test_steps_are_released(self):
+        writer = WSJFStreamWriter(make_header())
+        for i in range(10):
+            writer.root.add_numeric_step(name=f"S{i}", value=float(i))
+
+        assert len(writer.root.step.steps) == 1  # Only the latest, still mutable
+        assert writer.root.step_count == 9
+
+    def test_spools_to_disk(self):
+        writer = WSJFStreamWriter(make_header(), spool_size=1024)
+        for i in range(200):
+            writer.root.add_numeric_step(name=f"S{i}", value=float(i))
+        document = writer.finish()
+
+        assert document.size > 1024
+        assert len(document.to_dict()["root"]["steps"]) == 200
+
+    def test_only_innermost_sequence_accepts_steps(self):
+        writer = WSJFStreamWriter(make_header())
+        child = writer.root.add_sequence_call("Child")
+
+        with pytest.raises(RuntimeError, match="innermost"):
+            writer.root.add_boolean_step(name="B")
+        child.close()
+        with pytest.raises(RuntimeError, match="closed"):
+            child.add_boolean_step(name="B")
+
+    def test_finish_closes_open_sequences(self):
+        writer = WSJFStreamWriter(make_header())
+        writer.root.add_sequence_call("A").add_sequence_call("B").add_boolean_step(name="X")
+
+        data = writer.finish().to_dict()
+
+        assert data["root"]["steps"][0]["steps"][0]["steps"][0]["name"] == "X"
+
+    def test_invalid_step_is_rejected(self):
+        writer = WSJFStreamWriter(make_header())
+        writer.root.add_numeric_step(name="NaN", value=math.nan)
+
+        with pytest.raises(ValueError):
+            writer.root.add_boolean_step(name="Next")
+
+    def test_header_with_steps_rejected(self):
+        report = make_header()
+        report.root.add_boolean_step(name="B")
+
+        with pytest.raises(ValueError, match="steps"):
+            WSJFStreamWriter(report)
+
+    def test_write_to_stream(self):
+        target = io.BytesIO()
+        with stream() as document:
+            assert document.write_to(target) == document.size
+
+        assert json.loads(target.getvalue()) == expected_dict()
+
+
+class TestPostStreamedDocument:
+    """AsyncReportRepository.post_wsjf streams the document."""
+
+    async def test_post_with_retry(self):
+        bodies = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            bodies.append((request.headers.get("content-length"), await request.aread()))
+            if len(bodies) == 1:
+                return httpx.Response(503)
+            return httpx.Response(200, json={"ID": "abc"})
+
+        client = AsyncHttpClient(
+            "http://wats.test", "dGVzdDp0ZXN0",
+            transport=httpx.MockTransport(handler),
+            enable_throttling=False, enable_cache=False,
+            retry_config=RetryConfig(retry_methods={"POST"}, base_delay=0.0, jitter=False),
+        )
+        document = stream()
+
+        async with client:
+            assert await AsyncReportRepository(client).post_wsjf(document) == "abc"
+
+        assert len(bodies) == 2
+        for length, body in bodies:
+            assert int(length) == document.size
+            assert json.loads(body) == expected_dict()
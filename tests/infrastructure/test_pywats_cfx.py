@@ -4,6 +4,8 @@ Unit Tests for pywats_cfx - IPC-CFX Integration.
 Tests for CFX message models, adapters, and transport.
 """
 
+import asyncio
+import json
 import pytest
 from datetime import datetime
 from uuid import uuid4
@@ -47,6 +49,8 @@ from pywats_cfx.config import (
     ExchangeConfig,
 )
 
+from pywats_cfx.transport import CFXTransport, MemoryBroker
+
 
 # =============================================================================
 # CFX Message Model Tests
@@ -515,5 +519,134 @@ class TestCFXConfig:
         assert config.exchange.exchange_name == "cfx.custom"
 
 
+# =============================================================================
+# Transport Tests
+# =============================================================================
+
+def make_transport(broker: MemoryBroker, on_event=None, **exchange) -> CFXTransport:
+    config = CFXConfig(
+        endpoint=EndpointConfig(cfx_handle="//Test/WATS/Station1"),
+        exchange=ExchangeConfig(**exchange),
+        auto_reconnect=False,
+        publish_endpoint_connected=False,
+        publish_endpoint_disconnected=False,
+    )
+    return CFXTransport(config, on_event=on_event, amqp=broker)
+
+
+def inbound(broker: MemoryBroker, source: str, seq: int) -> None:
+    body = {"MessageName": "CFX.Production.Testing.Probe", "Src": source, "Seq": seq}
+    broker.deliver("cfx.exchange", "CFX.Production.Testing.Probe", json.dumps(body).encode(), app_id=source)
+
+
+class TestCFXTransport:
+    """Tests for CFXTransport against the in-process broker."""
+    
+    @pytest.mark.asyncio
+    async def test_send_batch_confirms_in_batches(self):
+        """Should publish through one cached exchange, confirming in batches."""
+        broker = MemoryBroker(confirm_latency=0.01)
+        transport = make_transport(broker, publish_batch_size=25)
+        await transport.connect()
+        events = [Event(event_type=EventType.TEST_RESULT, payload={"n": i}) for i in range(100)]
+        
+        await transport.send_batch(events)
+        
+        stats = transport.get_statistics()
+        assert stats["messages_sent"] == 100
+        assert stats["publish_batches"] == 4
+        assert broker.published == 100
+        assert broker.exchanges_declared == 1
+        assert broker.exchange_lookups == 0
+        await transport.disconnect()
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_senders_share_batches(self):
+        """Should group sends that arrive while a batch is in flight."""
+        broker = MemoryBroker(confirm_latency=0.01)
+        transport = make_transport(broker)
+        await transport.connect()
+        
+        await asyncio.gather(*(
+            transport.send(Event(event_type=EventType.TEST_RESULT, payload={"n": i}))
+            for i in range(50)
+        ))
+        
+        assert transport.get_statistics()["publish_batches"] < 50
+        await transport.disconnect()
+    
+    @pytest.mark.asyncio
+    async def test_publish_failure_raised_to_sender(self):
+        """Should raise a failed confirm to its sender only."""
+        broker = MemoryBroker()
+        transport = make_transport(broker)
+        await transport.connect()
+        publish = transport._exchange.publish
+        
+        async def flaky(message, routing_key):
+            if json.loads(message.body)["Payload"]["n"] == 1:
+                raise ConnectionError("nack")
+            await publish(message, routing_key=routing_key)
+        
+        transport._exchange.publish = flaky
+        
+        with pytest.raises(ConnectionError):
+            await transport.send_batch([
+                Event(event_type=EventType.TEST_RESULT, payload={"n": i}) for i in range(3)
+            ])
+        
+        stats = transport.get_statistics()
+        assert (stats["messages_sent"], stats["publish_errors"]) == (2, 1)
+        await transport.disconnect()
+    
+    @pytest.mark.asyncio
+    async def test_send_requires_connection(self):
+        """Should refuse to send while disconnected."""
+        transport = make_transport(MemoryBroker())
+        
+        with pytest.raises(RuntimeError):
+            await transport.send(Event(event_type=EventType.TEST_RESULT))
+    
+    @pytest.mark.asyncio
+    async def test_parallel_consumers_keep_source_order(self):
+        """Should handle sources in parallel and each source in order."""
+        broker = MemoryBroker()
+        received = {}
+        active = 0
+        peak = 0
+        
+        async def on_event(event):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.001 * (event.payload["Seq"] % 3))
+            received.setdefault(event.payload["Src"], []).append(event.payload["Seq"])
+            active -= 1
+        
+        transport = make_transport(broker, on_event, consumer_concurrency=4, prefetch_count=16)
+        await transport.connect()
+        for seq in range(30):
+            for source in ("//A", "//B", "//C", "//D", "//E", "//F"):
+                inbound(broker, source, seq)
+        
+        for _ in range(200):
+            if sum(map(len, received.values())) == 180:
+                break
+            await asyncio.sleep(0.01)
+        
+        assert all(seqs == list(range(30)) for seqs in received.values())
+        assert len(received) == 6
+        assert 1 < peak <= 4
+        channel = transport._channel
+        assert channel.max_unacked <= 16
+        assert channel.acked == 180
+        await transport.disconnect()
+    
+    def test_sync_start_not_supported(self):
+        """Should point sync callers at the async API."""
+        with pytest.raises(NotImplementedError):
+            make_transport(MemoryBroker()).start()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
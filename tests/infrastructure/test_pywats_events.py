@@ -5,6 +5,9 @@ Tests for Event, EventBus, handlers, and policies.
 """
 
 import asyncio
+import os
+import threading
+import time
 import pytest
 from datetime import datetime, timedelta
 from unittest.mock import Mock, AsyncMock, patch
@@ -21,6 +24,10 @@ from pywats_events import (
 )
 from pywats_events.policies.retry_policy import RetryPolicy, RetryConfig
 from pywats_events.policies.error_policy import ErrorPolicy, DeadLetterQueue, CircuitBreaker, CircuitState
+from pywats_events.policies.dead_letter_log import PersistentDeadLetterQueue
+from pywats_events.routing import EventFilter, EventRouter
+from pywats_events.routing.router import RoutingRule, all_of, by_payload, by_source, by_type
+from pywats_events.telemetry.tracing import EventTracer, TraceRingBuffer
 from pywats_events.transports import MockTransport
 
 
@@ -92,6 +99,86 @@ class TestEvent:
         
         assert event.payload == {"test": "data"}
         assert event.metadata.correlation_id == "abc"
+    
+    def test_event_ids_are_unique_and_time_ordered(self):
+        """Generated IDs parse as UUIDs and sort by creation order."""
+        from uuid import UUID
+        
+        ids = [Event(event_type=EventType.TEST_RESULT).id for _ in range(1000)]
+        
+        assert len(set(ids)) == 1000
+        assert ids == sorted(ids)
+        assert UUID(ids[0]).version == 7
+    
+    def test_metadata_round_trip(self):
+        """to_dict/from_dict keep identity and timestamp."""
+        metadata = EventMetadata(source="cfx", custom={"line": 1})
+        
+        restored = EventMetadata.from_dict(metadata.to_dict())
+        
+        assert restored == metadata
+        assert restored.timestamp == metadata.timestamp
+        assert restored.timestamp.tzinfo is not None
+    
+    def test_retry_copy_shares_custom_until_written(self):
+        """Retry copies keep the event ID and copy custom only on access."""
+        event = Event(
+            event_type=EventType.TEST_RESULT,
+            metadata=EventMetadata(custom={"line": 1}),
+        )
+        
+        retried = event.with_retry()
+        retried.metadata.custom["attempt"] = 2
+        
+        assert retried.id == event.id
+        assert retried.metadata.retry_count == 1
+        assert event.metadata.custom == {"line": 1}
+        assert retried.metadata.custom == {"line": 1, "attempt": 2}
+    
+    def test_derive_links_causation(self):
+        """Derived events get a new ID linked to the causing event."""
+        event = Event.create(EventType.TEST_RESULT, {}, source="cfx", custom={"line": 1})
+        
+        derived = event.derive(EventType.ASSET_FAULT, {"fault": "x"}, source="rules")
+        derived.metadata.custom["rule"] = "r1"
+        
+        assert derived.id != event.id
+        assert derived.metadata.causation_id == event.id
+        assert derived.metadata.correlation_id == event.id
+        assert derived.source == "rules"
+        assert event.metadata.custom == {"line": 1}
+    
+    def test_custom_reference_does_not_reach_copies(self):
+        """Writes through a custom dict taken before copying stay on the original."""
+        event = Event(event_type=EventType.TEST_RESULT, metadata=EventMetadata())
+        event.metadata.custom["line"] = 1
+        custom = event.metadata.custom
+        
+        retried = event.with_retry()
+        derived = event.derive(EventType.ASSET_FAULT, {})
+        custom["late"] = True
+        
+        assert event.metadata.custom == {"line": 1, "late": True}
+        assert retried.metadata.custom == {"line": 1}
+        assert derived.metadata.custom == {"line": 1}
+    
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    def test_forked_child_generates_different_ids(self):
+        """A forked child reseeds instead of repeating the parent's IDs."""
+        from pywats_events.models.event import new_event_id
+        
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.write(write_fd, new_event_id(created=0).encode())
+            os._exit(0)
+        os.close(write_fd)
+        os.waitpid(pid, 0)
+        with os.fdopen(read_fd) as f:
+            child_id = f.read()
+        
+        assert child_id
+        assert child_id[14:] != new_event_id(created=0)[14:]
 
 
 # =============================================================================
@@ -368,6 +455,336 @@ class TestDeadLetterQueue:
         assert dlq.size == 3
 
 
+class TestPersistentDeadLetterQueue:
+    """Tests for PersistentDeadLetterQueue."""
+    
+    def test_survives_restart(self, tmp_path):
+        """Entries and their index should be restored from the log."""
+        dlq = PersistentDeadLetterQueue(tmp_path)
+        event = Event(event_type=EventType.TEST_RESULT, payload={"sn": "SN1"})
+        dlq.add(event, ValueError("boom"), handler_name="ReportHandler")
+        dlq.add(Event(event_type=EventType.ASSET_FAULT, payload={}), KeyError("x"))
+        
+        reopened = PersistentDeadLetterQueue(tmp_path)
+        
+        assert reopened.size == 2
+        entry = reopened.peek()
+        assert entry.event.id == event.id
+        assert entry.event.payload == {"sn": "SN1"}
+        assert entry.handler_name == "ReportHandler"
+        assert str(entry.error) == "boom"
+        assert entry.error.error_type == "ValueError"
+        assert reopened.count(event_type="test.result") == 1
+        assert reopened.count(handler_name="ReportHandler") == 1
+    
+    def test_pop_is_persisted(self, tmp_path):
+        """Removed entries should stay removed after restart."""
+        dlq = PersistentDeadLetterQueue(tmp_path)
+        for i in range(3):
+            dlq.add(Event(event_type=EventType.TEST_RESULT, payload={"i": i}), ValueError())
+        
+        assert dlq.pop().event.payload == {"i": 0}
+        
+        reopened = PersistentDeadLetterQueue(tmp_path)
+        assert [e.event.payload["i"] for e in reopened.get_entries()] == [2, 1]
+    
+    def test_segments_rotate_and_are_collected(self, tmp_path):
+        """Fully acknowledged segments should be deleted."""
+        dlq = PersistentDeadLetterQueue(tmp_path, segment_max_bytes=1)
+        for i in range(4):
+            dlq.add(Event(event_type=EventType.TEST_RESULT, payload={"i": i}), ValueError())
+        assert len(list(tmp_path.glob("dlq-*.log"))) == 4
+        
+        dlq.clear()
+        
+        assert len(list(tmp_path.glob("dlq-*.log"))) <= 1
+        assert PersistentDeadLetterQueue(tmp_path).size == 0
+    
+    def test_torn_tail_is_ignored(self, tmp_path):
+        """A partially written last record should not break loading."""
+        dlq = PersistentDeadLetterQueue(tmp_path)
+        dlq.add(Event(event_type=EventType.TEST_RESULT, payload={}), ValueError())
+        with open(next(tmp_path.glob("dlq-*.log")), "a") as f:
+            f.write('{"seq": 2, "ev')
+        
+        assert PersistentDeadLetterQueue(tmp_path).size == 1
+    
+    def test_max_size_counts_drops(self, tmp_path):
+        """A bounded queue should count the entries it drops."""
+        dlq = PersistentDeadLetterQueue(tmp_path, max_size=2)
+        for i in range(3):
+            dlq.add(Event(event_type=EventType.TEST_RESULT, payload={"i": i}), ValueError())
+        
+        assert dlq.size == 2
+        assert dlq.dropped == 1
+    
+    @pytest.mark.asyncio
+    async def test_replay_async_filtered_and_throttled(self, tmp_path):
+        """Replay should republish matching entries at the given rate."""
+        dlq = PersistentDeadLetterQueue(tmp_path)
+        for i in range(5):
+            event = Event(event_type=EventType.TEST_RESULT, payload={"i": i})
+            event.metadata.retry_count = 3
+            dlq.add(event, ValueError(), handler_name="A" if i % 2 == 0 else "B")
+        bus = AsyncEventBus()
+        received = []
+        
+        class Handler(BaseHandler):
+            @property
+            def event_types(self) -> list[EventType]:
+                return [EventType.TEST_RESULT]
+            
+            async def handle(self, event: Event) -> None:
+                received.append(event)
+        
+        bus.register_handler(Handler())
+        
+        result = await dlq.replay_async(bus, handler_name="A", rate=50)
+        
+        assert result.replayed == 3
+        assert result.duration >= 2 / 50
+        assert [e.payload["i"] for e in received] == [0, 2, 4]
+        assert all(e.metadata.retry_count == 0 for e in received)
+        assert dlq.count() == 2
+        assert dlq.handler_names() == {"B": 2}
+    
+    @pytest.mark.asyncio
+    async def test_async_bus_writes_off_the_event_loop(self, tmp_path):
+        """On an AsyncEventBus, log appends and replay reads run in worker threads."""
+        added = []
+        dlq = PersistentDeadLetterQueue(tmp_path, on_add=lambda entry: added.append(threading.current_thread()))
+        bus = AsyncEventBus(error_policy=ErrorPolicy(dead_letter_queue=dlq))
+        io_threads = []
+        write, read = dlq._write, dlq._read
+        dlq._write = lambda *args: (io_threads.append(threading.current_thread()), write(*args))[1]
+        dlq._read = lambda seq: (io_threads.append(threading.current_thread()), read(seq))[1]
+        
+        class FailingHandler(BaseHandler):
+            @property
+            def event_types(self) -> list[EventType]:
+                return [EventType.TEST_RESULT]
+            
+            async def handle(self, event: Event) -> None:
+                raise RuntimeError("still down")
+        
+        bus.register_handler(FailingHandler())
+        await bus.publish(Event(event_type=EventType.TEST_RESULT, payload={}))
+        assert dlq.size == 1
+        
+        await dlq.replay_async(bus, rate=None)
+        
+        assert dlq.size == 1
+        assert added == [threading.current_thread()] * 2  # Callbacks stay on the loop
+        assert io_threads and threading.current_thread() not in io_threads
+    
+    def test_replay_refailures_are_dead_lettered_again(self, tmp_path):
+        """An event failing during replay should return to the queue once."""
+        dlq = PersistentDeadLetterQueue(tmp_path)
+        bus = EventBus(error_policy=ErrorPolicy(dead_letter_queue=dlq))
+        
+        class FailingHandler(BaseHandler):
+            @property
+            def event_types(self) -> list[EventType]:
+                return [EventType.TEST_RESULT]
+            
+            async def handle(self, event: Event) -> None:
+                raise RuntimeError("still down")
+        
+        bus.register_handler(FailingHandler())
+        bus.publish(Event(event_type=EventType.TEST_RESULT, payload={}))
+        assert dlq.handler_names() == {"FailingHandler": 1}
+        
+        result = dlq.replay(bus, rate=None)
+        
+        assert result.replayed == 1
+        assert dlq.size == 1
+
+
+class TestEventRouter:
+    """Tests for EventRouter compiled routing."""
+    
+    @staticmethod
+    def _event(event_type=EventType.TEST_RESULT, source="cfx", **payload):
+        return Event(event_type=event_type, payload=payload, metadata=EventMetadata(source=source))
+    
+    def test_priority_order_across_indexed_and_residual_rules(self):
+        """The highest-priority matching rule wins regardless of how it is indexed."""
+        router = EventRouter()
+        router.add_rule(RoutingRule("by_type", by_type(EventType.TEST_RESULT), priority=50), "type_handler")
+        router.add_rule(RoutingRule("custom", lambda e: e.payload.get("n", 0) > 5, priority=10), "custom_handler")
+        router.add_rule(RoutingRule("by_source", by_source("cfx"), priority=20), "source_handler")
+        
+        assert router.route(self._event(n=9)) == "custom_handler"
+        assert router.route(self._event(n=1)) == "source_handler"
+        assert router.route(self._event(source="mqtt")) == "type_handler"
+        assert router.get_all_handlers(self._event(n=9)) == ["custom_handler", "source_handler", "type_handler"]
+        assert router.route(self._event(EventType.ASSET_FAULT, "mqtt")) is None
+    
+    def test_only_candidate_rules_are_evaluated(self):
+        """Indexed rules for other keys are never evaluated."""
+        router = EventRouter()
+        calls = []
+        
+        for n in range(300):
+            def check(event, n=n):
+                calls.append(n)
+                return True
+            router.add_rule(RoutingRule(f"station{n}", all_of(by_payload("station", n), check)), n)
+        
+        assert router.route(self._event(station=123)) == 123
+        assert calls == [123]
+        assert router.route(self._event(station="unknown")) is None
+    
+    def test_event_filter_rules_are_indexed(self):
+        """EventFilter predicates index by their merged field constraints."""
+        router = EventRouter()
+        failures = EventFilter().by_type(EventType.TEST_RESULT).payload_equals("result", "fail")
+        router.add_rule(RoutingRule("failures", failures), "fail_handler")
+        router.set_default_handler("default")
+        
+        assert router.rule_count == 1
+        assert router.route(self._event(result="fail")) == "fail_handler"
+        assert router.route(self._event(result="pass")) == "default"
+        
+        router.clear()
+        assert router.route(self._event(result="fail")) is None
+    
+    def test_unhashable_payload_values(self):
+        """Unhashable payload values simply don't match indexed rules."""
+        router = EventRouter()
+        router.add_rule(RoutingRule("tags", by_payload("tags", "a")), "tags_handler")
+        router.add_rule(RoutingRule("list", by_payload("tags", ["a"])), "list_handler")
+        
+        assert router.route(self._event(tags=["a"])) == "list_handler"
+        assert router.route(self._event(tags="a")) == "tags_handler"
+
+
+class TestEventFilter:
+    """Tests for EventFilter."""
+    
+    def test_repeated_conditions_are_merged(self):
+        """Multiple type conditions intersect; exclusions apply."""
+        event_filter = (EventFilter()
+            .by_type(EventType.TEST_RESULT, EventType.ASSET_FAULT)
+            .by_type(EventType.TEST_RESULT)
+            .exclude_source("sim")
+        )
+        
+        assert event_filter.matches(Event(event_type=EventType.TEST_RESULT, payload={}))
+        assert not event_filter.matches(Event(event_type=EventType.ASSET_FAULT, payload={}))
+        assert not event_filter.matches(Event(
+            event_type=EventType.TEST_RESULT, payload={}, metadata=EventMetadata(source="sim")
+        ))
+    
+    def test_combinators_and_custom_predicates(self):
+        """AND/OR/NOT and where() keep their semantics."""
+        fail = EventFilter().payload_in("result", ["fail", "error"])
+        cfx = EventFilter().where(lambda e: e.payload.get("line") == 1)
+        event = Event(event_type=EventType.TEST_RESULT, payload={"result": "fail", "line": 2})
+        
+        assert fail.matches(event)
+        assert not (fail & cfx).matches(event)
+        assert (fail | cfx).matches(event)
+        assert (~cfx).matches(event)
+        assert EventFilter().has_payload_key("line").matches(event)
+
+
+class TestEventTracer:
+    """Tests for EventTracer buffered export."""
+    
+    def test_export_happens_off_the_dispatch_path(self):
+        """Closing a trace only buffers it; flush formats and exports."""
+        tracer = EventTracer(flush_interval=60)
+        exported = []
+        tracer.add_exporter(exported.append)
+        
+        with tracer.trace("dispatch") as context:
+            context.current_span.set_attribute("handler", "ReportHandler")
+        
+        assert exported == []
+        assert tracer.flush() == 1
+        
+        span = exported[0]["spans"][0]
+        assert span["attributes"]["handler"] == "ReportHandler"
+        assert datetime.fromisoformat(span["start_time"]).tzinfo is not None
+        assert span["duration_ms"] >= 0
+        tracer.shutdown()
+    
+    def test_trace_event_attributes(self):
+        """trace_event records event identity on the root span."""
+        tracer = EventTracer(flush_interval=60)
+        exported = []
+        tracer.add_exporter(exported.append)
+        event = Event(event_type=EventType.TEST_RESULT, payload={})
+        
+        with tracer.trace_event(event) as span:
+            span.set_attribute("result", "success")
+        tracer.shutdown()
+        
+        attributes = exported[0]["spans"][0]["attributes"]
+        assert attributes["event.id"] == event.id
+        assert attributes["result"] == "success"
+    
+    def test_sampling_keeps_error_traces(self):
+        """Sampled-out traces are counted; error traces are always exported."""
+        tracer = EventTracer(flush_interval=60, sample_rate=0.0)
+        exported = []
+        tracer.add_exporter(exported.append)
+        
+        for _ in range(5):
+            with tracer.trace("ok"):
+                pass
+        with pytest.raises(RuntimeError):
+            with tracer.trace("failing"):
+                raise RuntimeError("boom")
+        tracer.shutdown()
+        
+        assert len(exported) == 1
+        assert exported[0]["spans"][0]["status"] == "error"
+        assert tracer.stats["sampled_out"] == 5
+    
+    def test_batch_exporter_receives_lists(self):
+        """Batch exporters are called once per batch."""
+        tracer = EventTracer(flush_interval=60, batch_size=4)
+        batches = []
+        tracer.add_exporter(batches.append, batch=True)
+        
+        for _ in range(10):
+            with tracer.trace("op"):
+                pass
+        tracer.shutdown()
+        
+        assert sum(len(batch) for batch in batches) == 10
+        assert all(len(batch) <= 4 for batch in batches)
+        assert tracer.stats["exported"] == 10
+    
+    def test_background_exporter_flushes_on_interval(self):
+        """The exporter thread picks up traces without an explicit flush."""
+        tracer = EventTracer(flush_interval=0.05)
+        exported = []
+        tracer.add_exporter(exported.append)
+        
+        with tracer.trace("op"):
+            pass
+        
+        deadline = time.monotonic() + 2.0
+        while not exported and time.monotonic() < deadline:
+            time.sleep(0.01)
+        tracer.shutdown()
+        
+        assert len(exported) == 1
+    
+    def test_ring_buffer_overwrites_oldest(self):
+        """A full ring drops the oldest trace and counts it."""
+        ring = TraceRingBuffer(capacity=3)
+        for n in range(5):
+            ring.push(n)
+        
+        assert ring.dropped == 2
+        assert ring.drain(10) == [2, 3, 4]
+        assert len(ring) == 0
+
+
 class TestCircuitBreaker:
     """Tests for CircuitBreaker."""
     
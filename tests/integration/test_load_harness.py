@@ -0,0 +1,303 @@
+"""
+Tests for the server stand-in, load generator and HTTP record/replay
+(pywats_dev.perf).
+
+The stand-in is exercised through the real AsyncWATS client via transport
+injection, so these tests also cover the client request path end to end.
+"""
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from pywats import AsyncWATS
+from pywats_dev.perf import (
+    Cassette,
+    LoadGenerator,
+    RecordingTransport,
+    ReplayMismatchError,
+    ReplayTransport,
+    StandInBehavior,
+    WATSStandInServer,
+)
+from pywats_dev.perf.cassette import HAS_ZSTD, Interaction
+
+
+def _api(server: WATSStandInServer, **kwargs) -> AsyncWATS:
+    return AsyncWATS(
+        base_url=server.base_url,
+        token="dGVzdDp0ZXN0",
+        transport=server.transport(),
+        enable_throttling=False,
+        enable_cache=False,
+        **kwargs,
+    )
+
+
+class TestStandInServer:
+    """Tests for WATSStandInServer routes and fault injection."""
+
+    async def test_product_and_process_lookup(self):
+        """Seeded products and default processes are served."""
+        server = WATSStandInServer()
+        server.add_product("PN-001", description="Widget")
+
+        async with _api(server) as api:
+            product = await api.product.get_product("PN-001")
+            processes = await api.process.get_processes()
+
+        assert product.part_number == "PN-001"
+        assert product.description == "Widget"
+        assert {p.code for p in processes} == {10, 100, 500}
+
+    async def test_submit_indexes_header(self):
+        """Submitted reports are stored and queryable."""
+        server = WATSStandInServer()
+        generator = LoadGenerator(server)
+
+        async with _api(server) as api:
+            report_id = await api.report.submit(generator.make_report("SN-0001"))
+            headers = await api.report.query_headers(odata_filter="serialNumber eq 'SN-0001'")
+
+        assert report_id in server.reports
+        assert "SN-0001" in server.accepted_at
+        assert len(headers) == 1
+        assert headers[0].part_number == "PN-LOAD-001"
+
+    async def test_header_query_filter_paging(self):
+        """Header queries honour $filter, $orderby, $skip and $top."""
+        server = WATSStandInServer()
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        server.seed_headers(100, start, start + timedelta(days=10), part_numbers=["A", "B"])
+
+        async with _api(server) as api:
+            only_a = await api.report.query_headers(odata_filter="partNumber eq 'A'")
+            window = await api.report.query_headers(
+                odata_filter="start ge 2024-01-06T00:00:00Z and partNumber eq 'B'",
+                orderby="start desc",
+            )
+            page = await api.report.query_headers(orderby="start", skip=10, top=5)
+
+        assert len(only_a) == 50
+        assert window and all(h.part_number == "B" for h in window)
+        assert window[0].start_utc >= window[-1].start_utc
+        assert [h.serial_number for h in page] == [f"SEED-{i:08d}" for i in range(10, 15)]
+
+    async def test_max_top_caps_page_size(self):
+        """Server-side page size limit is applied."""
+        server = WATSStandInServer(StandInBehavior(max_top=7))
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        server.seed_headers(20, start, start + timedelta(days=1))
+
+        async with _api(server) as api:
+            headers = await api.report.query_headers(top=100)
+
+        assert len(headers) == 7
+
+    async def test_unknown_route_returns_404(self):
+        """Unrouted paths return 404."""
+        server = WATSStandInServer()
+        async with httpx.AsyncClient(transport=server.transport(), base_url=server.base_url) as client:
+            response = await client.get("/api/Nope")
+        assert response.status_code == 404
+
+    async def test_error_injection(self):
+        """error_rate=1.0 fails every request with 500."""
+        server = WATSStandInServer(StandInBehavior(error_rate=1.0))
+        async with httpx.AsyncClient(transport=server.transport(), base_url=server.base_url) as client:
+            response = await client.get("/api/App/Version")
+        assert response.status_code == 500
+        assert server.stats["injected_errors"] == 1
+
+    async def test_throttling_returns_429(self):
+        """Requests over throttle_rps are rejected with Retry-After."""
+        server = WATSStandInServer(StandInBehavior(throttle_rps=2))
+        async with httpx.AsyncClient(transport=server.transport(), base_url=server.base_url) as client:
+            statuses = [(await client.get("/api/App/Version")) for _ in range(5)]
+
+        throttled = [r for r in statuses if r.status_code == 429]
+        assert throttled
+        assert "Retry-After" in throttled[0].headers
+
+    async def test_custom_route(self):
+        """Extra routes can be registered with the route decorator."""
+        server = WATSStandInServer()
+
+        @server.route("GET", "/api/Custom")
+        async def custom(request, params):
+            return httpx.Response(200, json={"ok": True})
+
+        async with httpx.AsyncClient(transport=server.transport(), base_url=server.base_url) as client:
+            response = await client.get("/api/Custom")
+        assert response.json() == {"ok": True}
+
+
+class TestLoadGenerator:
+    """Tests for LoadGenerator runs through each client path."""
+
+    @pytest.mark.parametrize("mode", ["api", "pending_queue", "converter_pool"])
+    async def test_run_delivers_all_reports(self, mode, tmp_path):
+        """Every report sent through the client path is accepted."""
+        server = WATSStandInServer(StandInBehavior(latency=0.001))
+        generator = LoadGenerator(server, max_concurrent=4, work_dir=tmp_path)
+
+        result = await generator.run(mode=mode, rate=500, count=25, drain_timeout=20)
+
+        assert result.sent == 25
+        assert result.accepted == 25
+        assert result.throughput > 0
+        assert 0 < result.p50_ms <= result.p99_ms
+        assert result.to_dict()["mode"] == mode
+
+    async def test_failed_submissions_not_counted(self, tmp_path):
+        """Reports rejected by the server are sent but not accepted."""
+        server = WATSStandInServer(StandInBehavior(error_rate=1.0))
+        generator = LoadGenerator(server, max_concurrent=4, work_dir=tmp_path)
+
+        result = await generator.run(mode="api", rate=500, count=10, drain_timeout=10)
+
+        assert result.sent == 10
+        assert result.accepted == 0
+        assert server.stats["injected_errors"] >= 10
+
+
+class TestCassette:
+    """Tests for HTTP record/replay."""
+
+    async def _record(self, server: WATSStandInServer) -> Cassette:
+        recorder = RecordingTransport(server.transport())
+        generator = LoadGenerator(server)
+        async with AsyncWATS(base_url=server.base_url, token="c2VjcmV0", transport=recorder,
+                             enable_throttling=False, enable_cache=False) as api:
+            await api.product.get_product("PN-001")
+            await api.report.submit(generator.make_report("SN-REC-1"))
+            await api.report.submit(generator.make_report("SN-REC-2"))
+            await api.report.query_headers(odata_filter="partNumber eq 'PN-LOAD-001'")
+        return recorder.cassette
+
+    async def test_recording_captures_full_bodies(self):
+        """Requests and responses are recorded untruncated with secrets redacted."""
+        server = WATSStandInServer()
+        server.add_product("PN-001")
+        cassette = await self._record(server)
+
+        assert len(cassette) == 4
+        submit = cassette.interactions[1]
+        assert submit.method == "POST"
+        assert b"SN-REC-1" in submit.request_content
+        assert submit.request_headers["authorization"] == "<redacted>"
+        assert b"SN-REC-2" in cassette.interactions[3].response_content
+
+    @pytest.mark.parametrize("suffix", [
+        ".jsonl",
+        ".jsonl.gz",
+        pytest.param(".jsonl.zst", marks=pytest.mark.skipif(not HAS_ZSTD, reason="zstandard not installed")),
+    ])
+    async def test_save_load_roundtrip(self, tmp_path, suffix):
+        """Cassettes survive a save/load round trip in every format."""
+        server = WATSStandInServer()
+        server.add_product("PN-001")
+        cassette = await self._record(server)
+        cassette.metadata["source"] = "unit-test"
+
+        loaded = Cassette.load(cassette.save(tmp_path / f"traffic{suffix}"))
+
+        assert loaded.metadata == {"source": "unit-test"}
+        assert [i.url for i in loaded] == [i.url for i in cassette]
+        assert loaded.interactions[1].request_content == cassette.interactions[1].request_content
+
+    async def test_replay_serves_recorded_responses(self):
+        """Replaying the same workload returns recorded data without a server."""
+        server = WATSStandInServer()
+        server.add_product("PN-001", description="Recorded")
+        cassette = await self._record(server)
+
+        replay = ReplayTransport(cassette, speed=0)
+        async with AsyncWATS(base_url=server.base_url, token="x", transport=replay,
+                             enable_throttling=False, enable_cache=False) as api:
+            product = await api.product.get_product("PN-001")
+            # Body differs from the recording (new report) - matched on endpoint
+            generator = LoadGenerator(WATSStandInServer())
+            first = await api.report.submit(generator.make_report("SN-OTHER"))
+            headers = await api.report.query_headers(odata_filter="partNumber eq 'PN-LOAD-001'")
+
+        assert product.description == "Recorded"
+        assert first in server.reports
+        assert {h.serial_number for h in headers} == {"SN-REC-1", "SN-REC-2"}
+        assert replay.served == 3
+        assert replay.remaining == 1
+
+    async def test_replay_recorded_latency(self):
+        """speed=1.0 reproduces recorded latency; speed=0 does not wait."""
+        server = WATSStandInServer(StandInBehavior(latency=0.05))
+        server.add_product("PN-001")
+        cassette = await self._record(server)
+        request = httpx.Request("GET", f"{server.base_url}/api/Product/PN-001")
+
+        started = time.perf_counter()
+        await ReplayTransport(cassette, speed=1.0).handle_async_request(request)
+        realtime = time.perf_counter() - started
+
+        started = time.perf_counter()
+        await ReplayTransport(cassette, speed=0).handle_async_request(request)
+        fast = time.perf_counter() - started
+
+        assert realtime >= 0.045
+        assert fast < 0.02
+
+    async def test_replay_paced_keeps_request_spacing(self):
+        """pace=True holds each request until its recorded offset."""
+        cassette = Cassette([
+            Interaction("GET", "/api/App/Version", 200, offset=1.0),
+            Interaction("GET", "/api/App/Version", 200, offset=1.2),
+        ])
+        request = httpx.Request("GET", "http://example/api/App/Version")
+
+        paced = ReplayTransport(cassette, speed=1.0, pace=True)
+        started = time.perf_counter()
+        await paced.handle_async_request(request)
+        first = time.perf_counter() - started
+        await paced.handle_async_request(request)
+        second = time.perf_counter() - started
+
+        unpaced = ReplayTransport(cassette, speed=1.0)
+        started = time.perf_counter()
+        await unpaced.handle_async_request(request)
+        await unpaced.handle_async_request(request)
+        fast = time.perf_counter() - started
+
+        assert first < 0.05  # First request anchors the replay clock
+        assert second >= 0.19
+        assert fast < 0.05
+
+    async def test_unmatched_request(self):
+        """Strict replay raises; lenient replay answers 404."""
+        cassette = Cassette()
+        request = httpx.Request("GET", "http://example/api/Missing")
+
+        with pytest.raises(ReplayMismatchError):
+            await ReplayTransport(cassette).handle_async_request(request)
+
+        lenient = ReplayTransport(cassette, strict=False)
+        response = await lenient.handle_async_request(request)
+        assert response.status_code == 404
+        assert lenient.unmatched == 1
+
+    async def test_sequence_and_repeat_modes(self):
+        """Sequence mode serves in order; repeat keeps serving the last match."""
+        server = WATSStandInServer()
+        server.add_product("PN-001")
+        cassette = await self._record(server)
+        version = httpx.Request("GET", f"{server.base_url}/api/App/Version")
+
+        sequence = ReplayTransport(cassette, speed=0, match="sequence")
+        statuses = [(await sequence.handle_async_request(version)).status_code for _ in range(4)]
+        assert statuses == [i.status_code for i in cassette]
+        with pytest.raises(ReplayMismatchError):
+            await sequence.handle_async_request(version)
+
+        repeat = ReplayTransport(cassette, speed=0, repeat=True)
+        product = httpx.Request("GET", f"{server.base_url}/api/Product/PN-001")
+        for _ in range(3):
+            assert (await repeat.handle_async_request(product)).status_code == 200
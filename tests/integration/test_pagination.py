@@ -3,11 +3,15 @@
 Tests the pagination utilities in pywats.core.pagination.
 """
 import pytest
+from datetime import datetime, timedelta
 from unittest.mock import Mock, MagicMock
 
 from pywats.core.pagination import (
     paginate,
     paginate_all,
+    apaginate,
+    apaginate_windows,
+    date_windows,
     Paginator,
     PaginationConfig,
 )
@@ -257,3 +261,205 @@ class TestPaginationConfig:
         with caplog.at_level(logging.WARNING):
             PaginationConfig(page_size=5000)
         assert "slow" in caplog.text.lower()
+
+
+class TestAsyncPaginate:
+    """Tests for the prefetching apaginate async iterator."""
+
+    @staticmethod
+    def _source(total, delay=0.0, calls=None, in_flight=None):
+        """Async page fetcher over range(total) with $skip/$top semantics."""
+        import asyncio
+
+        state = {"current": 0, "peak": 0}
+
+        async def fetch_page(skip, top):
+            if calls is not None:
+                calls.append((skip, top))
+            state["current"] += 1
+            state["peak"] = max(state["peak"], state["current"])
+            try:
+                await asyncio.sleep(delay)
+                return list(range(skip, min(skip + top, total)))
+            finally:
+                state["current"] -= 1
+
+        return fetch_page, state
+
+    @pytest.mark.asyncio
+    async def test_yields_all_items_in_order(self):
+        """All items are yielded in page order."""
+        fetch_page, _ = self._source(95)
+        items = [i async for i in apaginate(fetch_page, lambda p: p, page_size=10, start_index=0)]
+        assert items == list(range(95))
+
+    @pytest.mark.asyncio
+    async def test_prefetch_overlaps_fetches(self):
+        """Up to prefetch + 1 pages are fetched concurrently."""
+        fetch_page, state = self._source(100, delay=0.01)
+        items = [i async for i in apaginate(fetch_page, lambda p: p, page_size=10, start_index=0, prefetch=3)]
+        assert len(items) == 100
+        assert state["peak"] == 4
+
+    @pytest.mark.asyncio
+    async def test_prefetch_zero_is_sequential(self):
+        """prefetch=0 fetches one page at a time."""
+        fetch_page, state = self._source(50, delay=0.001)
+        items = [i async for i in apaginate(fetch_page, lambda p: p, page_size=10, start_index=0, prefetch=0)]
+        assert len(items) == 50
+        assert state["peak"] == 1
+
+    @pytest.mark.asyncio
+    async def test_max_items_limits_requests(self):
+        """max_items trims the last page and never requests beyond it."""
+        calls = []
+        fetch_page, _ = self._source(1000, calls=calls)
+        items = [i async for i in apaginate(
+            fetch_page, lambda p: p, page_size=10, start_index=0, max_items=25, prefetch=5
+        )]
+        assert items == list(range(25))
+        assert calls == [(0, 10), (10, 10), (20, 5)]
+
+    @pytest.mark.asyncio
+    async def test_total_stops_scheduling(self):
+        """Known totals prevent speculative fetches past the end."""
+        import asyncio
+
+        calls = []
+
+        async def fetch_page(start, count):
+            calls.append(start)
+            await asyncio.sleep(0)
+            return MockResponse(items=list(range(start, min(start + count, 31))), total=30)
+
+        items = [i async for i in apaginate(
+            fetch_page, lambda r: r.items, get_total=lambda r: r.total, page_size=10, start_index=1, prefetch=1
+        )]
+        assert items == list(range(1, 31))
+        assert max(calls) <= 21
+
+    @pytest.mark.asyncio
+    async def test_early_break_cancels_prefetch(self):
+        """Breaking out cancels in-flight prefetches."""
+        import asyncio
+
+        started, finished = [], []
+
+        async def fetch_page(skip, top):
+            started.append(skip)
+            await asyncio.sleep(0.05 if skip else 0)
+            finished.append(skip)
+            return list(range(skip, skip + top))
+
+        pages = apaginate(fetch_page, lambda p: p, page_size=10, start_index=0, prefetch=2)
+        async for item in pages:
+            break
+        await pages.aclose()
+        await asyncio.sleep(0.1)
+
+        assert started == [0, 10, 20]
+        assert finished == [0]
+
+    @pytest.mark.asyncio
+    async def test_fetch_error_propagates(self):
+        """Errors from a page fetch are raised to the consumer."""
+        async def fetch_page(skip, top):
+            if skip >= 10:
+                raise RuntimeError("boom")
+            return list(range(skip, skip + top))
+
+        items = []
+        with pytest.raises(RuntimeError):
+            async for item in apaginate(fetch_page, lambda p: p, page_size=10, start_index=0):
+                items.append(item)
+        assert items == list(range(10))
+
+    @pytest.mark.asyncio
+    async def test_on_page_callback(self):
+        """on_page is called per page."""
+        fetch_page, _ = self._source(25)
+        progress = []
+        async for _ in apaginate(
+            fetch_page, lambda p: p, page_size=10, start_index=0,
+            on_page=lambda n, so_far, total: progress.append((n, so_far)),
+        ):
+            pass
+        assert progress == [(1, 10), (2, 20), (3, 25)]
+
+
+class TestAsyncPaginateWindows:
+    """Tests for date-window cursoring."""
+
+    def test_date_windows_cover_range(self):
+        """Windows are contiguous, half-open and clipped to the end."""
+        windows = date_windows(datetime(2026, 1, 1), datetime(2026, 1, 3, 12), timedelta(days=1))
+        assert windows == [
+            (datetime(2026, 1, 1), datetime(2026, 1, 2)),
+            (datetime(2026, 1, 2), datetime(2026, 1, 3)),
+            (datetime(2026, 1, 3), datetime(2026, 1, 3, 12)),
+        ]
+
+    def test_date_windows_rejects_empty_window(self):
+        with pytest.raises(ValueError):
+            date_windows(datetime(2026, 1, 1), datetime(2026, 1, 2), timedelta(0))
+
+    @pytest.mark.asyncio
+    async def test_windows_yield_in_order_with_prefetch(self):
+        """Windows complete out of order but are yielded chronologically."""
+        import asyncio
+
+        start = datetime(2026, 1, 1)
+
+        async def fetch_window(lower, upper):
+            day = (lower - start).days
+            await asyncio.sleep(0.02 if day % 2 == 0 else 0)
+            return [day]
+
+        items = [d async for d in apaginate_windows(
+            fetch_window, start, start + timedelta(days=6), timedelta(days=1), prefetch=3
+        )]
+        assert items == [0, 1, 2, 3, 4, 5]
+
+
+class TestAsyncScimIterUsers:
+    """AsyncScimService.iter_users uses the prefetching paginator."""
+
+    @pytest.mark.asyncio
+    async def test_iter_users_pages_through_all(self):
+        from pywats.domains.scim.async_service import AsyncScimService
+        from pywats.domains.scim.models import ScimListResponse, ScimUser
+
+        users = [ScimUser(user_name=f"user{i}") for i in range(23)]
+        calls = []
+
+        class Repo:
+            async def get_users(self, start_index=None, count=None):
+                calls.append((start_index, count))
+                page = users[start_index - 1:start_index - 1 + count]
+                return ScimListResponse(resources=page, total_results=len(users))
+
+        service = AsyncScimService(Repo())
+        names = [u.user_name async for u in service.iter_users(page_size=10)]
+        assert names == [u.user_name for u in users]
+        assert calls == [(1, 10), (11, 10), (21, 10)]
+
+        limited = [u async for u in service.iter_users(page_size=10, max_users=5)]
+        assert len(limited) == 5
+
+    @pytest.mark.asyncio
+    async def test_iter_users_reports_empty_first_page(self):
+        """on_page is still called once when there are no users."""
+        from pywats.domains.scim.async_service import AsyncScimService
+        from pywats.domains.scim.models import ScimListResponse
+
+        class Repo:
+            async def get_users(self, start_index=None, count=None):
+                return ScimListResponse(resources=[], total_results=0)
+
+        progress = []
+        service = AsyncScimService(Repo())
+        users = [u async for u in service.iter_users(
+            on_page=lambda n, so_far, total: progress.append((n, so_far)))]
+
+        assert users == []
+        assert progress == [(1, 0)]
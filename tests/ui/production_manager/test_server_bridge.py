@@ -0,0 +1,197 @@
+"""Tests for the Production Manager ServerBridge.
+
+Server calls are replaced with local coroutines; the tests check that
+they run on one persistent loop and that loads are deduplicated,
+superseded and delivered through Qt signals.
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from PySide6.QtCore import QCoreApplication
+
+from pywats_ui.apps.production_manager.server_bridge import ServerBridge
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    """A Qt application to deliver queued signals."""
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def bridge(qapp):
+    bridge = ServerBridge()
+    bridge.configure("https://wats.example.com", "token")
+    yield bridge
+    bridge.shutdown()
+
+
+def wait_for(qapp, condition, timeout=5.0):
+    """Process Qt events until condition() is true."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        qapp.processEvents()
+        time.sleep(0.005)
+
+
+class TestServerBridge:
+    """Tests for request execution and delivery."""
+
+    def test_calls_share_one_loop_thread(self, qapp, bridge):
+        """All calls run on the same background loop and reach the signal."""
+        threads = []
+        loaded = []
+
+        async def fetch(definition_id):
+            threads.append(threading.current_thread())
+            return {"id": definition_id}
+
+        bridge._fetch_definition = fetch
+        bridge.definition_loaded.connect(loaded.append)
+
+        bridge.load_definition("a")
+        wait_for(qapp, lambda: len(loaded) == 1)
+        bridge.load_definition("b")
+        wait_for(qapp, lambda: len(loaded) == 2)
+
+        assert loaded == [{"id": "a"}, {"id": "b"}]
+        assert threads[0] is threads[1]
+        assert threads[0] is not threading.current_thread()
+
+    def test_identical_loads_are_deduplicated(self, qapp, bridge):
+        """A repeated load joins the one already in flight."""
+        calls = []
+        loaded = []
+
+        async def fetch(definition_id):
+            calls.append(definition_id)
+            await asyncio.sleep(0.05)
+            return [definition_id]
+
+        bridge._fetch_relations = fetch
+        bridge.relations_loaded.connect(loaded.append)
+
+        for _ in range(5):
+            bridge.load_relations("a")
+        wait_for(qapp, lambda: bridge.pending_count == 0)
+
+        assert calls == ["a"]
+        assert loaded == [["a"]]
+
+    def test_newer_load_supersedes_older(self, qapp, bridge):
+        """Browsing to another definition cancels the stale load."""
+        cancelled = []
+        loaded = []
+
+        async def fetch(definition_id):
+            try:
+                await asyncio.sleep(0.2 if definition_id == "a" else 0)
+            except asyncio.CancelledError:
+                cancelled.append(definition_id)
+                raise
+            return {"id": definition_id}
+
+        bridge._fetch_xaml = fetch
+        bridge.xaml_loaded.connect(loaded.append)
+
+        bridge.load_xaml("a")
+        bridge.load_xaml("b")
+        wait_for(qapp, lambda: loaded and cancelled)
+
+        assert loaded == [{"id": "b"}]
+        assert cancelled == ["a"]
+
+    def test_errors_are_reported(self, qapp, bridge):
+        """Exceptions are delivered on error_occurred."""
+        errors = []
+
+        async def fetch(definition_id):
+            raise RuntimeError("server down")
+
+        bridge._fetch_media = fetch
+        bridge.error_occurred.connect(errors.append)
+
+        bridge.load_media("a")
+        wait_for(qapp, lambda: errors)
+
+        assert errors == ["server down"]
+
+    def test_session_shared_until_reconfigured(self, qapp, bridge):
+        """Requests reuse one client session per server."""
+        sessions = []
+        done = []
+
+        async def fetch(is_global):
+            sessions.append(bridge._current_session())
+            return []
+
+        bridge._fetch_definitions = fetch
+        bridge.definitions_loaded.connect(done.append)
+
+        bridge.load_definitions()
+        wait_for(qapp, lambda: len(done) == 1)
+        bridge.load_definitions(is_global=True)
+        wait_for(qapp, lambda: len(done) == 2)
+        bridge.configure("https://other.example.com", "token")
+        bridge.load_definitions()
+        wait_for(qapp, lambda: len(done) == 3)
+
+        assert sessions[0] is sessions[1]
+        assert sessions[2] is not sessions[0]
+        assert sessions[2].base_url == "https://other.example.com"
+
+    def test_request_keeps_session_it_was_submitted_with(self, qapp, bridge):
+        """A request still running after configure() never touches bridge state."""
+        old = bridge._current_session()
+        bridge.configure("https://other.example.com", "token")
+        new = bridge._session
+        seen = []
+
+        async def fetch():
+            seen.append(bridge._current_session())
+
+        # A request submitted before configure() finishes afterwards
+        bridge._runner.submit(bridge._execute(0, old, fetch)).result(2)
+
+        assert new.base_url == "https://other.example.com"
+        assert seen == [old]
+        assert bridge._session is new
+
+    def test_shutdown_cancels_pending(self, qapp):
+        """shutdown() cancels in-flight calls and stops the loop."""
+        bridge = ServerBridge()
+        bridge.configure("https://wats.example.com", "token")
+        started = threading.Event()
+        loaded = []
+
+        async def fetch(definition_id):
+            started.set()
+            await asyncio.sleep(10)
+            return {}
+
+        bridge._fetch_definition = fetch
+        bridge.definition_loaded.connect(loaded.append)
+
+        bridge.load_definition("a")
+        assert started.wait(2)
+        bridge.shutdown()
+        qapp.processEvents()
+
+        assert bridge.pending_count == 0
+        assert loaded == []
+        assert not bridge._runner.is_running
+
+    def test_requires_configuration(self, qapp):
+        """Calls without a server report an error instead of running."""
+        bridge = ServerBridge()
+        errors = []
+        bridge.error_occurred.connect(errors.append)
+
+        bridge.load_definitions()
+
+        assert errors == ["Server not configured"]
+        assert not bridge._runner.is_running